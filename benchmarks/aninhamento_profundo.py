@@ -0,0 +1,64 @@
+# benchmarks/aninhamento_profundo.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.parser import Parser
+from src.parser_iterativo import ParserIterativo
+"""
+Analisa programas com aninhamento crescente nos dois Parsers:
+  - SE ... ENTAO INICIO ... FIM encadeados (comandos aninhados);
+  - parênteses aninhados numa expressão aritmética;
+  - parênteses aninhados numa expressão relacional.
+
+O Parser recursivo estoura o limite de recursão do Python a partir de
+algumas centenas de níveis; o ParserIterativo deve crescer linearmente.
+Uso: python benchmarks/aninhamento_profundo.py [profundidade_maxima]
+"""
+
+CABECALHO = ":DECLARACOES\nx:INTEIRO\n:ALGORITMO\n"
+
+def comandos_aninhados(profundidade):
+  return CABECALHO + "SE x > 0 ENTAO INICIO\n" * profundidade + "x = 1\n" + "FIM\n" * profundidade
+
+def parenteses_aritmeticos(profundidade):
+  return CABECALHO + "x = " + "(" * profundidade + "x + 1" + ")" * profundidade + "\n"
+
+def parenteses_relacionais(profundidade):
+  return CABECALHO + "ENQUANTO " + "(" * profundidade + "x < 1" + ")" * profundidade + " LER x\n"
+
+def medir(classe, codigo):
+  tokens = AnalisadorLexico(codigo).tokenize(lote=True)
+  inicio = time.perf_counter()
+  try:
+    resultado = classe(tokens).parse()
+  except RecursionError:
+    return "RecursionError"
+  segundos = time.perf_counter() - inicio
+  assert resultado["sucesso"], resultado["erros"]
+  return f"{segundos * 1e3:9.1f} ms ({segundos / len(tokens) * 1e9:6.0f} ns/token)"
+
+def main():
+  maxima = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+  profundidades = [100, 1000]
+  while profundidades[-1] * 10 <= maxima:
+    profundidades.append(profundidades[-1] * 10)
+  if profundidades[-1] != maxima:
+    profundidades.append(maxima)
+
+  for nome, gerar in (
+    ("SE/INICIO", comandos_aninhados),
+    ("( aritmético )", parenteses_aritmeticos),
+    ("( relacional )", parenteses_relacionais),
+  ):
+    for profundidade in profundidades:
+      codigo = gerar(profundidade)
+      for classe in (Parser, ParserIterativo):
+        print(f"{nome:<15} profundidade={profundidade:<7} {classe.__name__:<16} {medir(classe, codigo)}")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,89 @@
+# benchmarks/artefato.py
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.parser import Parser
+from src.semantico import analisar
+from src.bytecode import compilar
+from src.artefato import Artefato, gravar_artefato
+from src.gerador_de_programas import GeradorDeProgramas, tamanho_em_bytes
+"""
+Compara o preparo de um programa a partir do código-fonte (análises
+léxica, sintática e semântica e compilação para bytecode) com a carga do
+artefato .mcc (src/artefato.py), em programas sintéticos de vários
+tamanhos:
+
+  - cabeçalho: só Artefato(caminho), que deve levar o mesmo tempo em
+    qualquer tamanho;
+  - pronto: o ProgramaCompilado e o índice de linhas, prontos para a
+    máquina virtual (as instruções ficam no mmap, sem cópia);
+  - main.py: o processo inteiro, inspecionando o .mcc, contra a análise
+    do .mc sem cache.
+
+Cada medida é a menor de algumas rodadas.
+Uso: python benchmarks/artefato.py [faixas, ex.: 10KB,100KB,1MB,10MB]
+"""
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(RAIZ, "main.py")
+RODADAS = 5
+
+def menor_tempo(funcao, rodadas=RODADAS):
+  melhor = None
+  for _ in range(rodadas):
+    inicio = time.perf_counter()
+    funcao()
+    segundos = time.perf_counter() - inicio
+    melhor = segundos if melhor is None else min(melhor, segundos)
+  return melhor
+
+def preparar(codigo_fonte):
+  tokens = AnalisadorLexico(codigo_fonte).tokenize(lote=True)
+  resultado = Parser(tokens).parse()
+  semantica = analisar(resultado["arvore"], tokens.indice_linhas)
+  return compilar(resultado["arvore"], semantica["tabela"]), semantica["tabela"], tokens.indice_linhas
+
+def abrir(caminho):
+  Artefato(caminho).fechar()
+
+def carregar(caminho):
+  with Artefato(caminho) as artefato:
+    artefato.programa()
+    artefato.indice_linhas
+
+def main():
+  faixas = (sys.argv[1] if len(sys.argv) > 1 else "10KB,100KB,1MB,10MB").split(",")
+  diretorio = tempfile.mkdtemp()
+  print(f"{'faixa':>6s} {'preparo':>10s} {'cabeçalho':>10s} {'pronto':>10s} {'main .mc':>10s} {'main .mcc':>10s}  artefato")
+  for faixa in faixas:
+    codigo_fonte = GeradorDeProgramas(21).gerar(tamanho=tamanho_em_bytes(faixa))
+    fonte = os.path.join(diretorio, f"{faixa}.mc")
+    caminho = os.path.join(diretorio, f"{faixa}.mcc")
+    with open(fonte, "w", encoding="utf-8") as f:
+      f.write(codigo_fonte)
+    programa, tabela, indice_linhas = preparar(codigo_fonte)
+    tamanho = gravar_artefato(caminho, programa, tabela, indice_linhas, codigo_fonte, fonte)
+
+    rodadas = 1 if len(codigo_fonte) > 2**20 else RODADAS
+    tempo_preparo = menor_tempo(lambda: preparar(codigo_fonte), rodadas)
+    tempo_cabecalho = menor_tempo(lambda: abrir(caminho), 50)
+    tempo_pronto = menor_tempo(lambda: carregar(caminho))
+    comando = [sys.executable, MAIN]
+    tempo_main_fonte = menor_tempo(
+      lambda: subprocess.run(comando + [fonte, "--sem-cache"], check=True, stdout=subprocess.DEVNULL), rodadas
+    )
+    tempo_main_artefato = menor_tempo(lambda: subprocess.run(comando + [caminho], check=True, stdout=subprocess.DEVNULL))
+    print(
+      f"{faixa:>6s} {tempo_preparo * 1e3:8.1f} ms {tempo_cabecalho * 1e6:7.1f} µs {tempo_pronto * 1e3:7.2f} ms "
+      f"{tempo_main_fonte * 1e3:7.0f} ms {tempo_main_artefato * 1e3:7.0f} ms  {tamanho / 2**10:,.0f} KiB"
+    )
+
+if __name__ == "__main__":
+  main()
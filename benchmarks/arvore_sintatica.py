@@ -0,0 +1,62 @@
+# benchmarks/arvore_sintatica.py
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.parser import Parser
+"""
+Compara os dois modos do Parser num programa com 100 mil comandos:
+  - construir_arvore=True: constrói a AST (src/arvore.py);
+  - construir_arvore=False: só valida (sucesso/erros), sem criar nós.
+
+Os tokens são gerados antes da medição (TokenStream), então o tempo e a
+memória medidos são apenas os da análise sintática.
+Uso: python benchmarks/arvore_sintatica.py [milhares_de_comandos]
+"""
+
+# Cada bloco tem 5 comandos de nível superior (SE, ENQUANTO, atribuição, IMPRIMIR, LER)
+COMANDOS = """SE numero1 > numero2 E (aux < 10) ENTAO
+  aux = numero2 * (numero1 + 3.5)
+ENQUANTO numero1 < 100 numero1 = numero1 + 1
+aux = aux / 2
+IMPRIMIR("valor")
+LER numero2
+"""
+COMANDOS_POR_BLOCO = 5
+
+def gerar_programa(comandos):
+  cabecalho = ":DECLARACOES\nnumero1:INTEIRO\nnumero2:INTEIRO\naux:REAL\n:ALGORITMO\n"
+  return cabecalho + COMANDOS * (comandos // COMANDOS_POR_BLOCO)
+
+def medir(tokens, construir_arvore):
+  inicio = time.perf_counter()
+  resultado = Parser(tokens, construir_arvore=construir_arvore).parse()
+  segundos = time.perf_counter() - inicio
+
+  # Memória medida numa segunda execução, para o tracemalloc não distorcer o tempo
+  tracemalloc.start()
+  resultado = Parser(tokens, construir_arvore=construir_arvore).parse()
+  memoria = tracemalloc.get_traced_memory() # (retida, pico)
+  tracemalloc.stop()
+  assert resultado["sucesso"], resultado["erros"]
+  return segundos, memoria, resultado
+
+def main():
+  milhares = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+  comandos = milhares * 1000
+  tokens = AnalisadorLexico(gerar_programa(comandos)).tokenize(lote=True)
+  print(f"{comandos} comandos, {len(tokens)} tokens")
+  for construir_arvore in (True, False):
+    segundos, memoria, resultado = medir(tokens, construir_arvore)
+    modo = "AST" if construir_arvore else "só validação"
+    retida, pico = memoria
+    print(f"{modo:<13} {segundos:7.3f} s  {retida / 2**20:8.1f} MiB retidos  {pico / 2**20:8.1f} MiB de pico")
+    del resultado
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,66 @@
+# benchmarks/cache_de_compilacao.py
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.parser import Parser
+from src.cache_de_compilacao import CacheDeCompilacao
+"""
+Compara as análises léxica + sintática completas com a leitura do mesmo
+resultado (TokenStream + AST) do CacheDeCompilacao, num programa com 20
+mil comandos. Mostra também o tamanho da entrada em disco. Cada medida é
+a menor de 5 execuções; o cache vai para um diretório temporário.
+Uso: python benchmarks/cache_de_compilacao.py [milhares_de_comandos]
+"""
+
+COMANDOS = """SE numero1 > numero2 E (aux < 10) ENTAO
+  aux = numero2 * (numero1 + 3.5)
+ENQUANTO numero1 < 100 numero1 = numero1 + 1
+aux = aux / 2
+IMPRIMIR("valor")
+LER numero2
+"""
+COMANDOS_POR_BLOCO = 5
+REPETICOES = 5
+
+def gerar_programa(comandos):
+  cabecalho = ":DECLARACOES\nnumero1:INTEIRO\nnumero2:INTEIRO\naux:REAL\n:ALGORITMO\n"
+  return cabecalho + COMANDOS * (comandos // COMANDOS_POR_BLOCO)
+
+def menor_tempo(funcao):
+  melhor = None
+  for _ in range(REPETICOES):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    segundos = time.perf_counter() - inicio
+    melhor = segundos if melhor is None else min(melhor, segundos)
+  return melhor, resultado
+
+def analisar(codigo_fonte):
+  tokens = AnalisadorLexico(codigo_fonte).tokenize(lote=True)
+  return tokens, Parser(tokens).parse()
+
+def main():
+  milhares = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+  codigo_fonte = gerar_programa(milhares * 1000)
+  cache = CacheDeCompilacao(tempfile.mkdtemp())
+
+  tempo_analise, (tokens, resultado) = menor_tempo(lambda: analisar(codigo_fonte))
+  assert resultado["sucesso"], resultado["erros"]
+  cache.salvar(codigo_fonte, tokens, resultado)
+  tempo_cache, em_cache = menor_tempo(lambda: cache.carregar(codigo_fonte))
+  assert em_cache is not None
+  tamanho = os.path.getsize(cache.arquivo(cache.chave(codigo_fonte)))
+
+  print(f"{milhares * 1000} comandos, {len(tokens)} tokens, {len(codigo_fonte) / 2**10:.0f} KiB de código-fonte")
+  print(f"análises   {tempo_analise * 1e3:8.1f} ms")
+  print(f"cache      {tempo_cache * 1e3:8.1f} ms  ({tempo_analise / tempo_cache:4.1f}x)  entrada de {tamanho / 2**10:.0f} KiB")
+  print(cache.estatisticas())
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,80 @@
+# benchmarks/despacho_do_scanner.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.token_type import TiposDeToken
+"""
+Custo por token do motor de caracteres do AnalisadorLexico em duas
+entradas extremas, medidas separadamente:
+
+  - operadores: expressões sem espaços, quase só tokens de um ou dois
+    caracteres ('(', '+', '>=', ...), que dependem da tabela de símbolos;
+  - identificadores: palavras reservadas e nomes separados por espaços,
+    que dependem da classificação do primeiro caractere, da consulta às
+    palavras reservadas e do espaço em branco.
+
+Para cada entrada, mede tokenize(lote=True) e proximo_token() (o menor
+tempo de algumas rodadas) e conta os objetos str distintos entre os
+textos dos identificadores e palavras reservadas devolvidos por
+proximo_token(): com a internação, cada lexema repetido é um só objeto.
+
+Uso: python benchmarks/despacho_do_scanner.py [milhares_de_tokens]
+"""
+
+RODADAS = 5
+
+OPERADORES = "x=(a+b)*(c-d)/(e+f)-(g*h)\nSE(i>=j)E(k<=l)OU(m!=n)E(o==p)ENTAO\n"
+IDENTIFICADORES = (
+  "SE contador E limite OU total ENTAO LER valor_atual\n"
+  "ENQUANTO indice INICIO LER proximo_valor LER contador FIM\n"
+)
+
+def gerar_entrada(linha, quantidade):
+  tokens_por_linha = len(AnalisadorLexico(linha).tokenize(lote=True)) - 1
+  return linha * (quantidade // tokens_por_linha + 1)
+
+def lote(codigo):
+  return len(AnalisadorLexico(codigo).tokenize(lote=True))
+
+def por_chamada(codigo):
+  analisador = AnalisadorLexico(codigo)
+  proximo_token = analisador.proximo_token
+  quantidade = 0
+  while proximo_token().tipo is not TiposDeToken.FIM_DE_ARQUIVO:
+    quantidade += 1
+  return quantidade + 1
+
+# Retorna (textos distintos, objetos str distintos) das palavras e identificadores
+def objetos_de_texto(codigo):
+  palavras = [
+    token.texto for token in AnalisadorLexico(codigo).tokenize()
+    if token.tipo is TiposDeToken.IDENTIFICADOR or token.tipo.name.startswith("PALAVRA_RESERVADA")
+  ]
+  return len(set(palavras)), len({id(texto) for texto in palavras})
+
+def medir(consumir, codigo):
+  melhor = None
+  for _ in range(RODADAS):
+    inicio = time.perf_counter()
+    quantidade = consumir(codigo)
+    segundos = time.perf_counter() - inicio
+    melhor = segundos if melhor is None else min(melhor, segundos)
+  return melhor / quantidade * 1e9, quantidade
+
+def main():
+  milhares = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+  for nome, linha in (("operadores", OPERADORES), ("identificadores", IDENTIFICADORES)):
+    codigo = gerar_entrada(linha, milhares * 1000)
+    for modo, consumir in (("tokenize(lote=True)", lote), ("proximo_token()", por_chamada)):
+      custo, quantidade = medir(consumir, codigo)
+      print(f"{nome:<16} {modo:<20} {custo:8.1f} ns/token ({quantidade} tokens)")
+    textos, objetos = objetos_de_texto(gerar_entrada(linha, 10000))
+    print(f"{nome:<16} {'textos de palavras':<20} {textos} distintos em {objetos} objetos str")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,134 @@
+# benchmarks/incremental.py
+
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.parser import Parser
+from src.arvore import iguais
+from src.incremental import DocumentoIncremental
+"""
+Edições num arquivo de 100 mil linhas com o DocumentoIncremental: digitar
+um caractere num identificador, inserir e apagar uma linha de comando,
+quebrar uma expressão (erro sintático) e consertá-la, e abrir e fechar um
+comentário /* */, e digitar com erros sintáticos espalhados pelo arquivo.
+Mostra a mediana, o p95 e o máximo de cada tipo de edição, contra uma
+reanálise completa. No fim, confere que o resultado e
+os tokens são os mesmos da análise completa do texto editado.
+Uso: python benchmarks/incremental.py [milhares_de_linhas] [edicoes]
+"""
+
+SEMENTE = 19
+COMANDOS = """SE numero1 > numero2 E (aux < 10) ENTAO
+  aux = numero2 * (numero1 + 3.5)
+ENQUANTO numero1 < 100
+  numero1 = numero1 + 1
+INICIO
+  aux = aux / 2
+  IMPRIMIR("valor")
+FIM
+LER numero2
+"""
+LINHAS_POR_BLOCO = COMANDOS.count("\n")
+
+def gerar_programa(linhas):
+  cabecalho = ":DECLARACOES\nnumero1:INTEIRO\nnumero2:INTEIRO\naux:REAL\n:ALGORITMO\n"
+  return cabecalho + COMANDOS * (linhas // LINHAS_POR_BLOCO)
+
+def analisar_tudo(codigo_fonte):
+  tokens = AnalisadorLexico(codigo_fonte).tokenize(lote=True)
+  return tokens, Parser(tokens).parse()
+
+# Cada edição é uma função (documento, aleatório) -> lista de (offset, removidos, inseridos)
+def digitar(documento, aleatorio):
+  texto = documento.codigo_fonte
+  offset = texto.index("aux", aleatorio.randrange(len(texto) // 2)) + 3
+  return [(offset, 0, "x"), (offset, 1, "")]
+
+def linha_nova(documento, aleatorio):
+  texto = documento.codigo_fonte
+  offset = texto.index("\nLER", aleatorio.randrange(len(texto) // 2)) + 1
+  linha = "numero1 = numero2 - 7\n"
+  return [(offset, 0, linha), (offset, len(linha), "")]
+
+def quebrar_e_consertar(documento, aleatorio):
+  texto = documento.codigo_fonte
+  offset = texto.index("+ 1", aleatorio.randrange(len(texto) // 2)) + 2
+  return [(offset, 1, ""), (offset, 0, "1")]
+
+def comentario(documento, aleatorio):
+  texto = documento.codigo_fonte
+  offset = texto.index("\nINICIO", aleatorio.randrange(len(texto) // 2)) + 1
+  fim = texto.index("FIM\n", offset) + 4
+  return [(offset, 0, "/*"), (fim + 2, 0, "*/"), (fim + 2, 2, ""), (offset, 2, "")]
+
+EDICOES = (("digitar", digitar), ("linha nova", linha_nova), ("quebrar/consertar", quebrar_e_consertar), ("comentário", comentario))
+ERROS_ESPALHADOS = 50
+
+def medir(nome, documento, aleatorio, edicao, quantidade, completa):
+  tempos = []
+  for _ in range(quantidade):
+    for offset, removidos, inseridos in edicao(documento, aleatorio):
+      inicio = time.perf_counter()
+      documento.editar(offset, removidos, inseridos)
+      tempos.append(time.perf_counter() - inicio)
+  tempos.sort()
+  print(
+    f"{nome:20s}  mediana {statistics.median(tempos) * 1000:6.2f} ms  p95 {tempos[int(len(tempos) * 0.95)] * 1000:6.2f} ms  "
+    f"máx {tempos[-1] * 1000:6.2f} ms  ({completa / statistics.median(tempos):,.0f}x)"
+  )
+
+# Apaga o '1' de ERROS_ESPALHADOS expressões '+ 1' (do fim para o começo,
+# para os deslocamentos das anteriores não mudarem); retorna as edições que
+# os consertam
+def espalhar_erros(documento):
+  texto = documento.codigo_fonte
+  passo = len(texto) // ERROS_ESPALHADOS
+  consertos = []
+  for k in reversed(range(ERROS_ESPALHADOS)):
+    offset = texto.index("+ 1", k * passo) + 2
+    documento.editar(offset, 1, "")
+    consertos.append((offset, 0, "1"))
+  return consertos
+
+def main():
+  milhares = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+  quantidade = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+  codigo_fonte = gerar_programa(milhares * 1000)
+  aleatorio = random.Random(SEMENTE)
+
+  inicio = time.perf_counter()
+  analisar_tudo(codigo_fonte)
+  completa = time.perf_counter() - inicio
+  inicio = time.perf_counter()
+  documento = DocumentoIncremental(codigo_fonte)
+  abertura = time.perf_counter() - inicio
+  print(f"{codigo_fonte.count(chr(10))} linhas, {len(documento.segmentos)} segmentos")
+  print(f"análise completa      {completa * 1000:9.1f} ms")
+  print(f"abertura do documento {abertura * 1000:9.1f} ms")
+
+  for nome, edicao in EDICOES:
+    medir(nome, documento, aleatorio, edicao, quantidade, completa)
+  consertos = espalhar_erros(documento)
+  medir(f"digitar ({ERROS_ESPALHADOS} erros)", documento, aleatorio, digitar, quantidade, completa)
+  conferir(documento)
+  for offset, removidos, inseridos in consertos:
+    documento.editar(offset, removidos, inseridos)
+  conferir(documento)
+  print("resultado e tokens iguais aos da análise completa")
+
+def conferir(documento):
+  tokens, esperado = analisar_tudo(documento.codigo_fonte)
+  obtido = documento.resultado()
+  assert obtido["sucesso"] == esperado["sucesso"]
+  assert [erro.como_dicionario() for erro in obtido["erros"]] == [erro.como_dicionario() for erro in esperado["erros"]]
+  assert iguais(obtido["arvore"], esperado["arvore"])
+  assert documento.tokens().inicios == tokens.inicios
+
+if __name__ == "__main__":
+  main()
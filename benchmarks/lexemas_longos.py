@@ -0,0 +1,50 @@
+# benchmarks/lexemas_longos.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico, MOTORES
+from src.token_type import TiposDeToken
+"""
+Microbenchmark do Analisador Léxico para lexemas muito longos:
+uma CADEIA de 1 MB e um bloco de comentário /* ... */ de 10 MB.
+
+Uso: python benchmarks/lexemas_longos.py
+"""
+
+MB = 1024 * 1024
+
+# Monta os programas de teste (o conteúdo tem quebras de linha para exercitar
+# o recálculo de linha/coluna em bloco)
+def gerar_entradas():
+  linha = "x" * 63 + "\n"
+  cadeia = "IMPRIMIR(\"" + (linha * (MB // len(linha))).replace("\n", " ") + "\")\n"
+  comentario = "/*" + linha * (10 * MB // len(linha)) + "*/\nLER x\n"
+  return {
+    "cadeia de 1 MB": cadeia,
+    "comentário de 10 MB": comentario,
+  }
+
+# Consome todos os tokens e devolve (quantidade de tokens, segundos)
+def medir(codigo, motor):
+  analisador = AnalisadorLexico(codigo, motor=motor)
+  inicio = time.perf_counter()
+  quantidade = 0
+  while True:
+    token = analisador.proximo_token()
+    quantidade += 1
+    if token is None or token.tipo == TiposDeToken.FIM_DE_ARQUIVO:
+      break
+  return quantidade, time.perf_counter() - inicio
+
+def main():
+  for nome, codigo in gerar_entradas().items():
+    for motor in MOTORES:
+      quantidade, segundos = medir(codigo, motor)
+      print(f"{nome:<22} motor={motor:<11} tokens={quantidade:<4} {segundos * 1000:10.2f} ms")
+
+if __name__ == "__main__":
+  main()
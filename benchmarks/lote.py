@@ -0,0 +1,79 @@
+# benchmarks/lote.py
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lote import expandir_entradas, verificar_lote
+"""
+Escalabilidade da verificação em lote (main.py --lote): gera um corpus de
+10 mil arquivos .mc pequenos (variados, alguns com erros) num diretório
+temporário e verifica todos com 1, 2, 4, ... processos, até o número de
+núcleos. Mostra o tempo, arquivos por segundo e o ganho em relação a um
+processo. O cache das análises fica desligado, para medir o trabalho real.
+Uso: python benchmarks/lote.py [arquivos] [max_processos]
+"""
+
+SEMENTE = 16
+
+def gerar_programa(aleatorio):
+  variaveis = [f"v{i}" for i in range(aleatorio.randint(2, 6))]
+  linhas = [":DECLARACOES"]
+  linhas += [f"{nome}:INTEIRO" for nome in variaveis]
+  linhas.append("media:REAL")
+  linhas.append(":ALGORITMO")
+  for _ in range(aleatorio.randint(10, 60)):
+    alvo, a, b = (aleatorio.choice(variaveis) for _ in range(3))
+    forma = aleatorio.randrange(6)
+    if forma == 5:
+      linhas.append(f"media = media + {a} / {aleatorio.randint(1, 9)}.5")
+    elif forma == 0:
+      linhas.append(f"{alvo} = {a} * ({b} + {aleatorio.randint(1, 99)}) - 2")
+    elif forma == 1:
+      linhas.append(f"SE {a} > {b} E {a} < 100 ENTAO INICIO {alvo} = {a} + 1 IMPRIMIR({alvo}) FIM SENAO {alvo} = {b}")
+    elif forma == 2:
+      linhas.append(f"ENQUANTO {a} < {aleatorio.randint(1, 99)} {a} = {a} + 1")
+    elif forma == 3:
+      linhas.append(f"LER {alvo}")
+    else:
+      linhas.append(f'IMPRIMIR("{alvo}")')
+  # Cerca de 1 em 10 arquivos tem um erro (sintático ou semântico)
+  if aleatorio.random() < 0.1:
+    linhas.insert(aleatorio.randint(len(variaveis) + 4, len(linhas)), aleatorio.choice(("x = = 1", "nao_declarada = 1")))
+  return "\n".join(linhas) + "\n"
+
+def gerar_corpus(diretorio, quantidade):
+  aleatorio = random.Random(SEMENTE)
+  for i in range(quantidade):
+    subdiretorio = os.path.join(diretorio, f"d{i // 1000:02d}")
+    os.makedirs(subdiretorio, exist_ok=True)
+    with open(os.path.join(subdiretorio, f"p{i:05d}.mc"), "w", encoding="utf-8") as f:
+      f.write(gerar_programa(aleatorio))
+
+def main():
+  quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+  maximo = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+  diretorio = tempfile.mkdtemp()
+  gerar_corpus(diretorio, quantidade)
+  arquivos = expandir_entradas([diretorio])
+  print(f"{len(arquivos)} arquivos, {os.cpu_count()} núcleos")
+
+  processos = 1
+  base = None
+  while processos <= maximo:
+    inicio = time.perf_counter()
+    falhas = sum(not resultado.sucesso for resultado in verificar_lote(arquivos, processos, usar_cache=False))
+    segundos = time.perf_counter() - inicio
+    base = base or segundos
+    print(
+      f"{processos:3d} processos  {segundos:7.2f} s  {len(arquivos) / segundos:8.0f} arquivos/s  "
+      f"{base / segundos:5.2f}x  ({falhas} com erros)"
+    )
+    processos = processos * 2 if processos * 2 <= maximo or processos == maximo else maximo
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,57 @@
+# benchmarks/maquina_virtual.py
+
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.parser import Parser
+from src.semantico import analisar
+from src.bytecode import compilar
+from src.maquina_virtual import MaquinaVirtual
+"""
+Mede a máquina virtual em programas dominados por laços ENQUANTO
+(benchmarks/programas/*.mc): instruções executadas, tempo e milhões de
+instruções por segundo. Cada programa roda 'repeticoes' vezes e vale o
+menor tempo. A compilação não entra na medida.
+
+Uso: python benchmarks/maquina_virtual.py [repeticoes] [programa.mc ...]
+"""
+
+PROGRAMAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "programas")
+
+def compilar_arquivo(caminho):
+  with open(caminho, "r", encoding="utf-8") as f:
+    codigo = f.read()
+  tokens = AnalisadorLexico(codigo).tokenize(lote=True)
+  resultado = Parser(tokens).parse()
+  semantica = analisar(resultado["arvore"], tokens.indice_linhas)
+  if not semantica["sucesso"]:
+    raise SystemExit("\n".join(semantica["erros"]))
+  return compilar(resultado["arvore"], semantica["tabela"])
+
+def main():
+  repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+  arquivos = sys.argv[2:] or sorted(
+    os.path.join(PROGRAMAS, nome) for nome in os.listdir(PROGRAMAS) if nome.endswith(".mc")
+  )
+  for caminho in arquivos:
+    programa = compilar_arquivo(caminho)
+    melhor = None
+    for _ in range(repeticoes):
+      saida = io.StringIO()
+      maquina = MaquinaVirtual(programa, entrada=io.StringIO(), saida=saida)
+      inicio = time.perf_counter()
+      instrucoes = maquina.executar()
+      segundos = time.perf_counter() - inicio
+      melhor = segundos if melhor is None else min(melhor, segundos)
+    print(
+      f"{os.path.basename(caminho):<16} {instrucoes:>11} instruções  {melhor:7.3f} s  "
+      f"{instrucoes / melhor / 1e6:6.2f} M instruções/s  saída: {saida.getvalue().strip()}"
+    )
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,67 @@
+# benchmarks/memoria_tokens.py
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.token_stream import TokenStream
+from src.token_type import TiposDeToken
+"""
+Mede a memória ocupada por um milhão de tokens em duas representações:
+  - lista de objetos Token (um objeto por token);
+  - TokenStream (vetores de tipos e deslocamentos).
+
+A memória do código-fonte não entra na conta (ele já existe antes da
+análise léxica). Uso: python benchmarks/memoria_tokens.py [milhoes]
+"""
+
+COMANDOS = """SE numero1 > numero2 ENTAO
+  INICIO
+    aux = numero2 * (numero1 + 3.5)
+    numero2 = numero1
+    IMPRIMIR("troca")
+  FIM
+"""
+
+# Gera um programa com pelo menos 'quantidade' tokens
+def gerar_programa(quantidade):
+  tokens_por_bloco = 23
+  cabecalho = ":DECLARACOES\nnumero1:INTEIRO\nnumero2:INTEIRO\naux:REAL\n:ALGORITMO\n"
+  return cabecalho + COMANDOS * (quantidade // tokens_por_bloco + 1)
+
+def lista_de_tokens(codigo):
+  analisador = AnalisadorLexico(codigo)
+  tokens = []
+  while True:
+    token = analisador.proximo_token()
+    tokens.append(token)
+    if token.tipo == TiposDeToken.FIM_DE_ARQUIVO:
+      return tokens
+
+def token_stream(codigo):
+  return TokenStream.do_analisador(AnalisadorLexico(codigo))
+
+# Retorna (bytes retidos pelo resultado, quantidade de tokens, segundos)
+def medir(construir, codigo):
+  tracemalloc.start()
+  inicio = time.perf_counter()
+  resultado = construir(codigo)
+  segundos = time.perf_counter() - inicio
+  retidos = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+  return retidos, len(resultado), segundos
+
+def main():
+  milhoes = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+  codigo = gerar_programa(int(milhoes * 1_000_000))
+  for nome, construir in (("lista de Token", lista_de_tokens), ("TokenStream", token_stream)):
+    retidos, quantidade, segundos = medir(construir, codigo)
+    por_milhao = retidos / quantidade * 1_000_000 / (1024 * 1024)
+    print(f"{nome:<15} tokens={quantidade:<9} {por_milhao:8.1f} MiB por milhão de tokens ({segundos:.2f} s)")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,86 @@
+# benchmarks/otimizador.py
+
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.parser import Parser
+from src.semantico import analisar
+from src.otimizador import otimizar, PASSOS
+from src.bytecode import compilar
+from src.maquina_virtual import MaquinaVirtual
+"""
+Mede o efeito de cada passo do otimizador na execução (máquina virtual).
+O programa é um laço cujo corpo tem o que um gerador de código costuma
+deixar: expressões constantes ((2*3)+i*1), SE com condição constante,
+cadeias E/OU com operandos constantes e cópias ('aux = a'). Roda sem
+otimização, com cada passo sozinho e com todos os passos, e mostra os nós
+eliminados, as instruções executadas e o tempo (menor de 'repeticoes').
+
+Uso: python benchmarks/otimizador.py [iteracoes] [repeticoes]
+"""
+
+def gerar_programa(iteracoes):
+  return f""":DECLARACOES
+i:INTEIRO
+soma:INTEIRO
+aux:INTEIRO
+a:INTEIRO
+b:INTEIRO
+r:REAL
+
+:ALGORITMO
+ENQUANTO i < {iteracoes}
+   INICIO
+      aux = (2*3)+i*1
+      SE 1 > 2 ENTAO soma = soma - 1 SENAO soma = soma + aux*1 + 0
+      SE i > 0 E 1 < 2 OU 2 > 3 ENTAO a = i - 0
+      aux = a
+      b = aux + 1
+      SE aux < b E 1 == 1 ENTAO r = r + 1.0 * 1
+      i = i + 1
+   FIM
+IMPRIMIR(soma)
+IMPRIMIR(r)
+"""
+
+def medir(codigo, passos, repeticoes):
+  tokens = AnalisadorLexico(codigo).tokenize(lote=True)
+  resultado = Parser(tokens).parse()
+  semantica = analisar(resultado["arvore"], tokens.indice_linhas)
+  relatorio = otimizar(resultado["arvore"], semantica["tabela"], passos)
+  programa = compilar(resultado["arvore"], semantica["tabela"])
+  melhor = None
+  for _ in range(repeticoes):
+    saida = io.StringIO()
+    maquina = MaquinaVirtual(programa, saida=saida)
+    inicio = time.perf_counter()
+    instrucoes = maquina.executar()
+    segundos = time.perf_counter() - inicio
+    melhor = segundos if melhor is None else min(melhor, segundos)
+  return relatorio, instrucoes, melhor, saida.getvalue().split()
+
+def main():
+  iteracoes = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+  repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+  codigo = gerar_programa(iteracoes)
+  _, base_instrucoes, base_segundos, base_saida = medir(codigo, (), repeticoes)
+  print(f"{'sem otimização':<16} {'':>13}  {base_instrucoes:>10} instruções  {base_segundos:7.3f} s")
+  for nome, passos in [(passo, (passo,)) for passo in PASSOS] + [("todos", PASSOS)]:
+    relatorio, instrucoes, segundos, saida = medir(codigo, passos, repeticoes)
+    assert saida == base_saida, (nome, saida, base_saida)
+    if passos == ("copias",):
+      efeito = f"{relatorio['copias']:>4} leituras"
+    else:
+      efeito = f"{sum(n for passo, n in relatorio.items() if passo != 'copias'):>4} nós     "
+    print(
+      f"{nome:<16} {efeito} {instrucoes:>10} instruções  {segundos:7.3f} s  "
+      f"({instrucoes / base_instrucoes:5.1%} das instruções, {segundos / base_segundos:5.1%} do tempo)"
+    )
+
+if __name__ == "__main__":
+  main()
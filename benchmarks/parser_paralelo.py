@@ -0,0 +1,63 @@
+# benchmarks/parser_paralelo.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.parser import Parser
+from src.arvore import iguais
+from src.parser_paralelo import analisar_em_paralelo, pontos_de_divisao, TAMANHO_MINIMO
+"""
+Análise de um único arquivo grande (200 mil comandos de nível superior,
+com corpos de SE/ENQUANTO na linha seguinte e blocos INICIO/FIM) de forma
+sequencial e com analisar_em_paralelo usando 1, 2, 4, ... processos, até
+o número de núcleos. Confere que tokens e AST são os mesmos da análise
+sequencial e mostra o ganho de cada configuração.
+Uso: python benchmarks/parser_paralelo.py [milhares_de_comandos] [max_processos]
+"""
+
+COMANDOS = """SE numero1 > numero2 E (aux < 10) ENTAO
+  aux = numero2 * (numero1 + 3.5)
+ENQUANTO numero1 < 100
+  numero1 = numero1 + 1
+INICIO
+  aux = aux / 2
+  IMPRIMIR("valor")
+FIM
+LER numero2
+"""
+COMANDOS_POR_BLOCO = 4
+
+def gerar_programa(comandos):
+  cabecalho = ":DECLARACOES\nnumero1:INTEIRO\nnumero2:INTEIRO\naux:REAL\n:ALGORITMO\n"
+  return cabecalho + COMANDOS * (comandos // COMANDOS_POR_BLOCO)
+
+def main():
+  milhares = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+  maximo = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+  codigo_fonte = gerar_programa(milhares * 1000)
+
+  inicio = time.perf_counter()
+  tokens = AnalisadorLexico(codigo_fonte).tokenize(lote=True)
+  resultado = Parser(tokens).parse()
+  base = time.perf_counter() - inicio
+  assert resultado["sucesso"], resultado["erros"]
+  print(f"{milhares * 1000} comandos, {len(codigo_fonte) / 2**20:.1f} MiB, {len(tokens)} tokens, {os.cpu_count()} núcleos")
+  print(f"sequencial     {base:7.2f} s")
+
+  processos = 1
+  while processos <= maximo:
+    tamanho = max(TAMANHO_MINIMO, len(codigo_fonte) // (processos * 4))
+    inicio = time.perf_counter()
+    tokens_paralelos, paralelo = analisar_em_paralelo(codigo_fonte, processos)
+    segundos = time.perf_counter() - inicio
+    assert list(tokens_paralelos.inicios) == list(tokens.inicios) and iguais(paralelo["arvore"], resultado["arvore"])
+    pedacos = len(pontos_de_divisao(codigo_fonte, tamanho)) + 1
+    print(f"{processos:3d} processos  {segundos:7.2f} s  {base / segundos:5.2f}x  ({pedacos} pedaços)")
+    processos = processos * 2 if processos * 2 <= maximo or processos == maximo else maximo
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,234 @@
+# benchmarks/programas_sinteticos.py
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+  import resource
+except ImportError:
+  resource = None # Windows: sem pico de memória
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico, MOTORES
+from src.parser_iterativo import PARSERS
+from src.gerador_de_programas import GeradorDeProgramas, tamanho_em_bytes
+"""
+Suíte de desempenho com programas sintéticos (src/gerador_de_programas.py),
+em faixas de tamanho de 1 KB a 100 MB. Em cada faixa mede três fases, cada
+uma num processo separado, para o pico de memória (ru_maxrss) de cada uma:
+
+  - lexico: só o AnalisadorLexico (tokenize em lote);
+  - parser: AnalisadorLexico e Parser, com a AST;
+  - main: o main.py inteiro, desde o início do interpretador (análises
+    léxica, sintática e semântica, sem o cache em disco).
+
+O tempo de cada fase é o menor de algumas rodadas; nas faixas pequenas,
+cada rodada repete a fase até passar de 0,2 s. O resultado (tokens/s,
+bytes/s e pico de memória por faixa e fase) vai para um JSON. Com --base,
+é comparado com um JSON salvo antes: uma fase mais lenta ou com mais
+memória que a tolerância é reportada como regressão, e o programa termina
+com código 1.
+
+Acima de 16 MB, os comandos gerados para 16 MB se repetem até o tamanho
+da faixa (gerar 100 MB comando a comando levaria minutos). As faixas
+grandes são opcionais: a de 100 MB leva vários minutos e precisa de
+alguns GB de memória para a AST.
+Uso: python benchmarks/programas_sinteticos.py [--faixas 1KB,10KB,100KB,1MB,10MB,100MB] [--saida atual.json] [--base base.json]
+"""
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(RAIZ, "main.py")
+FASES = ("lexico", "parser", "main")
+FAIXAS_PADRAO = "1KB,10KB,100KB,1MB,10MB"
+LIMITE_DE_GERACAO = 16 * 2**20
+TEMPO_MINIMO = 0.2
+VERSAO_DO_RELATORIO = 1
+
+def ler_argumentos():
+  argumentos = argparse.ArgumentParser(description="Suíte de desempenho com programas .mc sintéticos")
+  argumentos.add_argument("--faixas", default=FAIXAS_PADRAO, help=f"tamanhos separados por vírgula (padrão: {FAIXAS_PADRAO})")
+  argumentos.add_argument("--fases", default=",".join(FASES), help=f"fases medidas (padrão: {','.join(FASES)})")
+  argumentos.add_argument("--repeticoes", type=int, default=3, help="rodadas por fase; vale a mais rápida (padrão: 3)")
+  argumentos.add_argument("--saida", help="arquivo JSON com o resultado (salve um como base)")
+  argumentos.add_argument("--base", help="JSON de uma execução anterior, para comparar")
+  argumentos.add_argument("--tolerancia", type=float, default=0.15,
+                          help="perda de vazão ou aumento de memória aceito em relação à base (padrão: 0.15)")
+  argumentos.add_argument("--motor", choices=MOTORES, default="caracteres")
+  argumentos.add_argument("--parser", choices=tuple(PARSERS), default="recursivo")
+  # Parâmetros do gerador
+  argumentos.add_argument("--semente", type=int, default=21)
+  argumentos.add_argument("--declaracoes", type=int, default=20)
+  argumentos.add_argument("--profundidade", type=int, default=3)
+  argumentos.add_argument("--operadores", type=int, default=4)
+  argumentos.add_argument("--comentarios", type=float, default=0.05)
+  argumentos.add_argument("--cadeias", type=float, default=0.1)
+  args = argumentos.parse_args()
+  args.faixas = [faixa.strip() for faixa in args.faixas.split(",") if faixa.strip()]
+  args.fases = [fase.strip() for fase in args.fases.split(",") if fase.strip()]
+  desconhecidas = [fase for fase in args.fases if fase not in FASES]
+  if desconhecidas:
+    argumentos.error(f"fase desconhecida: {', '.join(desconhecidas)} (fases: {', '.join(FASES)})")
+  try:
+    for faixa in args.faixas:
+      tamanho_em_bytes(faixa)
+  except ValueError:
+    argumentos.error(f"faixa inválida: {faixa}")
+  return args
+
+# Parâmetros que definem o programa gerado e a medição (devem ser iguais aos da base)
+def parametros(args):
+  return {
+    "semente": args.semente, "declaracoes": args.declaracoes, "profundidade": args.profundidade,
+    "operadores": args.operadores, "comentarios": args.comentarios, "cadeias": args.cadeias,
+    "motor": args.motor, "parser": args.parser,
+  }
+
+def gerar_arquivo(caminho, tamanho, args):
+  gerador = GeradorDeProgramas(
+    args.semente, args.declaracoes, args.profundidade, args.operadores, args.comentarios, args.cadeias,
+  )
+  programa = gerador.gerar(tamanho=min(tamanho, LIMITE_DE_GERACAO))
+  with open(caminho, "w", encoding="utf-8") as f:
+    f.write(programa)
+    if tamanho > LIMITE_DE_GERACAO:
+      corpo = programa[programa.index(":ALGORITMO\n") + len(":ALGORITMO\n"):]
+      for _ in range((tamanho - len(programa)) // len(corpo) + 1):
+        f.write(corpo)
+  return os.path.getsize(caminho)
+
+# --- Processo filho ---
+
+# Tempo de uma rodada: a fase repetida até passar de TEMPO_MINIMO
+def cronometrar(fase):
+  vezes = 0
+  inicio = time.perf_counter()
+  while True:
+    fase()
+    vezes += 1
+    decorrido = time.perf_counter() - inicio
+    if decorrido >= TEMPO_MINIMO:
+      return decorrido / vezes
+
+def pico_de_memoria(dos_filhos):
+  if resource is None:
+    return None
+  pico = resource.getrusage(resource.RUSAGE_CHILDREN if dos_filhos else resource.RUSAGE_SELF).ru_maxrss
+  return pico / 2**20 if sys.platform == "darwin" else pico / 2**10 # bytes no macOS, KiB no Linux
+
+# Executado no processo filho: mede uma fase e imprime o resultado em JSON
+def medir(fase, caminho, repeticoes, motor, parser):
+  with open(caminho, "r", encoding="utf-8") as f:
+    codigo_fonte = f.read()
+  if fase == "lexico":
+    def rodada():
+      AnalisadorLexico(codigo_fonte, motor).tokenize(lote=True)
+  elif fase == "parser":
+    def rodada():
+      resultado = PARSERS[parser](AnalisadorLexico(codigo_fonte, motor).tokenize(lote=True)).parse()
+      assert resultado["sucesso"], resultado["erros"]
+  else:
+    comando = [sys.executable, MAIN, caminho, "--sem-cache", "--motor", motor, "--parser", parser]
+    def rodada():
+      subprocess.run(comando, check=True, stdout=subprocess.DEVNULL)
+  segundos = min(cronometrar(rodada) for _ in range(int(repeticoes)))
+  # No main.py, o pico é o do processo do main.py (o único filho deste processo)
+  pico = pico_de_memoria(fase == "main")
+  tokens = len(AnalisadorLexico(codigo_fonte, motor).tokenize(lote=True))
+  print(json.dumps({"segundos": segundos, "tokens": tokens, "pico_rss_mib": pico}))
+
+def medir_no_filho(fase, caminho, args):
+  saida = subprocess.run(
+    [sys.executable, os.path.abspath(__file__), "--filho", fase, caminho, str(args.repeticoes), args.motor, args.parser],
+    check=True, capture_output=True, text=True,
+  ).stdout
+  return json.loads(saida)
+
+# --- Comparação com a base ---
+
+def mib(valor):
+  return valor / 2**20
+
+# Lista de regressões (textos) do relatório atual em relação à base
+def comparar(base, atual, tolerancia):
+  regressoes = []
+  for faixa, medidas in atual["faixas"].items():
+    anteriores = base["faixas"].get(faixa, {})
+    for fase in FASES:
+      if fase not in medidas or fase not in anteriores:
+        continue
+      nova, antiga = medidas[fase], anteriores[fase]
+      if nova["bytes_por_segundo"] < antiga["bytes_por_segundo"] * (1 - tolerancia):
+        regressoes.append(
+          f"{faixa} {fase}: {mib(nova['bytes_por_segundo']):.2f} MiB/s, na base {mib(antiga['bytes_por_segundo']):.2f} MiB/s "
+          f"({nova['bytes_por_segundo'] / antiga['bytes_por_segundo'] - 1:+.0%})"
+        )
+      if nova["pico_rss_mib"] and antiga["pico_rss_mib"] and nova["pico_rss_mib"] > antiga["pico_rss_mib"] * (1 + tolerancia):
+        regressoes.append(
+          f"{faixa} {fase}: pico de {nova['pico_rss_mib']:.1f} MiB, na base {antiga['pico_rss_mib']:.1f} MiB "
+          f"({nova['pico_rss_mib'] / antiga['pico_rss_mib'] - 1:+.0%})"
+        )
+  return regressoes
+
+def main():
+  if len(sys.argv) > 1 and sys.argv[1] == "--filho":
+    medir(*sys.argv[2:])
+    return
+  args = ler_argumentos()
+  base = None
+  if args.base:
+    with open(args.base, "r", encoding="utf-8") as f:
+      base = json.load(f)
+    if base.get("parametros") != parametros(args):
+      sys.exit(f"A base {args.base} foi medida com outros parâmetros: {base.get('parametros')}")
+
+  relatorio = {
+    "versao": VERSAO_DO_RELATORIO,
+    "python": f"{platform.python_implementation()} {platform.python_version()}",
+    "plataforma": platform.platform(),
+    "parametros": parametros(args),
+    "faixas": {},
+  }
+  with tempfile.TemporaryDirectory() as diretorio:
+    for faixa in args.faixas:
+      caminho = os.path.join(diretorio, f"{faixa}.mc")
+      tamanho = gerar_arquivo(caminho, tamanho_em_bytes(faixa), args)
+      medidas = relatorio["faixas"][faixa] = {"bytes": tamanho}
+      for fase in args.fases:
+        medicao = medir_no_filho(fase, caminho, args)
+        segundos, tokens, pico = medicao["segundos"], medicao["tokens"], medicao["pico_rss_mib"]
+        medidas["tokens"] = tokens
+        medidas[fase] = {
+          "segundos": segundos,
+          "tokens_por_segundo": tokens / segundos,
+          "bytes_por_segundo": tamanho / segundos,
+          "pico_rss_mib": pico,
+        }
+        print(
+          f"{faixa:>6s} {fase:7s} {segundos * 1000:10.1f} ms  {tokens / segundos:12,.0f} tokens/s  "
+          f"{mib(tamanho / segundos):8.2f} MiB/s  pico {'-' if pico is None else f'{pico:.1f}'} MiB"
+        )
+        sys.stdout.flush()
+
+  if args.saida:
+    with open(args.saida, "w", encoding="utf-8") as f:
+      json.dump(relatorio, f, indent=2)
+      f.write("\n")
+  if base is not None:
+    regressoes = comparar(base, relatorio, args.tolerancia)
+    if regressoes:
+      sys.stdout.flush()
+      for regressao in regressoes:
+        print(f"REGRESSÃO: {regressao}", file=sys.stderr)
+      print(f"{len(regressoes)} regressões em relação a {args.base} (tolerância {args.tolerancia:.0%})", file=sys.stderr)
+      sys.exit(1)
+    print(f"sem regressões em relação a {args.base} (tolerância {args.tolerancia:.0%})")
+
+if __name__ == "__main__":
+  main()
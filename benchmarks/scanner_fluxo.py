@@ -0,0 +1,73 @@
+# benchmarks/scanner_fluxo.py
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.scanner_fluxo import AnalisadorLexicoEmFluxo
+from src.parser import Parser
+"""
+Memória e tempo da validação (análises léxica e sintática, sem AST) de um
+arquivo grande: lendo o arquivo inteiro num str (como o main.py) e com o
+AnalisadorLexicoEmFluxo, por mmap e em blocos. Cada modo roda num processo
+separado, para medir o pico de memória (ru_maxrss) de cada um.
+Uso: python benchmarks/scanner_fluxo.py [MiB]
+"""
+
+COMANDOS = """SE numero1 > numero2 E (aux < 10) ENTAO
+  aux = numero2 * (numero1 + 3.5)
+ENQUANTO numero1 < 100
+  numero1 = numero1 + 1 /* comentário
+  em duas linhas */
+INICIO
+  aux = aux / 2 # média
+  IMPRIMIR("valor")
+FIM
+LER numero2
+"""
+MODOS = ("str", "mmap", "blocos")
+
+def gerar_arquivo(caminho, mib):
+  bloco = COMANDOS * 1000
+  with open(caminho, "w", encoding="utf-8") as f:
+    f.write(":DECLARACOES\nnumero1:INTEIRO\nnumero2:INTEIRO\naux:REAL\n:ALGORITMO\n")
+    for _ in range(mib * 2**20 // len(bloco.encode("utf-8")) + 1):
+      f.write(bloco)
+
+# Executado no processo filho: valida o arquivo e imprime segundos e pico de memória
+def validar(caminho, modo):
+  inicio = time.perf_counter()
+  if modo == "str":
+    with open(caminho, "r", encoding="utf-8") as f:
+      resultado = Parser(AnalisadorLexico(f.read()), construir_arvore=False).parse()
+  else:
+    with AnalisadorLexicoEmFluxo(caminho, usar_mmap=modo == "mmap") as analisador:
+      resultado = Parser(analisador, construir_arvore=False).parse()
+  assert resultado["sucesso"], resultado["erros"]
+  print(time.perf_counter() - inicio, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+def main():
+  if len(sys.argv) > 2 and sys.argv[1] == "--filho":
+    validar(sys.argv[2], sys.argv[3])
+    return
+  mib = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+  with tempfile.TemporaryDirectory() as diretorio:
+    caminho = os.path.join(diretorio, "grande.mc")
+    gerar_arquivo(caminho, mib)
+    print(f"arquivo de {os.path.getsize(caminho) / 2**20:.0f} MiB")
+    for modo in MODOS:
+      saida = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--filho", caminho, modo],
+        check=True, capture_output=True, text=True,
+      ).stdout.split()
+      segundos, pico = float(saida[0]), int(saida[1]) / 1024
+      print(f"{modo:7s} {segundos:7.2f} s  {os.path.getsize(caminho) / 2**20 / segundos:6.2f} MiB/s  pico {pico:8.1f} MiB")
+
+if __name__ == "__main__":
+  main()
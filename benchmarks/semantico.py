@@ -0,0 +1,47 @@
+# benchmarks/semantico.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.parser import Parser
+from src.semantico import analisar
+"""
+Mede a análise semântica em programas com muitas variáveis (100 mil ou
+mais): cada variável é declarada uma vez e usada em uma atribuição e numa
+condição. O tempo por variável deve ficar constante (passada linear).
+
+Uso: python benchmarks/semantico.py [milhares_de_variaveis]
+"""
+
+def gerar_programa(variaveis):
+  linhas = [":DECLARACOES"]
+  for i in range(variaveis):
+    linhas.append(f"v{i}:{'REAL' if i % 3 == 0 else 'INTEIRO'}")
+  linhas.append(":ALGORITMO")
+  for i in range(1, variaveis):
+    linhas.append(f"SE v{i - 1} < 10 ENTAO v{i} = v{i} * 2 + 1")
+  return "\n".join(linhas) + "\n"
+
+def main():
+  maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+  milhares = 50
+  while milhares <= maximo:
+    variaveis = milhares * 1000
+    codigo = gerar_programa(variaveis)
+    tokens = AnalisadorLexico(codigo).tokenize(lote=True)
+    programa = Parser(tokens).parse()["arvore"]
+    inicio = time.perf_counter()
+    resultado = analisar(programa, tokens.indice_linhas)
+    segundos = time.perf_counter() - inicio
+    print(
+      f"{variaveis:>7} variáveis  {segundos * 1e3:8.1f} ms  "
+      f"{segundos / variaveis * 1e9:6.0f} ns/variável  {len(resultado['erros'])} erros"
+    )
+    milhares *= 2
+
+if __name__ == "__main__":
+  main()
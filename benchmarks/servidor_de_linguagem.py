@@ -0,0 +1,204 @@
+# benchmarks/servidor_de_linguagem.py
+
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.parser import Parser
+"""
+Cliente local do servidor de linguagem (main.py --servidor), pela entrada
+e saída padrão do processo, como um editor. Abre centenas de documentos
+(parte deles com erro sintático) e confere os diagnósticos publicados com
+os da análise completa; depois digita, tecla a tecla, em vários documentos
+ao mesmo tempo, abre um documento de 100 mil linhas e o edita. Durante
+tudo isso, um pedido sem resposta pronta (método não suportado) é enviado
+a cada 20 ms, para medir o tempo de resposta do laço de eventos.
+Uso: python benchmarks/servidor_de_linguagem.py [documentos] [processos]
+"""
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEMENTE = 20
+CABECALHO = ":DECLARACOES\nnumero1:INTEIRO\nnumero2:INTEIRO\naux:REAL\n:ALGORITMO\n"
+COMANDOS = """SE numero1 > numero2 E (aux < 10) ENTAO
+  aux = numero2 * (numero1 + 3.5)
+ENQUANTO numero1 < 100
+  numero1 = numero1 + 1
+INICIO
+  aux = aux / 2
+  IMPRIMIR("valor")
+FIM
+LER numero2
+"""
+
+class Cliente:
+  def __init__(self, processo):
+    self.processo = processo
+    self.proximo_id = 0
+    self.respostas = {} # id -> Future
+    self.diagnosticos = {} # uri -> (versão, diagnósticos, instante)
+    self.publicacoes = {} # uri -> quantidade de publishDiagnostics
+    self.publicado = asyncio.Event()
+    self.leitura = asyncio.ensure_future(self._ler())
+
+  @classmethod
+  async def iniciar(cls, processos):
+    processo = await asyncio.create_subprocess_exec(
+      sys.executable, os.path.join(RAIZ, "main.py"), "--servidor", "--processos", str(processos),
+      stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, limit=2**26,
+    )
+    return cls(processo)
+
+  def _escrever(self, mensagem):
+    corpo = json.dumps(mensagem).encode("utf-8")
+    self.processo.stdin.write(b"Content-Length: %d\r\n\r\n" % len(corpo) + corpo)
+
+  async def _ler(self):
+    saida = self.processo.stdout
+    while True:
+      tamanho = None
+      while True:
+        linha = await saida.readline()
+        if not linha:
+          return
+        if not linha.strip():
+          break
+        tamanho = int(linha.split(b":")[1])
+      mensagem = json.loads(await saida.readexactly(tamanho))
+      if "id" in mensagem and "method" not in mensagem:
+        self.respostas.pop(mensagem["id"]).set_result(mensagem)
+      elif mensagem.get("method") == "textDocument/publishDiagnostics":
+        parametros = mensagem["params"]
+        uri = parametros["uri"]
+        self.diagnosticos[uri] = (parametros.get("version"), parametros["diagnostics"], time.perf_counter())
+        self.publicacoes[uri] = self.publicacoes.get(uri, 0) + 1
+        self.publicado.set()
+
+  async def requisitar(self, metodo, parametros=None):
+    self.proximo_id += 1
+    futuro = self.respostas[self.proximo_id] = asyncio.get_running_loop().create_future()
+    self._escrever({"jsonrpc": "2.0", "id": self.proximo_id, "method": metodo, "params": parametros or {}})
+    await self.processo.stdin.drain()
+    return await futuro
+
+  def notificar(self, metodo, parametros):
+    self._escrever({"jsonrpc": "2.0", "method": metodo, "params": parametros})
+
+  # Espera até que todos os documentos tenham diagnósticos da versão dada
+  async def esperar(self, versoes):
+    while any(self.diagnosticos.get(uri, (None,))[0] != versao for uri, versao in versoes.items()):
+      self.publicado.clear()
+      await self.publicado.wait()
+
+  async def encerrar(self):
+    await self.requisitar("shutdown")
+    self.notificar("exit", None)
+    await self.processo.stdin.drain()
+    return await self.processo.wait()
+
+def gerar_documento(aleatorio, blocos, com_erro):
+  linhas = (CABECALHO + COMANDOS * blocos).splitlines(keepends=True)
+  if com_erro:
+    k = aleatorio.choice([i for i, linha in enumerate(linhas) if linha.startswith("SE ")])
+    linhas[k] = linhas[k].replace(" ENTAO", "")
+  return "".join(linhas)
+
+# Primeiro erro da análise completa (None se o programa for válido)
+def primeiro_erro(texto):
+  resultado = Parser(AnalisadorLexico(texto).tokenize(lote=True)).parse()
+  return None if resultado["sucesso"] else resultado["erros"][0]
+
+def resumo(tempos):
+  tempos = sorted(tempos)
+  return f"mediana {statistics.median(tempos) * 1000:6.1f} ms  p99 {tempos[int(len(tempos) * 0.99)] * 1000:6.1f} ms  máx {tempos[-1] * 1000:6.1f} ms"
+
+async def medir_laco(cliente, tempos, parar):
+  while not parar.is_set():
+    inicio = time.perf_counter()
+    await cliente.requisitar("$/ping")
+    tempos.append(time.perf_counter() - inicio)
+    await asyncio.sleep(0.02)
+
+async def main():
+  quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+  processos = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+  aleatorio = random.Random(SEMENTE)
+  cliente = await Cliente.iniciar(processos)
+  await cliente.requisitar("initialize", {"capabilities": {}})
+  cliente.notificar("initialized", {})
+  tempos_do_laco = []
+  parar = asyncio.Event()
+  medicao = asyncio.ensure_future(medir_laco(cliente, tempos_do_laco, parar))
+
+  # 1. Abertura de muitos documentos
+  textos = {f"file:///doc{i}.mc": gerar_documento(aleatorio, aleatorio.randint(5, 40), i % 4 == 0) for i in range(quantidade)}
+  inicio = time.perf_counter()
+  for uri, texto in textos.items():
+    cliente.notificar("textDocument/didOpen", {"textDocument": {"uri": uri, "languageId": "mc", "version": 1, "text": texto}})
+  await cliente.esperar({uri: 1 for uri in textos})
+  print(f"{quantidade} documentos abertos e analisados em {time.perf_counter() - inicio:.2f} s ({processos} processos)")
+  for uri, texto in textos.items():
+    diagnosticos = cliente.diagnosticos[uri][1]
+    assert [d["message"] for d in diagnosticos][:1] == ([] if primeiro_erro(texto) is None else [primeiro_erro(texto)]), uri
+
+  # 2. Digitação: uma linha nova, tecla a tecla, em 50 documentos ao mesmo tempo
+  digitados = list(textos)[:50]
+  linha = "numero2 = numero1 * 2\n"
+  publicacoes_antes = {uri: cliente.publicacoes[uri] for uri in digitados}
+  for k, caractere in enumerate(linha):
+    for uri in digitados:
+      posicao = {"line": 5, "character": k}
+      cliente.notificar("textDocument/didChange", {
+        "textDocument": {"uri": uri, "version": 2 + k},
+        "contentChanges": [{"range": {"start": posicao, "end": posicao}, "text": caractere}],
+      })
+    await cliente.processo.stdin.drain()
+    await asyncio.sleep(0.03)
+  fim_da_digitacao = time.perf_counter()
+  await cliente.esperar({uri: 1 + len(linha) for uri in digitados})
+  atrasos = [cliente.diagnosticos[uri][2] - fim_da_digitacao for uri in digitados]
+  publicacoes = statistics.mean(cliente.publicacoes[uri] - publicacoes_antes[uri] for uri in digitados)
+  print(f"digitação em {len(digitados)} documentos: {len(linha)} teclas, {publicacoes:.1f} análises publicadas por documento")
+  print(f"  diagnósticos depois da última tecla: {resumo(atrasos)}")
+  for uri in digitados:
+    texto = CABECALHO + linha + textos[uri][len(CABECALHO):]
+    assert [d["message"] for d in cliente.diagnosticos[uri][1]][:1] == ([] if primeiro_erro(texto) is None else [primeiro_erro(texto)]), uri
+
+  # 3. Tokens semânticos
+  inicio = time.perf_counter()
+  dados = (await cliente.requisitar("textDocument/semanticTokens/full", {"textDocument": {"uri": digitados[0]}}))["result"]["data"]
+  print(f"tokens semânticos de um documento: {len(dados) // 5} tokens em {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+  # 4. Documento grande: abertura (segundos, num processo) e uma edição
+  grande = "file:///grande.mc"
+  texto = gerar_documento(aleatorio, 100000 // COMANDOS.count("\n"), False)
+  inicio = time.perf_counter()
+  cliente.notificar("textDocument/didOpen", {"textDocument": {"uri": grande, "languageId": "mc", "version": 1, "text": texto}})
+  await cliente.esperar({grande: 1})
+  print(f"documento de {texto.count(chr(10))} linhas aberto em {time.perf_counter() - inicio:.2f} s")
+  posicao = {"line": 50000, "character": 0}
+  inicio = time.perf_counter()
+  cliente.notificar("textDocument/didChange", {
+    "textDocument": {"uri": grande, "version": 2},
+    "contentChanges": [{"range": {"start": posicao, "end": posicao}, "text": "SE numero1 > 2\n"}],
+  })
+  await cliente.esperar({grande: 2})
+  print(f"  edição com erro publicada em {(time.perf_counter() - inicio) * 1000:.1f} ms: {cliente.diagnosticos[grande][1][0]['message']}")
+  intervalo = {"start": {"line": 50000, "character": 0}, "end": {"line": 50100, "character": 0}}
+  inicio = time.perf_counter()
+  dados = (await cliente.requisitar("textDocument/semanticTokens/range", {"textDocument": {"uri": grande}, "range": intervalo}))["result"]["data"]
+  print(f"  tokens semânticos de 100 linhas: {len(dados) // 5} tokens em {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+  parar.set()
+  await medicao
+  print(f"resposta do laço de eventos ({len(tempos_do_laco)} pedidos): {resumo(tempos_do_laco)}")
+  print(f"servidor encerrado com código {await cliente.encerrar()}")
+
+if __name__ == "__main__":
+  asyncio.run(main())
@@ -0,0 +1,49 @@
+# benchmarks/tokenize_lote.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico, MOTORES
+from src.token_type import TiposDeToken
+from memoria_tokens import gerar_programa
+"""
+Compara o custo por token das três formas de obter tokens do
+AnalisadorLexico: proximo_token() chamado em laço, tokenize() (gerador)
+e tokenize(lote=True) (TokenStream).
+
+Uso: python benchmarks/tokenize_lote.py [milhares_de_tokens]
+"""
+
+def por_chamada(analisador):
+  quantidade = 0
+  while True:
+    token = analisador.proximo_token()
+    quantidade += 1
+    if token is None or token.tipo == TiposDeToken.FIM_DE_ARQUIVO:
+      return quantidade
+
+def gerador(analisador):
+  quantidade = 0
+  for _ in analisador.tokenize():
+    quantidade += 1
+  return quantidade
+
+def lote(analisador):
+  return len(analisador.tokenize(lote=True))
+
+def main():
+  milhares = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+  codigo = gerar_programa(milhares * 1000)
+  for motor in MOTORES:
+    for nome, consumir in (("proximo_token()", por_chamada), ("tokenize()", gerador), ("tokenize(lote=True)", lote)):
+      analisador = AnalisadorLexico(codigo, motor=motor)
+      inicio = time.perf_counter()
+      quantidade = consumir(analisador)
+      segundos = time.perf_counter() - inicio
+      print(f"motor={motor:<11} {nome:<20} {segundos / quantidade * 1e9:8.1f} ns/token ({quantidade} tokens)")
+
+if __name__ == "__main__":
+  main()
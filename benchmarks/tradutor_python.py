@@ -0,0 +1,69 @@
+# benchmarks/tradutor_python.py
+
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scanner import AnalisadorLexico
+from src.parser import Parser
+from src.semantico import analisar
+from src.bytecode import compilar
+from src.maquina_virtual import executar
+from src.tradutor_python import compilar_para_python, executar_codigo, carregar_do_cache, salvar_no_cache
+"""
+Compara os dois executores nos programas de benchmarks/programas/*.mc:
+a máquina virtual (bytecode) e o code object Python gerado pelo
+TradutorPython. Mostra também o custo de preparar o programa: análises
+completas + compile(), contra a leitura do code object do cache (marshal).
+Cada medida é a menor de 'repeticoes' execuções.
+
+Uso: python benchmarks/tradutor_python.py [repeticoes]
+"""
+
+PROGRAMAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "programas")
+
+def menor_tempo(funcao, repeticoes):
+  melhor = None
+  for _ in range(repeticoes):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    segundos = time.perf_counter() - inicio
+    melhor = segundos if melhor is None else min(melhor, segundos)
+  return melhor, resultado
+
+def main():
+  repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+  # O cache vai para um diretório temporário, não para benchmarks/programas
+  temporario = tempfile.mkdtemp()
+  for nome in sorted(os.listdir(PROGRAMAS)):
+    if not nome.endswith(".mc"):
+      continue
+    with open(os.path.join(PROGRAMAS, nome), "r", encoding="utf-8") as f:
+      codigo_fonte = f.read()
+    caminho = os.path.join(temporario, nome)
+
+    def preparar():
+      tokens = AnalisadorLexico(codigo_fonte).tokenize(lote=True)
+      resultado = Parser(tokens).parse()
+      semantica = analisar(resultado["arvore"], tokens.indice_linhas)
+      return (
+        compilar(resultado["arvore"], semantica["tabela"]),
+        compilar_para_python(resultado["arvore"], semantica["tabela"], tokens.indice_linhas, caminho),
+      )
+
+    tempo_preparo, (bytecode, codigo) = menor_tempo(preparar, repeticoes)
+    salvar_no_cache(caminho, codigo_fonte, codigo)
+    tempo_cache, _ = menor_tempo(lambda: carregar_do_cache(caminho, codigo_fonte), repeticoes)
+    tempo_vm, _ = menor_tempo(lambda: executar(bytecode, saida=io.StringIO()), repeticoes)
+    tempo_python, _ = menor_tempo(lambda: executar_codigo(codigo, saida=io.StringIO()), repeticoes)
+    print(
+      f"{nome:<16} vm {tempo_vm:7.3f} s  python {tempo_python:7.3f} s  ({tempo_vm / tempo_python:4.1f}x)  "
+      f"preparo {tempo_preparo * 1e3:6.2f} ms  cache {tempo_cache * 1e3:6.3f} ms"
+    )
+
+if __name__ == "__main__":
+  main()
@@ -1,9 +1,22 @@
 # main.py
 
+import argparse
 import sys
-from src.scanner import AnalisadorLexico
-from src.parser import Parser, SyntaxError
-from src.token_type import TiposDeToken
+from collections import Counter
+from src.scanner import AnalisadorLexico, MOTORES
+from src.parser import MAX_ERROS
+from src.parser_iterativo import PARSERS
+from src.cache_de_compilacao import CacheDeCompilacao, opcoes_da_analise
+from src.estatisticas import Estatisticas, SEM_ESTATISTICAS
+from src.diagnostico import gravar_json, gravar_sarif
+from src.semantico import analisar
+from src.otimizador import otimizar, PASSOS
+from src.bytecode import compilar
+from src.maquina_virtual import executar, ErroDeExecucao
+from src.artefato import caminho_do_artefato, EXTENSAO
+# Os módulos de um só modo (--servidor, --lote, --paralelo, --fluxo, .mcc e
+# --executor python) são importados só quando usados: o asyncio e o
+# ProcessPoolExecutor, por exemplo, custam dezenas de ms na partida.
 """
 CONSTRUÇÃO DE COMPILADORES I
 Checkpoint 1 (Analisador Léxico) e Checkpoint 2 (Analisador Sintático)
@@ -15,53 +28,404 @@ Nomes dos Integrantes do Grupo:
 
 """
 
+# Lista de passos do otimizador separados por vírgula (--otimizar constantes,ramos)
+def passos_de_otimizacao(texto):
+  passos = tuple(passo.strip() for passo in texto.split(",") if passo.strip())
+  desconhecidos = [passo for passo in passos if passo not in PASSOS]
+  if desconhecidos:
+    raise argparse.ArgumentTypeError(f"passo desconhecido: {', '.join(desconhecidos)} (passos: {', '.join(PASSOS)})")
+  return passos
+
+def ler_argumentos():
+  argumentos = argparse.ArgumentParser(description="Analisador léxico e sintático para programas .mc")
+  # O arquivo original é 'programa_checkpoint2.mc' (arquivo está na raiz do projeto)
+  argumentos.add_argument("arquivos", nargs="*", default=["programa_checkpoint2.mc"], metavar="arquivo",
+                          help="programa a analisar (padrão: programa_checkpoint2.mc); com --lote, arquivos, diretórios ou padrões glob")
+  argumentos.add_argument("--lote", action="store_true",
+                          help="verifica vários arquivos em paralelo (análises léxica, sintática e semântica)")
+  argumentos.add_argument("--paralelo", action="store_true",
+                          help="divide um arquivo grande em pedaços analisados em paralelo (mesmos tokens, AST e erros)")
+  argumentos.add_argument("--processos", type=int, default=None,
+                          help="com --lote, --paralelo ou --servidor: quantidade de processos (padrão: um por núcleo)")
+  argumentos.add_argument("--fluxo", action="store_true",
+                          help="só as análises léxica e sintática, lendo o arquivo aos poucos (mmap), em memória constante")
+  argumentos.add_argument("--servidor", action="store_true",
+                          help="servidor de linguagem (LSP) para editores, pela entrada e saída padrão: erros e tokens semânticos")
+  argumentos.add_argument("--tokens", action="store_true",
+                          help="imprime a lista de tokens (Ckp 1) antes da análise sintática")
+  argumentos.add_argument("--motor", choices=MOTORES, default="caracteres",
+                          help="motor do Analisador Léxico")
+  argumentos.add_argument("--parser", choices=tuple(PARSERS), default="recursivo",
+                          help="Analisador Sintático; 'iterativo' suporta aninhamento sem limite de recursão")
+  argumentos.add_argument("--recuperar", action="store_true",
+                          help="não para no primeiro erro: reporta todos os erros léxicos e sintáticos")
+  argumentos.add_argument("--max-erros", type=int, default=MAX_ERROS,
+                          help=f"limite de erros reportados com --recuperar (padrão: {MAX_ERROS})")
+  argumentos.add_argument("--sem-cache", action="store_true",
+                          help="não usa o cache em disco dos tokens e do resultado da análise sintática, nem o do code object (--executor python)")
+  argumentos.add_argument("--otimizar", nargs="?", const=PASSOS, type=passos_de_otimizacao, metavar="PASSOS",
+                          help=f"otimiza a AST antes da execução; sem valor, aplica todos os passos ({','.join(PASSOS)})")
+  argumentos.add_argument("--run", action="store_true",
+                          help="após as análises, compila e executa o programa (LER lê da entrada padrão)")
+  argumentos.add_argument("--executor", choices=("vm", "python"), default="vm",
+                          help="com --run: 'vm' (bytecode na máquina virtual) ou 'python' (code object Python, com cache em disco)")
+  argumentos.add_argument("--stats", action="store_true",
+                          help="no fim, mostra o tempo de cada fase, os tokens por tipo e as chamadas das regras do Parser")
+  argumentos.add_argument("--stats-json", metavar="ARQUIVO",
+                          help="grava as mesmas estatísticas do --stats num arquivo JSON")
+  argumentos.add_argument("--trace", metavar="ARQUIVO",
+                          help="grava as fases num arquivo de trace-event do Chrome (chrome://tracing ou Perfetto)")
+  argumentos.add_argument("--erros-json", metavar="ARQUIVO",
+                          help="grava os erros léxicos, sintáticos e semânticos num arquivo JSON (código, posição, tokens esperados)")
+  argumentos.add_argument("--sarif", metavar="ARQUIVO",
+                          help="grava os erros num arquivo SARIF 2.1.0, para ferramentas de CI")
+  argumentos.add_argument("--artefato", nargs="?", const="", metavar="ARQUIVO",
+                          help=f"após as análises, grava o programa compilado num artefato binário (padrão: programa{EXTENSAO}); "
+                               f"um arquivo {EXTENSAO} dado como programa é executado (--run) ou inspecionado sem as análises")
+  args = argumentos.parse_args()
+  if len(args.arquivos) > 1 and not args.lote:
+    argumentos.error("vários arquivos só com --lote")
+  if args.processos is not None and args.processos < 1:
+    argumentos.error("--processos deve ser pelo menos 1")
+  if args.fluxo and (args.lote or args.paralelo or args.run or args.otimizar is not None):
+    argumentos.error("--fluxo não pode ser usado com --lote, --paralelo, --run ou --otimizar")
+  args.estatisticas = args.stats or args.stats_json is not None or args.trace is not None
+  args.relatorio_de_erros = args.erros_json is not None or args.sarif is not None
+  if args.servidor and (
+    args.lote or args.paralelo or args.fluxo or args.run or args.tokens or args.recuperar or args.otimizar is not None or
+    args.estatisticas or args.relatorio_de_erros
+  ):
+    argumentos.error("--servidor só pode ser usado com --processos, --parser e --motor")
+  if args.lote and args.estatisticas:
+    argumentos.error("--stats, --stats-json e --trace não podem ser usados com --lote")
+  if args.lote and args.relatorio_de_erros:
+    argumentos.error("--erros-json e --sarif não podem ser usados com --lote")
+  args.arquivo = args.arquivos[0]
+  args.de_artefato = not args.lote and args.arquivo.endswith(EXTENSAO)
+  if args.de_artefato and (
+    args.paralelo or args.fluxo or args.servidor or args.tokens or args.recuperar or args.otimizar is not None or
+    args.executor != "vm" or args.artefato is not None or args.relatorio_de_erros
+  ):
+    argumentos.error(f"um artefato {EXTENSAO} só pode ser usado com --run e --stats")
+  if args.artefato is not None and (args.lote or args.fluxo or args.servidor):
+    argumentos.error("--artefato não pode ser usado com --lote, --fluxo ou --servidor")
+  if args.artefato == "":
+    args.artefato = caminho_do_artefato(args.arquivo)
+  return args
+
+# Opções que mudam o código gerado (entram na chave do cache)
+def opcoes_do_cache(args):
+  return "otimizar=" + ",".join(args.otimizar or ())
+
+# Executa o programa (--run) e reporta erros de execução
+def rodar(execucao, titulo="--- Executando o Programa ---"):
+  print(titulo)
+  sys.stdout.flush()
+  try:
+    execucao()
+  except ErroDeExecucao as erro:
+    sys.stdout.flush()
+    print(erro, file=sys.stderr)
+    sys.exit(1)
+
+# --lote: verifica todos os arquivos e imprime o resultado de cada um assim
+# que fica pronto. Termina com código 1 se algum arquivo tiver erros.
+def verificar_em_lote(args):
+  from src.lote import expandir_entradas, verificar_lote
+  arquivos = expandir_entradas(args.arquivos)
+  falhas = 0
+  cache = Counter() # Contadores do cache somados de todos os processos
+  for resultado in verificar_lote(
+    arquivos, args.processos, args.parser, args.recuperar, args.max_erros, usar_cache=not args.sem_cache, cache=cache
+  ):
+    if resultado.sucesso:
+      print(f"OK    {resultado.caminho}")
+    else:
+      falhas += 1
+      sys.stdout.flush()
+      print(f"ERRO  {resultado.caminho}", file=sys.stderr)
+      for err in resultado.erros:
+        print("  - " + err, file=sys.stderr)
+      sys.stderr.flush()
+  print(f"--- {len(arquivos)} arquivos verificados, {falhas} com erros ---")
+  if not args.sem_cache:
+    print(
+      f"--- cache: {cache['acertos']} acertos, {cache['faltas']} faltas, {cache['gravacoes']} gravações, "
+      f"{cache['removidas']} removidas, {cache['varreduras']} varreduras ---"
+    )
+  if falhas:
+    sys.exit(1)
+
+# --fluxo: análises léxica e sintática sem carregar o arquivo inteiro. O
+# Parser consome os tokens à medida que são lidos e não constrói a AST, de
+# modo que a memória não cresce com o tamanho do arquivo. Sem AST, não há
+# análise semântica. As mensagens são as mesmas das análises normais.
+def validar_em_fluxo(args, estatisticas, diagnosticos):
+  from src.scanner_fluxo import AnalisadorLexicoEmFluxo
+  primeiro_erro = None
+  if args.tokens:
+    estatisticas.fase("listagem dos tokens")
+    print("--- Iniciando Análise Léxica do Arquivo (Ckp 1) ---")
+    sys.stdout.flush()
+    # Uma passada só para a listagem (também para no primeiro erro léxico)
+    with AnalisadorLexicoEmFluxo(args.arquivo) as analisador:
+      primeiro_erro = analisador.escrever(sys.stdout)
+    sys.stdout.flush()
+
+  estatisticas.fase("análises léxica e sintática (fluxo)")
+  with AnalisadorLexicoEmFluxo(args.arquivo) as analisador:
+    estatisticas.instrumentar_scanner(analisador)
+    parser = PARSERS[args.parser](
+      analisador, construir_arvore=False, recuperar=args.recuperar, max_erros=args.max_erros, estatisticas=estatisticas,
+    )
+    resultado = parser.parse()
+    # O primeiro erro léxico pode estar depois do ponto em que o Parser parou
+    if not args.tokens and not args.recuperar:
+      primeiro_erro = analisador.procurar_primeiro_erro()
+  estatisticas.fase("saída")
+
+  if primeiro_erro is not None and not args.recuperar:
+    diagnosticos.append(primeiro_erro)
+    print(primeiro_erro.mensagem, file=sys.stderr)
+  if args.tokens:
+    print("--- Análise Léxica Concluída ---")
+    print()
+  print("--- Iniciando Análise Sintática (Ckp 2) ---")
+  diagnosticos.extend(resultado["erros"])
+  if resultado["sucesso"]:
+    print("Análise sintática concluída sem erros.")
+  else:
+    sys.stdout.flush()
+    print("Foram encontrados erros sintáticos:", file=sys.stderr)
+    for err in resultado["erros"]:
+      print(f"- {err}", file=sys.stderr)
+    sys.exit(1)
+
+# Programa já compilado (.mcc): o artefato é aberto por mmap e executado
+# (--run) ou descrito, sem o código-fonte e sem as análises
+def usar_artefato(args, estatisticas):
+  from src.artefato import Artefato, ErroDeArtefato
+  estatisticas.fase("carga do artefato")
+  try:
+    with Artefato(args.arquivo) as artefato:
+      if not args.run:
+        estatisticas.fase("saída")
+        print(artefato.descrever())
+        return
+      programa = artefato.programa()
+      indice_linhas = artefato.indice_linhas
+      estatisticas.fase("execução")
+      rodar(lambda: executar(programa, indice_linhas=indice_linhas))
+  except ErroDeArtefato as erro:
+    print(erro, file=sys.stderr)
+    sys.exit(1)
+
+# --stats, --stats-json e --trace: encerra a última fase e relata
+def relatar_estatisticas(args, estatisticas):
+  estatisticas.fase(None)
+  if args.stats:
+    sys.stdout.flush()
+    print(estatisticas.tabela(), file=sys.stderr)
+  if args.stats_json:
+    estatisticas.gravar_json(args.stats_json)
+  if args.trace:
+    estatisticas.gravar_trace(args.trace)
+
+# --erros-json e --sarif: grava os diagnósticos (a lista vazia, se não houve erros)
+def relatar_diagnosticos(args, diagnosticos):
+  if args.erros_json:
+    gravar_json(args.erros_json, args.arquivo, diagnosticos)
+  if args.sarif:
+    gravar_sarif(args.sarif, args.arquivo, diagnosticos)
+
 def main():
+  args = ler_argumentos()
+  if args.servidor:
+    from src.servidor_de_linguagem import servir
+    servir(args.processos, args.parser, args.motor)
+    return
+  if args.lote:
+    verificar_em_lote(args)
+    return
+  if not args.estatisticas and not args.relatorio_de_erros:
+    analisar_arquivo(args, SEM_ESTATISTICAS, [])
+    return
+  # Os relatórios saem também quando a análise termina com erro (sys.exit)
+  estatisticas = Estatisticas() if args.estatisticas else SEM_ESTATISTICAS
+  diagnosticos = []
   try:
-    # Ajuste o caminho do arquivo de entrada conforme a sua estrutura de pastas
-    # O arquivo original é 'programa_checkpoint2.mc' (arquivo está na raiz do projeto)
-    programa_checkpoint = "programa_checkpoint2.mc"
-    
+    analisar_arquivo(args, estatisticas, diagnosticos)
+  finally:
+    if args.estatisticas:
+      relatar_estatisticas(args, estatisticas)
+    relatar_diagnosticos(args, diagnosticos)
+
+# Análise de um arquivo. 'estatisticas' marca o início de cada fase (com
+# SEM_ESTATISTICAS, as marcações não fazem nada). Os erros encontrados são
+# acrescentados a 'diagnosticos', na ordem em que são impressos.
+def analisar_arquivo(args, estatisticas, diagnosticos):
+  programa_checkpoint = args.arquivo
+  try:
+    if args.fluxo:
+      validar_em_fluxo(args, estatisticas, diagnosticos)
+      return
+    if args.de_artefato:
+      usar_artefato(args, estatisticas)
+      return
+
     # Usa a forma idiomática de Python para ler o arquivo
+    estatisticas.fase("leitura do arquivo")
     with open(programa_checkpoint, "r", encoding="utf-8") as f:
         codigo_fonte = f.read()
 
-    # --- Fase 1: Análise Léxica (Demonstração Ckp 1) ---
-    analisador = AnalisadorLexico(codigo_fonte)
+    # Com '--executor python', o code object em cache para este mesmo
+    # código-fonte é executado direto, sem nenhuma das análises
+    if args.run and args.executor == "python" and not args.tokens and not args.sem_cache:
+      from src.tradutor_python import carregar_do_cache, executar_codigo
+      estatisticas.fase("cache do code object")
+      codigo = carregar_do_cache(programa_checkpoint, codigo_fonte, opcoes_do_cache(args))
+      if codigo is not None:
+        estatisticas.fase("execução")
+        rodar(lambda: executar_codigo(codigo), "--- Executando o Programa (código em cache) ---")
+        return
 
-    print("--- Iniciando Análise Léxica do Arquivo (Ckp 1) ---")
-
-    while True:
-      token_atual = analisador.proximo_token()
-      if token_atual:
-        print(token_atual)
-      
-      # O loop continua até encontrar o FIM_DE_ARQUIVO ou um erro léxico (que retorna None)
-      if token_atual is None or token_atual.tipo == TiposDeToken.FIM_DE_ARQUIVO:
-          break
+    # Tokens e resultado do Parser em cache para este mesmo código-fonte:
+    # num acerto, o AnalisadorLexico e o Parser não são executados
+    cache = None if args.sem_cache else CacheDeCompilacao()
+    if cache:
+      estatisticas.contar_cache(cache)
+      estatisticas.fase("cache das análises")
+    em_cache = cache.carregar(codigo_fonte, opcoes_da_analise(args.recuperar, args.max_erros)) if cache else None
+    # Com --recuperar a análise é sempre sequencial (os erros dependem do estado do Parser)
+    paralelo = args.paralelo and not args.recuperar
 
-    print("--- Análise Léxica Concluída ---")
+    # --- Fase 1: Análise Léxica (Ckp 1) ---
+    # O código-fonte é varrido uma única vez. O TokenStream resultante é
+    # usado tanto para listar os tokens quanto pelo Parser.
+    if em_cache is not None:
+      tokens = em_cache[0]
+    elif paralelo:
+      # Fases 1 e 2 juntas, por pedaços, em vários processos
+      from src.parser_paralelo import analisar_em_paralelo
+      estatisticas.fase("análises léxica e sintática (paralelo)")
+      tokens, em_paralelo = analisar_em_paralelo(codigo_fonte, args.processos, args.parser, args.motor)
+    else:
+      estatisticas.fase("análise léxica")
+      analisador = AnalisadorLexico(codigo_fonte, motor=args.motor)
+      tokens = analisador.tokenize(lote=True)
+    estatisticas.contar_tokens(tokens)
 
-    # --- Fase 2: Análise Sintática (Ckp 2) ---
+    # Requisito 9 (Ckp 1): a listagem (e o Parser) param no primeiro erro léxico
+    primeiro_erro = tokens.diagnosticos[0] if tokens.diagnosticos else None
 
-    # É necessário criar uma *nova instância* do Analisador Léxico
-    # para o Parser, pois o primeiro analisador já consumiu o código-fonte.
-    analisador_para_parser = AnalisadorLexico(codigo_fonte)
-    parser = Parser(analisador_para_parser)
+    estatisticas.fase("saída")
+    if args.tokens:
+      estatisticas.fase("listagem dos tokens")
+      print("--- Iniciando Análise Léxica do Arquivo (Ckp 1) ---")
+      sys.stdout.flush()
+      ate = primeiro_erro.indice_token if primeiro_erro is not None else len(tokens)
+      tokens.escrever(sys.stdout, ate)
+      sys.stdout.flush()
+    # Com --recuperar, os erros léxicos são reportados junto com os sintáticos
+    if primeiro_erro is not None and not args.recuperar:
+      diagnosticos.append(primeiro_erro)
+      print(primeiro_erro.mensagem, file=sys.stderr)
+    if args.tokens:
+      print("--- Análise Léxica Concluída ---")
+      print()
 
-    print("\n--- Iniciando Análise Sintática (Ckp 2) ---")
+    # --- Fase 2: Análise Sintática (Ckp 2) ---
+    print("--- Iniciando Análise Sintática (Ckp 2) ---")
 
-    # O método .parse() inicia a análise sintática descendente recursiva
-    resultado = parser.parse()
+    if em_cache is not None:
+      resultado = em_cache[1]
+    else:
+      if paralelo:
+        resultado = em_paralelo
+      else:
+        estatisticas.fase("análise sintática")
+        parser = PARSERS[args.parser](tokens, recuperar=args.recuperar, max_erros=args.max_erros, estatisticas=estatisticas)
+        # O método .parse() inicia a análise sintática descendente recursiva
+        resultado = parser.parse()
+      # Gravado antes da análise semântica, que preenche os slots da AST
+      if cache:
+        estatisticas.fase("gravação do cache")
+        cache.salvar(codigo_fonte, tokens, resultado, opcoes_da_analise(args.recuperar, args.max_erros))
 
+    estatisticas.fase("saída")
+    diagnosticos.extend(resultado["erros"])
     if resultado["sucesso"]:
       print("Análise sintática concluída sem erros.")
     else:
       # Requisito 3 (Ckp 2): Reportar erros sintáticos
+      sys.stdout.flush()
       print("Foram encontrados erros sintáticos:", file=sys.stderr)
       for err in resultado["erros"]:
-        print("- " + err, file=sys.stderr)
+        print(f"- {err}", file=sys.stderr)
       sys.exit(1)
 
+    # --- Fase 3: Análise Semântica (sobre a AST) ---
+    print("--- Iniciando Análise Semântica ---")
+    estatisticas.fase("análise semântica")
+    semantica = analisar(resultado["arvore"], tokens.indice_linhas)
+    estatisticas.fase("saída")
+    diagnosticos.extend(semantica["erros"])
+    if semantica["sucesso"]:
+      print("Análise semântica concluída sem erros.")
+    else:
+      sys.stdout.flush()
+      print("Foram encontrados erros semânticos:", file=sys.stderr)
+      for err in semantica["erros"]:
+        print(f"- {err}", file=sys.stderr)
+      sys.exit(1)
+
+    # --- Otimização (--otimizar) ---
+    if args.otimizar is not None:
+      print("--- Otimização ---")
+      estatisticas.fase("otimização")
+      relatorio = otimizar(resultado["arvore"], semantica["tabela"], args.otimizar)
+      for passo, quantidade in relatorio.items():
+        unidade = "leituras substituídas" if passo == "copias" else "nós eliminados"
+        print(f"{passo}: {quantidade} {unidade}")
+
+    # --- Artefato (--artefato) ---
+    programa = None
+    if args.artefato is not None:
+      from src.artefato import gravar_artefato
+      estatisticas.fase("gravação do artefato")
+      programa = compilar(resultado["arvore"], semantica["tabela"])
+      tamanho = gravar_artefato(
+        args.artefato, programa, semantica["tabela"], tokens.indice_linhas, codigo_fonte, programa_checkpoint
+      )
+      estatisticas.fase("saída")
+      print(f"Artefato gravado em {args.artefato} ({tamanho:,} bytes).")
+
+    # --- Execução (--run) ---
+    if args.run:
+      estatisticas.fase("compilação")
+      codigo = None
+      if args.executor == "python":
+        from src.tradutor_python import (
+          compilar_para_python, executar_codigo, salvar_no_cache, ProgramaNaoTraduzivel,
+        )
+        try:
+          codigo = compilar_para_python(
+            resultado["arvore"], semantica["tabela"], tokens.indice_linhas, programa_checkpoint
+          )
+          if not args.sem_cache:
+            salvar_no_cache(programa_checkpoint, codigo_fonte, codigo, opcoes_do_cache(args))
+        except ProgramaNaoTraduzivel as erro:
+          # Aninhamento profundo demais para o compile() do CPython
+          print(f"{erro} Executando na máquina virtual.", file=sys.stderr)
+      if codigo is not None:
+        estatisticas.fase("execução")
+        rodar(lambda: executar_codigo(codigo))
+      else:
+        if programa is None:
+          programa = compilar(resultado["arvore"], semantica["tabela"])
+        estatisticas.fase("execução")
+        rodar(lambda: executar(programa, indice_linhas=tokens.indice_linhas))
+
   except FileNotFoundError:
     print(f"Ocorreu um erro: Arquivo '{programa_checkpoint}' não encontrado.", file=sys.stderr)
     sys.exit(1)
@@ -71,4 +435,4 @@ def main():
     sys.exit(1)
 
 if __name__ == "__main__":
-  main()
\ No newline at end of file
+  main()
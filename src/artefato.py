@@ -0,0 +1,363 @@
+# src/artefato.py
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from .semantico import TIPOS_DE_VARIAVEL
+from .bytecode import ProgramaCompilado, NOMES_DAS_INSTRUCOES
+from .indice_linhas import IndiceDeLinhas
+"""
+Artefato.py
+
+Programa compilado num arquivo binário (.mcc), que pode ser executado ou
+inspecionado sem o código-fonte e sem as análises (AnalisadorLexico,
+Parser e análise semântica): o main.py grava o artefato de um programa
+que passou por todas as análises (--artefato), e um executor só precisa
+abrir o arquivo e rodar o bytecode.
+
+O arquivo tem um cabeçalho de tamanho fixo e seções de vetores (array),
+todos little-endian e alinhados em 8 bytes:
+
+  - cabeçalho: assinatura, versão do formato, versão do bytecode (hash
+    dos opcodes), resumo BLAKE2 do código-fonte, tamanho do arquivo e,
+    para cada seção, o deslocamento e o tamanho em bytes;
+  - símbolos: tabela única de textos (nomes de variáveis, cadeias do
+    IMPRIMIR e o caminho do código-fonte), sem repetições, com o início
+    de cada texto num vetor e o UTF-8 de todos eles concatenado;
+  - declarações: por slot, o símbolo do nome, o código do tipo
+    (TIPOS_DE_VARIAVEL) e o deslocamento da declaração no código-fonte;
+  - constantes: o tipo de cada uma e um valor de 64 bits (o inteiro, os
+    bits IEEE 754 do real, ou o símbolo da cadeia; um inteiro maior que 64
+    bits vai como texto para a tabela de símbolos);
+  - instruções: o array('i') de src/bytecode.py, sem alteração;
+  - posições: endereços das instruções que podem falhar e o deslocamento
+    de cada uma no código-fonte;
+  - linhas: os deslocamentos dos '\n' do código-fonte (IndiceDeLinhas),
+    para que os erros de execução mostrem linha e coluna.
+
+Artefato(caminho) mapeia o arquivo com mmap e lê só o cabeçalho, em tempo
+constante. Cada seção é decodificada no primeiro acesso: os vetores são
+memoryviews sobre o próprio mapa (sem cópia), e os textos são
+decodificados um a um, quando pedidos.
+"""
+
+ASSINATURA = b"MCC\0"
+VERSAO_DO_ARTEFATO = 1 # Incrementar quando o formato do arquivo mudar
+EXTENSAO = ".mcc"
+
+# Versão do bytecode: muda se alguma instrução for adicionada, removida ou reordenada
+VERSAO_DO_BYTECODE = hashlib.blake2b(repr(NOMES_DAS_INSTRUCOES).encode("utf-8"), digest_size=8).digest()
+
+# Seções do arquivo, na ordem em que são gravadas: (nome, tipo do array)
+SECOES = (
+  ("inicios_dos_simbolos", "q"), # símbolo -> início no texto (um a mais: o fim do último)
+  ("texto_dos_simbolos", "B"), # UTF-8 de todos os símbolos
+  ("nomes", "I"), # slot -> símbolo do nome
+  ("tipos", "B"), # slot -> código do tipo
+  ("declaracoes", "q"), # slot -> deslocamento da declaração
+  ("tipos_das_constantes", "B"), # índice -> _INTEIRO, _REAL, _INTEIRO_GRANDE ou _CADEIA
+  ("constantes", "q"), # índice -> valor (ver _valor_da_constante)
+  ("instrucoes", "i"), # bytecode
+  ("enderecos", "I"), # endereços (crescentes) das instruções com posição
+  ("posicoes", "q"), # deslocamento no código-fonte de cada endereço acima
+  ("quebras", "q"), # deslocamentos dos '\n' do código-fonte
+)
+_INDICE_DA_SECAO = {nome: indice for indice, (nome, _) in enumerate(SECOES)}
+
+# assinatura, versão, seções, versão do bytecode, resumo do código-fonte,
+# tamanho do arquivo, símbolo do caminho do código-fonte e, por seção,
+# (deslocamento, tamanho)
+_CABECALHO = struct.Struct("<4sHH8s16sQI" + "QQ" * len(SECOES))
+_ALINHAMENTO = 8
+
+# Tipos das constantes
+_INTEIRO, _REAL, _INTEIRO_GRANDE, _CADEIA = range(4)
+_REAL_EM_BITS = struct.Struct("<d")
+_BITS_EM_INTEIRO = struct.Struct("<q")
+
+_NOMES_DOS_TIPOS = {tipo: tipo.name.rsplit("_", 1)[1] for tipo in TIPOS_DE_VARIAVEL} # INTEIRO, REAL
+
+class ErroDeArtefato(Exception):
+  pass
+
+# Caminho padrão do artefato de um programa: 'programa.mc' -> 'programa.mcc'
+def caminho_do_artefato(caminho):
+  return os.path.splitext(caminho)[0] + EXTENSAO
+
+def resumo_do_codigo(codigo_fonte):
+  return hashlib.blake2b(codigo_fonte.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+# --- Gravação ---
+
+# Grava o artefato de um programa compilado (src/bytecode.py). 'tabela' é a
+# TabelaDeSimbolos da análise semântica; 'fonte' é o caminho do .mc.
+def gravar_artefato(caminho, programa, tabela, indice_linhas, codigo_fonte, fonte):
+  simbolos = {} # texto -> índice (a tabela de símbolos internada)
+
+  def simbolo(texto):
+    return simbolos.setdefault(texto, len(simbolos))
+
+  nomes = array("I", [simbolo(nome) for nome in tabela.nomes])
+  tipos_das_constantes = array("B")
+  constantes = array("q")
+  for valor in programa.constantes:
+    tipo, valor = _codificar_constante(valor, simbolo)
+    tipos_das_constantes.append(tipo)
+    constantes.append(valor)
+  simbolo_da_fonte = simbolo(fonte)
+
+  inicios_dos_simbolos = array("q", [0])
+  texto_dos_simbolos = bytearray()
+  for texto in simbolos: # Na ordem dos índices
+    texto_dos_simbolos += texto.encode("utf-8", "surrogatepass")
+    inicios_dos_simbolos.append(len(texto_dos_simbolos))
+
+  enderecos = sorted(programa.posicoes)
+  vetores = {
+    "inicios_dos_simbolos": inicios_dos_simbolos,
+    "texto_dos_simbolos": texto_dos_simbolos,
+    "nomes": nomes,
+    "tipos": array("B", tabela.tipos),
+    "declaracoes": array("q", tabela.declaracoes),
+    "tipos_das_constantes": tipos_das_constantes,
+    "constantes": constantes,
+    "instrucoes": array("i", programa.instrucoes),
+    "enderecos": array("I", enderecos),
+    "posicoes": array("q", [programa.posicoes[endereco] for endereco in enderecos]),
+    "quebras": array("q", indice_linhas.quebras()),
+  }
+
+  # Layout: cada seção começa num múltiplo de _ALINHAMENTO
+  partes = []
+  secoes = []
+  posicao = _alinhar(_CABECALHO.size)
+  for nome, _ in SECOES:
+    vetor = vetores[nome]
+    if sys.byteorder == "big" and isinstance(vetor, array):
+      vetor = array(vetor.typecode, vetor)
+      vetor.byteswap()
+    dados = bytes(vetor)
+    secoes.append((posicao, len(dados)))
+    partes.append((posicao, dados))
+    posicao = _alinhar(posicao + len(dados))
+
+  cabecalho = _CABECALHO.pack(
+    ASSINATURA, VERSAO_DO_ARTEFATO, len(SECOES), VERSAO_DO_BYTECODE, resumo_do_codigo(codigo_fonte),
+    posicao, simbolo_da_fonte, *(campo for secao in secoes for campo in secao),
+  )
+  conteudo = bytearray(posicao)
+  conteudo[:len(cabecalho)] = cabecalho
+  for inicio, dados in partes:
+    conteudo[inicio:inicio + len(dados)] = dados
+
+  temporario = f"{caminho}.{os.getpid()}.tmp"
+  with open(temporario, "wb") as f:
+    f.write(conteudo)
+  os.replace(temporario, caminho) # Escrita atômica
+  return len(conteudo)
+
+def _alinhar(posicao):
+  return -(-posicao // _ALINHAMENTO) * _ALINHAMENTO
+
+# (tipo, valor de 64 bits) de uma constante do bytecode
+def _codificar_constante(valor, simbolo):
+  if isinstance(valor, str):
+    return _CADEIA, simbolo(valor)
+  if isinstance(valor, float):
+    return _REAL, _BITS_EM_INTEIRO.unpack(_REAL_EM_BITS.pack(valor))[0]
+  if -2**63 <= valor < 2**63:
+    return _INTEIRO, valor
+  return _INTEIRO_GRANDE, simbolo(str(valor))
+
+# --- Leitura ---
+
+class Artefato:
+  __slots__ = (
+    "caminho", "versao", "versao_do_bytecode", "resumo_da_fonte", "tamanho",
+    "_arquivo", "_mapa", "_secoes", "_simbolo_da_fonte", "_vistas", "_cache",
+  )
+
+  # Abre o arquivo e valida o cabeçalho (tempo constante: as seções só são
+  # lidas quando acessadas)
+  def __init__(self, caminho):
+    self.caminho = caminho
+    self._vistas = [] # memoryviews exportadas do mapa (liberadas em fechar())
+    self._cache = {} # seções e listas já decodificadas
+    self._mapa = None
+    self._arquivo = open(caminho, "rb")
+    try:
+      tamanho = os.fstat(self._arquivo.fileno()).st_size
+      if tamanho < _CABECALHO.size:
+        raise ErroDeArtefato(f"'{caminho}' não é um artefato .mcc (arquivo curto demais).")
+      self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+      self._ler_cabecalho(tamanho)
+    except BaseException:
+      self.fechar()
+      raise
+
+  def _ler_cabecalho(self, tamanho):
+    campos = _CABECALHO.unpack_from(self._mapa, 0)
+    assinatura, versao, quantidade, versao_do_bytecode, resumo, tamanho_gravado, fonte = campos[:7]
+    if assinatura != ASSINATURA:
+      raise ErroDeArtefato(f"'{self.caminho}' não é um artefato .mcc.")
+    if versao != VERSAO_DO_ARTEFATO or quantidade != len(SECOES):
+      raise ErroDeArtefato(
+        f"'{self.caminho}' é um artefato da versão {versao}; esta versão lê a {VERSAO_DO_ARTEFATO}. Compile o programa de novo."
+      )
+    if versao_do_bytecode != VERSAO_DO_BYTECODE:
+      raise ErroDeArtefato(f"'{self.caminho}' foi gerado com outro conjunto de instruções. Compile o programa de novo.")
+    if tamanho_gravado != tamanho:
+      raise ErroDeArtefato(f"'{self.caminho}' está truncado ou corrompido ({tamanho} bytes, esperado {tamanho_gravado}).")
+    secoes = []
+    for indice, (_, tipo) in enumerate(SECOES):
+      inicio, tamanho_da_secao = campos[7 + 2 * indice:9 + 2 * indice]
+      if inicio % _ALINHAMENTO or inicio + tamanho_da_secao > tamanho or tamanho_da_secao % array(tipo).itemsize:
+        raise ErroDeArtefato(f"'{self.caminho}' está corrompido (seção {SECOES[indice][0]}).")
+      secoes.append((inicio, tamanho_da_secao))
+    self.versao = versao
+    self.versao_do_bytecode = versao_do_bytecode
+    self.resumo_da_fonte = resumo
+    self.tamanho = tamanho
+    self._secoes = secoes
+    self._simbolo_da_fonte = fonte
+
+  def fechar(self):
+    for vista in self._vistas:
+      vista.release()
+    self._vistas.clear()
+    self._cache.clear()
+    if self._mapa is not None:
+      self._mapa.close()
+      self._mapa = None
+    self._arquivo.close()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *excecao):
+    self.fechar()
+
+  # Vetor de uma seção: memoryview sobre o mapa (ou cópia, em máquinas big-endian)
+  def secao(self, nome):
+    vetor = self._cache.get(nome)
+    if vetor is None:
+      indice = _INDICE_DA_SECAO[nome]
+      inicio, tamanho = self._secoes[indice]
+      tipo = SECOES[indice][1]
+      if sys.byteorder == "big":
+        vetor = array(tipo, self._mapa[inicio:inicio + tamanho])
+        vetor.byteswap()
+      else:
+        vetor = memoryview(self._mapa)[inicio:inicio + tamanho].cast(tipo)
+        self._vistas.append(vetor)
+      self._cache[nome] = vetor
+    return vetor
+
+  # --- Símbolos e declarações ---
+
+  def quantidade_de_simbolos(self):
+    return len(self.secao("inicios_dos_simbolos")) - 1
+
+  # Texto do i-ésimo símbolo (decodificado só este)
+  def simbolo(self, i):
+    inicios = self.secao("inicios_dos_simbolos")
+    return bytes(self.secao("texto_dos_simbolos")[inicios[i]:inicios[i + 1]]).decode("utf-8", "surrogatepass")
+
+  @property
+  def fonte(self):
+    return self.simbolo(self._simbolo_da_fonte)
+
+  @property
+  def nomes(self):
+    nomes = self._cache.get("lista_de_nomes")
+    if nomes is None:
+      simbolo = self.simbolo
+      nomes = self._cache["lista_de_nomes"] = [simbolo(i) for i in self.secao("nomes")]
+    return nomes
+
+  @property
+  def tipos(self):
+    return [TIPOS_DE_VARIAVEL[codigo] for codigo in self.secao("tipos")]
+
+  # (nome, tipo, deslocamento da declaração) de cada variável, por slot
+  def declaracoes(self):
+    return list(zip(self.nomes, self.tipos, self.secao("declaracoes")))
+
+  # --- Programa ---
+
+  @property
+  def constantes(self):
+    constantes = self._cache.get("lista_de_constantes")
+    if constantes is None:
+      constantes = self._cache["lista_de_constantes"] = [
+        self._valor_da_constante(tipo, valor)
+        for tipo, valor in zip(self.secao("tipos_das_constantes"), self.secao("constantes"))
+      ]
+    return constantes
+
+  def _valor_da_constante(self, tipo, valor):
+    if tipo == _INTEIRO:
+      return valor
+    if tipo == _REAL:
+      return _REAL_EM_BITS.unpack(_BITS_EM_INTEIRO.pack(valor))[0]
+    if tipo == _CADEIA:
+      return self.simbolo(valor)
+    if tipo == _INTEIRO_GRANDE:
+      return int(self.simbolo(valor))
+    raise ErroDeArtefato(f"'{self.caminho}' está corrompido (constante de tipo {tipo}).")
+
+  @property
+  def instrucoes(self):
+    return self.secao("instrucoes")
+
+  # Endereço -> deslocamento no código-fonte, por busca binária nas seções
+  @property
+  def posicoes(self):
+    return PosicoesDoArtefato(self.secao("enderecos"), self.secao("posicoes"))
+
+  # Índice de linhas do código-fonte, para as mensagens de erro
+  @property
+  def indice_linhas(self):
+    return IndiceDeLinhas.das_quebras(self.secao("quebras"))
+
+  # O ProgramaCompilado para a máquina virtual: as instruções ficam no mapa
+  def programa(self):
+    return ProgramaCompilado(self.instrucoes, self.constantes, self.nomes, self.tipos, self.posicoes)
+
+  # Texto de inspeção: cabeçalho, tamanhos das seções e declarações
+  def descrever(self):
+    indice_linhas = self.indice_linhas
+    linhas = [
+      f"Artefato {self.caminho} ({self.tamanho:,} bytes, formato versão {self.versao})",
+      f"Código-fonte: {self.fonte} (BLAKE2 {self.resumo_da_fonte.hex()})",
+      f"Símbolos: {self.quantidade_de_simbolos()}, variáveis: {len(self.secao('nomes'))}, "
+      f"constantes: {len(self.secao('constantes'))}, bytecode: {len(self.instrucoes)} palavras, "
+      f"linhas: {len(self.secao('quebras')) + 1}",
+      "Declarações:",
+    ]
+    for nome, tipo, inicio in self.declaracoes():
+      linha, coluna = indice_linhas.linha_coluna(inicio)
+      linhas.append(f"  {nome}: {_NOMES_DOS_TIPOS[tipo]} (linha {linha}, coluna {coluna})")
+    return "\n".join(linhas)
+
+# Mapa endereço -> deslocamento de um artefato, com a interface de dicionário
+# usada pela MaquinaVirtual (get), sem montar o dicionário
+class PosicoesDoArtefato:
+  __slots__ = ("enderecos", "posicoes")
+
+  def __init__(self, enderecos, posicoes):
+    self.enderecos = enderecos
+    self.posicoes = posicoes
+
+  def get(self, endereco, padrao=None):
+    i = bisect_left(self.enderecos, endereco)
+    if i < len(self.enderecos) and self.enderecos[i] == endereco:
+      return self.posicoes[i]
+    return padrao
+
+  def __len__(self):
+    return len(self.enderecos)
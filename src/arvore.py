@@ -0,0 +1,186 @@
+# src/arvore.py
+
+from types import SimpleNamespace
+"""
+Arvore.py
+
+Nós da Árvore Sintática Abstrata (AST) construída pelo Parser (Ckp 2).
+
+Cada nó usa __slots__ e guarda apenas valores simples: nomes, operadores,
+lexemas de literais e o deslocamento (inicio) do nó no código-fonte, nunca
+objetos Token. A linha/coluna de um nó pode ser obtida com o IndiceDeLinhas
+do código-fonte: indice.linha_coluna(no.inicio).
+"""
+
+class No:
+  __slots__ = ("inicio",)
+  campos = () # Nomes dos campos, na ordem do construtor (sem 'inicio')
+
+  def __repr__(self):
+    valores = ", ".join(f"{campo}={getattr(self, campo)!r}" for campo in self.campos)
+    return f"{type(self).__name__}({valores})"
+
+# Regra: programa : ':' 'DECLARACOES' listaDeclaracoes ':' 'ALGORITMO' listaComandos;
+class Programa(No):
+  __slots__ = ("declaracoes", "comandos")
+  campos = __slots__
+
+  def __init__(self, declaracoes, comandos, inicio):
+    self.declaracoes = declaracoes # Lista de Declaracao
+    self.comandos = comandos # Lista de comandos
+    self.inicio = inicio
+
+# Regra: declaracao : VARIAVEL ':' tipoVar;
+class Declaracao(No):
+  __slots__ = ("nome", "tipo")
+  campos = __slots__
+
+  def __init__(self, nome, tipo, inicio):
+    self.nome = nome
+    self.tipo = tipo # TiposDeToken.PALAVRA_RESERVADA_INTEIRO ou _REAL
+    self.inicio = inicio
+
+# Regra: comandoAtribuicao : VARIAVEL '=' expressaoAritmetica;
+class Atribuicao(No):
+  __slots__ = ("alvo", "expressao")
+  campos = __slots__
+
+  def __init__(self, alvo, expressao, inicio):
+    self.alvo = alvo # Var
+    self.expressao = expressao
+    self.inicio = inicio
+
+# Regra: comandoEntrada : 'LER' VARIAVEL;
+class Ler(No):
+  __slots__ = ("alvo",)
+  campos = __slots__
+
+  def __init__(self, alvo, inicio):
+    self.alvo = alvo # Var
+    self.inicio = inicio
+
+# Regra: comandoSaida : 'IMPRIMIR' '(' (VARIAVEL | CADEIA) ')';
+class Imprimir(No):
+  __slots__ = ("valor",)
+  campos = __slots__
+
+  def __init__(self, valor, inicio):
+    self.valor = valor # Var ou Literal (CADEIA)
+    self.inicio = inicio
+
+# Regra: comandoCondicao : 'SE' expressaoRelacional 'ENTAO' comando ('SENAO' comando)?;
+class Se(No):
+  __slots__ = ("condicao", "entao", "senao")
+  campos = __slots__
+
+  def __init__(self, condicao, entao, senao, inicio):
+    self.condicao = condicao
+    self.entao = entao
+    self.senao = senao # None quando não há 'SENAO'
+    self.inicio = inicio
+
+# Regra: comandoRepeticao : 'ENQUANTO' expressaoRelacional comando;
+class Enquanto(No):
+  __slots__ = ("condicao", "corpo")
+  campos = __slots__
+
+  def __init__(self, condicao, corpo, inicio):
+    self.condicao = condicao
+    self.corpo = corpo
+    self.inicio = inicio
+
+# Regra: subAlgoritmo : 'INICIO' listaComandos 'FIM';
+class Bloco(No):
+  __slots__ = ("comandos",)
+  campos = __slots__
+
+  def __init__(self, comandos, inicio):
+    self.comandos = comandos
+    self.inicio = inicio
+
+# Operação aritmética: '+', '-', '*' ou '/' (inicio = posição do operador)
+class BinOp(No):
+  __slots__ = ("op", "esquerda", "direita")
+  campos = __slots__
+
+  def __init__(self, op, esquerda, direita, inicio):
+    self.op = op
+    self.esquerda = esquerda
+    self.direita = direita
+    self.inicio = inicio
+
+# Comparação: '>', '<', '>=', '<=', '==' ou '!=' (inicio = posição do operador)
+class RelOp(No):
+  __slots__ = ("op", "esquerda", "direita")
+  campos = __slots__
+
+  def __init__(self, op, esquerda, direita, inicio):
+    self.op = op
+    self.esquerda = esquerda
+    self.direita = direita
+    self.inicio = inicio
+
+# Operador booleano: 'E' ou 'OU' (inicio = posição do operador)
+class BoolOp(No):
+  __slots__ = ("op", "esquerda", "direita")
+  campos = __slots__
+
+  def __init__(self, op, esquerda, direita, inicio):
+    self.op = op
+    self.esquerda = esquerda
+    self.direita = direita
+    self.inicio = inicio
+
+# Constante NUMINT, NUMREAL ou CADEIA (texto = lexema, sem aspas na CADEIA)
+class Literal(No):
+  __slots__ = ("tipo", "texto")
+  campos = __slots__
+
+  def __init__(self, tipo, texto, inicio):
+    self.tipo = tipo # TiposDeToken.NUMINT, NUMREAL ou CADEIA
+    self.texto = texto
+    self.inicio = inicio
+
+# Uso de uma variável (IDENTIFICADOR ou a palavra 'VARIAVEL')
+class Var(No):
+  __slots__ = ("nome", "slot")
+  campos = ("nome",)
+
+  def __init__(self, nome, inicio):
+    self.nome = nome
+    self.slot = None # Índice na TabelaDeSimbolos, preenchido pela análise semântica
+    self.inicio = inicio
+
+NOS = (
+  Programa, Declaracao, Atribuicao, Ler, Imprimir, Se, Enquanto, Bloco,
+  BinOp, RelOp, BoolOp, Literal, Var,
+)
+
+"""
+Fábricas usadas pelo Parser. Na construção normal, cada nome é a própria
+classe do nó. No modo só-validação, todos os nomes apontam para uma função
+que não cria nada, de modo que o Parser percorre a gramática sem alocar nós.
+"""
+def _sem_no(*_):
+  return None
+
+FABRICA_ARVORE = SimpleNamespace(**{classe.__name__: classe for classe in NOS})
+FABRICA_NULA = SimpleNamespace(**{classe.__name__: _sem_no for classe in NOS})
+
+# Compara duas árvores campo a campo (iterativo, para suportar aninhamento profundo)
+def iguais(a, b):
+  pendentes = [(a, b)]
+  while pendentes:
+    x, y = pendentes.pop()
+    if isinstance(x, No) or isinstance(y, No):
+      if type(x) is not type(y) or x.inicio != y.inicio:
+        return False
+      for campo in x.campos:
+        pendentes.append((getattr(x, campo), getattr(y, campo)))
+    elif isinstance(x, list) or isinstance(y, list):
+      if type(x) is not type(y) or len(x) != len(y):
+        return False
+      pendentes.extend(zip(x, y))
+    elif x != y:
+      return False
+  return True
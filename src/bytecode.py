@@ -0,0 +1,273 @@
+# src/bytecode.py
+
+from array import array
+from .token_type import TiposDeToken
+from .semantico import INTEIRO, REAL
+from . import arvore
+"""
+Bytecode.py
+
+Compila a AST (já validada pela análise semântica) para o bytecode da
+máquina virtual (src/maquina_virtual.py).
+
+O código é um vetor array('i'): cada instrução é um opcode seguido, quando
+a instrução tem argumento, de um inteiro (slot de variável, índice na
+tabela de constantes ou endereço de desvio). As variáveis são acessadas
+pelo slot que a análise semântica gravou em cada nó Var.
+
+Os tipos são resolvidos aqui, na compilação: a divisão entre dois
+INTEIRO vira DIVIDIR_INTEIRO, e um valor INTEIRO atribuído a uma variável
+REAL é convertido com PARA_REAL antes de ARMAZENAR.
+"""
+
+# --- Opcodes ---
+(
+  CARREGAR, # slot: empilha o valor da variável
+  ARMAZENAR, # slot: desempilha e grava na variável
+  CONSTANTE, # índice: empilha constantes[índice]
+  SOMAR,
+  SUBTRAIR,
+  MULTIPLICAR,
+  DIVIDIR_INTEIRO, # INTEIRO / INTEIRO: trunca em direção a zero
+  DIVIDIR_REAL,
+  PARA_REAL, # converte o topo da pilha para REAL
+  MENOR,
+  MENOR_IGUAL,
+  MAIOR,
+  MAIOR_IGUAL,
+  IGUAL,
+  DIFERENTE,
+  SALTAR, # endereço
+  SALTAR_SE_FALSO, # endereço: desempilha a condição
+  SALTAR_SE_FALSO_OU_DESEMPILHAR, # endereço: 'E' (mantém o falso e salta)
+  SALTAR_SE_VERDADEIRO_OU_DESEMPILHAR, # endereço: 'OU' (mantém o verdadeiro e salta)
+  LER_INTEIRO, # slot
+  LER_REAL, # slot
+  IMPRIMIR_VARIAVEL, # slot
+  IMPRIMIR_CADEIA, # índice da cadeia em constantes
+  PARAR,
+) = range(24)
+
+NOMES_DAS_INSTRUCOES = (
+  "CARREGAR", "ARMAZENAR", "CONSTANTE", "SOMAR", "SUBTRAIR", "MULTIPLICAR",
+  "DIVIDIR_INTEIRO", "DIVIDIR_REAL", "PARA_REAL", "MENOR", "MENOR_IGUAL",
+  "MAIOR", "MAIOR_IGUAL", "IGUAL", "DIFERENTE", "SALTAR", "SALTAR_SE_FALSO",
+  "SALTAR_SE_FALSO_OU_DESEMPILHAR", "SALTAR_SE_VERDADEIRO_OU_DESEMPILHAR",
+  "LER_INTEIRO", "LER_REAL", "IMPRIMIR_VARIAVEL", "IMPRIMIR_CADEIA", "PARAR",
+)
+
+# Instruções seguidas de um argumento
+COM_ARGUMENTO = frozenset((
+  CARREGAR, ARMAZENAR, CONSTANTE, SALTAR, SALTAR_SE_FALSO,
+  SALTAR_SE_FALSO_OU_DESEMPILHAR, SALTAR_SE_VERDADEIRO_OU_DESEMPILHAR,
+  LER_INTEIRO, LER_REAL, IMPRIMIR_VARIAVEL, IMPRIMIR_CADEIA,
+))
+
+DESVIOS = frozenset((
+  SALTAR, SALTAR_SE_FALSO, SALTAR_SE_FALSO_OU_DESEMPILHAR, SALTAR_SE_VERDADEIRO_OU_DESEMPILHAR,
+))
+
+# Instruções que podem falhar na execução (têm a posição no código-fonte)
+COM_POSICAO = frozenset((DIVIDIR_INTEIRO, DIVIDIR_REAL, LER_INTEIRO, LER_REAL))
+
+OPERACOES_ARITMETICAS = {"+": SOMAR, "-": SUBTRAIR, "*": MULTIPLICAR}
+COMPARACOES = {
+  "<": MENOR, "<=": MENOR_IGUAL, ">": MAIOR, ">=": MAIOR_IGUAL,
+  "==": IGUAL, "!=": DIFERENTE,
+}
+
+class ProgramaCompilado:
+  __slots__ = ("instrucoes", "constantes", "nomes", "tipos", "posicoes")
+
+  def __init__(self, instrucoes, constantes, nomes, tipos, posicoes):
+    self.instrucoes = instrucoes # array('i')
+    self.constantes = constantes # Números (int/float) e cadeias
+    self.nomes = nomes # slot -> nome da variável
+    self.tipos = tipos # slot -> INTEIRO ou REAL
+    self.posicoes = posicoes # endereço da instrução -> deslocamento no código-fonte
+
+  # Lista as instruções, uma por linha: "endereço  NOME  argumento"
+  def desmontar(self):
+    linhas = []
+    instrucoes = self.instrucoes
+    endereco = 0
+    while endereco < len(instrucoes):
+      op = instrucoes[endereco]
+      linha = f"{endereco:>6}  {NOMES_DAS_INSTRUCOES[op]}"
+      if op in COM_ARGUMENTO:
+        argumento = instrucoes[endereco + 1]
+        if op == CONSTANTE or op == IMPRIMIR_CADEIA:
+          linha += f" {argumento} ({self.constantes[argumento]!r})"
+        elif op in DESVIOS:
+          linha += f" {argumento}"
+        else:
+          linha += f" {argumento} ({self.nomes[argumento]})"
+        endereco += 2
+      else:
+        endereco += 1
+      linhas.append(linha)
+    return "\n".join(linhas)
+
+# Marcadores das pilhas de trabalho do Compilador
+_ARITMETICA = 1 # Combina os tipos dos dois operandos e emite a operação (valor = BinOp)
+_COMPARACAO = 2 # Emite a comparação (valor = RelOp)
+_SALTO_LOGICO = 3 # Emite o desvio de 'E'/'OU' entre os dois operandos (valor = BoolOp)
+_CORRIGIR = 4 # Preenche o endereço de um desvio com o endereço atual (valor = posição)
+_SENAO = 5 # Fim do ENTAO com SENAO: salta o SENAO e corrige o desvio da condição
+_REPETIR = 6 # Fim do corpo do ENQUANTO: volta à condição e corrige a saída
+
+class Compilador:
+  # 'tabela' é a TabelaDeSimbolos produzida pela análise semântica da
+  # mesma AST (que precisa ter terminado sem erros).
+  def __init__(self, programa, tabela):
+    self.programa = programa
+    self.tabela = tabela
+    self.instrucoes = array("i")
+    self.constantes = []
+    self._indice_constante = {} # (tipo, valor) -> índice em constantes
+    self.posicoes = {}
+
+  def compilar(self):
+    self._comandos(self.programa.comandos)
+    self.instrucoes.append(PARAR)
+    tabela = self.tabela
+    tipos = [tabela.tipo(slot) for slot in range(len(tabela))]
+    return ProgramaCompilado(self.instrucoes, self.constantes, list(tabela.nomes), tipos, self.posicoes)
+
+  # --- Emissão ---
+
+  def _emitir(self, op, argumento=None, inicio=None):
+    if inicio is not None:
+      self.posicoes[len(self.instrucoes)] = inicio
+    self.instrucoes.append(op)
+    if argumento is not None:
+      self.instrucoes.append(argumento)
+
+  # Emite um desvio com endereço a preencher; retorna a posição do endereço
+  def _emitir_desvio(self, op):
+    self.instrucoes.append(op)
+    self.instrucoes.append(-1)
+    return len(self.instrucoes) - 1
+
+  # Faz o desvio em 'posicao' apontar para a próxima instrução a ser emitida
+  def _corrigir(self, posicao):
+    self.instrucoes[posicao] = len(self.instrucoes)
+
+  def _constante(self, valor):
+    chave = (type(valor), valor)
+    indice = self._indice_constante.get(chave)
+    if indice is None:
+      indice = self._indice_constante[chave] = len(self.constantes)
+      self.constantes.append(valor)
+    return indice
+
+  # --- Comandos ---
+
+  # Compila os comandos com uma pilha explícita (aninhamento sem limite de
+  # recursão). Cada item é um nó ou um par (marcador, valor).
+  def _comandos(self, comandos):
+    pendentes = list(reversed(comandos))
+    while pendentes:
+      item = pendentes.pop()
+      if type(item) is tuple:
+        marcador, valor = item
+        if marcador == _CORRIGIR:
+          self._corrigir(valor)
+        elif marcador == _SENAO:
+          desvio_da_condicao, senao = valor
+          fim = self._emitir_desvio(SALTAR)
+          self._corrigir(desvio_da_condicao)
+          pendentes.append((_CORRIGIR, fim))
+          pendentes.append(senao)
+        else: # _REPETIR
+          inicio_da_condicao, saida = valor
+          self._emitir(SALTAR, inicio_da_condicao)
+          self._corrigir(saida)
+        continue
+
+      classe = type(item)
+      if classe is arvore.Atribuicao:
+        tipo = self._expressao(item.expressao)
+        slot = item.alvo.slot
+        if tipo is INTEIRO and self.tabela.tipo(slot) is REAL:
+          self._emitir(PARA_REAL)
+        self._emitir(ARMAZENAR, slot)
+      elif classe is arvore.Ler:
+        slot = item.alvo.slot
+        self._emitir(LER_REAL if self.tabela.tipo(slot) is REAL else LER_INTEIRO, slot, item.inicio)
+      elif classe is arvore.Imprimir:
+        if type(item.valor) is arvore.Var:
+          self._emitir(IMPRIMIR_VARIAVEL, item.valor.slot)
+        else:
+          self._emitir(IMPRIMIR_CADEIA, self._constante(item.valor.texto))
+      elif classe is arvore.Se:
+        self._expressao(item.condicao)
+        desvio = self._emitir_desvio(SALTAR_SE_FALSO)
+        if item.senao is None:
+          pendentes.append((_CORRIGIR, desvio))
+        else:
+          pendentes.append((_SENAO, (desvio, item.senao)))
+        pendentes.append(item.entao)
+      elif classe is arvore.Enquanto:
+        inicio_da_condicao = len(self.instrucoes)
+        self._expressao(item.condicao)
+        saida = self._emitir_desvio(SALTAR_SE_FALSO)
+        pendentes.append((_REPETIR, (inicio_da_condicao, saida)))
+        pendentes.append(item.corpo)
+      elif classe is arvore.Bloco:
+        pendentes.extend(reversed(item.comandos))
+
+  # --- Expressões ---
+
+  # Compila uma expressão (aritmética, relacional ou booleana) em pós-ordem
+  # iterativa e retorna o seu tipo: INTEIRO ou REAL, ou None para condições.
+  def _expressao(self, expressao):
+    tipos = []
+    pendentes = [expressao]
+    while pendentes:
+      item = pendentes.pop()
+      classe = type(item)
+      if classe is arvore.Var:
+        self._emitir(CARREGAR, item.slot)
+        tipos.append(self.tabela.tipo(item.slot))
+      elif classe is arvore.Literal:
+        if item.tipo == TiposDeToken.NUMINT:
+          self._emitir(CONSTANTE, self._constante(int(item.texto)))
+          tipos.append(INTEIRO)
+        else:
+          self._emitir(CONSTANTE, self._constante(float(item.texto)))
+          tipos.append(REAL)
+      elif classe is arvore.BinOp or classe is arvore.RelOp:
+        pendentes.append((_ARITMETICA if classe is arvore.BinOp else _COMPARACAO, item))
+        pendentes.append(item.direita)
+        pendentes.append(item.esquerda)
+      elif classe is arvore.BoolOp:
+        pendentes.append((_SALTO_LOGICO, item))
+        pendentes.append(item.esquerda)
+      else:
+        marcador, no = item
+        if marcador == _ARITMETICA:
+          direita, esquerda = tipos.pop(), tipos.pop()
+          if no.op == "/":
+            real = esquerda is REAL or direita is REAL
+            self._emitir(DIVIDIR_REAL if real else DIVIDIR_INTEIRO, inicio=no.inicio)
+          else:
+            self._emitir(OPERACOES_ARITMETICAS[no.op])
+          tipos.append(REAL if esquerda is REAL or direita is REAL else INTEIRO)
+        elif marcador == _COMPARACAO:
+          del tipos[-2:]
+          self._emitir(COMPARACOES[no.op])
+          tipos.append(None)
+        elif marcador == _SALTO_LOGICO:
+          # 'E' só avalia a direita se a esquerda for verdadeira; 'OU', se for falsa
+          op = SALTAR_SE_FALSO_OU_DESEMPILHAR if no.op == "E" else SALTAR_SE_VERDADEIRO_OU_DESEMPILHAR
+          pendentes.append((_CORRIGIR, self._emitir_desvio(op)))
+          pendentes.append(no.direita)
+          tipos.pop()
+        else: # _CORRIGIR: fim do operando direito de 'E'/'OU'
+          self._corrigir(no)
+    return tipos.pop()
+
+# Compila uma AST analisada (ver src/semantico.py) para um ProgramaCompilado
+def compilar(programa, tabela):
+  return Compilador(programa, tabela).compilar()
@@ -0,0 +1,332 @@
+# src/cache_de_compilacao.py
+
+import hashlib
+import marshal
+import os
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+from .arvore import No, NOS, Var, Literal
+from .diagnostico import DiagnosticoLexico, compactar, reconstruir
+from .token_type import TIPOS_POR_ORDINAL, ORDINAL_DO_TIPO
+from .token_stream import TokenStream
+from .scanner import PALAVRAS_RESERVADAS
+from .parser import TABELAS
+from .gramatica import CACHE_DO_USUARIO
+"""
+CacheDeCompilacao.py
+
+Cache em disco do resultado das análises léxica e sintática, indexado
+pelo conteúdo do arquivo. A chave é o hash BLAKE2 do código-fonte junto
+com a versão das palavras reservadas, o hash da gramática (gramatica.txt)
+e as opções que mudam o resultado (ex.: --recuperar). Cada entrada guarda,
+com marshal comprimido por zlib:
+  - o TokenStream: os tipos, o espaço antes de cada token e o seu
+    comprimento (em vez dos deslocamentos absolutos, cabem em 1 ou 2
+    bytes) e os erros léxicos;
+  - o resultado do Parser: sucesso, diagnósticos (em tuplas) e, se houver, a AST
+    serializada em pós-ordem numa lista plana (sem recursão).
+
+Num acerto, o TokenStream e o resultado são reconstruídos sem passar pelo
+AnalisadorLexico nem pelo Parser. As escritas são atômicas (arquivo
+temporário + os.replace), então vários processos podem usar o mesmo
+diretório. O tamanho total é limitado: ao gravar, as entradas usadas há
+mais tempo (mtime, atualizado a cada acerto) são removidas.
+"""
+
+DIRETORIO_CACHE = os.path.join(CACHE_DO_USUARIO, "compilacao")
+LIMITE_PADRAO = 64 * 1024 * 1024 # Bytes
+VERSAO_DO_CACHE = 3 # Incrementar quando o formato das entradas (ou o Scanner/Parser) mudar
+NIVEL_DE_COMPRESSAO = 1 # zlib: o mais rápido já reduz a entrada a cerca de um quinto
+EXTENSAO = ".mcache"
+# Gravações entre duas varreduras do diretório. Entre elas, o total é
+# estimado somando o tamanho de cada entrada gravada por este processo;
+# a varredura corrige a estimativa (entradas de outros processos).
+GRAVACOES_POR_VARREDURA = 1024
+# Ao passar do limite, remove entradas até esta fração dele, para que a
+# próxima varredura só venha depois de mais gravações
+FRACAO_APOS_REMOCAO = 0.9
+
+# Versão do léxico: muda se alguma palavra reservada for adicionada ou alterada
+VERSAO_DAS_PALAVRAS = hashlib.blake2b(
+  repr(sorted((texto, tipo.name) for texto, tipo in PALAVRAS_RESERVADAS.items())).encode("utf-8"),
+  digest_size=8,
+).hexdigest()
+
+# Marcas da AST serializada (um byte por valor, em pós-ordem)
+_NO, _LISTA, _NADA, _TEXTO, _TIPO, _VAR, _LITERAL = range(7)
+_INDICE_DO_NO = {classe: indice for indice, classe in enumerate(NOS)}
+_QUANTIDADE_DE_CAMPOS = {classe: len(classe.campos) for classe in NOS}
+
+# Opções do Parser que mudam os erros reportados (entram na chave)
+def opcoes_da_analise(recuperar, max_erros):
+  return f"recuperar={max_erros}" if recuperar else ""
+
+class CacheDeCompilacao:
+  def __init__(self, diretorio=DIRETORIO_CACHE, limite_bytes=LIMITE_PADRAO):
+    self.diretorio = diretorio
+    self.limite_bytes = limite_bytes
+    # Contadores deste processo
+    self.acertos = 0
+    self.faltas = 0
+    self.gravacoes = 0
+    self.removidas = 0 # Entradas removidas pelo limite de tamanho
+    self.varreduras = 0 # Varreduras do diretório para aplicar o limite
+    # Tamanho estimado do diretório (None = ainda não varrido)
+    self._total_estimado = None
+    self._gravacoes_sem_varredura = 0
+
+  # 'opcoes' identifica as opções que mudam o resultado (ex.: "recuperar=20")
+  def chave(self, codigo_fonte, opcoes=""):
+    resumo = hashlib.blake2b(digest_size=16)
+    resumo.update(
+      f"{VERSAO_DO_CACHE}:{sys.implementation.cache_tag}:{VERSAO_DAS_PALAVRAS}:"
+      f"{TABELAS.hash_da_gramatica}:{opcoes}\0".encode("utf-8")
+    )
+    resumo.update(codigo_fonte.encode("utf-8", "surrogatepass"))
+    return resumo.hexdigest()
+
+  def arquivo(self, chave):
+    return os.path.join(self.diretorio, chave + EXTENSAO)
+
+  # Retorna (tokens, resultado) ou None. Com com_arvore=True, uma entrada
+  # de análise bem-sucedida gravada sem a AST conta como falta.
+  def carregar(self, codigo_fonte, opcoes="", com_arvore=True):
+    arquivo = self.arquivo(self.chave(codigo_fonte, opcoes))
+    try:
+      with open(arquivo, "rb") as f:
+        dados = f.read()
+    except OSError:
+      self.faltas += 1
+      return None
+    try:
+      tokens, resultado = _ler_entrada(marshal.loads(zlib.decompress(dados)), codigo_fonte)
+    except Exception:
+      # Entrada corrompida ou de outro formato: descarta
+      self._remover(arquivo)
+      self.faltas += 1
+      return None
+    if com_arvore and resultado["sucesso"] and resultado["arvore"] is None:
+      self.faltas += 1
+      return None
+    try:
+      os.utime(arquivo) # Marca como usada agora (ordem do LRU)
+    except OSError:
+      pass
+    self.acertos += 1
+    return tokens, resultado
+
+  # Grava o TokenStream e o resultado do Parser. Deve ser chamado antes da
+  # análise semântica/otimização, que alteram a AST.
+  def salvar(self, codigo_fonte, tokens, resultado, opcoes=""):
+    arquivo = self.arquivo(self.chave(codigo_fonte, opcoes))
+    try:
+      dados = zlib.compress(marshal.dumps(_entrada(tokens, resultado)), NIVEL_DE_COMPRESSAO)
+    except (ValueError, OverflowError, RecursionError):
+      return False # Não serializável (não deve acontecer com a AST plana)
+    try:
+      os.makedirs(self.diretorio, exist_ok=True)
+      temporario = f"{arquivo}.{os.getpid()}.tmp"
+      with open(temporario, "wb") as f:
+        f.write(dados)
+      os.replace(temporario, arquivo) # Escrita atômica
+    except OSError:
+      return False # Sem permissão de escrita: segue sem cache
+    self.gravacoes += 1
+    self._contabilizar(len(dados))
+    return True
+
+  def estatisticas(self):
+    return {
+      "acertos": self.acertos, "faltas": self.faltas, "gravacoes": self.gravacoes,
+      "removidas": self.removidas, "varreduras": self.varreduras,
+    }
+
+  # Soma a entrada gravada ao total estimado. O diretório só é varrido na
+  # primeira gravação, quando a estimativa passa do limite ou a cada
+  # GRAVACOES_POR_VARREDURA gravações, e não a cada uma (lote frio: O(n²)).
+  def _contabilizar(self, tamanho):
+    self._gravacoes_sem_varredura += 1
+    if self._total_estimado is not None:
+      self._total_estimado += tamanho # Sobrescrever uma entrada superestima: só antecipa a varredura
+      if self._total_estimado <= self.limite_bytes and self._gravacoes_sem_varredura < GRAVACOES_POR_VARREDURA:
+        return
+    self._limitar()
+
+  # Remove as entradas usadas há mais tempo até caber no limite (com folga)
+  def _limitar(self):
+    self.varreduras += 1
+    self._gravacoes_sem_varredura = 0
+    entradas = []
+    total = 0
+    try:
+      with os.scandir(self.diretorio) as itens:
+        for item in itens:
+          if not item.name.endswith(EXTENSAO):
+            continue
+          try:
+            informacoes = item.stat()
+          except OSError:
+            continue # Removida por outro processo
+          entradas.append((informacoes.st_mtime, informacoes.st_size, item.path))
+          total += informacoes.st_size
+    except OSError:
+      self._total_estimado = None
+      return
+    if total > self.limite_bytes:
+      alvo = self.limite_bytes * FRACAO_APOS_REMOCAO
+      entradas.sort()
+      for _, tamanho, caminho in entradas:
+        if total <= alvo:
+          break
+        if self._remover(caminho):
+          self.removidas += 1
+        total -= tamanho
+    self._total_estimado = total
+
+  def _remover(self, caminho):
+    try:
+      os.remove(caminho)
+      return True
+    except OSError:
+      return False
+
+# --- Formato das entradas ---
+
+# Menor typecode sem sinal que comporta 'maior'
+def _tipo_que_comporta(maior):
+  for tipo in "BHIQ":
+    if maior < 1 << (8 * array(tipo).itemsize):
+      return tipo
+  raise OverflowError(maior)
+
+# Cada token vira (espaço desde o fim do anterior, comprimento): valores
+# pequenos, ao contrário dos deslocamentos, que crescem com o arquivo
+def _entrada(tokens, resultado):
+  inicios, fins = tokens.inicios, tokens.fins
+  espacos = [inicio - fim for inicio, fim in zip(inicios, (0, *fins))]
+  comprimentos = [fim - inicio for inicio, fim in zip(inicios, fins)]
+  tipo_espaco = _tipo_que_comporta(max(espacos, default=0))
+  tipo_comprimento = _tipo_que_comporta(max(comprimentos, default=0))
+  diagnosticos = [(d.codigo, d.inicio, d.fim, d.indice_token) for d in tokens.diagnosticos]
+  arvore = resultado.get("arvore")
+  return (
+    VERSAO_DO_CACHE,
+    tokens.tipos.tobytes(),
+    tipo_espaco, array(tipo_espaco, espacos).tobytes(),
+    tipo_comprimento, array(tipo_comprimento, comprimentos).tobytes(),
+    diagnosticos,
+    resultado["sucesso"], [compactar(erro) for erro in resultado["erros"]],
+    serializar_arvore(arvore) if arvore is not None else None,
+  )
+
+def _ler_entrada(entrada, codigo_fonte):
+  (versao, tipos, tipo_espaco, espacos, tipo_comprimento, comprimentos,
+   diagnosticos, sucesso, erros, arvore) = entrada
+  if versao != VERSAO_DO_CACHE:
+    raise ValueError("versão do cache")
+  espacos = array(tipo_espaco, espacos)
+  comprimentos = array(tipo_comprimento, comprimentos)
+  if not (len(tipos) == len(espacos) == len(comprimentos)):
+    raise ValueError("vetores de tamanhos diferentes")
+  tokens = TokenStream(codigo_fonte)
+  tokens.tipos = array("B", tipos)
+  # Intercalados (espaço, comprimento, espaço, ...), a soma acumulada dá
+  # (início, fim, início, ...)
+  intercalados = [0] * (2 * len(espacos))
+  intercalados[0::2] = espacos
+  intercalados[1::2] = comprimentos
+  deslocamentos = list(accumulate(intercalados))
+  tokens.inicios = array(tokens.inicios.typecode, deslocamentos[0::2])
+  tokens.fins = array(tokens.fins.typecode, deslocamentos[1::2])
+  tokens.diagnosticos = [
+    DiagnosticoLexico(codigo, inicio, fim, tokens.indice_linhas, indice_token)
+    for codigo, inicio, fim, indice_token in diagnosticos
+  ]
+  resultado = {
+    "sucesso": sucesso,
+    "erros": [reconstruir(erro, tokens.indice_linhas) for erro in erros],
+    "arvore": desserializar_arvore(arvore) if arvore is not None else None,
+  }
+  return tokens, resultado
+
+# Serializa a AST em pós-ordem: 'marcas' tem um byte por valor e 'valores'
+# os dados de cada um. Os filhos vêm antes do nó, então a leitura só
+# precisa de uma pilha. Var e Literal (a maioria dos nós) têm marcas
+# próprias. Iterativo, para suportar aninhamento profundo. 'deslocamento'
+# é somado ao inicio de cada nó (AST de um pedaço do arquivo).
+def serializar_arvore(programa, deslocamento=0):
+  marcas = bytearray()
+  valores = []
+  pendentes = [programa]
+  while pendentes:
+    valor = pendentes.pop()
+    tipo = type(valor)
+    if tipo is Var:
+      marcas.append(_VAR)
+      valores += (valor.nome, valor.inicio + deslocamento)
+    elif tipo is Literal:
+      marcas.append(_LITERAL)
+      valores += (ORDINAL_DO_TIPO[valor.tipo], valor.texto, valor.inicio + deslocamento)
+    elif tipo is tuple: # Fechamento de um nó ou lista cujos filhos já foram gravados
+      marcas.append(valor[0])
+      valores += valor[1:]
+    elif isinstance(valor, No):
+      pendentes.append((_NO, _INDICE_DO_NO[tipo], valor.inicio + deslocamento))
+      pendentes.extend(getattr(valor, campo) for campo in reversed(valor.campos))
+    elif tipo is list:
+      pendentes.append((_LISTA, len(valor)))
+      pendentes.extend(reversed(valor))
+    elif valor is None:
+      marcas.append(_NADA)
+    elif tipo is str:
+      marcas.append(_TEXTO)
+      valores.append(valor)
+    else:
+      marcas.append(_TIPO)
+      valores.append(ORDINAL_DO_TIPO[valor])
+  return bytes(marcas), valores
+
+# Reconstrói a AST: cada nó/lista desempilha os seus campos/elementos
+def desserializar_arvore(serializada):
+  marcas, valores = serializada
+  pilha = []
+  empilhar = pilha.append
+  j = 0
+  for marca in marcas:
+    if marca == _VAR:
+      empilhar(Var(valores[j], valores[j + 1]))
+      j += 2
+    elif marca == _LITERAL:
+      empilhar(Literal(TIPOS_POR_ORDINAL[valores[j]], valores[j + 1], valores[j + 2]))
+      j += 3
+    elif marca == _NO:
+      classe = NOS[valores[j]]
+      quantidade = _QUANTIDADE_DE_CAMPOS[classe]
+      argumentos = pilha[-quantidade:]
+      del pilha[-quantidade:]
+      empilhar(classe(*argumentos, valores[j + 1]))
+      j += 2
+    elif marca == _LISTA:
+      quantidade = valores[j]
+      j += 1
+      if quantidade:
+        lista = pilha[-quantidade:]
+        del pilha[-quantidade:]
+        empilhar(lista)
+      else:
+        empilhar([])
+    elif marca == _NADA:
+      empilhar(None)
+    elif marca == _TEXTO:
+      empilhar(valores[j])
+      j += 1
+    elif marca == _TIPO:
+      empilhar(TIPOS_POR_ORDINAL[valores[j]])
+      j += 1
+    else:
+      raise ValueError(f"marca inválida {marca}")
+  if len(pilha) != 1 or not isinstance(pilha[0], No):
+    raise ValueError("AST incompleta")
+  return pilha[0]
@@ -0,0 +1,247 @@
+# src/diagnostico.py
+
+import json
+from .token import Token
+from .token_type import TIPOS_POR_ORDINAL, ORDINAL_DO_TIPO
+"""
+Diagnostico.py
+
+Representação estruturada dos erros encontrados pelo compilador.
+Cada diagnóstico guarda apenas o código do erro e a posição do trecho
+envolvido no código-fonte; o texto da mensagem (no mesmo formato impresso
+pelos Analisadores Léxico e Sintático) só é montado quando for exibido.
+Numa análise com recuperação, com muitos erros, nenhuma mensagem é
+formatada até que alguém a imprima.
+
+Os diagnósticos também podem ser gravados em JSON ou em SARIF 2.1.0 (o
+formato de resultados de análise estática lido por ferramentas de CI),
+sem que essas ferramentas precisem interpretar o texto do stderr.
+"""
+
+# Códigos de erro léxico (Requisito 9 - Ckp 1)
+NUMERO_INVALIDO = "numero_invalido"
+IDENTIFICADOR_INVALIDO = "identificador_invalido"
+CADEIA_NAO_FINALIZADA = "cadeia_nao_finalizada"
+SIMBOLO_NAO_RECONHECIDO = "simbolo_nao_reconhecido"
+
+class DiagnosticoLexico:
+  __slots__ = ("codigo", "inicio", "fim", "indice_linhas", "indice_token")
+
+  def __init__(self, codigo, inicio, fim, indice_linhas, indice_token=None):
+    self.codigo = codigo # Um dos códigos de erro acima
+    self.inicio = inicio # Deslocamento do início do lexema inválido
+    self.fim = fim # Deslocamento logo após o lexema inválido
+    self.indice_linhas = indice_linhas # IndiceDeLinhas do código-fonte
+    # Quantos tokens válidos foram emitidos antes do erro (usado pelo TokenStream)
+    self.indice_token = indice_token
+
+  @property
+  def texto(self):
+    return self.indice_linhas.codigo_fonte[self.inicio:self.fim]
+
+  @property
+  def linha(self):
+    return self.indice_linhas.linha_coluna(self.inicio)[0]
+
+  @property
+  def coluna(self):
+    return self.indice_linhas.linha_coluna(self.inicio)[1]
+
+  # Monta a mensagem de erro (Requisito 9 - Ckp 1)
+  @property
+  def mensagem(self):
+    linha, coluna = self.indice_linhas.linha_coluna(self.inicio)
+    posicao = f"na Linha: {linha}, Coluna: {coluna}"
+    if self.codigo == NUMERO_INVALIDO:
+      return f"ERRO LÉXICO: Número inválido '{self.texto}' {posicao}"
+    if self.codigo == IDENTIFICADOR_INVALIDO:
+      return f"ERRO LÉXICO: Identificador inválido '{self.texto}' {posicao}"
+    if self.codigo == CADEIA_NAO_FINALIZADA:
+      return f"ERRO LÉXICO: Cadeia não finalizada {posicao}"
+    return f"ERRO LÉXICO: Símbolo não reconhecido '{self.texto}' {posicao}"
+
+  def __str__(self):
+    return self.mensagem
+
+  def __repr__(self):
+    return f"DiagnosticoLexico({self.codigo!r}, inicio={self.inicio}, fim={self.fim})"
+
+  def como_dicionario(self):
+    linha, coluna = self.indice_linhas.linha_coluna(self.inicio)
+    return {
+      "fase": "lexica", "codigo": self.codigo, "mensagem": self.mensagem,
+      "linha": linha, "coluna": coluna, "inicio": self.inicio, "fim": self.fim, "texto": self.texto,
+    }
+
+# Códigos de erro sintático (Requisito 3 - Ckp 2)
+SEM_TOKEN = "sem_token"
+TOKEN_INESPERADO = "token_inesperado" # _expect: tipo diferente do esperado
+TEXTO_INESPERADO = "texto_inesperado" # _expect: texto diferente do esperado
+TIPO_INVALIDO = "tipo_invalido"
+FATOR_INVALIDO = "fator_invalido"
+OPERADOR_BOOLEANO_INVALIDO = "operador_booleano_invalido"
+INICIO_DE_COMANDO_INVALIDO = "inicio_de_comando_invalido"
+VALOR_DE_SAIDA_INVALIDO = "valor_de_saida_invalido"
+ERRO_LEXICO = "erro_lexico" # Com recuperação, sem o diagnóstico léxico
+ANALISE_ABORTADA = "analise_abortada" # Sem recuperação, no primeiro erro léxico
+
+# Início das mensagens de erro sintático de cada código (o restante é o
+# token encontrado, ou o tipo/texto esperado)
+_MENSAGENS = {
+  TIPO_INVALIDO: "Tipo inválido. Esperado 'INTEIRO' ou 'REAL', encontrado ",
+  FATOR_INVALIDO: "Fator inválido. Esperado NUMINT, NUMREAL, VARIAVEL, IDENTIFICADOR ou '(', encontrado ",
+  OPERADOR_BOOLEANO_INVALIDO: "Operador booleano inválido: ",
+  INICIO_DE_COMANDO_INVALIDO: "Início de comando inválido: ",
+  VALOR_DE_SAIDA_INVALIDO: "Esperado VARIAVEL, IDENTIFICADOR ou CADEIA, encontrado ",
+}
+
+# Formata um token para exibição em mensagens de erro
+def _formatar_token(tok):
+  pos = "em posição desconhecida"
+  if tok and tok.linha is not None and tok.coluna is not None:
+    pos = f"na linha {tok.linha}, coluna {tok.coluna}"
+
+  # tok.tipo é um Enum, acessa-se o nome com .name
+  tipo_nome = tok.tipo.name if tok.tipo else "DESCONHECIDO"
+  return f"'{tok.texto}' ({tipo_nome}) {pos}"
+
+class DiagnosticoSintatico:
+  __slots__ = ("codigo", "esperados", "texto_esperado", "token")
+
+  def __init__(self, codigo, esperados=frozenset(), texto_esperado=None, token=None):
+    self.codigo = codigo # Um dos códigos de erro sintático acima
+    # Tipos de token aceitos no ponto do erro (conjunto compartilhado,
+    # montado uma vez no Parser) e o texto exigido, se houver (ex.: ')')
+    self.esperados = esperados
+    self.texto_esperado = texto_esperado
+    # Token encontrado (cópia estável, com o deslocamento; a linha e a
+    # coluna são resolvidas só na formatação). None quando não há token.
+    self.token = token
+
+  @property
+  def offset(self):
+    return self.token.offset if self.token is not None else None
+
+  # Monta a mensagem de erro (Requisito 3 - Ckp 2)
+  @property
+  def mensagem(self):
+    codigo = self.codigo
+    if codigo == ANALISE_ABORTADA:
+      return "Erro léxico encontrado. Abortando análise sintática."
+    if codigo == ERRO_LEXICO:
+      return "Erro léxico encontrado."
+    if codigo == SEM_TOKEN:
+      return f"ERRO SINTÁTICO: Esperado token do tipo {self._nome_esperado()}, mas não há token atual."
+    encontrado = _formatar_token(self.token)
+    if codigo == TOKEN_INESPERADO:
+      return f"ERRO SINTÁTICO: Esperado token do tipo {self._nome_esperado()}, encontrado {encontrado}."
+    if codigo == TEXTO_INESPERADO:
+      return f"ERRO SINTÁTICO: Esperado token '{self.texto_esperado}', encontrado {encontrado}."
+    return f"ERRO SINTÁTICO: {_MENSAGENS[codigo]}{encontrado}."
+
+  def _nome_esperado(self):
+    return " ou ".join(sorted(tipo.name for tipo in self.esperados))
+
+  def como_dicionario(self):
+    token = self.token
+    dados = {
+      "fase": "sintatica", "codigo": self.codigo, "mensagem": self.mensagem,
+      "esperados": sorted(tipo.name for tipo in self.esperados),
+    }
+    if self.texto_esperado is not None:
+      dados["texto_esperado"] = self.texto_esperado
+    if token is not None:
+      dados.update(
+        linha=token.linha, coluna=token.coluna, inicio=token.offset,
+        encontrado={"tipo": token.tipo.name if token.tipo else None, "texto": token.texto},
+      )
+    return dados
+
+  def __str__(self):
+    return self.mensagem
+
+  def __repr__(self):
+    return f"DiagnosticoSintatico({self.codigo!r}, offset={self.offset})"
+
+# --- Forma compacta (tuplas de tipos simples, para o marshal e o pickle) ---
+
+# Diagnóstico -> tupla. 'deslocamento' é somado às posições (diagnóstico de
+# um pedaço do arquivo, na análise em paralelo). Outros valores (mensagens
+# já montadas, como as da análise semântica) passam como estão.
+def compactar(diagnostico, deslocamento=0):
+  if isinstance(diagnostico, DiagnosticoLexico):
+    return (
+      "L", diagnostico.codigo, diagnostico.inicio + deslocamento, diagnostico.fim + deslocamento,
+      diagnostico.indice_token,
+    )
+  if isinstance(diagnostico, DiagnosticoSintatico):
+    token = diagnostico.token
+    return (
+      "S", diagnostico.codigo, tuple(ORDINAL_DO_TIPO[tipo] for tipo in diagnostico.esperados),
+      diagnostico.texto_esperado,
+      None if token is None else (ORDINAL_DO_TIPO[token.tipo], token.texto, token.offset + deslocamento),
+    )
+  return diagnostico
+
+# Tupla -> diagnóstico, com as posições resolvidas no IndiceDeLinhas do arquivo
+def reconstruir(compacto, indice_linhas):
+  if not isinstance(compacto, tuple):
+    return compacto
+  if compacto[0] == "L":
+    _, codigo, inicio, fim, indice_token = compacto
+    return DiagnosticoLexico(codigo, inicio, fim, indice_linhas, indice_token)
+  _, codigo, esperados, texto_esperado, token = compacto
+  if token is not None:
+    ordinal, texto, offset = token
+    token = Token(TIPOS_POR_ORDINAL[ordinal], texto, offset=offset, indice=indice_linhas)
+  return DiagnosticoSintatico(
+    codigo, frozenset(TIPOS_POR_ORDINAL[ordinal] for ordinal in esperados), texto_esperado, token,
+  )
+
+# --- Saída para ferramentas (JSON e SARIF) ---
+
+# Um diagnóstico (ou uma mensagem já montada, como as da análise semântica) como dicionário
+def _como_dicionario(diagnostico):
+  if isinstance(diagnostico, str):
+    return {"fase": "semantica", "mensagem": diagnostico}
+  return diagnostico.como_dicionario()
+
+def gravar_json(caminho, arquivo, diagnosticos):
+  with open(caminho, "w", encoding="utf-8") as f:
+    json.dump(
+      {"arquivo": arquivo, "diagnosticos": [_como_dicionario(d) for d in diagnosticos]},
+      f, indent=2, ensure_ascii=False,
+    )
+    f.write("\n")
+
+# SARIF 2.1.0: um 'run' com uma regra por código de erro e um resultado por
+# diagnóstico, com a região (linha e coluna a partir de 1) quando conhecida
+def gravar_sarif(caminho, arquivo, diagnosticos):
+  arquivo = arquivo.replace("\\", "/") # URI relativa, também no Windows
+  regras = {}
+  resultados = []
+  for diagnostico in diagnosticos:
+    dados = _como_dicionario(diagnostico)
+    codigo = dados.get("codigo") or dados["fase"]
+    regras.setdefault(codigo, {"id": codigo, "properties": {"fase": dados["fase"]}})
+    resultado = {"ruleId": codigo, "level": "error", "message": {"text": dados["mensagem"]}}
+    if dados.get("linha") is not None:
+      resultado["locations"] = [{
+        "physicalLocation": {
+          "artifactLocation": {"uri": arquivo},
+          "region": {"startLine": dados["linha"], "startColumn": dados["coluna"]},
+        },
+      }]
+    resultados.append(resultado)
+  sarif = {
+    "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+    "version": "2.1.0",
+    "runs": [{
+      "tool": {"driver": {"name": "compiladorPython", "rules": list(regras.values())}},
+      "artifacts": [{"location": {"uri": arquivo}}],
+      "results": resultados,
+    }],
+  }
+  with open(caminho, "w", encoding="utf-8") as f:
+    json.dump(sarif, f, indent=2, ensure_ascii=False)
+    f.write("\n")
@@ -0,0 +1,217 @@
+# src/estatisticas.py
+
+import json
+import os
+import time
+from collections import Counter
+from .token_type import TiposDeToken
+from .token_stream import TIPOS_POR_ORDINAL
+from .gramatica import carregar_tabelas, nome_do_metodo
+"""
+Estatísticas de Desempenho (--stats)
+
+Instrumentação opcional das fases do main.py e do Parser, para saber onde
+vai o tempo de uma análise lenta:
+
+  - tempo de cada fase (leitura do arquivo, análise léxica, sintática,
+    semântica, listagem dos tokens, ...), com time.perf_counter_ns;
+  - tokens por TiposDeToken, contados no TokenStream depois da análise
+    léxica (ou, no --fluxo, à medida que o Parser os lê);
+  - chamadas de cada regra da gramática no Parser (_comando,
+    _expressao_aritmetica, ...), das consultas ao token atual
+    (_is_current, _is_inicio_comando, _is_inicio_declaracao) e de
+    _optional, com as falhas de _optional por token esperado;
+  - contadores do cache das análises (acertos, faltas, gravações,
+    entradas removidas e varreduras do diretório).
+
+Os contadores do Parser são funções ligadas à instância na construção
+(Parser(..., estatisticas=...)), que encobrem os métodos da classe. Sem
+estatísticas (SEM_ESTATISTICAS, o padrão), os ganchos são vazios e nada é
+ligado: o Parser roda os próprios métodos da classe, sem nenhum teste a
+mais por token ou por regra. No ParserIterativo, as regras de comando são
+ações da pilha de análise, e só os métodos (_comando, _lista_comandos e
+as expressões) são contados.
+
+O relatório sai como tabela, como JSON ou como arquivo de trace-event do
+Chrome (chrome://tracing ou ui.perfetto.dev), com uma faixa por fase e os
+contadores em "otherData".
+"""
+
+# Consultas ao token atual (lookahead) contadas no Parser
+CONSULTAS = ("_is_current", "_is_inicio_comando", "_is_inicio_declaracao")
+
+# Sem estatísticas: todos os ganchos são vazios
+class EstatisticasDesligadas:
+  __slots__ = ()
+
+  def fase(self, nome):
+    pass
+
+  def contar_tokens(self, tokens):
+    pass
+
+  def instrumentar_parser(self, parser):
+    pass
+
+  def instrumentar_scanner(self, scanner):
+    pass
+
+  def contar_cache(self, cache):
+    pass
+
+SEM_ESTATISTICAS = EstatisticasDesligadas()
+
+# Envolve um método num contador de chamadas
+def _contado(metodo, contagens, chave):
+  def contado(*argumentos):
+    contagens[chave] += 1
+    return metodo(*argumentos)
+  return contado
+
+# Envolve _optional, contando as chamadas e as falhas por token esperado
+def _opcional_contado(opcional, consultas, falhas):
+  def contado(tipo, texto=None):
+    consultas["_optional"] += 1
+    if opcional(tipo, texto):
+      return True
+    falhas[(tipo, texto)] += 1
+    return False
+  return contado
+
+class Estatisticas:
+  def __init__(self):
+    self.origem = time.perf_counter_ns()
+    self.fases = [] # (nome, início, fim), em ns desde a origem
+    self.regras = Counter() # método da regra -> chamadas
+    self.consultas = Counter() # método de consulta -> chamadas
+    self.falhas_de_opcional = Counter() # (tipo, texto) esperado -> falhas de _optional
+    self._tokens = Counter() # TiposDeToken -> quantidade (tokens lidos no --fluxo)
+    self._streams = [] # TokenStreams contados só no relatório
+    self._caches = [] # CacheDeCompilacao lidos só no relatório
+    self._fase = None # (nome, início) da fase em andamento
+
+  # Encerra a fase em andamento e começa a fase 'nome' (None: só encerra)
+  def fase(self, nome):
+    agora = time.perf_counter_ns() - self.origem
+    if self._fase is not None:
+      self.fases.append((self._fase[0], self._fase[1], agora))
+    self._fase = None if nome is None else (nome, agora)
+
+  # Os tipos do TokenStream são contados só no relatório, fora das fases
+  def contar_tokens(self, tokens):
+    self._streams.append(tokens)
+
+  # Os contadores do cache também são lidos só no relatório (as gravações
+  # acontecem depois das fases de análise)
+  def contar_cache(self, cache):
+    self._caches.append(cache)
+
+  def instrumentar_parser(self, parser):
+    for regra in carregar_tabelas().regras:
+      nome = nome_do_metodo(regra)
+      metodo = getattr(parser, nome, None)
+      if metodo is not None:
+        setattr(parser, nome, _contado(metodo, self.regras, nome))
+    for nome in CONSULTAS:
+      setattr(parser, nome, _contado(getattr(parser, nome), self.consultas, nome))
+    parser._optional = _opcional_contado(parser._optional, self.consultas, self.falhas_de_opcional)
+
+  # Conta os tokens de um analisador lido sob demanda (AnalisadorLexicoEmFluxo)
+  def instrumentar_scanner(self, scanner):
+    proximo_token = scanner.proximo_token
+    tokens = self._tokens
+
+    # O Parser consome o FIM_DE_ARQUIVO e lê de novo; conta-se um só, como no TokenStream
+    def contado():
+      token = proximo_token()
+      if token is not None and (token.tipo is not TiposDeToken.FIM_DE_ARQUIVO or not tokens[token.tipo]):
+        tokens[token.tipo] += 1
+      return token
+    scanner.proximo_token = contado
+
+  def tokens(self):
+    contagem = Counter(self._tokens)
+    for stream in self._streams:
+      for ordinal, quantidade in Counter(stream.tipos).items():
+        contagem[TIPOS_POR_ORDINAL[ordinal]] += quantidade
+    return contagem
+
+  def cache(self):
+    contagem = Counter()
+    for cache in self._caches:
+      contagem.update(cache.estatisticas())
+    return contagem
+
+  # --- Relatórios ---
+
+  # Tempo total de cada fase, na ordem em que aparecem (uma fase como
+  # "saída" pode ocorrer várias vezes)
+  def por_fase(self):
+    total = {}
+    for nome, inicio, fim in self.fases:
+      total[nome] = total.get(nome, 0) + (fim - inicio) / 1e6
+    return total
+
+  def como_dicionario(self):
+    return {
+      "fases": [{"nome": nome, "inicio_ms": inicio / 1e6, "ms": (fim - inicio) / 1e6} for nome, inicio, fim in self.fases],
+      "por_fase_ms": self.por_fase(),
+      "total_ms": sum(fim - inicio for _, inicio, fim in self.fases) / 1e6,
+      "tokens": {tipo.name: quantidade for tipo, quantidade in self.tokens().most_common()},
+      "regras": dict(self.regras.most_common()),
+      "consultas": dict(self.consultas.most_common()),
+      "falhas_de_optional": {_nome_esperado(chave): quantidade for chave, quantidade in self.falhas_de_opcional.most_common()},
+      "cache": dict(self.cache()),
+    }
+
+  def tabela(self):
+    dados = self.como_dicionario()
+    total = dados["total_ms"] or 1
+    linhas = ["--- Estatísticas ---", f"{'Fase':40s} {'ms':>10s} {'%':>6s}"]
+    for nome, ms in dados["por_fase_ms"].items():
+      linhas.append(f"{nome:40s} {ms:10.2f} {ms / total:6.1%}")
+    linhas.append(f"{'total':40s} {dados['total_ms']:10.2f}")
+    for titulo, chave in (
+      ("Tokens por tipo", "tokens"),
+      ("Chamadas das regras do Parser", "regras"),
+      ("Consultas ao token atual", "consultas"),
+      ("Falhas de _optional por token esperado", "falhas_de_optional"),
+    ):
+      contagem = dados[chave]
+      if not contagem:
+        continue
+      soma = sum(contagem.values())
+      linhas.append("")
+      linhas.append(f"{titulo} ({soma:,}):")
+      for nome, quantidade in contagem.items():
+        linhas.append(f"  {nome:38s} {quantidade:12,} {quantidade / soma:6.1%}")
+    # Contadores de naturezas diferentes: sem percentuais
+    if dados["cache"]:
+      linhas.append("")
+      linhas.append("Cache das análises:")
+      for nome, quantidade in dados["cache"].items():
+        linhas.append(f"  {nome:38s} {quantidade:12,}")
+    return "\n".join(linhas)
+
+  def gravar_json(self, caminho):
+    with open(caminho, "w", encoding="utf-8") as f:
+      json.dump(self.como_dicionario(), f, indent=2, ensure_ascii=False)
+      f.write("\n")
+
+  # Arquivo no formato trace-event do Chrome: uma faixa ('X') por fase, em µs
+  def gravar_trace(self, caminho):
+    pid = os.getpid()
+    eventos = [
+      {"name": nome, "cat": "fase", "ph": "X", "ts": inicio / 1e3, "dur": (fim - inicio) / 1e3, "pid": pid, "tid": 1}
+      for nome, inicio, fim in self.fases
+    ]
+    eventos.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 1, "args": {"name": "main.py"}})
+    dados = self.como_dicionario()
+    del dados["fases"], dados["por_fase_ms"]
+    with open(caminho, "w", encoding="utf-8") as f:
+      json.dump({"traceEvents": eventos, "displayTimeUnit": "ms", "otherData": dados}, f, ensure_ascii=False)
+
+# Nome legível do token esperado por _optional: "LEFT_PAR '('"
+def _nome_esperado(chave):
+  tipo, texto = chave
+  return tipo.name if texto is None else f"{tipo.name} '{texto}'"
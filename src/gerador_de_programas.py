@@ -0,0 +1,406 @@
+# src/gerador_de_programas.py
+
+import argparse
+import random
+import sys
+from .token_type import TiposDeToken
+from .scanner import PALAVRAS_RESERVADAS
+from .gramatica import GRAMATICA_PADRAO, SIMBOLOS_TERMINAIS, ler_gramatica, chaves_do_terminal, carregar_tabelas
+"""
+Gerador de Programas Sintéticos
+
+Gera programas .mc aleatórios, reproduzíveis pela semente, derivando as
+regras do gramatica.txt (lidas com ler_gramatica, sem as transformações
+LL(1)): cada não-terminal escolhe uma das suas alternativas e cada
+terminal vira um lexema do seu tipo de token. Os parâmetros controlam a
+derivação nas regras que eles afetam:
+
+  - declaracoes: quantidade de declarações (listaDeclaracoes);
+  - comandos ou tamanho: quantidade de comandos do nível de cima
+    (listaComandos), ou tantos quantos forem precisos para chegar ao
+    tamanho em bytes;
+  - profundidade: aninhamento máximo de SE/ENQUANTO/INICIO (alternativas
+    de 'comando' que derivam outro 'comando');
+  - operadores: máximo de operadores por expressão (recursão à esquerda
+    e parênteses de fatorAritmetico e termoRelacional);
+  - comentarios e cadeias: fração dos comandos precedidos por um
+    comentário (# ou /* */) e dos comandos que são IMPRIMIR("...");
+  - erros: quantidade de erros injetados em comandos do nível de cima,
+    léxicos (um lexema inválido) ou sintáticos (um '=', ENTAO ou ')'
+    removido).
+
+Sem erros injetados, os programas são aceitos pelos Parsers: nos
+conflitos FIRST/FIRST da tabela LL(1), as alternativas que perdem o
+conflito nunca começam pelo token disputado (ex.: em termoRelacional, a
+comparação não começa com '('). Também passam na análise semântica: só
+usam variáveis declaradas e não atribuem valores REAL a variáveis INTEIRO.
+Listas e recursões à esquerda são geradas com laços, então nem programas
+de milhões de comandos nem expressões longas esgotam a recursão.
+Uso: python -m src.gerador_de_programas [--semente N] [--comandos N | --tamanho 10MB] [-o arquivo.mc]
+"""
+
+# Regras com papel especial na geração
+REGRA_INICIAL = "programa"
+REGRA_DE_DECLARACAO = "declaracao"
+REGRA_DE_COMANDO = "comando"
+REGRA_DE_ATRIBUICAO = "comandoAtribuicao"
+# Regras que começam uma linha nova (e as listas delas)
+REGRAS_DE_LINHA = (REGRA_DE_DECLARACAO, REGRA_DE_COMANDO)
+
+OPERADORES_RELACIONAIS = ("<", ">", "<=", ">=", "==", "!=")
+PALAVRAS = ("valor", "total", "media", "contador", "resultado", "soma", "limite", "passo", "indice", "auxiliar")
+# Lexemas inválidos dos erros léxicos injetados
+LEXEMAS_INVALIDOS = ("@", "$", "12abc", "3.")
+# Tokens cuja remoção sempre deixa o programa com erro sintático
+TOKENS_OBRIGATORIOS = ("=", "ENTAO", ")")
+
+# Espaçamento entre lexemas: 'IMPRIMIR(x)', 'n:INTEIRO', 'a + (b * 2)'
+SEM_ESPACO_ANTES = frozenset((")", ":"))
+SEM_ESPACO_DEPOIS = frozenset(("(", ":", "IMPRIMIR"))
+
+# Texto fixo de cada tipo de token (palavras reservadas e símbolos)
+_LEXEMA_DO_TIPO = {tipo: texto for texto, tipo in PALAVRAS_RESERVADAS.items()}
+_LEXEMA_DO_TIPO.update({tipo: texto for texto, tipo in SIMBOLOS_TERMINAIS.items()})
+_TIPOS_DE_VARIAVEL = (TiposDeToken.PALAVRA_RESERVADA_INTEIRO, TiposDeToken.PALAVRA_RESERVADA_REAL)
+
+# Tamanho em bytes a partir de um texto como '512', '1KB', '10MB' ou '1GB'
+def tamanho_em_bytes(texto):
+  texto = texto.strip().upper()
+  for sufixo, fator in (("GB", 2**30), ("MB", 2**20), ("KB", 2**10), ("B", 1)):
+    if texto.endswith(sufixo):
+      return int(float(texto[:-len(sufixo)]) * fator)
+  return int(texto)
+
+class GeradorDeProgramas:
+  def __init__(self, semente=0, declaracoes=20, profundidade=3, operadores=4,
+               comentarios=0.05, cadeias=0.1, erros=0, gramatica=GRAMATICA_PADRAO):
+    if declaracoes < 1:
+      raise ValueError("O programa precisa de pelo menos uma declaração.")
+    with open(gramatica, "r", encoding="utf-8") as f:
+      self.regras = ler_gramatica(f.read())
+    self.tabelas = carregar_tabelas(gramatica)
+    self.semente = semente
+    self.declaracoes = declaracoes
+    self.profundidade = profundidade
+    self.operadores = operadores
+    self.comentarios = comentarios
+    self.cadeias = cadeias
+    self.erros = erros
+    self._classificar_regras()
+
+  # --- Análise das regras ---
+
+  def _classificar_regras(self):
+    regras = self.regras
+    # Símbolos alcançáveis a partir de cada regra (ponto fixo)
+    alcancaveis = {regra: set() for regra in regras}
+    mudou = True
+    while mudou:
+      mudou = False
+      for regra, alternativas in regras.items():
+        antes = len(alcancaveis[regra])
+        for alternativa in alternativas:
+          for simbolo in alternativa:
+            alcancaveis[regra].add(simbolo)
+            if simbolo in regras:
+              alcancaveis[regra] |= alcancaveis[simbolo]
+        mudou = mudou or len(alcancaveis[regra]) != antes
+
+    def alcanca(alternativa, alvo):
+      return any(simbolo == alvo or (simbolo in regras and alvo in alcancaveis[simbolo]) for simbolo in alternativa)
+
+    self.listas = {} # regra -> item ('listaComandos: comando listaComandos | comando')
+    self.recursivas_a_esquerda = {} # regra -> (sufixos das alternativas recursivas, bases)
+    self.alternativas = {} # regra -> (alternativas que derivam a própria regra, demais)
+    for regra, alternativas in regras.items():
+      if len(alternativas) == 2 and any(len(a) == 1 for a in alternativas):
+        item = next(a for a in alternativas if len(a) == 1)[0]
+        if (item, regra) in alternativas:
+          self.listas[regra] = item
+          continue
+      recursivas = [a[1:] for a in alternativas if a[0] == regra]
+      if recursivas:
+        self.recursivas_a_esquerda[regra] = (recursivas, [a for a in alternativas if a[0] != regra])
+        continue
+      ciclicas = [a for a in alternativas if alcanca(a, regra)]
+      simples = [a for a in alternativas if not alcanca(a, regra)]
+      # Se todas derivam a regra (ex.: comandoCondicao), o ciclo é controlado em outra regra
+      self.alternativas[regra] = (ciclicas, simples) if simples else ([], alternativas)
+
+    aninhadas, simples = self.alternativas[REGRA_DE_COMANDO]
+    self.comandos_de_cadeia = [a for a in simples if alcanca(a, "CADEIA")]
+    self.chaves = {}
+    for alternativas in regras.values():
+      for alternativa in alternativas:
+        for simbolo in alternativa:
+          if simbolo not in regras:
+            self.chaves[simbolo] = chaves_do_terminal(simbolo)[0]
+
+    # (regra, alternativa) -> chave do token que não pode começar a alternativa
+    self.inicios_proibidos = {}
+    for conflito in self.tabelas.conflitos:
+      alternativas = self.tabelas.regras.get(conflito.regra)
+      if conflito.tipo == "FIRST/FIRST" and alternativas == self.regras.get(conflito.regra):
+        for indice in conflito.alternativas:
+          if indice != conflito.escolhida:
+            self.inicios_proibidos[(conflito.regra, alternativas[indice])] = conflito.chave
+
+  # --- Geração ---
+
+  # Gera um programa com 'comandos' comandos no nível de cima ou com pelo
+  # menos 'tamanho' bytes (padrão: 100 comandos)
+  def gerar(self, comandos=None, tamanho=None):
+    if comandos is None and tamanho is None:
+      comandos = 100
+    self.aleatorio = random.Random(self.semente)
+    self.partes = []
+    self.tamanho = 0
+    self.espaco = False
+    self.nivel = 0
+    self.orcamento = 0
+    self.variaveis = []
+    self.inteiras = []
+    self.declarando = False
+    self.alvo = False
+    self.so_inteiros = False
+    self.forcar_cadeia = False
+    self.proibido = None # Chave que o próximo terminal não pode ter
+    self.injetados = [] # Tipo de cada erro injetado ('lexico' ou 'sintatico')
+    self.limite = (comandos, tamanho)
+    self._expandir(REGRA_INICIAL)
+    self._escrever("\n")
+    return "".join(self.partes)
+
+  def _escrever(self, texto):
+    self.partes.append(texto)
+    self.tamanho += len(texto)
+
+  def _emitir(self, lexema):
+    if self.espaco and lexema not in SEM_ESPACO_ANTES:
+      self._escrever(" ")
+    self._escrever(lexema)
+    self.espaco = lexema not in SEM_ESPACO_DEPOIS
+
+  def _nova_linha(self, nivel):
+    if self.partes:
+      self._escrever("\n" + "  " * nivel)
+    self.espaco = False
+
+  def _expandir(self, regra):
+    if regra in self.listas:
+      self._lista(regra)
+      return
+    if regra in REGRAS_DE_LINHA:
+      self._nova_linha(self.nivel)
+    if regra == REGRA_DE_COMANDO:
+      self._comando()
+      return
+    if regra == REGRA_DE_DECLARACAO:
+      self.declarando = True
+    elif regra == REGRA_DE_ATRIBUICAO:
+      self.alvo = True
+
+    if regra in self.recursivas_a_esquerda:
+      # A -> A x | b gera b x x ... x, com um operador do orçamento por x
+      recursivas, bases = self.recursivas_a_esquerda[regra]
+      repeticoes = 0
+      while self.orcamento > 0 and self.aleatorio.random() < 0.5:
+        self.orcamento -= 1
+        repeticoes += 1
+      self._seguir(regra, self._escolher(bases))
+      for _ in range(repeticoes):
+        self._sequencia(self.aleatorio.choice(recursivas))
+      return
+    ciclicas, simples = self.alternativas[regra]
+    ciclicas = self._permitidas(ciclicas)
+    if ciclicas and self.orcamento > 0 and self.aleatorio.random() < 0.5:
+      self.orcamento -= 1
+      self._seguir(regra, self.aleatorio.choice(ciclicas))
+    else:
+      self._seguir(regra, self._escolher(simples))
+
+  def _seguir(self, regra, alternativa):
+    if self.inicios_proibidos:
+      self.proibido = self.inicios_proibidos.get((regra, alternativa), self.proibido)
+    self._sequencia(alternativa)
+
+  # Alternativas que não começam pelo terminal proibido
+  def _permitidas(self, alternativas):
+    if self.proibido is None:
+      return alternativas
+    return [a for a in alternativas if self.chaves.get(a[0]) != self.proibido]
+
+  # Escolhe uma alternativa, respeitando as cadeias pedidas e os tipos da atribuição
+  def _escolher(self, alternativas):
+    alternativas = self._permitidas(alternativas) or alternativas
+    if len(alternativas) > 1:
+      if self.forcar_cadeia:
+        alternativas = [a for a in alternativas if "CADEIA" in a] or alternativas
+      else:
+        alternativas = [a for a in alternativas if "CADEIA" not in a] or alternativas
+      if self.so_inteiros:
+        alternativas = [a for a in alternativas if "NUMREAL" not in a] or alternativas
+    return self.aleatorio.choice(alternativas)
+
+  def _sequencia(self, simbolos):
+    anterior = None
+    for simbolo in simbolos:
+      if simbolo in self.regras:
+        self._expandir(simbolo)
+      else:
+        # Terminal depois de uma linha (SENAO, FIM, ':' de ALGORITMO) começa outra linha
+        if anterior in REGRAS_DE_LINHA or self.listas.get(anterior) in REGRAS_DE_LINHA:
+          self._nova_linha(max(self.nivel - 1, 0))
+        self._terminal(simbolo)
+      anterior = simbolo
+
+  def _lista(self, regra):
+    item = self.listas[regra]
+    if item != REGRA_DE_COMANDO:
+      for _ in range(self.declaracoes):
+        self._expandir(item)
+    elif self.nivel > 0:
+      for _ in range(self.aleatorio.randint(1, 3)):
+        self._expandir(item)
+    else:
+      self._comandos_do_nivel_de_cima(item)
+
+  def _comandos_do_nivel_de_cima(self, item):
+    comandos, tamanho = self.limite
+    aleatorio = self.aleatorio
+    if comandos is not None:
+      alvos = sorted(aleatorio.sample(range(comandos), min(self.erros, comandos)))
+    else:
+      alvos = sorted(aleatorio.randrange(max(tamanho, 1)) for _ in range(self.erros))
+    indice = proximo_erro = 0
+    while True:
+      posicao = indice if comandos is not None else self.tamanho
+      terminou = indice >= comandos if comandos is not None else indice > 0 and self.tamanho >= tamanho
+      if terminou and (comandos is not None or proximo_erro == len(alvos)):
+        return
+      inicio = len(self.partes)
+      self._expandir(item)
+      if proximo_erro < len(alvos) and (alvos[proximo_erro] <= posicao or terminou):
+        proximo_erro += 1
+        self._injetar_erro(inicio)
+      indice += 1
+
+  def _comando(self):
+    aleatorio = self.aleatorio
+    if self.comentarios and aleatorio.random() < self.comentarios:
+      self._comentario()
+      self._nova_linha(self.nivel)
+    self.orcamento = aleatorio.randint(0, self.operadores)
+    self.so_inteiros = False
+    aninhadas, simples = self.alternativas[REGRA_DE_COMANDO]
+    if self.cadeias and aleatorio.random() < self.cadeias:
+      self.forcar_cadeia = True
+      alternativa = aleatorio.choice(self.comandos_de_cadeia)
+    elif self.nivel < self.profundidade:
+      alternativa = aleatorio.choice(aninhadas + simples)
+    else:
+      alternativa = aleatorio.choice(simples)
+    if alternativa in aninhadas:
+      self.nivel += 1
+      self._sequencia(alternativa)
+      self.nivel -= 1
+    else:
+      self._sequencia(alternativa)
+
+  def _comentario(self):
+    aleatorio = self.aleatorio
+    palavras = " ".join(aleatorio.choice(PALAVRAS) for _ in range(aleatorio.randint(2, 6)))
+    if aleatorio.random() < 0.7:
+      self._escrever("# " + palavras)
+    else:
+      # Uma parte só, que _injetar_erro reconhece pelo '/*' inicial
+      continuacao = " ".join(aleatorio.choice(PALAVRAS) for _ in range(aleatorio.randint(1, 4)))
+      self._escrever(f"/* {palavras}\n{'  ' * self.nivel}{continuacao} */")
+
+  def _terminal(self, terminal):
+    aleatorio = self.aleatorio
+    chave = self.chaves[terminal]
+    self.proibido = None
+    if type(chave) is tuple:
+      self._emitir(chave[1]) # Operador matemático: (OPERADOR_MATEMATICO, '+')
+    elif chave is TiposDeToken.IDENTIFICADOR:
+      self._emitir(self._variavel())
+    elif chave is TiposDeToken.NUMINT:
+      self._emitir(str(aleatorio.randint(0, 999)))
+    elif chave is TiposDeToken.NUMREAL:
+      self._emitir(f"{aleatorio.randint(0, 99)}.{aleatorio.randint(0, 99)}")
+    elif chave is TiposDeToken.OP_REL:
+      self._emitir(aleatorio.choice(OPERADORES_RELACIONAIS))
+    elif chave is TiposDeToken.CADEIA:
+      self.forcar_cadeia = False
+      self._emitir('"' + " ".join(aleatorio.choice(PALAVRAS) for _ in range(aleatorio.randint(1, 5))) + '"')
+    else:
+      if self.declarando and chave in _TIPOS_DE_VARIAVEL:
+        self.declarando = False
+        if chave is TiposDeToken.PALAVRA_RESERVADA_INTEIRO:
+          self.inteiras.append(self.variaveis[-1])
+      self._emitir(_LEXEMA_DO_TIPO[chave])
+
+  # Nome de variável: nova na declaração, declarada nos comandos
+  def _variavel(self):
+    if self.declarando:
+      nome = f"{PALAVRAS[len(self.variaveis) % len(PALAVRAS)]}{len(self.variaveis)}"
+      self.variaveis.append(nome)
+      return nome
+    if self.alvo:
+      # Alvo da atribuição: se for INTEIRO, a expressão só usa valores INTEIRO
+      self.alvo = False
+      nome = self.aleatorio.choice(self.variaveis)
+      self.so_inteiros = nome in self.inteiras
+      return nome
+    return self.aleatorio.choice(self.inteiras if self.so_inteiros else self.variaveis)
+
+  # Injeta um erro léxico ou sintático no comando que começa em partes[inicio]
+  def _injetar_erro(self, inicio):
+    partes = self.partes
+    tokens = [k for k in range(inicio, len(partes)) if partes[k] and not partes[k].startswith(("\n", " ", "#", "/*"))]
+    if self.aleatorio.random() < 0.5:
+      k = self.aleatorio.choice(tokens)
+      invalido = self.aleatorio.choice(LEXEMAS_INVALIDOS) + " "
+      partes[k] = invalido + partes[k]
+      self.tamanho += len(invalido)
+      self.injetados.append("lexico")
+    else:
+      k = next((k for k in tokens if partes[k] in TOKENS_OBRIGATORIOS), tokens[-1])
+      self.tamanho -= len(partes[k])
+      partes[k] = ""
+      self.injetados.append("sintatico")
+
+# Gera um programa (ver GeradorDeProgramas para os parâmetros)
+def gerar_programa(semente=0, comandos=None, tamanho=None, **parametros):
+  return GeradorDeProgramas(semente, **parametros).gerar(comandos, tamanho)
+
+def main():
+  argumentos = argparse.ArgumentParser(description="Gera programas .mc sintéticos a partir do gramatica.txt")
+  argumentos.add_argument("--semente", type=int, default=0)
+  quantidade = argumentos.add_mutually_exclusive_group()
+  quantidade.add_argument("--comandos", type=int, help="comandos no nível de cima (padrão: 100)")
+  quantidade.add_argument("--tamanho", type=tamanho_em_bytes, help="tamanho mínimo em bytes (ex.: 64KB, 10MB)")
+  argumentos.add_argument("--declaracoes", type=int, default=20)
+  argumentos.add_argument("--profundidade", type=int, default=3, help="aninhamento máximo de SE/ENQUANTO/INICIO")
+  argumentos.add_argument("--operadores", type=int, default=4, help="máximo de operadores por expressão")
+  argumentos.add_argument("--comentarios", type=float, default=0.05, help="fração dos comandos precedidos por comentário")
+  argumentos.add_argument("--cadeias", type=float, default=0.1, help="fração dos comandos que são IMPRIMIR(\"...\")")
+  argumentos.add_argument("--erros", type=int, default=0, help="quantidade de erros léxicos/sintáticos injetados")
+  argumentos.add_argument("--gramatica", default=GRAMATICA_PADRAO)
+  argumentos.add_argument("-o", "--saida", help="arquivo de saída (padrão: saída padrão)")
+  args = argumentos.parse_args()
+
+  gerador = GeradorDeProgramas(
+    args.semente, args.declaracoes, args.profundidade, args.operadores,
+    args.comentarios, args.cadeias, args.erros, args.gramatica,
+  )
+  programa = gerador.gerar(args.comandos, args.tamanho)
+  if args.saida:
+    with open(args.saida, "w", encoding="utf-8") as f:
+      f.write(programa)
+  else:
+    sys.stdout.write(programa)
+
+if __name__ == "__main__":
+  main()
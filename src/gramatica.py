@@ -0,0 +1,445 @@
+# src/gramatica.py
+
+import hashlib
+import os
+import pickle
+import re
+import sys
+from .token_type import TiposDeToken
+from .scanner import PALAVRAS_RESERVADAS
+"""
+Ferramenta de Gramática (Ckp 2)
+
+Lê o arquivo gramatica.txt e gera as tabelas LL(1) usadas pelos Parsers:
+
+  1. Leitura das regras (grupos '( a | b )' viram regras auxiliares);
+  2. Remoção da recursão à esquerda (ex.: expressaoAritmetica);
+  3. Fatoração à esquerda (ex.: listaComandos, comandoCondicao);
+  4. Conjuntos FIRST e FOLLOW;
+  5. Tabela de análise: regra -> chave do token -> alternativa, com o
+     relatório dos conflitos LL(1) e de como cada um foi resolvido.
+
+As chaves das tabelas são TiposDeToken. Os operadores matemáticos, que
+dividem o tipo OPERADOR_MATEMATICO, usam a chave (tipo, texto).
+
+O resultado é guardado em disco, no diretório de cache do usuário, com um
+hash no nome do arquivo: o do texto da gramática, deste arquivo e dos
+TiposDeToken. Enquanto nenhum deles mudar, as tabelas são apenas
+carregadas. Relatório: python -m src.gramatica [gramatica.txt]
+"""
+
+GRAMATICA_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gramatica.txt")
+# Diretório de cache do usuário (XDG), fora da árvore do pacote; cada cache
+# tem o seu subdiretório (o de compilação, src/cache_de_compilacao.py, também)
+CACHE_DO_USUARIO = os.path.join(
+  os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+  "compilador-mc",
+)
+DIRETORIO_CACHE = os.path.join(CACHE_DO_USUARIO, "gramatica")
+
+# Sufixos das regras criadas pelas transformações
+SUFIXO_RECURSAO = "Resto" # Remoção da recursão à esquerda
+SUFIXO_FATORACAO = "Sufixo" # Fatoração à esquerda
+SUFIXO_GRUPO = "Grupo" # Grupos '( ... )'
+
+# Terminais da gramática que não são palavras reservadas
+SIMBOLOS_TERMINAIS = {
+  ":": TiposDeToken.DOIS_PONTOS,
+  "=": TiposDeToken.OPERADOR_ATRIBUICAO,
+  "(": TiposDeToken.LEFT_PAR,
+  ")": TiposDeToken.RIGHT_PAR,
+}
+OPERADORES_MATEMATICOS = ("+", "-", "*", "/")
+
+class ErroDeGramatica(Exception):
+  pass
+
+# Converte um terminal da gramática nas chaves de token que ele aceita
+def chaves_do_terminal(terminal):
+  # Adaptado (Ckp 2, Req 4): VARIAVEL aceita IDENTIFICADOR (Ckp 1) ou a palavra 'VARIAVEL'
+  if terminal == "VARIAVEL" or terminal == "'VARIAVEL'":
+    return (TiposDeToken.IDENTIFICADOR, TiposDeToken.PALAVRA_RESERVADA_VARIAVEL)
+  if terminal.startswith("'"):
+    texto = terminal[1:-1]
+    if texto in PALAVRAS_RESERVADAS:
+      return (PALAVRAS_RESERVADAS[texto],)
+    if texto in SIMBOLOS_TERMINAIS:
+      return (SIMBOLOS_TERMINAIS[texto],)
+    if texto in OPERADORES_MATEMATICOS:
+      return ((TiposDeToken.OPERADOR_MATEMATICO, texto),)
+  elif terminal in TiposDeToken.__members__:
+    return (TiposDeToken[terminal],)
+  raise ErroDeGramatica(f"Terminal desconhecido na gramática: {terminal}")
+
+# Nome do método do Parser que implementa uma regra (comandoCondicao -> _comando_condicao)
+def nome_do_metodo(regra):
+  return "_" + re.sub(r"(?<!^)([A-Z])", r"_\1", regra).lower()
+
+# Nome legível de uma chave de token (para relatórios)
+def nome_da_chave(chave):
+  if isinstance(chave, tuple):
+    return f"'{chave[1]}'"
+  return chave.name
+
+# --- Leitura do gramatica.txt ---
+
+_LEXEMA_GRAMATICA = re.compile(r"\s*(?:('[^']*')|([A-Za-z_]\w*)|(\S))")
+
+def _lexemas(texto):
+  lexemas = []
+  posicao = 0
+  while True:
+    encontrado = _LEXEMA_GRAMATICA.match(texto, posicao)
+    if encontrado is None:
+      return lexemas
+    posicao = encontrado.end()
+    citado, nome, simbolo = encontrado.groups()
+    if citado is not None:
+      lexemas.append(("terminal", citado))
+    elif nome is not None:
+      lexemas.append(("nome", nome))
+    elif simbolo in ":;|()":
+      lexemas.append((simbolo, simbolo))
+    else:
+      # Símbolo sem aspas (ex: '=' em comandoAtribuicao) é tratado como terminal
+      lexemas.append(("terminal", f"'{simbolo}'"))
+
+"""
+Lê as regras 'nome : alternativa | alternativa ;'. O ';' final é opcional
+quando a próxima linha começa uma nova regra ('nome :'), como acontece
+em fatorAritmetico no gramatica.txt original. Nomes que começam com
+minúscula são não-terminais; os demais são terminais.
+"""
+def ler_gramatica(texto):
+  lexemas = _lexemas(texto)
+  regras = {}
+  i = 0
+
+  def inicia_regra(j):
+    return (
+      j + 1 < len(lexemas) and lexemas[j][0] == "nome" and
+      lexemas[j][1][0].islower() and lexemas[j + 1][0] == ":"
+    )
+
+  # Lê alternativas até ';', ')' ou o início de outra regra
+  def alternativas(regra):
+    nonlocal i
+    lista = [[]]
+    while i < len(lexemas):
+      tipo, valor = lexemas[i]
+      if tipo == ";" or tipo == ")" or inicia_regra(i):
+        break
+      i += 1
+      if tipo == "|":
+        lista.append([])
+      elif tipo == "(":
+        grupo = _nome_livre(regras, regra + SUFIXO_GRUPO)
+        regras[grupo] = None # Reserva o nome antes de ler grupos internos
+        regras[grupo] = alternativas(grupo)
+        if i >= len(lexemas) or lexemas[i][0] != ")":
+          raise ErroDeGramatica(f"Grupo sem ')' na regra '{regra}'.")
+        i += 1
+        lista[-1].append(grupo)
+      else:
+        lista[-1].append(valor) # Nome de regra ou terminal
+    return [tuple(alternativa) for alternativa in lista]
+
+  while i < len(lexemas):
+    if not inicia_regra(i):
+      raise ErroDeGramatica(f"Esperado 'regra :', encontrado '{lexemas[i][1]}'.")
+    nome = lexemas[i][1]
+    i += 2
+    regras[nome] = alternativas(nome)
+    if i < len(lexemas) and lexemas[i][0] == ";":
+      i += 1
+
+  # Não-terminais usados devem estar definidos
+  for nome, lista in regras.items():
+    for alternativa in lista:
+      for simbolo in alternativa:
+        if simbolo[0].islower() and simbolo not in regras:
+          raise ErroDeGramatica(f"Regra '{simbolo}' usada em '{nome}' não foi definida.")
+  return regras
+
+# --- Transformações ---
+
+def _nome_livre(regras, base):
+  nome, n = base, 1
+  while nome in regras:
+    n += 1
+    nome = f"{base}{n}"
+  return nome
+
+"""
+Remove a recursão imediata à esquerda:
+  A : A a | b   =>   A : b AResto;  AResto : a AResto | (vazio);
+Recursão indireta não é tratada: é reportada como ErroDeGramatica.
+"""
+def remover_recursao_a_esquerda(regras):
+  resultado = {}
+  for nome, lista in regras.items():
+    recursivas = [alternativa[1:] for alternativa in lista if alternativa[:1] == (nome,)]
+    if not recursivas:
+      resultado[nome] = list(lista)
+      continue
+    resto = _nome_livre(regras.keys() | resultado.keys(), nome + SUFIXO_RECURSAO)
+    resultado[nome] = [alternativa + (resto,) for alternativa in lista if alternativa[:1] != (nome,)]
+    resultado[resto] = [alternativa + (resto,) for alternativa in recursivas] + [()]
+  _verificar_recursao_indireta(resultado)
+  return resultado
+
+def _verificar_recursao_indireta(regras):
+  anulaveis = _anulaveis(regras)
+  # Arestas A -> B quando B pode aparecer no início de uma alternativa de A
+  inicio = {nome: set() for nome in regras}
+  for nome, lista in regras.items():
+    for alternativa in lista:
+      for simbolo in alternativa:
+        if simbolo not in regras:
+          break
+        inicio[nome].add(simbolo)
+        if simbolo not in anulaveis:
+          break
+  for nome in regras:
+    visitados, pendentes = set(), list(inicio[nome])
+    while pendentes:
+      atual = pendentes.pop()
+      if atual == nome:
+        raise ErroDeGramatica(f"Recursão à esquerda indireta na regra '{nome}'.")
+      if atual not in visitados:
+        visitados.add(atual)
+        pendentes.extend(inicio[atual])
+
+"""
+Fatora à esquerda as alternativas com prefixo comum:
+  A : a b | a c   =>   A : a ASufixo;  ASufixo : b | c;
+"""
+def fatorar_a_esquerda(regras):
+  resultado = dict(regras)
+  pendentes = list(resultado)
+  while pendentes:
+    nome = pendentes.pop(0)
+    lista = resultado[nome]
+    grupos = {}
+    for alternativa in lista:
+      grupos.setdefault(alternativa[:1], []).append(alternativa)
+    novas = []
+    for alternativa in lista:
+      grupo = grupos.pop(alternativa[:1], None)
+      if grupo is None:
+        continue # Grupo já tratado na sua primeira alternativa
+      if len(grupo) == 1 or alternativa == ():
+        novas.extend(grupo)
+        continue
+      # Maior prefixo comum do grupo
+      tamanho = 1
+      while all(len(outra) > tamanho for outra in grupo) and len({outra[tamanho] for outra in grupo}) == 1:
+        tamanho += 1
+      sufixo = _nome_livre(resultado, nome + SUFIXO_FATORACAO)
+      resultado[sufixo] = [outra[tamanho:] for outra in grupo]
+      novas.append(grupo[0][:tamanho] + (sufixo,))
+      pendentes.append(sufixo)
+    resultado[nome] = novas
+  return resultado
+
+# --- FIRST e FOLLOW ---
+
+def _anulaveis(regras):
+  anulaveis = set()
+  mudou = True
+  while mudou:
+    mudou = False
+    for nome, lista in regras.items():
+      if nome not in anulaveis and any(all(simbolo in anulaveis for simbolo in alternativa) for alternativa in lista):
+        anulaveis.add(nome)
+        mudou = True
+  return anulaveis
+
+# FIRST de uma sequência de símbolos: (chaves, anulável)
+def _primeiros_da_sequencia(sequencia, primeiros, anulaveis):
+  chaves = set()
+  for simbolo in sequencia:
+    if simbolo in primeiros:
+      chaves |= primeiros[simbolo]
+      if simbolo not in anulaveis:
+        return chaves, False
+    else:
+      chaves.update(chaves_do_terminal(simbolo))
+      return chaves, False
+  return chaves, True
+
+def calcular_primeiros(regras, anulaveis):
+  primeiros = {nome: set() for nome in regras}
+  mudou = True
+  while mudou:
+    mudou = False
+    for nome, lista in regras.items():
+      for alternativa in lista:
+        chaves, _ = _primeiros_da_sequencia(alternativa, primeiros, anulaveis)
+        if not chaves <= primeiros[nome]:
+          primeiros[nome] |= chaves
+          mudou = True
+  return primeiros
+
+def calcular_seguintes(regras, inicial, primeiros, anulaveis):
+  seguintes = {nome: set() for nome in regras}
+  seguintes[inicial].add(TiposDeToken.FIM_DE_ARQUIVO)
+  mudou = True
+  while mudou:
+    mudou = False
+    for nome, lista in regras.items():
+      for alternativa in lista:
+        for posicao, simbolo in enumerate(alternativa):
+          if simbolo not in regras:
+            continue
+          chaves, anulavel = _primeiros_da_sequencia(alternativa[posicao + 1:], primeiros, anulaveis)
+          if anulavel:
+            chaves |= seguintes[nome]
+          if not chaves <= seguintes[simbolo]:
+            seguintes[simbolo] |= chaves
+            mudou = True
+  return seguintes
+
+# --- Tabela LL(1) ---
+
+class Conflito:
+  def __init__(self, regra, chave, alternativas, escolhida, tipo):
+    self.regra = regra
+    self.chave = chave
+    self.alternativas = alternativas # Índices das alternativas em disputa
+    self.escolhida = escolhida # Índice da alternativa usada na tabela
+    self.tipo = tipo # "FIRST/FIRST" ou "FIRST/FOLLOW"
+
+  def __str__(self):
+    return (
+      f"Conflito {self.tipo} em '{self.regra}' com {nome_da_chave(self.chave)}: "
+      f"alternativas {self.alternativas}, escolhida {self.escolhida}"
+    )
+
+"""
+Resolve um conflito como o Parser escrito à mão:
+  1. a alternativa que começa pelo próprio terminal (ex.: '(' em termoRelacional);
+  2. uma alternativa não vazia (ex.: o 'SENAO' fica com o 'SE' mais próximo);
+  3. a primeira alternativa da gramática.
+"""
+def _resolver(regras, nome, candidatas, chave):
+  def prioridade(indice):
+    alternativa = regras[nome][indice]
+    if alternativa and alternativa[0] not in regras and chave in chaves_do_terminal(alternativa[0]):
+      return (0, indice)
+    if alternativa:
+      return (1, indice)
+    return (2, indice)
+  return min(candidatas, key=prioridade)
+
+class TabelasLL1:
+  def __init__(self, regras, inicial, primeiros, seguintes, anulaveis, tabela, conflitos, hash_da_gramatica):
+    self.regras = regras # regra -> lista de alternativas (tuplas de símbolos)
+    self.inicial = inicial
+    self.primeiros = primeiros # regra -> frozenset de chaves
+    self.seguintes = seguintes # regra -> frozenset de chaves
+    self.anulaveis = anulaveis
+    self.tabela = tabela # regra -> {chave: índice da alternativa}
+    self.conflitos = conflitos
+    self.hash_da_gramatica = hash_da_gramatica
+
+  # Dicionário chave -> alternativa (tupla de símbolos) de uma regra
+  def alternativas_por_chave(self, regra):
+    alternativas = self.regras[regra]
+    return {chave: alternativas[indice] for chave, indice in self.tabela[regra].items()}
+
+  # Texto com a gramática transformada, FIRST, FOLLOW e conflitos
+  def relatorio(self):
+    linhas = ["--- Gramática transformada (LL(1)) ---"]
+    for nome, lista in self.regras.items():
+      corpo = " | ".join(" ".join(alternativa) if alternativa else "(vazio)" for alternativa in lista)
+      linhas.append(f"{nome} : {corpo};")
+    linhas.append("")
+    linhas.append("--- FIRST / FOLLOW ---")
+    for nome in self.regras:
+      primeiros = ", ".join(sorted(map(nome_da_chave, self.primeiros[nome])))
+      seguintes = ", ".join(sorted(map(nome_da_chave, self.seguintes[nome])))
+      vazio = " (anulável)" if nome in self.anulaveis else ""
+      linhas.append(f"{nome}{vazio}\n  FIRST:  {primeiros}\n  FOLLOW: {seguintes}")
+    linhas.append("")
+    linhas.append(f"--- Conflitos LL(1): {len(self.conflitos)} ---")
+    linhas.extend(str(conflito) for conflito in self.conflitos)
+    return "\n".join(linhas)
+
+# Além do texto da gramática, as tabelas dependem deste arquivo (as
+# transformações e as classes guardadas no pickle), dos TiposDeToken e das
+# palavras reservadas do Scanner (as chaves das tabelas)
+def _resumo_da_ferramenta():
+  with open(__file__, "rb") as f:
+    resumo = hashlib.sha256(f.read())
+  resumo.update(repr([(tipo.name, tipo.value) for tipo in TiposDeToken]).encode("utf-8"))
+  resumo.update(repr(sorted((texto, tipo.name) for texto, tipo in PALAVRAS_RESERVADAS.items())).encode("utf-8"))
+  return resumo.hexdigest()
+
+RESUMO_DA_FERRAMENTA = _resumo_da_ferramenta()
+
+def _resumo(texto):
+  return hashlib.sha256(f"{RESUMO_DA_FERRAMENTA}:{texto}".encode("utf-8")).hexdigest()[:16]
+
+def gerar_tabelas(texto):
+  regras = ler_gramatica(texto)
+  inicial = next(iter(regras))
+  regras = fatorar_a_esquerda(remover_recursao_a_esquerda(regras))
+  anulaveis = _anulaveis(regras)
+  primeiros = calcular_primeiros(regras, anulaveis)
+  seguintes = calcular_seguintes(regras, inicial, primeiros, anulaveis)
+
+  tabela, conflitos = {}, []
+  for nome, lista in regras.items():
+    candidatas = {}
+    for indice, alternativa in enumerate(lista):
+      chaves, anulavel = _primeiros_da_sequencia(alternativa, primeiros, anulaveis)
+      if anulavel:
+        chaves |= seguintes[nome]
+      for chave in chaves:
+        candidatas.setdefault(chave, []).append(indice)
+    linha = {}
+    for chave, indices in candidatas.items():
+      escolhida = _resolver(regras, nome, indices, chave)
+      if len(indices) > 1:
+        tipo = "FIRST/FOLLOW" if any(not lista[i] or _primeiros_da_sequencia(lista[i], primeiros, anulaveis)[1] for i in indices) else "FIRST/FIRST"
+        conflitos.append(Conflito(nome, chave, indices, escolhida, tipo))
+      linha[chave] = escolhida
+    tabela[nome] = linha
+
+  return TabelasLL1(
+    regras, inicial,
+    {nome: frozenset(chaves) for nome, chaves in primeiros.items()},
+    {nome: frozenset(chaves) for nome, chaves in seguintes.items()},
+    frozenset(anulaveis), tabela, conflitos,
+    _resumo(texto),
+  )
+
+# --- Cache em disco ---
+
+def carregar_tabelas(caminho=GRAMATICA_PADRAO, diretorio_cache=DIRETORIO_CACHE):
+  with open(caminho, "r", encoding="utf-8") as f:
+    texto = f.read()
+  arquivo_cache = os.path.join(diretorio_cache, f"gramatica-{_resumo(texto)}.pickle") if diretorio_cache else None
+
+  if arquivo_cache and os.path.exists(arquivo_cache):
+    try:
+      with open(arquivo_cache, "rb") as f:
+        return pickle.load(f)
+    except Exception:
+      pass # Cache corrompido ou de outra versão: gera de novo
+
+  tabelas = gerar_tabelas(texto)
+  if arquivo_cache:
+    try:
+      os.makedirs(diretorio_cache, exist_ok=True)
+      temporario = f"{arquivo_cache}.{os.getpid()}.tmp"
+      with open(temporario, "wb") as f:
+        pickle.dump(tabelas, f, protocol=pickle.HIGHEST_PROTOCOL)
+      os.replace(temporario, arquivo_cache) # Escrita atômica
+    except OSError:
+      pass # Sem permissão de escrita: segue sem cache
+  return tabelas
+
+if __name__ == "__main__":
+  print(carregar_tabelas(sys.argv[1] if len(sys.argv) > 1 else GRAMATICA_PADRAO).relatorio())
@@ -0,0 +1,512 @@
+# src/incremental.py
+
+from array import array
+from bisect import bisect_left
+from .token_type import TiposDeToken, TIPOS_POR_ORDINAL, ORDINAL_DO_TIPO
+from .token import Token
+from .token_stream import TokenStream
+from .diagnostico import DiagnosticoLexico, compactar, reconstruir
+from .indice_linhas import IndiceDeLinhas
+from .scanner import AnalisadorLexico
+from .parser import SyntaxError, INICIO_COMANDO, SINCRONIA_DECLARACAO, SINCRONIA_COMANDO
+from .arvore import No, Programa
+from .parser_iterativo import PARSERS
+"""
+Incremental.py
+
+Análises léxica e sintática incrementais, para sessões de edição (um
+editor que reanalisa o arquivo a cada tecla). O DocumentoIncremental
+guarda o código-fonte dividido em segmentos: o cabeçalho (':DECLARACOES'
+... ':ALGORITMO') e cada comando de nível superior do :ALGORITMO, com os
+seus tokens, erros léxicos e nó da AST. Um segmento vai do primeiro token
+do comando até o primeiro token do seguinte (espaços e comentários no fim
+pertencem a ele).
+
+Numa edição (deslocamento, tamanho removido, texto inserido), a varredura
+e a análise recomeçam no segmento anterior ao que contém a edição (o fim
+de um comando depende do primeiro token do seguinte; o início de um
+segmento é sempre o início de um token, um ponto seguro para o Analisador
+Léxico) e seguem comando a comando. Cadeias e comentários /* */ abertos ou
+fechados pela edição mudam os tokens seguintes, e por isso a análise para
+só quando uma fronteira entre comandos coincide com o início de um
+segmento antigo, depois da edição: dali em diante o texto é o mesmo, o
+Analisador Léxico está no início de um token e o Parser no nível superior,
+então os segmentos antigos são reaproveitados. O final descartado por uma
+edição que não sincroniza (abrir um /* ou uma cadeia) fica numa reserva
+enquanto o texto depois dele não muda, e a análise também sincroniza com
+ela (fechar o /* não reanalisa o resto do arquivo).
+
+Os deslocamentos guardados em cada segmento são os da época em que ele
+foi analisado (origem); o deslocamento acumulado dos segmentos depois da
+última edição é aplicado de forma preguiçosa, de modo que uma edição não
+percorre o arquivo inteiro. Sem recuperação de erros: um comando com erro
+vira um segmento quebrado, que vai até a próxima linha que começa com um
+comando, e a análise especulativa continua dali (o resultado é o do
+primeiro erro, como em Parser.parse()). Os segmentos quebrados ficam numa
+lista de índices em ordem, e a linha/coluna das mensagens vem de um índice
+de quebras de linha atualizado a cada edição.
+"""
+
+CABECALHO = "cabecalho"
+COMANDO = "comando"
+
+# IndiceDeLinhas que acompanha as edições: as quebras a partir de _corte
+# valem _quebras[k] + _deslocamento (o mesmo esquema dos inícios dos
+# segmentos). Cada edição passa o vetor para um índice novo; o antigo volta
+# a ser o índice do seu próprio texto, montado de novo se for consultado
+# (diagnósticos já entregues continuam com as posições do texto deles).
+class _LinhasEditaveis(IndiceDeLinhas):
+  def __init__(self, codigo_fonte):
+    super().__init__(codigo_fonte)
+    self._corte = 0
+    self._deslocamento = 0
+
+  def quebras(self):
+    quebras = super().quebras()
+    self._mover_corte(len(quebras))
+    return quebras
+
+  def linha_coluna(self, offset):
+    quebras = super().quebras()
+    anteriores = self._posicao(offset) # '\n' antes de 'offset'
+    if anteriores == 0:
+      return 1, offset + 1
+    anterior = quebras[anteriores - 1]
+    if anteriores > self._corte:
+      anterior += self._deslocamento
+    return anteriores + 1, offset - anterior
+
+  # Índice do texto depois da edição (o próprio 'codigo_fonte' já editado)
+  def editar(self, codigo_fonte, offset, removidos, inseridos):
+    quebras = super().quebras()
+    deslocamento = self._deslocamento
+    i = self._posicao(offset)
+    self._mover_corte(i)
+    j = bisect_left(quebras, offset + removidos - deslocamento, i)
+    novas = array(quebras.typecode)
+    posicao = inseridos.find("\n")
+    while posicao != -1:
+      novas.append(offset + posicao)
+      posicao = inseridos.find("\n", posicao + 1)
+    quebras[i:j] = novas
+    novo = _LinhasEditaveis(codigo_fonte)
+    novo._quebras = quebras
+    novo._corte = i + len(novas)
+    novo._deslocamento = deslocamento + len(inseridos) - removidos
+    self._quebras, self._corte, self._deslocamento = None, 0, 0
+    return novo
+
+  # Primeira quebra em 'offset' ou depois
+  def _posicao(self, offset):
+    quebras, corte = self._quebras, self._corte
+    if corte and offset <= quebras[corte - 1]:
+      return bisect_left(quebras, offset, 0, corte)
+    return bisect_left(quebras, offset - self._deslocamento, corte)
+
+  def _mover_corte(self, i):
+    quebras = self._quebras
+    deslocamento = self._deslocamento
+    for k in range(self._corte, i):
+      quebras[k] += deslocamento
+    for k in range(i, self._corte):
+      quebras[k] -= deslocamento
+    self._corte = i
+
+class Segmento:
+  __slots__ = (
+    "tipo", "primeiro", "origem", "tipos", "inicios", "fins", "diagnosticos",
+    "no", "erro",
+  )
+
+  def __init__(self, tipo, primeiro, origem, tipos, inicios, fins, diagnosticos, no=None, erro=None):
+    self.tipo = tipo # CABECALHO ou COMANDO
+    self.primeiro = primeiro # Primeiro comando do :ALGORITMO (obrigatório)
+    self.origem = origem # Início do segmento quando foi analisado
+    # Tokens do segmento (deslocamentos relativos ao texto da época da análise)
+    self.tipos = tipos
+    self.inicios = inicios
+    self.fins = fins
+    # Erros léxicos: (código, início, fim, índice do token no segmento)
+    self.diagnosticos = diagnosticos
+    # Cabeçalho: (declarações, início do Programa); comando: o nó do comando
+    self.no = no
+    # Segmento quebrado: o primeiro erro sintático, na forma compacta
+    # (src/diagnostico.py), com o deslocamento relativo ao início do segmento
+    self.erro = erro
+
+# Fonte de tokens para o Parser que grava tudo o que é lido (tokens e erros
+# léxicos), para depois dividir em segmentos
+class _Gravador:
+  def __init__(self, analisador, linhas):
+    self.analisador = analisador
+    self.linhas = linhas
+    tipo_offset = "I" if len(analisador.codigo_fonte) <= 0xFFFFFFFF else "Q"
+    self.tipos = array("B")
+    self.inicios = array(tipo_offset)
+    self.fins = array(tipo_offset)
+    self.diagnosticos = [] # Cada um com indice_token = tokens gravados antes dele
+    self._entregues = 0 # Diagnósticos já atribuídos a algum segmento
+    self.repetir_erro = False # Entregar de novo o último erro léxico (ver _analisar)
+
+  @property
+  def ultimo_erro(self):
+    return self.analisador.ultimo_erro
+
+  def proximo_token(self):
+    if self.repetir_erro:
+      self.repetir_erro = False
+      return None
+    lexema = self.analisador._proximo_lexema()
+    if lexema is None:
+      erro = self.analisador.diagnosticos[-1]
+      erro.indice_token = len(self.tipos)
+      self.diagnosticos.append(erro)
+      return None
+    tipo, inicio, fim = lexema
+    self.tipos.append(ORDINAL_DO_TIPO[tipo])
+    self.inicios.append(inicio)
+    self.fins.append(fim)
+    return self.token(len(self.tipos) - 1)
+
+  def token(self, i):
+    tipo = TIPOS_POR_ORDINAL[self.tipos[i]]
+    inicio = self.inicios[i]
+    if tipo is TiposDeToken.CADEIA:
+      texto = self.analisador.codigo_fonte[inicio + 1:self.fins[i] - 1]
+    elif tipo is TiposDeToken.FIM_DE_ARQUIVO:
+      texto = "FIM_DE_ARQUIVO"
+    else:
+      texto = self.analisador.codigo_fonte[inicio:self.fins[i]]
+    return Token(tipo, texto, offset=inicio, indice=self.linhas)
+
+  # Primeiro token a partir de 'desde' que começa uma linha com um comando
+  # (ou o FIM_DE_ARQUIVO): onde a análise recomeça depois de um erro
+  def candidato(self, desde, depois_de):
+    codigo = self.analisador.codigo_fonte
+    k = desde
+    while True:
+      while k >= len(self.tipos):
+        if self.tipos and TIPOS_POR_ORDINAL[self.tipos[-1]] is TiposDeToken.FIM_DE_ARQUIVO:
+          return len(self.tipos) - 1 # Nada depois do fim (segmento quebrado vazio, no fim)
+        self.proximo_token()
+      tipo = TIPOS_POR_ORDINAL[self.tipos[k]]
+      if tipo is TiposDeToken.FIM_DE_ARQUIVO:
+        return k
+      inicio = self.inicios[k]
+      if inicio > depois_de and tipo in INICIO_COMANDO and codigo.rfind("\n", self.fins[k - 1], inicio) != -1:
+        return k
+      k += 1
+
+  # Segmento com os tokens [a, b) e os erros léxicos gravados até o token b
+  def segmento(self, tipo, primeiro, origem, a, b, **campos):
+    diagnosticos = []
+    while self._entregues < len(self.diagnosticos) and self.diagnosticos[self._entregues].indice_token <= b:
+      erro = self.diagnosticos[self._entregues]
+      diagnosticos.append((erro.codigo, erro.inicio, erro.fim, erro.indice_token - a))
+      self._entregues += 1
+    return Segmento(tipo, primeiro, origem, self.tipos[a:b], self.inicios[a:b], self.fins[a:b], diagnosticos, **campos)
+
+# Soma 'delta' ao início de todos os nós de uma subárvore (iterativo)
+def _deslocar(raiz, delta):
+  pendentes = [raiz]
+  while pendentes:
+    no = pendentes.pop()
+    if isinstance(no, No):
+      no.inicio += delta
+      pendentes.extend(getattr(no, campo) for campo in no.campos)
+    elif isinstance(no, list):
+      pendentes.extend(no)
+
+# Segmentos descartados que ainda valem a partir do seu início (o texto dali
+# até o fim do arquivo não mudou); o início atual de segmentos[k] é
+# inicios[k] + deslocamento. 'quebrados': índices (em ordem) dos quebrados.
+class _Reserva:
+  __slots__ = ("segmentos", "inicios", "deslocamento", "quebrados")
+
+  def __init__(self, segmentos, inicios, deslocamento, quebrados):
+    self.segmentos = segmentos
+    self.inicios = inicios
+    self.deslocamento = deslocamento
+    self.quebrados = quebrados
+
+  # Índice do segmento (a partir de 'valida') que começa em 'offset', ou None
+  def procurar(self, offset, valida):
+    k = bisect_left(self.inicios, offset - self.deslocamento, valida)
+    if k < len(self.inicios) and self.inicios[k] + self.deslocamento == offset:
+      return k
+    return None
+
+class DocumentoIncremental:
+  def __init__(self, codigo_fonte, parser="recursivo", motor="caracteres"):
+    self.codigo_fonte = codigo_fonte
+    self.parser = parser
+    self.motor = motor
+    self._linhas = _LinhasEditaveis(codigo_fonte)
+    self.segmentos = [segmento for segmento, _, _ in self._analisar(0, True, False)]
+    # Início de cada segmento: para i >= _corte, é _inicios[i] + _deslocamento
+    # (o deslocamento das últimas edições, aplicado só quando preciso)
+    self._inicios = [segmento.origem for segmento in self.segmentos]
+    self._corte = len(self.segmentos)
+    self._deslocamento = 0
+    # Índices dos segmentos quebrados, em ordem
+    self._quebrados = [i for i, segmento in enumerate(self.segmentos) if segmento.erro is not None]
+    # Final descartado por uma edição que não sincronizou (abrir um /* ou
+    # uma cadeia), guardado para quando a edição for desfeita (fechar o /*)
+    self._reserva = _Reserva([], [], 0, [])
+    self._reserva_valida = 0 # Segmentos antes deste índice já não valem
+    self.reanalisados = len(self.segmentos) # Segmentos analisados na última edição
+
+  # --- Edição ---
+
+  # Substitui 'removidos' caracteres a partir de 'offset' por 'inseridos' e
+  # reanalisa só o trecho afetado. Retorna o resultado sem a AST (montar a
+  # AST percorre todos os segmentos; use arvore() quando precisar dela).
+  def editar(self, offset, removidos, inseridos):
+    codigo = self.codigo_fonte
+    if offset < 0 or removidos < 0 or offset + removidos > len(codigo):
+      raise ValueError(f"Edição fora do texto: offset={offset}, removidos={removidos}, tamanho={len(codigo)}")
+    self.codigo_fonte = codigo[:offset] + inseridos + codigo[offset + removidos:]
+    self._linhas = self._linhas.editar(self.codigo_fonte, offset, removidos, inseridos)
+    delta = len(inseridos) - removidos
+    fim_da_edicao = offset + removidos # No texto antigo
+
+    # Recomeça no segmento anterior ao da edição
+    inicial = max(self._segmento_em(offset) - 1, 0)
+    self._mover_corte(inicial)
+    segmentos = self.segmentos
+    quantidade = len(segmentos)
+    # Primeiro segmento antigo que começa depois da edição (pode ser reaproveitado)
+    intacto = max(self._segmento_em(fim_da_edicao - 1) + 1 if fim_da_edicao > 0 else 1, inicial + 1)
+    reuso = intacto
+    # Segmentos da reserva que incluem o trecho editado deixam de valer
+    reserva = self._reserva
+    self._reserva_valida = bisect_left(reserva.inicios, fim_da_edicao - reserva.deslocamento, self._reserva_valida)
+    reserva.deslocamento += delta
+    da_reserva = None
+    anterior = segmentos[inicial]
+    novos = []
+    for segmento, fim, proximo_primeiro in self._analisar(self._inicio(inicial), anterior.tipo == CABECALHO, anterior.primeiro):
+      novos.append(segmento)
+      while reuso < quantidade and self._inicio(reuso) + delta < fim:
+        reuso += 1
+      if reuso < quantidade and self._inicio(reuso) + delta == fim and segmentos[reuso].primeiro == proximo_primeiro:
+        break # Sincronizou: o restante do arquivo não muda
+      k = reserva.procurar(fim, self._reserva_valida)
+      if k is not None and reserva.segmentos[k].primeiro == proximo_primeiro:
+        da_reserva = k # Sincronizou com a reserva
+        break
+    else:
+      reuso = quantidade
+
+    quebrados = self._quebrados
+    primeiro_quebrado = bisect_left(quebrados, inicial)
+    novos_quebrados = [inicial + k for k, segmento in enumerate(novos) if segmento.erro is not None]
+    if da_reserva is None and reuso < quantidade:
+      diferenca = len(novos) - (reuso - inicial)
+      seguintes = quebrados[bisect_left(quebrados, reuso, primeiro_quebrado):]
+      quebrados[primeiro_quebrado:] = novos_quebrados
+      quebrados.extend(k + diferenca for k in seguintes)
+      segmentos[inicial:reuso] = novos
+      self._inicios[inicial:reuso] = [segmento.origem for segmento in novos]
+    else:
+      # O final antigo foi todo descartado: a parte depois da edição vira a
+      # nova reserva, e o final do documento vem da reserva antiga (ou acaba)
+      descartada = _Reserva(
+        segmentos[intacto:], self._inicios[intacto:], self._deslocamento + delta,
+        [k - intacto for k in quebrados[bisect_left(quebrados, intacto, primeiro_quebrado):]],
+      )
+      quebrados[primeiro_quebrado:] = novos_quebrados
+      del segmentos[inicial:], self._inicios[inicial:]
+      segmentos.extend(novos)
+      self._inicios.extend(segmento.origem for segmento in novos)
+      if da_reserva is not None:
+        base = len(segmentos) - da_reserva
+        quebrados.extend(base + k for k in reserva.quebrados[bisect_left(reserva.quebrados, da_reserva):])
+        segmentos.extend(reserva.segmentos[da_reserva:])
+        self._inicios.extend(reserva.inicios[da_reserva:])
+        self._deslocamento = reserva.deslocamento - delta # Somado abaixo
+      # Os segmentos da reserva usados agora não podem ficar nas duas listas;
+      # os anteriores a eles, sem o resto do arquivo, não servem mais
+      if descartada.segmentos or da_reserva is not None:
+        self._reserva, self._reserva_valida = descartada, 0
+    self._corte = inicial + len(novos)
+    self._deslocamento += delta
+    self.reanalisados = len(novos)
+    return self.resultado(construir_arvore=False)
+
+  # --- Resultados (os mesmos da análise completa do texto atual) ---
+
+  # Como Parser(...).parse(): sucesso, erros (só o primeiro, como
+  # diagnóstico) e a AST
+  def resultado(self, construir_arvore=True):
+    if not self._quebrados:
+      return {"sucesso": True, "erros": [], "arvore": self.arvore() if construir_arvore else None}
+    return {"sucesso": False, "erros": [self._erro(self._quebrados[0])], "arvore": None}
+
+  # Todos os erros, em ordem, como (início, fim, código, mensagem): os léxicos
+  # (o trecho do lexema, com o código do diagnóstico) e o erro sintático de
+  # cada segmento quebrado (o token do erro, com código None). Os segmentos
+  # depois do primeiro erro são analisados de forma especulativa, a partir
+  # da próxima linha que começa um comando.
+  def diagnosticos(self):
+    lista = []
+    for i in self._quebrados:
+      self._normalizar(i)
+      erro = self._erro(i)
+      segmento = self.segmentos[i]
+      for codigo, inicio, fim, _ in segmento.diagnosticos:
+        lista.append((inicio, fim, codigo, DiagnosticoLexico(codigo, inicio, fim, self._linhas).mensagem))
+      offset = erro.offset
+      if offset is not None: # None: o erro sintático é só o aviso de erro léxico
+        analisador = AnalisadorLexico(self.codigo_fonte, motor=self.motor)
+        analisador.reportar_erros = False
+        analisador.posicao_atual = offset
+        lexema = analisador._proximo_lexema()
+        lista.append((offset, lexema[2] if lexema is not None else offset, None, erro.mensagem))
+    return lista
+
+  # Programa com os nós de todos os segmentos (só sem erros sintáticos)
+  def arvore(self):
+    if self._quebrados:
+      return None
+    for i in range(len(self.segmentos)):
+      self._normalizar(i)
+    cabecalho = self.segmentos[0]
+    declaracoes, inicio = cabecalho.no
+    return Programa(declaracoes, [segmento.no for segmento in self.segmentos[1:]], inicio)
+
+  # TokenStream do texto atual (com os erros léxicos), como o de tokenize(lote=True).
+  # Com 'inicio'/'fim', só os tokens (e erros léxicos) dos segmentos que
+  # cobrem esse trecho do texto; o FIM_DE_ARQUIVO só se o trecho chega ao fim.
+  def tokens(self, inicio=0, fim=None):
+    stream = TokenStream(self.codigo_fonte)
+    primeiro = self._segmento_em(inicio)
+    ultimo = len(self.segmentos) if fim is None else self._segmento_em(fim) + 1
+    for i in range(primeiro, ultimo):
+      self._normalizar(i)
+      segmento = self.segmentos[i]
+      base = len(stream.tipos)
+      for codigo, inicio, fim, indice in segmento.diagnosticos:
+        stream.diagnosticos.append(DiagnosticoLexico(codigo, inicio, fim, stream.indice_linhas, base + indice))
+      stream.tipos.extend(segmento.tipos)
+      if segmento.inicios.typecode == stream.inicios.typecode:
+        stream.inicios.extend(segmento.inicios)
+        stream.fins.extend(segmento.fins)
+      else:
+        stream.inicios.extend(iter(segmento.inicios))
+        stream.fins.extend(iter(segmento.fins))
+    if ultimo == len(self.segmentos):
+      tamanho = len(self.codigo_fonte)
+      stream.adicionar(TiposDeToken.FIM_DE_ARQUIVO, tamanho, tamanho)
+    return stream
+
+  # --- Segmentos ---
+
+  def _inicio(self, i):
+    if i >= self._corte:
+      return self._inicios[i] + self._deslocamento
+    return self._inicios[i]
+
+  # Índice do segmento que contém 'offset' (o último que começa até ele)
+  def _segmento_em(self, offset):
+    baixo, alto = 0, len(self.segmentos)
+    while alto - baixo > 1:
+      meio = (baixo + alto) // 2
+      if self._inicio(meio) <= offset:
+        baixo = meio
+      else:
+        alto = meio
+    return baixo
+
+  # Move o corte do deslocamento pendente para o índice 'i' (custo
+  # proporcional à distância entre edições consecutivas)
+  def _mover_corte(self, i):
+    inicios = self._inicios
+    deslocamento = self._deslocamento
+    for k in range(self._corte, i):
+      inicios[k] += deslocamento
+    for k in range(i, min(self._corte, len(inicios))):
+      inicios[k] -= deslocamento
+    self._corte = i
+
+  # Atualiza os deslocamentos guardados no segmento i para o texto atual
+  def _normalizar(self, i):
+    segmento = self.segmentos[i]
+    delta = self._inicio(i) - segmento.origem
+    if not delta:
+      return
+    tipo_offset = segmento.inicios.typecode
+    segmento.inicios = array(tipo_offset, map(delta.__add__, segmento.inicios))
+    segmento.fins = array(tipo_offset, map(delta.__add__, segmento.fins))
+    segmento.diagnosticos = [(codigo, inicio + delta, fim + delta, indice) for codigo, inicio, fim, indice in segmento.diagnosticos]
+    if segmento.tipo == CABECALHO and segmento.no is not None:
+      declaracoes, inicio = segmento.no
+      _deslocar(declaracoes, delta)
+      segmento.no = (declaracoes, inicio + delta)
+    elif segmento.no is not None:
+      _deslocar(segmento.no, delta)
+    segmento.origem += delta
+
+  # Diagnóstico do erro do segmento quebrado i, no texto atual (um objeto
+  # novo a cada chamada: a linha/coluna vem do índice de linhas de agora)
+  def _erro(self, i):
+    erro = reconstruir(self.segmentos[i].erro, self._linhas)
+    if erro.token is not None:
+      erro.token.offset += self._inicio(i)
+    return erro
+
+  # Analisa a partir de 'inicio' (começo de um segmento) e gera
+  # (segmento, início do próximo, próximo é o primeiro comando) até o fim
+  # do arquivo. Quem consome para assim que reencontra um segmento antigo.
+  def _analisar(self, inicio, cabecalho, primeiro):
+    analisador = AnalisadorLexico(self.codigo_fonte, motor=self.motor)
+    analisador.reportar_erros = False
+    analisador.indice_linhas = self._linhas
+    analisador.posicao_atual = inicio
+    gravador = _Gravador(analisador, self._linhas)
+    parser = PARSERS[self.parser](gravador)
+    indice = 0 # Primeiro token do segmento corrente, no gravador
+    erro = None
+    try:
+      parser._advance()
+    except SyntaxError as erro_lexico:
+      erro = erro_lexico
+    while True:
+      tipo = CABECALHO if cabecalho else COMANDO
+      if erro is None:
+        if not cabecalho and not primeiro and parser.current.tipo is TiposDeToken.FIM_DE_ARQUIVO:
+          return
+        try:
+          if cabecalho:
+            inicio_do_programa = parser.current.offset
+            parser._secao(TiposDeToken.PALAVRA_RESERVADA_DECLARACOES, SINCRONIA_DECLARACAO)
+            declaracoes = parser._lista_declaracoes()
+            parser._secao(TiposDeToken.PALAVRA_RESERVADA_ALGORITMO, SINCRONIA_COMANDO)
+            no = (declaracoes, inicio_do_programa)
+          elif primeiro or parser._is_inicio_comando():
+            no = parser._comando()
+          else:
+            parser._expect(TiposDeToken.FIM_DE_ARQUIVO) # Sobrou algo que não é comando
+        except SyntaxError as erro_sintatico:
+          erro = erro_sintatico
+      if erro is None:
+        fim = len(gravador.tipos) - 1 # O token corrente começa o próximo segmento
+        yield gravador.segmento(tipo, primeiro, inicio, indice, fim, no=no), parser.current.offset, cabecalho
+        inicio, indice, primeiro, cabecalho = parser.current.offset, fim, cabecalho, False
+        continue
+
+      # Segmento quebrado: vai até a próxima linha que começa com um comando
+      fim = gravador.candidato(max(len(gravador.tipos) - 1, indice + 1), inicio)
+      proximo = gravador.inicios[fim]
+      segmento = gravador.segmento(
+        tipo, primeiro, inicio, indice, fim, erro=compactar(erro.diagnostico, -inicio),
+      )
+      yield segmento, proximo, cabecalho
+      if TIPOS_POR_ORDINAL[gravador.tipos[fim]] is TiposDeToken.FIM_DE_ARQUIVO:
+        return
+      parser = PARSERS[self.parser](gravador)
+      parser.current = gravador.token(fim)
+      # Se o erro léxico logo depois do token 'fim' já foi lido, o Parser
+      # novo o recebe de novo, como numa análise que começasse em 'fim'
+      gravador.repetir_erro = bool(gravador.diagnosticos) and gravador.diagnosticos[-1].indice_token == len(gravador.tipos)
+      inicio, indice, primeiro, cabecalho, erro = proximo, fim, cabecalho, False, None
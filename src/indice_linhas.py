@@ -0,0 +1,57 @@
+# src/indice_linhas.py
+
+from array import array
+from bisect import bisect_left
+"""
+IndiceDeLinhas.py
+
+Índice de quebras de linha do código-fonte (Requisito 9 - Ckp 1).
+Guarda, em um vetor ordenado, o deslocamento de cada '\n' do arquivo.
+Com ele, a linha e a coluna de qualquer deslocamento são obtidas sob
+demanda por busca binária, sem contabilizar posição caractere a caractere.
+"""
+class IndiceDeLinhas:
+  # 'primeira_linha' > 1 quando o código é um trecho de um arquivo maior
+  # que começa no início dessa linha (análise em paralelo por pedaços)
+  def __init__(self, codigo_fonte, primeira_linha=1):
+    self.codigo_fonte = codigo_fonte
+    self.primeira_linha = primeira_linha
+    self._quebras = None # Construído na primeira consulta
+
+  # Índice já montado, sem o código-fonte (ex.: lido de um artefato .mcc).
+  # 'quebras' é qualquer sequência ordenada de deslocamentos (array, memoryview).
+  @classmethod
+  def das_quebras(cls, quebras, primeira_linha=1):
+    indice = cls(None, primeira_linha)
+    indice._quebras = quebras
+    return indice
+
+  # Monta o vetor de deslocamentos dos '\n' (uma única passada com str.find)
+  def _construir(self):
+    codigo = self.codigo_fonte
+    procurar = codigo.find
+    quebras = array("q")
+    adicionar = quebras.append
+    posicao = procurar("\n")
+    while posicao != -1:
+      adicionar(posicao)
+      posicao = procurar("\n", posicao + 1)
+    self._quebras = quebras
+    return quebras
+
+  # Vetor ordenado com os deslocamentos de todos os '\n'
+  def quebras(self):
+    if self._quebras is None:
+      return self._construir()
+    return self._quebras
+
+  # Retorna (linha, coluna), ambas a partir de 1, do deslocamento 'offset'.
+  # Uma quebra de linha pertence à linha que ela encerra.
+  def linha_coluna(self, offset):
+    quebras = self._quebras
+    if quebras is None:
+      quebras = self._construir()
+    anteriores = bisect_left(quebras, offset) # '\n' antes de 'offset'
+    if anteriores == 0:
+      return self.primeira_linha, offset + 1
+    return anteriores + self.primeira_linha, offset - quebras[anteriores - 1]
@@ -0,0 +1,150 @@
+# src/lote.py
+
+import glob
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .scanner import AnalisadorLexico
+from .parser import MAX_ERROS
+from .parser_iterativo import PARSERS
+from .semantico import analisar
+from .cache_de_compilacao import CacheDeCompilacao, opcoes_da_analise
+"""
+Lote.py
+
+Verificação de muitos arquivos .mc em paralelo (main.py --lote). As
+entradas podem ser arquivos, diretórios (todos os .mc, recursivamente) ou
+padrões glob. Os arquivos são agrupados por tamanho, para que cada tarefa
+enviada a um processo tenha trabalho suficiente para compensar a
+comunicação entre processos, e os grupos são distribuídos num
+ProcessPoolExecutor com um processo por núcleo. Cada processo lê os
+arquivos ele mesmo (só os caminhos trafegam) e roda as análises léxica,
+sintática e semântica. Os resultados são devolvidos por arquivo, à medida
+que cada grupo termina, junto com os contadores do cache de cada processo.
+"""
+
+EXTENSAO = ".mc"
+TAMANHO_DO_GRUPO = 256 * 1024 # Bytes de código-fonte por tarefa (no máximo)
+GRUPOS_POR_PROCESSO = 8 # Grupos menores quando o lote é pequeno, para equilibrar a carga
+
+class ResultadoDoArquivo:
+  __slots__ = ("caminho", "sucesso", "erros")
+
+  def __init__(self, caminho, sucesso, erros):
+    self.caminho = caminho
+    self.sucesso = sucesso
+    self.erros = erros # Mensagens, na ordem em que o main.py as imprimiria
+
+# Arquivos, diretórios e padrões glob -> lista de arquivos (sem repetição).
+# Um padrão sem correspondência é mantido, para ser reportado como erro.
+def expandir_entradas(entradas):
+  arquivos = []
+  vistos = set()
+  for entrada in entradas:
+    if os.path.isdir(entrada):
+      encontrados = []
+      for raiz, diretorios, nomes in os.walk(entrada):
+        diretorios.sort()
+        encontrados.extend(os.path.join(raiz, nome) for nome in sorted(nomes) if nome.endswith(EXTENSAO))
+    elif glob.has_magic(entrada):
+      encontrados = sorted(glob.glob(entrada, recursive=True)) or [entrada]
+    else:
+      encontrados = [entrada]
+    for caminho in encontrados:
+      if caminho not in vistos:
+        vistos.add(caminho)
+        arquivos.append(caminho)
+  return arquivos
+
+# Analisa um código-fonte e retorna a lista de erros (vazia = sucesso)
+def verificar_codigo(codigo_fonte, parser="recursivo", recuperar=False, max_erros=MAX_ERROS, cache=None):
+  opcoes = opcoes_da_analise(recuperar, max_erros)
+  em_cache = cache.carregar(codigo_fonte, opcoes) if cache is not None else None
+  if em_cache is not None:
+    tokens, resultado = em_cache
+  else:
+    tokens = AnalisadorLexico(codigo_fonte).tokenize(lote=True)
+    resultado = PARSERS[parser](tokens, recuperar=recuperar, max_erros=max_erros).parse()
+    if cache is not None:
+      cache.salvar(codigo_fonte, tokens, resultado, opcoes)
+  erros = []
+  # Sem --recuperar, o primeiro erro léxico é reportado à parte (como no main.py)
+  if tokens.diagnosticos and not recuperar:
+    erros.append(tokens.diagnosticos[0].mensagem)
+  if not resultado["sucesso"]:
+    return erros + [str(erro) for erro in resultado["erros"]]
+  semantica = analisar(resultado["arvore"], tokens.indice_linhas)
+  return erros + semantica["erros"]
+
+def verificar_arquivo(caminho, parser="recursivo", recuperar=False, max_erros=MAX_ERROS, cache=None):
+  try:
+    with open(caminho, "r", encoding="utf-8") as f:
+      codigo_fonte = f.read()
+    erros = verificar_codigo(codigo_fonte, parser, recuperar, max_erros, cache)
+  except FileNotFoundError:
+    erros = [f"Arquivo '{caminho}' não encontrado."]
+  except Exception as erro:
+    # Erros de leitura/codificação ou internos, como no main.py
+    erros = [f"Ocorreu um erro ao tentar processar o arquivo: {erro}"]
+  return ResultadoDoArquivo(caminho, not erros, erros)
+
+# Cache de cada processo do pool (criado na primeira tarefa)
+_cache_do_processo = None
+
+# Retorna os resultados do grupo e os contadores do cache só deste grupo
+# (o cache do processo acumula os de todas as tarefas que ele recebeu)
+def _verificar_grupo(caminhos, parser, recuperar, max_erros, usar_cache):
+  global _cache_do_processo
+  if not usar_cache:
+    return [verificar_arquivo(caminho, parser, recuperar, max_erros) for caminho in caminhos], Counter()
+  if _cache_do_processo is None:
+    _cache_do_processo = CacheDeCompilacao()
+  cache = _cache_do_processo
+  antes = Counter(cache.estatisticas())
+  resultados = [verificar_arquivo(caminho, parser, recuperar, max_erros, cache) for caminho in caminhos]
+  return resultados, Counter(cache.estatisticas()) - antes
+
+# Divide os arquivos em grupos consecutivos de cerca de 'limite' bytes
+def agrupar(arquivos, processos, tamanho_do_grupo=TAMANHO_DO_GRUPO):
+  tamanhos = []
+  for caminho in arquivos:
+    try:
+      tamanhos.append(os.path.getsize(caminho))
+    except OSError:
+      tamanhos.append(0) # Inexistente: o erro é reportado na verificação
+  limite = min(tamanho_do_grupo, sum(tamanhos) // (processos * GRUPOS_POR_PROCESSO) + 1)
+  grupos = []
+  grupo = []
+  acumulado = 0
+  for caminho, tamanho in zip(arquivos, tamanhos):
+    grupo.append(caminho)
+    acumulado += tamanho
+    if acumulado >= limite:
+      grupos.append(grupo)
+      grupo = []
+      acumulado = 0
+  if grupo:
+    grupos.append(grupo)
+  return grupos
+
+# Gera um ResultadoDoArquivo por arquivo, na ordem em que os grupos terminam.
+# processos=None usa um processo por núcleo; com 1, roda neste processo.
+# Os contadores do cache de todos os processos são somados em 'cache' (um
+# Counter), se informado.
+def verificar_lote(arquivos, processos=None, parser="recursivo", recuperar=False, max_erros=MAX_ERROS, usar_cache=True, cache=None):
+  processos = processos or os.cpu_count() or 1
+  opcoes = (parser, recuperar, max_erros, usar_cache)
+  if cache is None:
+    cache = Counter()
+  if processos == 1 or len(arquivos) <= 1:
+    for grupo in agrupar(arquivos, 1):
+      resultados, contadores = _verificar_grupo(grupo, *opcoes)
+      cache.update(contadores)
+      yield from resultados
+    return
+  with ProcessPoolExecutor(max_workers=processos) as executor:
+    tarefas = [executor.submit(_verificar_grupo, grupo, *opcoes) for grupo in agrupar(arquivos, processos)]
+    for tarefa in as_completed(tarefas):
+      resultados, contadores = tarefa.result()
+      cache.update(contadores)
+      yield from resultados
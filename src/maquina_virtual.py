@@ -0,0 +1,208 @@
+# src/maquina_virtual.py
+
+import sys
+from .semantico import REAL
+from .bytecode import (
+  CARREGAR, ARMAZENAR, CONSTANTE, SOMAR, SUBTRAIR, MULTIPLICAR,
+  DIVIDIR_INTEIRO, DIVIDIR_REAL, PARA_REAL, MENOR, MENOR_IGUAL, MAIOR,
+  MAIOR_IGUAL, IGUAL, DIFERENTE, SALTAR, SALTAR_SE_FALSO,
+  SALTAR_SE_FALSO_OU_DESEMPILHAR, SALTAR_SE_VERDADEIRO_OU_DESEMPILHAR,
+  LER_INTEIRO, LER_REAL, IMPRIMIR_VARIAVEL, IMPRIMIR_CADEIA, PARAR,
+  COM_ARGUMENTO,
+)
+"""
+MaquinaVirtual.py
+
+Executa o bytecode gerado por src/bytecode.py numa máquina de pilha.
+
+As variáveis ficam numa lista plana indexada pelo slot (INTEIRO começa em
+0 e REAL em 0.0). O laço de despacho é um único método: o código, as
+constantes, a pilha e as suas operações ficam em variáveis locais, e os
+opcodes são testados em ordem de frequência (acesso a variáveis,
+constantes e desvios primeiro).
+
+INTEIRO / INTEIRO trunca em direção a zero (7 / -2 == -3), e divisão por
+zero interrompe a execução com ErroDeExecucao.
+"""
+
+class ErroDeExecucao(Exception):
+  pass
+
+class MaquinaVirtual:
+  # 'entrada'/'saida' são arquivos de texto (padrão: sys.stdin/sys.stdout).
+  # 'indice_linhas' (IndiceDeLinhas do código-fonte) é usado só para
+  # mostrar linha/coluna nas mensagens de erro.
+  def __init__(self, programa, entrada=None, saida=None, indice_linhas=None):
+    self.programa = programa
+    self.entrada = entrada if entrada is not None else sys.stdin
+    self.saida = saida if saida is not None else sys.stdout
+    self.indice_linhas = indice_linhas
+    self.variaveis = [0.0 if tipo is REAL else 0 for tipo in programa.tipos]
+    self.instrucoes_executadas = 0
+
+  # Executa o programa até PARAR. Retorna o número de instruções executadas.
+  def executar(self):
+    # Lista em vez do array('i'): indexar uma lista não cria um int novo
+    codigo = self.programa.instrucoes.tolist()
+    constantes = self.programa.constantes
+    variaveis = self.variaveis
+    pilha = []
+    empilhar = pilha.append
+    desempilhar = pilha.pop
+    escrever = self.saida.write
+    # Contagem de instruções sem custo por instrução: ordem[endereço] diz
+    # quantas instruções vêm antes do endereço, e só os desvios tomados
+    # acumulam o tamanho do trecho em linha reta que acabou de ser executado.
+    # Executadas até 'pc' (inclusive) = ajuste + ordem[pc] + 1.
+    ordem = _ordem_das_instrucoes(codigo)
+    ajuste = 0
+    pc = 0
+    try:
+      while True:
+        op = codigo[pc]
+        if op == CARREGAR:
+          empilhar(variaveis[codigo[pc + 1]])
+          pc += 2
+        elif op == CONSTANTE:
+          empilhar(constantes[codigo[pc + 1]])
+          pc += 2
+        elif op == ARMAZENAR:
+          variaveis[codigo[pc + 1]] = desempilhar()
+          pc += 2
+        elif op == SALTAR_SE_FALSO:
+          if desempilhar():
+            pc += 2
+          else:
+            alvo = codigo[pc + 1]
+            ajuste += ordem[pc] + 1 - ordem[alvo]
+            pc = alvo
+        elif op == SALTAR:
+          alvo = codigo[pc + 1]
+          ajuste += ordem[pc] + 1 - ordem[alvo]
+          pc = alvo
+        elif op == SOMAR:
+          direita = desempilhar()
+          pilha[-1] += direita
+          pc += 1
+        elif op == SUBTRAIR:
+          direita = desempilhar()
+          pilha[-1] -= direita
+          pc += 1
+        elif op == MULTIPLICAR:
+          direita = desempilhar()
+          pilha[-1] *= direita
+          pc += 1
+        elif op == MENOR:
+          direita = desempilhar()
+          pilha[-1] = pilha[-1] < direita
+          pc += 1
+        elif op == MENOR_IGUAL:
+          direita = desempilhar()
+          pilha[-1] = pilha[-1] <= direita
+          pc += 1
+        elif op == MAIOR:
+          direita = desempilhar()
+          pilha[-1] = pilha[-1] > direita
+          pc += 1
+        elif op == MAIOR_IGUAL:
+          direita = desempilhar()
+          pilha[-1] = pilha[-1] >= direita
+          pc += 1
+        elif op == IGUAL:
+          direita = desempilhar()
+          pilha[-1] = pilha[-1] == direita
+          pc += 1
+        elif op == DIFERENTE:
+          direita = desempilhar()
+          pilha[-1] = pilha[-1] != direita
+          pc += 1
+        elif op == DIVIDIR_INTEIRO:
+          direita = desempilhar()
+          esquerda = pilha[-1]
+          quociente = esquerda // direita
+          # '//' arredonda para baixo; corrige para truncar em direção a zero
+          if quociente < 0 and quociente * direita != esquerda:
+            quociente += 1
+          pilha[-1] = quociente
+          pc += 1
+        elif op == DIVIDIR_REAL:
+          direita = desempilhar()
+          pilha[-1] /= direita
+          pc += 1
+        elif op == SALTAR_SE_FALSO_OU_DESEMPILHAR:
+          if pilha[-1]:
+            desempilhar()
+            pc += 2
+          else:
+            alvo = codigo[pc + 1]
+            ajuste += ordem[pc] + 1 - ordem[alvo]
+            pc = alvo
+        elif op == SALTAR_SE_VERDADEIRO_OU_DESEMPILHAR:
+          if pilha[-1]:
+            alvo = codigo[pc + 1]
+            ajuste += ordem[pc] + 1 - ordem[alvo]
+            pc = alvo
+          else:
+            desempilhar()
+            pc += 2
+        elif op == PARA_REAL:
+          pilha[-1] = float(pilha[-1])
+          pc += 1
+        elif op == IMPRIMIR_VARIAVEL:
+          escrever(f"{variaveis[codigo[pc + 1]]}\n")
+          pc += 2
+        elif op == IMPRIMIR_CADEIA:
+          escrever(constantes[codigo[pc + 1]] + "\n")
+          pc += 2
+        elif op == LER_INTEIRO or op == LER_REAL:
+          slot = codigo[pc + 1]
+          variaveis[slot] = self._ler(slot, float if op == LER_REAL else int, pc)
+          pc += 2
+        elif op == PARAR:
+          return ajuste + ordem[pc] + 1
+        else:
+          raise ErroDeExecucao(f"ERRO DE EXECUÇÃO: Instrução inválida {op} no endereço {pc}.")
+    except ZeroDivisionError:
+      raise self._erro("Divisão por zero", pc) from None
+    finally:
+      self.instrucoes_executadas = ajuste + ordem[pc] + 1
+
+  # Lê uma linha da entrada e converte para o tipo da variável
+  def _ler(self, slot, conversao, pc):
+    nome = self.programa.nomes[slot]
+    linha = self.entrada.readline()
+    if not linha:
+      raise self._erro(f"Fim da entrada ao ler a variável '{nome}'", pc)
+    texto = linha.strip()
+    try:
+      return conversao(texto)
+    except ValueError:
+      tipo = "REAL" if conversao is float else "INTEIRO"
+      raise self._erro(f"Valor inválido '{texto}' para a variável {tipo} '{nome}'", pc) from None
+
+  # --- Mensagens ---
+
+  def _erro(self, mensagem, pc):
+    inicio = self.programa.posicoes.get(pc)
+    if inicio is None:
+      posicao = f"no endereço {pc}"
+    elif self.indice_linhas is None:
+      posicao = f"na posição {inicio}"
+    else:
+      linha, coluna = self.indice_linhas.linha_coluna(inicio)
+      posicao = f"na linha {linha}, coluna {coluna}"
+    return ErroDeExecucao(f"ERRO DE EXECUÇÃO: {mensagem} {posicao}.")
+
+# Para cada endereço, quantas instruções completas vêm antes dele
+def _ordem_das_instrucoes(codigo):
+  ordem = [0] * len(codigo)
+  endereco = contagem = 0
+  while endereco < len(codigo):
+    ordem[endereco] = contagem
+    contagem += 1
+    endereco += 2 if codigo[endereco] in COM_ARGUMENTO else 1
+  return ordem
+
+# Executa um ProgramaCompilado; retorna o número de instruções executadas
+def executar(programa, entrada=None, saida=None, indice_linhas=None):
+  return MaquinaVirtual(programa, entrada, saida, indice_linhas).executar()
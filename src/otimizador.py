@@ -0,0 +1,493 @@
+# src/otimizador.py
+
+from .token_type import TiposDeToken
+from .semantico import INTEIRO, REAL
+from . import arvore
+"""
+Otimizador.py
+
+Passos de otimização sobre a AST, depois da análise semântica (usam os
+tipos da TabelaDeSimbolos e o slot de cada Var). Cada passo pode ser
+ligado ou desligado e informa quantos nós eliminou:
+
+  - constantes: dobra operações entre literais, com a semântica de
+    INTEIRO/REAL da máquina virtual ((2*3)+1 -> 7, 7/2 -> 3, 7/2.0 -> 3.5);
+  - algebra:    simplificações algébricas (x*1, 1*x, x/1 -> x; x+0, x-0
+    e x*0 só para INTEIRO, para não mudar -0.0 e NaN em REAL);
+  - logica:     simplifica cadeias E/OU com operandos constantes
+    (x E 1 < 2 -> x; 1 > 2 E x -> 1 > 2);
+  - ramos:      remove SE cuja condição é constante (fica só o ramo que
+    executa) e ENQUANTO cuja condição é sempre falsa;
+  - copias:     propagação de cópias: depois de 'aux = x', as leituras de
+    'aux' viram leituras de 'x' enquanto nenhuma das duas for alterada.
+    Informa quantas leituras foram substituídas.
+
+Uma expressão só é descartada se não puder falhar na execução (não tem
+divisão por algo que não seja uma constante diferente de zero): otimizar
+não pode fazer sumir um erro de "Divisão por zero".
+"""
+
+PASSOS = ("constantes", "algebra", "logica", "ramos", "copias")
+
+# Operações entre constantes (a divisão é tratada à parte)
+_OPERACOES = {
+  "+": lambda a, b: a + b,
+  "-": lambda a, b: a - b,
+  "*": lambda a, b: a * b,
+}
+_COMPARACOES = {
+  "<": lambda a, b: a < b,
+  "<=": lambda a, b: a <= b,
+  ">": lambda a, b: a > b,
+  ">=": lambda a, b: a >= b,
+  "==": lambda a, b: a == b,
+  "!=": lambda a, b: a != b,
+}
+
+class Otimizador:
+  # 'tabela' é a TabelaDeSimbolos da análise semântica (sem erros) da AST
+  def __init__(self, programa, tabela, passos=PASSOS):
+    desconhecidos = set(passos) - set(PASSOS)
+    if desconhecidos:
+      raise ValueError(f"Passo de otimização desconhecido: {', '.join(sorted(desconhecidos))}")
+    self.programa = programa
+    self.tabela = tabela
+    self.passos = tuple(passo for passo in PASSOS if passo in passos) # Sempre na ordem de PASSOS
+
+  # Aplica os passos (alterando a AST) e retorna {passo: nós eliminados}
+  def otimizar(self):
+    relatorio = {}
+    for passo in self.passos:
+      relatorio[passo] = getattr(self, f"_passo_{passo}")()
+    return relatorio
+
+  # --- Passos sobre expressões ---
+
+  def _passo_constantes(self):
+    return self._reescrever_expressoes(self._dobrar_constante)
+
+  def _passo_algebra(self):
+    return self._reescrever_expressoes(self._simplificar_algebra)
+
+  def _passo_logica(self):
+    return self._reescrever_expressoes(self._simplificar_logica)
+
+  # As regras recebem o nó (com os filhos já reescritos), o seu tipo e um
+  # Resumo de cada filho, e retornam o nó que o substitui: o próprio nó, um
+  # dos filhos ou um Literal novo.
+
+  # BinOp entre dois literais -> literal
+  def _dobrar_constante(self, no, tipo, esquerda, direita):
+    if type(no) is not arvore.BinOp or type(no.esquerda) is not arvore.Literal or type(no.direita) is not arvore.Literal:
+      return no
+    a, b = _valor(no.esquerda), _valor(no.direita)
+    try:
+      if no.op == "/":
+        if b == 0:
+          return no # Divisão por zero fica para a execução
+        resultado = _dividir_inteiro(a, b) if tipo is INTEIRO else a / b
+      else:
+        resultado = _OPERACOES[no.op](a, b)
+    except OverflowError:
+      return no
+    return _literal(resultado, tipo, no.inicio)
+
+  def _simplificar_algebra(self, no, tipo, esquerda, direita):
+    if type(no) is not arvore.BinOp:
+      return no
+    op = no.op
+    # O operando que fica precisa ter o tipo do resultado (x*1.0 é REAL)
+    if _eh_constante(no.direita, 1) and (op == "*" or op == "/") and esquerda.tipo is tipo:
+      return no.esquerda
+    if _eh_constante(no.esquerda, 1) and op == "*" and direita.tipo is tipo:
+      return no.direita
+    if tipo is INTEIRO:
+      if _eh_constante(no.direita, 0) and (op == "+" or op == "-"):
+        return no.esquerda
+      if _eh_constante(no.esquerda, 0) and op == "+":
+        return no.direita
+      if op == "*" and (
+        _eh_constante(no.direita, 0) and esquerda.puro or _eh_constante(no.esquerda, 0) and direita.puro
+      ):
+        return _literal(0, INTEIRO, no.inicio)
+    return no
+
+  # E/OU com um operando constante. O operando esquerdo é avaliado primeiro,
+  # então só pode ser descartado se for puro.
+  def _simplificar_logica(self, no, tipo, esquerda, direita):
+    if type(no) is not arvore.BoolOp:
+      return no
+    absorvente = no.op == "OU" # Valor que decide o resultado: falso em E, verdadeiro em OU
+    if esquerda.valor is not None:
+      return no.esquerda if esquerda.valor is absorvente else no.direita
+    if direita.valor is not None:
+      if direita.valor is not absorvente:
+        return no.esquerda
+      if esquerda.puro:
+        return no.direita
+    return no
+
+  # Aplica 'regra' em pós-ordem a todas as expressões dos comandos e
+  # retorna quantos nós foram eliminados
+  def _reescrever_expressoes(self, regra):
+    eliminados = 0
+    for comando in self._todos_os_comandos():
+      classe = type(comando)
+      if classe is arvore.Atribuicao:
+        comando.expressao, removidos = self._reescrever(comando.expressao, regra)
+      elif classe is arvore.Se or classe is arvore.Enquanto:
+        comando.condicao, removidos = self._reescrever(comando.condicao, regra)
+      else:
+        continue
+      eliminados += removidos
+    return eliminados
+
+  # Pós-ordem iterativa: os filhos são reescritos antes do pai. Para cada
+  # nó reescrito guarda um Resumo (calculado a partir dos filhos, para que
+  # cadeias longas não sejam percorridas de novo a cada nível).
+  def _reescrever(self, expressao, regra):
+    eliminados = 0
+    resultados = [] # (nó reescrito, Resumo)
+    pendentes = [(expressao, False)]
+    while pendentes:
+      no, filhos_prontos = pendentes.pop()
+      classe = type(no)
+      if classe is arvore.Var or classe is arvore.Literal:
+        resultados.append((no, self._resumo_da_folha(no)))
+        continue
+      if not filhos_prontos:
+        pendentes.append((no, True))
+        pendentes.append((no.direita, False))
+        pendentes.append((no.esquerda, False))
+        continue
+      (direita, resumo_direita), (esquerda, resumo_esquerda) = resultados.pop(), resultados.pop()
+      no.esquerda, no.direita = esquerda, direita
+      resumo = _combinar(no, resumo_esquerda, resumo_direita)
+      novo = regra(no, resumo.tipo, resumo_esquerda, resumo_direita)
+      if novo is esquerda:
+        eliminados += resumo.tamanho - resumo_esquerda.tamanho
+        resumo = resumo_esquerda
+      elif novo is direita:
+        eliminados += resumo.tamanho - resumo_direita.tamanho
+        resumo = resumo_direita
+      elif novo is not no: # Literal novo
+        eliminados += resumo.tamanho - 1
+        resumo = self._resumo_da_folha(novo)
+      resultados.append((novo, resumo))
+    return resultados[0][0], eliminados
+
+  def _resumo_da_folha(self, no):
+    if type(no) is arvore.Var:
+      return Resumo(self.tabela.tipo(no.slot), True, None, 1)
+    return Resumo(INTEIRO if no.tipo == TiposDeToken.NUMINT else REAL, True, None, 1)
+
+  # --- Passo sobre comandos: ramos mortos ---
+
+  def _passo_ramos(self):
+    eliminados = 0
+    # Cada item é uma lista de comandos ou um campo (nó, nome) com um comando
+    pendentes = [self.programa.comandos]
+    while pendentes:
+      item = pendentes.pop()
+      if type(item) is list:
+        restantes = []
+        for comando in item:
+          novo, removidos = self._podar(comando)
+          eliminados += removidos
+          if novo is not None:
+            restantes.append(novo)
+        item[:] = restantes
+        filhos = restantes
+      else:
+        no, campo = item
+        novo, removidos = self._podar(getattr(no, campo))
+        eliminados += removidos
+        if novo is None and campo != "senao":
+          novo = arvore.Bloco([], getattr(no, campo).inicio) # ENTAO/corpo vazio
+        setattr(no, campo, novo)
+        filhos = [novo] if novo is not None else []
+      for comando in filhos:
+        classe = type(comando)
+        if classe is arvore.Se:
+          pendentes.append((comando, "entao"))
+          if comando.senao is not None:
+            pendentes.append((comando, "senao"))
+        elif classe is arvore.Enquanto:
+          pendentes.append((comando, "corpo"))
+        elif classe is arvore.Bloco:
+          pendentes.append(comando.comandos)
+    return eliminados
+
+  # Substitui um SE de condição constante pelo ramo que executa (None se
+  # nenhum) e remove ENQUANTO de condição falsa. Retorna (comando, eliminados).
+  def _podar(self, comando):
+    eliminados = 0
+    while True:
+      classe = type(comando)
+      if classe is arvore.Se:
+        valor = _valor_constante(comando.condicao)
+        if valor is None:
+          break
+        restante, descartado = (comando.entao, comando.senao) if valor else (comando.senao, comando.entao)
+        # O SE, a condição e o ramo que não executa
+        eliminados += 1 + _tamanho(comando.condicao) + _tamanho(descartado)
+      elif classe is arvore.Enquanto and _valor_constante(comando.condicao) is False:
+        restante = None
+        eliminados += _tamanho(comando)
+      else:
+        break
+      comando = restante
+      if comando is None:
+        break
+    return comando, eliminados
+
+  # --- Passo de propagação de cópias ---
+
+  def _passo_copias(self):
+    atribuidas = self._variaveis_atribuidas()
+    substituidas = 0
+    copias = {} # slot do destino -> Var de origem ('destino = origem')
+    pendentes = list(reversed(self.programa.comandos))
+    while pendentes:
+      comando = pendentes.pop()
+      if type(comando) is dict: # Estado das cópias ao sair de um SE/ENQUANTO
+        copias = dict(comando)
+        continue
+      classe = type(comando)
+      if classe is arvore.Atribuicao:
+        comando.expressao, trocas = _substituir(comando.expressao, copias)
+        substituidas += trocas
+        destino = comando.alvo.slot
+        copias = _sem_variaveis(copias, 1 << destino)
+        origem = comando.expressao
+        if (
+          type(origem) is arvore.Var and origem.slot != destino and
+          self.tabela.tipo(origem.slot) is self.tabela.tipo(destino)
+        ):
+          copias[destino] = origem
+      elif classe is arvore.Ler:
+        copias = _sem_variaveis(copias, 1 << comando.alvo.slot)
+      elif classe is arvore.Imprimir:
+        var = comando.valor
+        if type(var) is arvore.Var and var.slot in copias:
+          comando.valor = _copia_de(copias[var.slot], var)
+          substituidas += 1
+      elif classe is arvore.Se:
+        comando.condicao, trocas = _substituir(comando.condicao, copias)
+        substituidas += trocas
+        # Cada ramo começa com as cópias de antes do SE; depois do SE valem
+        # só as que nenhum dos ramos alterou
+        pendentes.append(_sem_variaveis(copias, atribuidas[id(comando)]))
+        if comando.senao is not None:
+          pendentes.append(comando.senao)
+          pendentes.append(dict(copias))
+        pendentes.append(comando.entao)
+      elif classe is arvore.Enquanto:
+        # A condição e o corpo rodam de novo depois do corpo: valem só as
+        # cópias que o corpo não altera
+        copias = _sem_variaveis(copias, atribuidas[id(comando)])
+        comando.condicao, trocas = _substituir(comando.condicao, copias)
+        substituidas += trocas
+        pendentes.append(dict(copias))
+        pendentes.append(comando.corpo)
+      elif classe is arvore.Bloco:
+        pendentes.extend(reversed(comando.comandos))
+    return substituidas
+
+  # Para cada SE/ENQUANTO/Bloco, a máscara de bits (por slot) das variáveis
+  # atribuídas dentro dele. Pós-ordem iterativa.
+  def _variaveis_atribuidas(self):
+    mascaras = {}
+    pendentes = [(comando, False) for comando in self.programa.comandos]
+    while pendentes:
+      comando, filhos_prontos = pendentes.pop()
+      classe = type(comando)
+      if classe is arvore.Atribuicao or classe is arvore.Ler:
+        mascaras[id(comando)] = 1 << comando.alvo.slot
+        continue
+      if classe is arvore.Se:
+        filhos = [comando.entao] if comando.senao is None else [comando.entao, comando.senao]
+      elif classe is arvore.Enquanto:
+        filhos = [comando.corpo]
+      elif classe is arvore.Bloco:
+        filhos = comando.comandos
+      else:
+        mascaras[id(comando)] = 0
+        continue
+      if filhos_prontos:
+        mascara = 0
+        for filho in filhos:
+          mascara |= mascaras[id(filho)]
+        mascaras[id(comando)] = mascara
+      else:
+        pendentes.append((comando, True))
+        pendentes.extend((filho, False) for filho in filhos)
+    return mascaras
+
+  # --- Percurso ---
+
+  # Todos os comandos do programa, em qualquer nível de aninhamento
+  def _todos_os_comandos(self):
+    pendentes = list(self.programa.comandos)
+    while pendentes:
+      comando = pendentes.pop()
+      yield comando
+      classe = type(comando)
+      if classe is arvore.Se:
+        pendentes.append(comando.entao)
+        if comando.senao is not None:
+          pendentes.append(comando.senao)
+      elif classe is arvore.Enquanto:
+        pendentes.append(comando.corpo)
+      elif classe is arvore.Bloco:
+        pendentes.extend(comando.comandos)
+
+# Otimiza a AST (já analisada) e retorna {passo: nós eliminados}
+def otimizar(programa, tabela, passos=PASSOS):
+  return Otimizador(programa, tabela, passos).otimizar()
+
+# --- Auxiliares ---
+
+def _valor(literal):
+  return int(literal.texto) if literal.tipo == TiposDeToken.NUMINT else float(literal.texto)
+
+def _literal(valor, tipo, inicio):
+  if tipo is INTEIRO:
+    return arvore.Literal(TiposDeToken.NUMINT, str(valor), inicio)
+  return arvore.Literal(TiposDeToken.NUMREAL, repr(float(valor)), inicio)
+
+# INTEIRO / INTEIRO truncado em direção a zero (como DIVIDIR_INTEIRO)
+def _dividir_inteiro(a, b):
+  quociente = a // b
+  if quociente < 0 and quociente * b != a:
+    quociente += 1
+  return quociente
+
+def _eh_constante(expressao, valor):
+  return type(expressao) is arvore.Literal and _valor(expressao) == valor
+
+# O que os passos precisam saber de uma subexpressão:
+#   tipo:    INTEIRO/REAL (None em condições)
+#   puro:    não pode falhar na execução (sem divisão por algo que não seja
+#            um literal diferente de zero)
+#   valor:   valor de uma condição que não depende das variáveis, ou None
+#   tamanho: número de nós
+class Resumo:
+  __slots__ = ("tipo", "puro", "valor", "tamanho")
+
+  def __init__(self, tipo, puro, valor, tamanho):
+    self.tipo = tipo
+    self.puro = puro
+    self.valor = valor
+    self.tamanho = tamanho
+
+# Resumo de BinOp/RelOp/BoolOp a partir dos resumos dos filhos
+def _combinar(no, esquerda, direita):
+  classe = type(no)
+  puro = esquerda.puro and direita.puro
+  tamanho = 1 + esquerda.tamanho + direita.tamanho
+  if classe is arvore.BinOp:
+    tipo = REAL if esquerda.tipo is REAL or direita.tipo is REAL else INTEIRO
+    if no.op == "/" and not (type(no.direita) is arvore.Literal and _valor(no.direita) != 0):
+      puro = False
+    return Resumo(tipo, puro, None, tamanho)
+  if classe is arvore.RelOp:
+    valor = None
+    if type(no.esquerda) is arvore.Literal and type(no.direita) is arvore.Literal:
+      valor = _COMPARACOES[no.op](_valor(no.esquerda), _valor(no.direita))
+    return Resumo(None, puro, valor, tamanho)
+  # E/OU com curto-circuito: '1 > 2 E x' é falso; 'x E 1 > 2' só se x for puro
+  absorvente = no.op == "OU"
+  if esquerda.valor is absorvente:
+    valor = absorvente
+  elif esquerda.valor is not None:
+    valor = direita.valor
+  elif direita.valor is absorvente and esquerda.puro:
+    valor = absorvente
+  else:
+    valor = None
+  return Resumo(None, puro, valor, tamanho)
+
+# Valor de uma condição que não depende das variáveis (True/False), ou None
+def _valor_constante(condicao):
+  if type(condicao) is not arvore.RelOp and type(condicao) is not arvore.BoolOp:
+    return None
+  resumos = []
+  pendentes = [(condicao, False)]
+  while pendentes:
+    no, filhos_prontos = pendentes.pop()
+    classe = type(no)
+    if classe is not arvore.BinOp and classe is not arvore.RelOp and classe is not arvore.BoolOp:
+      resumos.append(Resumo(None, True, None, 1))
+    elif filhos_prontos:
+      direita, esquerda = resumos.pop(), resumos.pop()
+      resumos.append(_combinar(no, esquerda, direita))
+    else:
+      pendentes.append((no, True))
+      pendentes.append((no.direita, False))
+      pendentes.append((no.esquerda, False))
+  return resumos[0].valor
+
+# Número de nós de uma subárvore (expressão ou comando)
+def _tamanho(no):
+  total = 0
+  pendentes = [no]
+  while pendentes:
+    no = pendentes.pop()
+    if no is None:
+      continue
+    total += 1
+    classe = type(no)
+    if classe is arvore.BinOp or classe is arvore.RelOp or classe is arvore.BoolOp:
+      pendentes.append(no.esquerda)
+      pendentes.append(no.direita)
+    elif classe is arvore.Atribuicao:
+      pendentes.append(no.alvo)
+      pendentes.append(no.expressao)
+    elif classe is arvore.Ler:
+      pendentes.append(no.alvo)
+    elif classe is arvore.Imprimir:
+      pendentes.append(no.valor)
+    elif classe is arvore.Se:
+      pendentes.extend((no.condicao, no.entao, no.senao))
+    elif classe is arvore.Enquanto:
+      pendentes.extend((no.condicao, no.corpo))
+    elif classe is arvore.Bloco:
+      pendentes.extend(no.comandos)
+  return total
+
+# Cópia sem as entradas que envolvem as variáveis da máscara
+def _sem_variaveis(copias, mascara):
+  return {
+    destino: origem for destino, origem in copias.items()
+    if not (mascara >> destino) & 1 and not (mascara >> origem.slot) & 1
+  }
+
+# Nova leitura da variável de origem, na posição da leitura substituída
+def _copia_de(origem, var):
+  copia = arvore.Var(origem.nome, var.inicio)
+  copia.slot = origem.slot
+  return copia
+
+# Troca, numa expressão, as leituras de variáveis que são cópias
+def _substituir(expressao, copias):
+  if not copias:
+    return expressao, 0
+  trocas = 0
+  if type(expressao) is arvore.Var:
+    if expressao.slot in copias:
+      return _copia_de(copias[expressao.slot], expressao), 1
+    return expressao, 0
+  pendentes = [expressao]
+  while pendentes:
+    no = pendentes.pop()
+    if type(no) is arvore.BinOp or type(no) is arvore.RelOp or type(no) is arvore.BoolOp:
+      for campo in ("esquerda", "direita"):
+        filho = getattr(no, campo)
+        if type(filho) is arvore.Var:
+          if filho.slot in copias:
+            setattr(no, campo, _copia_de(copias[filho.slot], filho))
+            trocas += 1
+        else:
+          pendentes.append(filho)
+  return expressao, trocas
@@ -1,12 +1,22 @@
 # src/parser.py
 
 from .token_type import TiposDeToken
-
-# Classe de Exceção para Erros Sintáticos, para replicar a lógica do JS
+from .token_stream import TokenStream
+from .arvore import FABRICA_ARVORE, FABRICA_NULA
+from .gramatica import carregar_tabelas, nome_do_metodo
+from .estatisticas import SEM_ESTATISTICAS
+from .diagnostico import (
+  DiagnosticoSintatico, SEM_TOKEN, TOKEN_INESPERADO, TEXTO_INESPERADO, TIPO_INVALIDO, FATOR_INVALIDO,
+  OPERADOR_BOOLEANO_INVALIDO, INICIO_DE_COMANDO_INVALIDO, VALOR_DE_SAIDA_INVALIDO, ERRO_LEXICO, ANALISE_ABORTADA,
+)
+
+# Classe de Exceção para Erros Sintáticos, para replicar a lógica do JS.
+# Carrega o DiagnosticoSintatico; a mensagem só é montada por str().
 class SyntaxError(Exception):
-    def __init__(self, message, token=None):
-        super().__init__(message)
-        self.token = token # Armazena o token para contexto
+    def __init__(self, diagnostico):
+        super().__init__(diagnostico)
+        self.diagnostico = diagnostico
+        self.token = diagnostico.token # Armazena o token para contexto
         self.is_syntax_error = True # Simula o atributo _syntaxError
 """
 Implementação do Analisador Sintático Descendente Preditivo Recursivo.
@@ -14,41 +24,192 @@ Implementação do Analisador Sintático Descendente Preditivo Recursivo.
 
 Este parser consome os tokens gerados pelo AnalisadorLexico (Ckp 1)
 e verifica se a estrutura do programa segue a gramática definida.
+Durante a análise, constrói a Árvore Sintática Abstrata (src/arvore.py);
+com construir_arvore=False, apenas valida, sem criar nós.
+"""
+# Tabelas LL(1) geradas a partir do gramatica.txt (src/gramatica.py).
+# Os conjuntos FIRST e a escolha do comando vêm da gramática, não de
+# testes escritos à mão.
+TABELAS = carregar_tabelas()
+INICIO_DECLARACAO = TABELAS.primeiros["declaracao"]
+INICIO_COMANDO = TABELAS.primeiros["comando"]
+OPERADORES_BOOLEANOS = TABELAS.primeiros["operadorBooleano"]
+# Regra escolhida para cada token que inicia um comando (ex.: SE -> comandoCondicao)
+REGRA_DO_COMANDO = {
+  chave: producao[0] for chave, producao in TABELAS.alternativas_por_chave("comando").items()
+}
+
 """
+Conjuntos de sincronização da recuperação de erros (modo pânico), tirados
+dos FOLLOW da gramática. Identificadores ficam de fora, pois também
+aparecem no meio das expressões: na sincronização, um identificador só
+para o descarte quando é o primeiro token da sua linha.
+"""
+VARIAVEIS = frozenset((TiposDeToken.IDENTIFICADOR, TiposDeToken.PALAVRA_RESERVADA_VARIAVEL))
+# Palavras que iniciam comandos, 'FIM', 'SENAO' e o fim do arquivo
+SINCRONIA_COMANDO = (INICIO_COMANDO | TABELAS.seguintes["comando"]) - VARIAVEIS
+# ':' (de ':ALGORITMO') e, se o cabeçalho faltar, os comandos
+SINCRONIA_DECLARACAO = (TABELAS.seguintes["declaracao"] - VARIAVEIS) | SINCRONIA_COMANDO
+# Na condição do 'SE', o 'ENTAO' (o FOLLOW de expressaoRelacional neste contexto)
+SINCRONIA_CONDICAO = SINCRONIA_COMANDO | {TiposDeToken.PALAVRA_RESERVADA_ENTAO}
+MAX_ERROS = 100 # Limite padrão de erros por análise no modo de recuperação
+
+# Tipos esperados de cada diagnóstico sintático, montados uma vez: um erro
+# só guarda a referência ao conjunto, sem criar nada além do registro
+ESPERADO = {tipo: frozenset((tipo,)) for tipo in TiposDeToken} # _expect
+ESPERADOS_TIPO = TABELAS.primeiros["tipoVar"]
+ESPERADOS_FATOR = TABELAS.primeiros["expressaoAritmetica"]
+ESPERADOS_SAIDA = frozenset((
+  TiposDeToken.PALAVRA_RESERVADA_VARIAVEL, TiposDeToken.IDENTIFICADOR, TiposDeToken.CADEIA,
+))
+
+# Interrompe a análise quando o limite de erros é atingido
+class LimiteDeErros(Exception):
+  pass
+
 class Parser:
-  def __init__(self, scanner):
+  # 'scanner' é o AnalisadorLexico (lido sob demanda) ou um TokenStream
+  # já gerado (lido por um CursorDeTokens, sem varrer o código de novo).
+  # Qualquer objeto com proximo_token() também é aceito.
+  # recuperar=False: para no primeiro erro (comportamento original).
+  # recuperar=True: registra o erro, sincroniza e continua, até max_erros.
+  # 'estatisticas' (src/estatisticas.py) liga os contadores de regras e
+  # consultas à instância; o padrão não liga nada.
+  def __init__(self, scanner, construir_arvore=True, recuperar=False, max_erros=MAX_ERROS,
+               estatisticas=SEM_ESTATISTICAS):
+    if isinstance(scanner, TokenStream):
+      scanner = scanner.cursor()
     self.scanner = scanner # O Analisador Léxico (Ckp 1)
     self.current = None # O token atual
     self.errors = [] # Lista de erros sintáticos (Req 3 - Ckp 2) 
+    self.recuperar = recuperar
+    self.max_erros = max_erros
+    self._sincronizado_em = None # Posição em que terminou a última sincronização
+    # Fábrica dos nós da AST; no modo só-validação, não cria nada
+    self.nos = FABRICA_ARVORE if construir_arvore else FABRICA_NULA
+    # Antes do despacho, que guarda os métodos (já contados, se for o caso)
+    estatisticas.instrumentar_parser(self)
+    # Despacho de 'comando': token atual -> método da regra (ex.: _comando_condicao)
+    self._despacho_comando = {
+      chave: getattr(self, nome_do_metodo(regra)) for chave, regra in REGRA_DO_COMANDO.items()
+    }
 
   # Ponto de entrada do Analisador Sintático.
   def parse(self):
-    self._advance() # Pega o primeiro token
+    if self.recuperar:
+      return self._parse_com_recuperacao()
     try:
-      self._programa() # Inicia pela regra principal da gramática
+      # Dentro do try: um erro léxico já no primeiro token também vira erro
+      # da análise, e não uma exceção para quem chamou
+      self._advance() # Pega o primeiro token
+      arvore = self._programa() # Inicia pela regra principal da gramática
       self._expect(TiposDeToken.FIM_DE_ARQUIVO) # Espera o fim do arquivo
-      return {"sucesso": True, "erros": []}
+      return {"sucesso": True, "erros": [], "arvore": arvore}
     except SyntaxError as e:
       # Se for um erro sintático conhecido (inclui erro léxico que abortou)
-      self.errors.append(str(e))
-      return {"sucesso": False, "erros": self.errors}
+      self.errors.append(e.diagnostico)
+      return {"sucesso": False, "erros": self.errors, "arvore": None}
     except Exception:
       # Se for outro erro (ex: erro interno)
       raise
 
+  # Analisa um trecho que contém só comandos (um pedaço do :ALGORITMO,
+  # usado pela análise em paralelo). Sem recuperação de erros.
+  def parse_comandos(self):
+    try:
+      self._advance()
+      comandos = self._lista_comandos()
+      self._expect(TiposDeToken.FIM_DE_ARQUIVO)
+      return {"sucesso": True, "erros": [], "comandos": comandos}
+    except SyntaxError as e:
+      self.errors.append(e.diagnostico)
+      return {"sucesso": False, "erros": self.errors, "comandos": None}
+
+  # Análise completa com recuperação: todos os erros léxicos e sintáticos
+  # numa única passada. A AST só é retornada se não houver erros.
+  def _parse_com_recuperacao(self):
+    arvore = None
+    try:
+      self._advance()
+      arvore = self._programa()
+      while True:
+        try:
+          self._expect(TiposDeToken.FIM_DE_ARQUIVO)
+          break
+        except SyntaxError as erro:
+          # Sobrou algo depois do programa: descarta o token e continua nos
+          # próximos comandos. Um identificador no início da linha seguinte já
+          # é um ponto de sincronização: a análise recomeça nele (sincronizar
+          # avançaria antes de testá-lo e descartaria o comando inteiro).
+          self._registrar(erro)
+          linha = self.current.linha
+          self._advance()
+          if self.current.tipo not in VARIAVEIS or self.current.linha == linha:
+            self._sincronizar(SINCRONIA_COMANDO)
+          if self._is_inicio_comando():
+            comandos = self._lista_comandos()
+            if arvore is not None:
+              arvore.comandos.extend(comandos)
+    except LimiteDeErros:
+      pass
+    sucesso = not self.errors
+    return {"sucesso": sucesso, "erros": self.errors, "arvore": arvore if sucesso else None}
+
+  # --- Recuperação de Erros (modo pânico) ---
+
+  # Registra um erro sintático. Um erro no mesmo token em que a última
+  # sincronização parou (nenhum token consumido desde então) é consequência
+  # do anterior e não é registrado.
+  def _registrar(self, erro):
+    if erro.token is not None and erro.token.offset == self._sincronizado_em:
+      return
+    self._adicionar_erro(erro.diagnostico)
+
+  # Os erros são diagnósticos (src/diagnostico.py), formatados só na exibição
+  def _adicionar_erro(self, diagnostico):
+    self.errors.append(diagnostico)
+    if self.max_erros is not None and len(self.errors) >= self.max_erros:
+      raise LimiteDeErros()
+
+  # Trata um erro capturado numa regra: sem recuperação, propaga-o;
+  # com recuperação, registra-o e descarta tokens até a 'sincronia'.
+  def _recuperar_de(self, erro, sincronia):
+    if not self.recuperar:
+      raise erro
+    self._registrar(erro)
+    self._sincronizar(sincronia)
+
+  # Descarta tokens até um tipo da 'sincronia', o fim do arquivo ou um
+  # identificador no início de uma linha (provável início de comando).
+  def _sincronizar(self, sincronia):
+    linha = self.current.linha
+    while self.current.tipo not in sincronia and self.current.tipo != TiposDeToken.FIM_DE_ARQUIVO:
+      self._advance()
+      if self.current.tipo in VARIAVEIS and self.current.linha != linha:
+        break
+      linha = self.current.linha
+    self._sincronizado_em = self.current.offset
+
   # --- Métodos Utilitários do Parser ---
 
   # Consome o token atual e pega o próximo do Analisador Léxico.
   # Se o léxico retornar 'None' (erro léxico), levanta um erro sintático
   # para abortar a análise.
+  # Com recuperação, o erro léxico é registrado e o token inválido, ignorado.
   def _advance(self):
     t = self.scanner.proximo_token()
     while t is None:
       # Se t for 'None', o Scanner (Ckp 1) encontrou um erro léxico.
+      if self.recuperar:
+        erro = getattr(self.scanner, "ultimo_erro", None)
+        self._adicionar_erro(erro if erro is not None else DiagnosticoSintatico(ERRO_LEXICO))
+        t = self.scanner.proximo_token()
+        if t is not None:
+          # Um erro sintático logo no token seguinte é consequência do léxico
+          self._sincronizado_em = t.offset
+        continue
       # Aborta a análise sintática (Req 3 - Ckp 2) 
-      raise SyntaxError(
-        "Erro léxico encontrado. Abortando análise sintática."
-      )
+      raise SyntaxError(DiagnosticoSintatico(ANALISE_ABORTADA))
     self.current = t
 
   # Verifica se o token atual é do tipo esperado.
@@ -56,43 +217,32 @@ class Parser:
   # Se não for, levanta um erro sintático (Req 3 - Ckp 2).
   def _expect(self, tipo, texto: str = None):
     if not self.current:
-      return self._raise(
-        f"Esperado token do tipo {tipo.name}, mas não há token atual."
-      )
+      return self._raise(SEM_TOKEN, ESPERADO[tipo])
     if self.current.tipo != tipo:
-      return self._raise(
-        f"Esperado token do tipo {tipo.name}, encontrado {self._fmt_token(self.current)}."
-      )
+      return self._raise(TOKEN_INESPERADO, ESPERADO[tipo])
     # Verificação opcional de texto (ex: esperar '(' e não só LEFT_PAR)
     if texto is not None and self.current.texto != texto:
-      return self._raise(
-        f"Esperado token '{texto}', encontrado {self._fmt_token(self.current)}."
-      )
+      return self._raise(TEXTO_INESPERADO, ESPERADO[tipo], texto)
     self._advance() # Consome o token esperado
 
   # Verifica se o token atual é de um tipo (e texto) opcional.
   # Se for, consome e retorna 'True'.
   # Se não for, não faz nada e retorna 'False'.
+  # É a consulta mais frequente do Parser: o token atual é lido uma vez só.
   def _optional(self, tipo, texto: str = None):
-    if self.current and self.current.tipo == tipo:
-      if texto is None or self.current.texto == texto:
-        self._advance()
-        return True
+    atual = self.current
+    if atual and atual.tipo == tipo and (texto is None or atual.texto == texto):
+      self._advance()
+      return True
     return False
 
-  # Formata um token para exibição em mensagens de erro
-  def _fmt_token(self, tok):
-    pos = "em posição desconhecida"
-    if tok and tok.linha is not None and tok.coluna is not None:
-      pos = f"na linha {tok.linha}, coluna {tok.coluna}"
-    
-    # tok.tipo é um Enum, acessa-se o nome com .name
-    tipo_nome = tok.tipo.name if tok.tipo else "DESCONHECIDO"
-    return f"'{tok.texto}' ({tipo_nome}) {pos}"
-
-  # Dispara um erro sintático formatado (Req 3 - Ckp 2)
-  def _raise(self, msg):
-    raise SyntaxError(f"ERRO SINTÁTICO: {msg}", self.current)
+  # Dispara um erro sintático (Req 3 - Ckp 2): 'codigo' e 'esperados'
+  # formam o DiagnosticoSintatico, cuja mensagem só é montada na exibição.
+  # O token é copiado com como_token(), pois o 'current' pode ser um
+  # CursorDeTokens, que muda de posição a cada avanço.
+  def _raise(self, codigo, esperados=frozenset(), texto=None):
+    token = self.current.como_token() if self.current else None
+    raise SyntaxError(DiagnosticoSintatico(codigo, esperados, texto, token))
 
   # Verifica se o token atual é de um tipo específico
   def _is_current(self, tipo):
@@ -100,122 +250,143 @@ class Parser:
 
   # --- Implementação da Gramática (Ckp 2) ---
   # Os métodos abaixo correspondem às regras da gramática 
+  # Cada um retorna o nó da AST que reconheceu (None no modo só-validação).
+  # Texto e posição são lidos do token atual *antes* de consumi-lo, pois
+  # o 'current' pode ser um CursorDeTokens, que muda a cada avanço.
 
   # Regra: programa : ':' 'DECLARACOES' listaDeclaracoes ':' 'ALGORITMO' listaComandos;
   def _programa(self):
-    self._expect(TiposDeToken.DOIS_PONTOS, ":")
-    self._expect(TiposDeToken.PALAVRA_RESERVADA_DECLARACOES)
-    self._lista_declaracoes()
-    self._expect(TiposDeToken.DOIS_PONTOS, ":")
-    self._expect(TiposDeToken.PALAVRA_RESERVADA_ALGORITMO)
-    self._lista_comandos()
+    inicio = self.current.offset
+    self._secao(TiposDeToken.PALAVRA_RESERVADA_DECLARACOES, SINCRONIA_DECLARACAO)
+    declaracoes = self._lista_declaracoes()
+    self._secao(TiposDeToken.PALAVRA_RESERVADA_ALGORITMO, SINCRONIA_COMANDO)
+    comandos = self._lista_comandos()
+    return self.nos.Programa(declaracoes, comandos, inicio)
+
+  # Cabeçalho de seção: ':' 'DECLARACOES' ou ':' 'ALGORITMO'.
+  # Com recuperação, descarta até a palavra da seção ou o seu conteúdo.
+  def _secao(self, palavra, sincronia):
+    try:
+      self._expect(TiposDeToken.DOIS_PONTOS, ":")
+      self._expect(palavra)
+    except SyntaxError as erro:
+      self._recuperar_de(erro, sincronia | {palavra})
+      self._optional(palavra)
 
   # Regra: listaDeclaracoes : declaracao listaDeclaracoes | declaracao;
   # Implementação: (declaracao)+ (uma ou mais declarações)
   def _lista_declaracoes(self):
-    self._declaracao() # Deve ter pelo menos uma
-    while self._is_inicio_declaracao():
+    declaracoes = []
+    while True:
+      try:
+        declaracoes.append(self._declaracao()) # Deve ter pelo menos uma
+      except SyntaxError as erro:
+        self._recuperar_de(erro, SINCRONIA_DECLARACAO)
+      if not self._is_inicio_declaracao():
+        return declaracoes
       # Pode ter mais
-      self._declaracao()
   
   # Verifica se o token atual pode iniciar uma declaração
+  # Adaptado (Ckp 2, Req 4) : FIRST(declaracao) = IDENTIFICADOR (Ckp 1) ou 'VARIAVEL' (original)
   def _is_inicio_declaracao(self):
-    # Adaptado (Ckp 2, Req 4) : Inicia com IDENTIFICADOR (Ckp 1) ou 'VARIAVEL' (original)
-    return (
-      self._is_current(TiposDeToken.IDENTIFICADOR) or
-      self._is_current(TiposDeToken.PALAVRA_RESERVADA_VARIAVEL)
-    )
+    return self.current and self.current.tipo in INICIO_DECLARACAO
 
   # Regra Original (gramatica.txt): declaracao : VARIAVEL ':' tipoVar;
   # Regra Adaptada (Ckp 2, Req 4): O léxico Ckp 1 criou IDENTIFICADOR. 
   # Esta implementação aceita tanto 'VARIAVEL' (literal) quanto um IDENTIFICADOR.
   def _declaracao(self):
+    nome, inicio = self.current.texto, self.current.offset
     if self._is_current(TiposDeToken.PALAVRA_RESERVADA_VARIAVEL):
       self._advance() # Aceita a palavra-chave 'VARIAVEL'
     else:
       # Ou aceita um IDENTIFICADOR (ex: 'idade', 'nota')
       self._expect(TiposDeToken.IDENTIFICADOR)
     self._expect(TiposDeToken.DOIS_PONTOS, ":")
-    self._tipo_var()
+    tipo = self._tipo_var()
+    return self.nos.Declaracao(nome, tipo, inicio)
 
   # Regra: tipoVar : 'INTEIRO' | 'REAL';
+  # Retorna o tipo do token reconhecido.
   def _tipo_var(self):
     if self._optional(TiposDeToken.PALAVRA_RESERVADA_INTEIRO):
-      return
+      return TiposDeToken.PALAVRA_RESERVADA_INTEIRO
     if self._optional(TiposDeToken.PALAVRA_RESERVADA_REAL):
-      return
+      return TiposDeToken.PALAVRA_RESERVADA_REAL
     
     # Erro (Req 3 - Ckp 2) 
-    self._raise(
-      f"Tipo inválido. Esperado 'INTEIRO' ou 'REAL', encontrado {self._fmt_token(self.current)}."
-    )
+    self._raise(TIPO_INVALIDO, ESPERADOS_TIPO)
 
   # Regra (sem recursão): expressaoAritmetica : termoAritmetico (('+' | '-') termoAritmetico)*
   def _expressao_aritmetica(self):
-    self._termo_aritmetico()
+    esquerda = self._termo_aritmetico()
     while (
       self._is_current(TiposDeToken.OPERADOR_MATEMATICO) and
       (self.current.texto == "+" or self.current.texto == "-")
     ):
+      op, inicio = self.current.texto, self.current.offset
       self._advance() # Consome '+' ou '-'
-      self._termo_aritmetico()
+      esquerda = self.nos.BinOp(op, esquerda, self._termo_aritmetico(), inicio)
+    return esquerda
 
   # Regra (sem recursão): termoAritmetico : fatorAritmetico (('*' | '/') fatorAritmetico)*
   def _termo_aritmetico(self):
-    self._fator_aritmetico()
+    esquerda = self._fator_aritmetico()
     while (
       self._is_current(TiposDeToken.OPERADOR_MATEMATICO) and
       (self.current.texto == "*" or self.current.texto == "/")
     ):
+      op, inicio = self.current.texto, self.current.offset
       self._advance() # Consome '*' ou '/'
-      self._fator_aritmetico()
+      esquerda = self.nos.BinOp(op, esquerda, self._fator_aritmetico(), inicio)
+    return esquerda
 
   # Regra Original: fatorAritmetico : NUMINT | NUMREAL | VARIAVEL | '(' expressaoAritmetica ')'
   # Implementação Adaptada (Ckp 2, Req 4): 
   # Aceita NUMINT/NUMREAL (Ckp 1), VARIAVEL (literal), IDENTIFICADOR (Ckp 1),
   # ou '(' (Ckp 1) expressaoAritmetica ')' (Ckp 1).
   def _fator_aritmetico(self):
-    if self._optional(TiposDeToken.NUMINT):
-      return
-    if self._optional(TiposDeToken.NUMREAL):
-      return
-    if self._optional(TiposDeToken.IDENTIFICADOR):
-      return # Ckp 1
-    if self._optional(TiposDeToken.PALAVRA_RESERVADA_VARIAVEL):
-      return # Gramática Original
+    tipo = self.current.tipo if self.current else None
+    if tipo == TiposDeToken.NUMINT or tipo == TiposDeToken.NUMREAL:
+      no = self.nos.Literal(tipo, self.current.texto, self.current.offset)
+      self._advance()
+      return no
+    if tipo == TiposDeToken.IDENTIFICADOR or tipo == TiposDeToken.PALAVRA_RESERVADA_VARIAVEL:
+      # IDENTIFICADOR (Ckp 1) ou VARIAVEL (Gramática Original)
+      no = self.nos.Var(self.current.texto, self.current.offset)
+      self._advance()
+      return no
     
     # Fator entre parênteses (Ckp 1, Req 5)
     if self._optional(TiposDeToken.LEFT_PAR, "("):
-      self._expressao_aritmetica()
+      no = self._expressao_aritmetica()
       self._expect(TiposDeToken.RIGHT_PAR, ")")
-      return
+      return no
     
     # Erro (Req 3 - Ckp 2)
-    self._raise(
-      f"Fator inválido. Esperado NUMINT, NUMREAL, VARIAVEL, IDENTIFICADOR ou '(', encontrado {self._fmt_token(self.current)}."
-    )
+    self._raise(FATOR_INVALIDO, ESPERADOS_FATOR)
 
   # Regra (sem recursão): expressaoRelacional : termoRelacional (operadorBooleano termoRelacional)*
   def _expressao_relacional(self):
-    self._termo_relacional()
-    while (
-      self._is_current(TiposDeToken.PALAVRA_RESERVADA_E) or
-      self._is_current(TiposDeToken.PALAVRA_RESERVADA_OU)
-    ):
+    esquerda = self._termo_relacional()
+    while self.current and self.current.tipo in OPERADORES_BOOLEANOS:
+      op, inicio = self.current.texto, self.current.offset
       self._operador_booleano()
-      self._termo_relacional()
+      esquerda = self.nos.BoolOp(op, esquerda, self._termo_relacional(), inicio)
+    return esquerda
 
   # Regra: termoRelacional : expressaoAritmetica OP_REL expressaoAritmetica | '(' expressaoRelacional ')'
   def _termo_relacional(self):
     if self._optional(TiposDeToken.LEFT_PAR, "("):
-      self._expressao_relacional()
+      no = self._expressao_relacional()
       self._expect(TiposDeToken.RIGHT_PAR, ")")
-      return
+      return no
     
     # Caso: expressaoAritmetica OP_REL expressaoAritmetica
-    self._expressao_aritmetica()
+    esquerda = self._expressao_aritmetica()
+    op = self.current.texto if self._is_current(TiposDeToken.OP_REL) else None
+    inicio = self.current.offset
     self._expect(TiposDeToken.OP_REL) # Ckp 1, Req 4
-    self._expressao_aritmetica()
+    return self.nos.RelOp(op, esquerda, self._expressao_aritmetica(), inicio)
 
   # Regra: operadorBooleano : 'E' | 'OU';
   def _operador_booleano(self):
@@ -223,118 +394,118 @@ class Parser:
       return
     if self._optional(TiposDeToken.PALAVRA_RESERVADA_OU):
       return
-    self._raise(f"Operador booleano inválido: {self._fmt_token(self.current)}.")
+    self._raise(OPERADOR_BOOLEANO_INVALIDO, OPERADORES_BOOLEANOS)
 
   # Regra: listaComandos : comando listaComandos | comando;
   # Implementação: (comando)+ (um ou mais comandos)
   def _lista_comandos(self):
-    self._comando() # Pelo menos um comando
-    while self._is_inicio_comando():
+    comandos = []
+    while True:
+      try:
+        comandos.append(self._comando()) # Pelo menos um comando
+      except SyntaxError as erro:
+        self._recuperar_de(erro, SINCRONIA_COMANDO)
+      if not self._is_inicio_comando():
+        return comandos
       # Seguido de zero ou mais comandos
-      self._comando()
 
   # Verifica se o token atual pode iniciar um comando
   def _is_inicio_comando(self):
-    return (
-      self._is_current(TiposDeToken.PALAVRA_RESERVADA_VARIAVEL) or # Atribuição
-      self._is_current(TiposDeToken.IDENTIFICADOR) or # Atribuição (Ckp 1)
-      self._is_current(TiposDeToken.PALAVRA_RESERVADA_LER) or # Entrada
-      self._is_current(TiposDeToken.PALAVRA_RESERVADA_IMPRIMIR) or # Saída
-      self._is_current(TiposDeToken.PALAVRA_RESERVADA_SE) or # Condição
-      self._is_current(TiposDeToken.PALAVRA_RESERVADA_ENQUANTO) or # Repetição
-      self._is_current(TiposDeToken.PALAVRA_RESERVADA_INICIO) # Sub-bloco
-    )
+    return self.current and self.current.tipo in INICIO_COMANDO
 
   # Regra: comando : comandoAtribuicao | comandoEntrada | comandoSaida | comandoCondicao | comandoRepeticao | subAlgoritmo;
+  # A alternativa é escolhida pela tabela LL(1) (uma consulta ao dicionário).
+  # Ckp 2, Req 4 : Atribuição pode começar com IDENTIFICADOR (Ckp 1) ou 'VARIAVEL'
   def _comando(self):
-    # Ckp 2, Req 4 : Atribuição pode começar com IDENTIFICADOR (Ckp 1) ou 'VARIAVEL'
-    if (
-      self._is_current(TiposDeToken.PALAVRA_RESERVADA_VARIAVEL) or
-      self._is_current(TiposDeToken.IDENTIFICADOR)
-    ):
-      self._comando_atribuicao()
-      return
-    if self._is_current(TiposDeToken.PALAVRA_RESERVADA_LER):
-      self._comando_entrada()
-      return
-    if self._is_current(TiposDeToken.PALAVRA_RESERVADA_IMPRIMIR):
-      self._comando_saida()
-      return
-    if self._is_current(TiposDeToken.PALAVRA_RESERVADA_SE):
-      self._comando_condicao()
-      return
-    if self._is_current(TiposDeToken.PALAVRA_RESERVADA_ENQUANTO):
-      self._comando_repeticao()
-      return
-    if self._is_current(TiposDeToken.PALAVRA_RESERVADA_INICIO):
-      self._sub_algoritmo()
-      return
-    # Erro (Req 3 - Ckp 2)
-    self._raise(f"Início de comando inválido: {self._fmt_token(self.current)}.")
+    metodo = self._despacho_comando.get(self.current.tipo) if self.current else None
+    if metodo is None:
+      # Erro (Req 3 - Ckp 2)
+      self._raise(INICIO_DE_COMANDO_INVALIDO, INICIO_COMANDO)
+    return metodo()
 
   # Regra Original: comandoAtribuicao : 'VARIAVEL' = expressaoAritmetica;
   # Regra Adaptada (Ckp 2, Req 4): aceita IDENTIFICADOR no lugar de VARIAVEL. 
   # Utiliza o operador '=' do Ckp 1 (Req 3).
   def _comando_atribuicao(self):
+    alvo = self.nos.Var(self.current.texto, self.current.offset)
     if self._optional(TiposDeToken.PALAVRA_RESERVADA_VARIAVEL):
       # aceita literal 'VARIAVEL' (gramática original)
       pass
     else:
       self._expect(TiposDeToken.IDENTIFICADOR) # aceita IDENTIFICADOR (Ckp 1)
+    inicio = self.current.offset
     self._expect(TiposDeToken.OPERADOR_ATRIBUICAO, "=") # Ckp 1, Req 3
-    self._expressao_aritmetica()
+    return self.nos.Atribuicao(alvo, self._expressao_aritmetica(), inicio)
 
   # Regra Original: comandoEntrada : 'LER' VARIAVEL;
   # Regra Adaptada (Ckp 2, Req 4): aceita IDENTIFICADOR no lugar de VARIAVEL. 
   def _comando_entrada(self):
+    inicio = self.current.offset
     self._expect(TiposDeToken.PALAVRA_RESERVADA_LER)
-    if self._optional(TiposDeToken.PALAVRA_RESERVADA_VARIAVEL):
+    alvo = self.nos.Var(self.current.texto, self.current.offset)
+    if not self._optional(TiposDeToken.PALAVRA_RESERVADA_VARIAVEL):
       # aceita literal 'VARIAVEL' (gramática original)
-      return
-    self._expect(TiposDeToken.IDENTIFICADOR) # aceita IDENTIFICADOR (Ckp 1)
+      self._expect(TiposDeToken.IDENTIFICADOR) # aceita IDENTIFICADOR (Ckp 1)
+    return self.nos.Ler(alvo, inicio)
 
   # Regra Original: comandoSaida : 'IMPRIMIR' LEFT_PAR (VARIAVEL | CADEIA) RIGHT_PAR;
   # Regra Adaptada (Ckp 2, Req 4/5):
   # Esta implementação aceita 'IMPRIMIR' '(' (IDENTIFICADOR | 'VARIAVEL' | CADEIA) ')'.
   def _comando_saida(self):
+    inicio = self.current.offset
     self._expect(TiposDeToken.PALAVRA_RESERVADA_IMPRIMIR)
     self._expect(TiposDeToken.LEFT_PAR, "(") # Ckp 1, Req 5
 
+    texto, offset = self.current.texto, self.current.offset
     if self._optional(TiposDeToken.PALAVRA_RESERVADA_VARIAVEL):
       # aceita literal 'VARIAVEL'
-      pass
+      valor = self.nos.Var(texto, offset)
     elif self._optional(TiposDeToken.IDENTIFICADOR):
       # aceita IDENTIFICADOR (Ckp 1)
-      pass
+      valor = self.nos.Var(texto, offset)
     elif self._optional(TiposDeToken.CADEIA):
       # aceita CADEIA (ex: "ola")
-      pass
+      valor = self.nos.Literal(TiposDeToken.CADEIA, texto, offset)
     else:
       # Erro (Req 3 - Ckp 2)
-      self._raise(
-        f"Esperado VARIAVEL, IDENTIFICADOR ou CADEIA, encontrado {self._fmt_token(self.current)}."
-      )
+      self._raise(VALOR_DE_SAIDA_INVALIDO, ESPERADOS_SAIDA)
     self._expect(TiposDeToken.RIGHT_PAR, ")") # Ckp 1, Req 5
+    return self.nos.Imprimir(valor, inicio)
 
   # Regra: comandoCondicao : 'SE' expressaoRelacional 'ENTAO' comando ('SENAO' comando)?;
   def _comando_condicao(self):
+    inicio = self.current.offset
     self._expect(TiposDeToken.PALAVRA_RESERVADA_SE)
-    self._expressao_relacional()
+    condicao = self._condicao_se()
     self._expect(TiposDeToken.PALAVRA_RESERVADA_ENTAO)
-    self._comando() # Comando do 'SE'
+    entao = self._comando() # Comando do 'SE'
     
     # Parte opcional do 'SENAO'
+    senao = None
     if self._optional(TiposDeToken.PALAVRA_RESERVADA_SENAO):
-      self._comando() # Comando do 'SENAO'
+      senao = self._comando() # Comando do 'SENAO'
+    return self.nos.Se(condicao, entao, senao, inicio)
+
+  # Condição do 'SE'. Com recuperação, um erro na expressão sincroniza
+  # no 'ENTAO', e o comando do 'SE' ainda é analisado.
+  def _condicao_se(self):
+    try:
+      return self._expressao_relacional()
+    except SyntaxError as erro:
+      self._recuperar_de(erro, SINCRONIA_CONDICAO)
+      return None
 
   # Regra: comandoRepeticao : 'ENQUANTO' expressaoRelacional comando;
   def _comando_repeticao(self):
+    inicio = self.current.offset
     self._expect(TiposDeToken.PALAVRA_RESERVADA_ENQUANTO)
-    self._expressao_relacional()
-    self._comando()
+    condicao = self._expressao_relacional()
+    return self.nos.Enquanto(condicao, self._comando(), inicio)
 
   # Regra: subAlgoritmo : 'INICIO' listaComandos 'FIM';
   def _sub_algoritmo(self):
+    inicio = self.current.offset
     self._expect(TiposDeToken.PALAVRA_RESERVADA_INICIO)
-    self._lista_comandos()
-    self._expect(TiposDeToken.PALAVRA_RESERVADA_FIM)
\ No newline at end of file
+    comandos = self._lista_comandos()
+    self._expect(TiposDeToken.PALAVRA_RESERVADA_FIM)
+    return self.nos.Bloco(comandos, inicio)
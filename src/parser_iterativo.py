@@ -0,0 +1,290 @@
+# src/parser_iterativo.py
+
+from .token_type import TiposDeToken
+from .parser import (
+  Parser, SyntaxError, REGRA_DO_COMANDO, OPERADORES_BOOLEANOS, SINCRONIA_COMANDO, INICIO_COMANDO,
+  ESPERADOS_FATOR, ESPERADOS_SAIDA,
+)
+from .diagnostico import INICIO_DE_COMANDO_INVALIDO, VALOR_DE_SAIDA_INVALIDO, FATOR_INVALIDO
+"""
+Parser Iterativo (Ckp 2)
+
+Mesma gramática, mesmas mensagens de erro e mesma AST do Parser recursivo
+(src/parser.py), mas sem recursão em Python: programas com comandos ou
+parênteses aninhados em centenas de milhares de níveis não esgotam o
+limite de recursão, e o tempo continua linear no número de tokens.
+
+  - Comandos: driver LL(1) dirigido por tabela. A pilha de análise guarda
+    terminais (TiposDeToken, consumidos com _expect) e ações (funções
+    deste módulo). A tabela PRODUCOES_COMANDO, derivada da tabela LL(1)
+    do gramatica.txt, escolhe a produção de 'comando' pelo token atual.
+    Os nós reconhecidos vão para uma pilha de valores, de onde as ações
+    de redução montam os nós dos comandos.
+  - Expressões: precedência por níveis ('*' '/' acima de '+' '-'; 'E' e
+    'OU' no mesmo nível), com uma pilha explícita para os parênteses.
+
+Declarações e a regra 'programa' não são recursivas e são herdadas do
+Parser.
+"""
+
+# --- Ações da pilha de análise ---
+# Cada ação recebe o parser, a pilha de análise e a pilha de valores.
+
+# Empilha a posição do token atual (início do comando ou do operador)
+def _posicao(parser, pilha, valores):
+  valores.append(parser.current.offset)
+
+# comandoAtribuicao: aceita 'VARIAVEL' (literal) ou IDENTIFICADOR
+def _alvo_atribuicao(parser, pilha, valores):
+  valores.append(parser.nos.Var(parser.current.texto, parser.current.offset))
+  if not parser._optional(TiposDeToken.PALAVRA_RESERVADA_VARIAVEL):
+    parser._expect(TiposDeToken.IDENTIFICADOR)
+
+# Regra: comando (escolhe a produção pela tabela)
+def _comando(parser, pilha, valores):
+  producao = PRODUCOES_COMANDO.get(parser.current.tipo)
+  if producao is None:
+    # Erro (Req 3 - Ckp 2)
+    parser._raise(INICIO_DE_COMANDO_INVALIDO, INICIO_COMANDO)
+  pilha.extend(producao)
+
+# Regra: listaComandos : comando listaComandos | comando;
+def _lista_comandos(parser, pilha, valores):
+  valores.append([])
+  pilha.extend((_continuar_lista, _anexar_comando, _comando))
+
+# Move o comando reconhecido para a lista aberta por _lista_comandos
+def _anexar_comando(parser, pilha, valores):
+  comando = valores.pop()
+  valores[-1].append(comando)
+
+# Se o token atual inicia um comando, a lista continua
+def _continuar_lista(parser, pilha, valores):
+  if parser.current.tipo in PRODUCOES_COMANDO:
+    pilha.extend((_continuar_lista, _anexar_comando, _comando))
+
+def _expressao_aritmetica(parser, pilha, valores):
+  valores.append(parser._expressao_aritmetica())
+
+def _condicao_se(parser, pilha, valores):
+  valores.append(parser._condicao_se())
+
+def _expressao_relacional(parser, pilha, valores):
+  valores.append(parser._expressao_relacional())
+
+# comandoEntrada: aceita 'VARIAVEL' (literal) ou IDENTIFICADOR
+def _alvo_ler(parser, pilha, valores):
+  valores.append(parser.nos.Var(parser.current.texto, parser.current.offset))
+  if not parser._optional(TiposDeToken.PALAVRA_RESERVADA_VARIAVEL):
+    parser._expect(TiposDeToken.IDENTIFICADOR)
+
+# comandoSaida: (IDENTIFICADOR | 'VARIAVEL' | CADEIA)
+def _valor_imprimir(parser, pilha, valores):
+  texto, offset = parser.current.texto, parser.current.offset
+  if (
+    parser._optional(TiposDeToken.PALAVRA_RESERVADA_VARIAVEL) or
+    parser._optional(TiposDeToken.IDENTIFICADOR)
+  ):
+    valores.append(parser.nos.Var(texto, offset))
+  elif parser._optional(TiposDeToken.CADEIA):
+    valores.append(parser.nos.Literal(TiposDeToken.CADEIA, texto, offset))
+  else:
+    # Erro (Req 3 - Ckp 2)
+    parser._raise(VALOR_DE_SAIDA_INVALIDO, ESPERADOS_SAIDA)
+
+# Parte opcional ('SENAO' comando) do comandoCondicao
+def _senao_opcional(parser, pilha, valores):
+  if parser._optional(TiposDeToken.PALAVRA_RESERVADA_SENAO):
+    pilha.extend((_reduzir_se, _comando))
+  else:
+    valores.append(None)
+    _reduzir_se(parser, pilha, valores)
+
+# --- Reduções: montam o nó a partir da pilha de valores ---
+
+def _reduzir_atribuicao(parser, pilha, valores):
+  expressao, inicio = valores.pop(), valores.pop()
+  valores.append(parser.nos.Atribuicao(valores.pop(), expressao, inicio))
+
+def _reduzir_ler(parser, pilha, valores):
+  alvo = valores.pop()
+  valores.append(parser.nos.Ler(alvo, valores.pop()))
+
+def _reduzir_imprimir(parser, pilha, valores):
+  valor = valores.pop()
+  valores.append(parser.nos.Imprimir(valor, valores.pop()))
+
+def _reduzir_se(parser, pilha, valores):
+  senao, entao, condicao = valores.pop(), valores.pop(), valores.pop()
+  valores.append(parser.nos.Se(condicao, entao, senao, valores.pop()))
+
+def _reduzir_enquanto(parser, pilha, valores):
+  corpo, condicao = valores.pop(), valores.pop()
+  valores.append(parser.nos.Enquanto(condicao, corpo, valores.pop()))
+
+def _reduzir_bloco(parser, pilha, valores):
+  comandos = valores.pop()
+  valores.append(parser.nos.Bloco(comandos, valores.pop()))
+
+# Produções de cada alternativa de 'comando', escritas na ordem da gramática.
+_ATRIBUICAO = (
+  _alvo_atribuicao, _posicao, TiposDeToken.OPERADOR_ATRIBUICAO, _expressao_aritmetica, _reduzir_atribuicao,
+)
+_ENTRADA = (
+  _posicao, TiposDeToken.PALAVRA_RESERVADA_LER, _alvo_ler, _reduzir_ler,
+)
+_SAIDA = (
+  _posicao, TiposDeToken.PALAVRA_RESERVADA_IMPRIMIR,
+  TiposDeToken.LEFT_PAR, _valor_imprimir, TiposDeToken.RIGHT_PAR, _reduzir_imprimir,
+)
+_CONDICAO = (
+  _posicao, TiposDeToken.PALAVRA_RESERVADA_SE, _condicao_se,
+  TiposDeToken.PALAVRA_RESERVADA_ENTAO, _comando, _senao_opcional,
+)
+_REPETICAO = (
+  _posicao, TiposDeToken.PALAVRA_RESERVADA_ENQUANTO, _expressao_relacional, _comando, _reduzir_enquanto,
+)
+_SUB_ALGORITMO = (
+  _posicao, TiposDeToken.PALAVRA_RESERVADA_INICIO,
+  _lista_comandos, TiposDeToken.PALAVRA_RESERVADA_FIM, _reduzir_bloco,
+)
+
+_PRODUCOES_POR_REGRA = {
+  "comandoAtribuicao": _ATRIBUICAO,
+  "comandoEntrada": _ENTRADA,
+  "comandoSaida": _SAIDA,
+  "comandoCondicao": _CONDICAO,
+  "comandoRepeticao": _REPETICAO,
+  "subAlgoritmo": _SUB_ALGORITMO,
+}
+
+# Token atual -> produção (invertida, pronta para entrar na pilha)
+PRODUCOES_COMANDO = {
+  chave: tuple(reversed(_PRODUCOES_POR_REGRA[regra])) for chave, regra in REGRA_DO_COMANDO.items()
+}
+
+class ParserIterativo(Parser):
+
+  # Executa a pilha de análise até esvaziá-la e devolve o valor reconhecido
+  def _executar(self, simbolo_inicial):
+    pilha = [simbolo_inicial]
+    valores = []
+    while pilha:
+      try:
+        while pilha:
+          simbolo = pilha.pop()
+          if isinstance(simbolo, TiposDeToken):
+            self._expect(simbolo) # Terminal
+          else:
+            simbolo(self, pilha, valores) # Ação
+      except SyntaxError as erro:
+        self._recuperar_na_lista(erro, pilha, valores)
+    return valores[0]
+
+  # Recuperação (modo pânico) dentro de listaComandos: abandona o comando
+  # incompleto, voltando a pilha de análise e a de valores até a lista
+  # mais interna, e continua nela depois de sincronizar.
+  def _recuperar_na_lista(self, erro, pilha, valores):
+    if not self.recuperar or _continuar_lista not in pilha:
+      raise erro
+    while pilha[-1] is not _continuar_lista:
+      pilha.pop()
+    # Cada _continuar_lista na pilha corresponde a uma lista aberta em
+    # 'valores'; uma lista já encerrada (à espera do 'FIM') também é descartada.
+    abertas = pilha.count(_continuar_lista)
+    listas = sum(isinstance(valor, list) for valor in valores)
+    while not (isinstance(valores[-1], list) and listas == abertas):
+      if isinstance(valores.pop(), list):
+        listas -= 1
+    self._recuperar_de(erro, SINCRONIA_COMANDO)
+
+  # Regra: listaComandos : comando listaComandos | comando;
+  def _lista_comandos(self):
+    return self._executar(_lista_comandos)
+
+  # Regra: comando (um único comando, com seus sub-comandos)
+  def _comando(self):
+    return self._executar(_comando)
+
+  # Regra: expressaoAritmetica, sem recursão.
+  # 'soma' e 'produto' guardam (esquerda, operador, posição) ainda sem o
+  # operando direito; 'niveis' guarda esses pendentes a cada '(' aberto.
+  def _expressao_aritmetica(self):
+    nos = self.nos
+    niveis = []
+    soma = produto = None
+    while True:
+      # Espera um fatorAritmetico
+      atual = self.current
+      tipo = atual.tipo if atual else None
+      if tipo == TiposDeToken.NUMINT or tipo == TiposDeToken.NUMREAL:
+        valor = nos.Literal(tipo, atual.texto, atual.offset)
+        self._advance()
+      elif tipo == TiposDeToken.IDENTIFICADOR or tipo == TiposDeToken.PALAVRA_RESERVADA_VARIAVEL:
+        valor = nos.Var(atual.texto, atual.offset)
+        self._advance()
+      elif self._optional(TiposDeToken.LEFT_PAR, "("):
+        niveis.append((soma, produto))
+        soma = produto = None
+        continue
+      else:
+        # Erro (Req 3 - Ckp 2)
+        self._raise(FATOR_INVALIDO, ESPERADOS_FATOR)
+
+      # Fator reconhecido: fecha os operadores pendentes
+      while True:
+        if produto is not None:
+          valor = nos.BinOp(produto[1], produto[0], valor, produto[2])
+          produto = None
+        if self._is_current(TiposDeToken.OPERADOR_MATEMATICO) and (self.current.texto == "*" or self.current.texto == "/"):
+          produto = (valor, self.current.texto, self.current.offset)
+          self._advance()
+          break
+        if soma is not None:
+          valor = nos.BinOp(soma[1], soma[0], valor, soma[2])
+          soma = None
+        if self._is_current(TiposDeToken.OPERADOR_MATEMATICO) and (self.current.texto == "+" or self.current.texto == "-"):
+          soma = (valor, self.current.texto, self.current.offset)
+          self._advance()
+          break
+        if not niveis:
+          return valor
+        # Fim de '(' expressaoAritmetica ')': o valor é um fator do nível de fora
+        self._expect(TiposDeToken.RIGHT_PAR, ")")
+        soma, produto = niveis.pop()
+
+  # Regra: expressaoRelacional, sem recursão.
+  # 'pendente' guarda (esquerda, operador, posição) do último 'E'/'OU'.
+  def _expressao_relacional(self):
+    nos = self.nos
+    niveis = []
+    pendente = None
+    while True:
+      # Espera um termoRelacional; '(' abre uma expressaoRelacional
+      if self._optional(TiposDeToken.LEFT_PAR, "("):
+        niveis.append(pendente)
+        pendente = None
+        continue
+      esquerda = self._expressao_aritmetica()
+      op = self.current.texto if self._is_current(TiposDeToken.OP_REL) else None
+      inicio = self.current.offset
+      self._expect(TiposDeToken.OP_REL) # Ckp 1, Req 4
+      valor = nos.RelOp(op, esquerda, self._expressao_aritmetica(), inicio)
+
+      # Termo reconhecido: fecha o operador booleano pendente
+      while True:
+        if pendente is not None:
+          valor = nos.BoolOp(pendente[1], pendente[0], valor, pendente[2])
+          pendente = None
+        if self.current and self.current.tipo in OPERADORES_BOOLEANOS:
+          pendente = (valor, self.current.texto, self.current.offset)
+          self._operador_booleano()
+          break
+        if not niveis:
+          return valor
+        # Fim de '(' expressaoRelacional ')': o valor é um termo do nível de fora
+        self._expect(TiposDeToken.RIGHT_PAR, ")")
+        pendente = niveis.pop()
+
+# Implementações do Analisador Sintático (mesma gramática, mesmos erros e mesma AST)
+PARSERS = {"recursivo": Parser, "iterativo": ParserIterativo}
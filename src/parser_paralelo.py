@@ -0,0 +1,226 @@
+# src/parser_paralelo.py
+
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from .token_type import TiposDeToken
+from .token_stream import TokenStream
+from .indice_linhas import IndiceDeLinhas
+from .scanner import AnalisadorLexico, PALAVRAS_RESERVADAS
+from .parser import INICIO_COMANDO
+from .arvore import Bloco
+from .cache_de_compilacao import serializar_arvore, desserializar_arvore
+from .parser_iterativo import PARSERS
+from .diagnostico import compactar, reconstruir
+"""
+ParserParalelo.py
+
+Análises léxica e sintática de um único arquivo grande em vários
+processos (main.py --paralelo). Os comandos de nível superior do
+:ALGORITMO são independentes entre si, então o arquivo é dividido em
+pedaços no início de linhas que começam um comando fora de qualquer
+INICIO/FIM, cadeia ou comentário, e só depois do primeiro comando do
+:ALGORITMO (uma declaração como 'v1: INTEIRO' também começa com um
+identificador, e a lista de comandos não pode ser vazia). Essa
+pré-varredura usa uma única expressão regular que só para em cadeias,
+comentários, ALGORITMO e INICIO/FIM.
+
+Cada pedaço é analisado num processo: o primeiro como programa completo e
+os demais como listas de comandos (Parser.parse_comandos). As posições já
+voltam corrigidas para o arquivo inteiro: a linha das mensagens pelo
+IndiceDeLinhas do pedaço (primeira_linha) e os deslocamentos dos tokens,
+da AST e dos diagnósticos somando o início do pedaço.
+
+Os resultados são juntados em ordem. Um pedaço que falha exatamente no
+seu FIM_DE_ARQUIVO foi cortado no meio de um comando (ex.: o corpo de um
+ENQUANTO na linha seguinte): ele é juntado ao próximo e reanalisado neste
+processo. Um erro em qualquer outra posição é o primeiro erro do arquivo,
+pois tudo antes dele foi aceito. Se algum pedaço tiver erro léxico, o
+arquivo inteiro é analisado de novo sem divisão. Assim, tokens, AST e
+mensagens são sempre os mesmos da análise sequencial.
+"""
+
+TAMANHO_MINIMO = 256 * 1024 # Bytes de código-fonte por pedaço (no mínimo)
+PEDACOS_POR_PROCESSO = 4
+
+# Trechos que mudam o estado da pré-varredura: cadeias e comentários (como
+# o AnalisadorLexico os consome) e as palavras ALGORITMO e INICIO/FIM
+_VARREDURA = re.compile(r'"[^"]*"?|/\*.*?(?:\*/|\Z)|#[^\n\r]*|\b(ALGORITMO|INICIO|FIM)\b', re.S)
+_PRIMEIRA_PALAVRA = re.compile(r"[ \t]*([A-Za-z_]\w*)")
+# Linhas depois das quais o comando seguinte ainda pode fazer parte do anterior
+_ABREM_COMANDO = {"SE", "ENQUANTO", "SENAO"}
+_PEDEM_CONTINUACAO = {"ENTAO", "SENAO", "E", "OU"}
+_OPERADORES = tuple("+-*/=<>!(")
+
+class ResultadoDoPedaco:
+  __slots__ = ("sucesso", "erros", "no_fim", "erro_lexico", "tipos", "inicios", "fins", "arvore")
+
+  def __init__(self, sucesso, erros, no_fim, erro_lexico, tipos=b"", inicios=b"", fins=b"", arvore=None):
+    self.sucesso = sucesso
+    self.erros = erros
+    self.no_fim = no_fim # O erro foi no FIM_DE_ARQUIVO do pedaço
+    self.erro_lexico = erro_lexico
+    # Vetores do TokenStream (bytes), com deslocamentos do arquivo inteiro
+    self.tipos = tipos
+    self.inicios = inicios
+    self.fins = fins
+    self.arvore = arvore # AST serializada (Programa, ou Bloco com os comandos)
+
+# Uma palavra pode iniciar um comando de nível superior?
+def _inicia_comando(palavra):
+  tipo = PALAVRAS_RESERVADAS.get(palavra)
+  return tipo is None or tipo in INICIO_COMANDO
+
+# Primeiro início de linha em [de, ate) que parece começar um comando novo
+def _linha_de_comando(codigo, de, ate):
+  quebra = codigo.find("\n", max(de - 1, 0), ate)
+  while quebra != -1 and quebra + 1 < ate:
+    linha = quebra + 1
+    palavra = _PRIMEIRA_PALAVRA.match(codigo, linha, ate)
+    if palavra is not None and _inicia_comando(palavra.group(1)):
+      anterior = codigo[codigo.rfind("\n", 0, quebra) + 1:quebra].split()
+      if anterior and anterior[0] not in _ABREM_COMANDO and anterior[-1] not in _PEDEM_CONTINUACAO \
+          and not anterior[-1].endswith(_OPERADORES):
+        return linha
+    quebra = codigo.find("\n", linha, ate)
+  return None
+
+# Deslocamentos em que o arquivo pode ser dividido, a cada ~'tamanho' bytes
+def pontos_de_divisao(codigo_fonte, tamanho):
+  pontos = []
+  alvo = tamanho
+  profundidade = 0
+  no_algoritmo = False # Só há pontos depois do primeiro comando do :ALGORITMO
+  posicao = 0 # Fim do último trecho especial
+  fim_do_codigo = len(codigo_fonte)
+  if fim_do_codigo < 2 * tamanho:
+    return pontos
+  for encontrado in _VARREDURA.finditer(codigo_fonte):
+    inicio = encontrado.start()
+    # Código comum em [posicao, inicio), todo na mesma profundidade
+    while no_algoritmo and profundidade == 0 and inicio > alvo and fim_do_codigo - alvo >= tamanho:
+      ponto = _linha_de_comando(codigo_fonte, max(posicao, alvo), inicio)
+      if ponto is None:
+        break
+      pontos.append(ponto)
+      alvo = ponto + tamanho
+    palavra = encontrado.group(1)
+    if palavra == "ALGORITMO" and not no_algoritmo:
+      no_algoritmo = True
+      primeiro = _linha_de_comando(codigo_fonte, encontrado.end(), fim_do_codigo)
+      alvo = max(alvo, fim_do_codigo if primeiro is None else primeiro + 1)
+    elif palavra == "INICIO":
+      profundidade += 1
+    elif palavra == "FIM" and profundidade > 0:
+      profundidade -= 1
+    posicao = encontrado.end()
+  while no_algoritmo and profundidade == 0 and fim_do_codigo - alvo >= tamanho:
+    ponto = _linha_de_comando(codigo_fonte, max(posicao, alvo), fim_do_codigo)
+    if ponto is None:
+      break
+    pontos.append(ponto)
+    alvo = ponto + tamanho
+  return pontos
+
+# Analisa um pedaço (executado nos processos do pool)
+def _analisar_pedaco(texto, deslocamento, primeira_linha, primeiro, parser, motor, tipo_offset):
+  analisador = AnalisadorLexico(texto, motor=motor)
+  analisador.indice_linhas = IndiceDeLinhas(texto, primeira_linha)
+  tokens = analisador.tokenize(lote=True)
+  if tokens.diagnosticos:
+    return ResultadoDoPedaco(False, [], False, True)
+  analise = PARSERS[parser](tokens)
+  resultado = analise.parse() if primeiro else analise.parse_comandos()
+  arvore = None
+  no_fim = False
+  if resultado["sucesso"]:
+    raiz = resultado["arvore"] if primeiro else Bloco(resultado["comandos"], 0)
+    arvore = serializar_arvore(raiz, deslocamento)
+  else:
+    no_fim = analise.current is not None and analise.current.tipo is TiposDeToken.FIM_DE_ARQUIVO
+  return ResultadoDoPedaco(
+    resultado["sucesso"], [compactar(erro, deslocamento) for erro in resultado["erros"]], no_fim, False,
+    tokens.tipos.tobytes(),
+    array(tipo_offset, map(deslocamento.__add__, tokens.inicios)).tobytes(),
+    array(tipo_offset, map(deslocamento.__add__, tokens.fins)).tobytes(),
+    arvore,
+  )
+
+def _analisar_sem_dividir(codigo_fonte, parser, motor):
+  tokens = AnalisadorLexico(codigo_fonte, motor=motor).tokenize(lote=True)
+  return tokens, PARSERS[parser](tokens).parse()
+
+# Retorna (tokens, resultado), iguais aos de AnalisadorLexico + Parser.parse()
+# no arquivo inteiro. processos=None usa um processo por núcleo.
+def analisar_em_paralelo(codigo_fonte, processos=None, parser="recursivo", motor="caracteres", tamanho_do_pedaco=None):
+  processos = processos or os.cpu_count() or 1
+  tamanho = tamanho_do_pedaco or max(TAMANHO_MINIMO, len(codigo_fonte) // (processos * PEDACOS_POR_PROCESSO))
+  pontos = pontos_de_divisao(codigo_fonte, tamanho)
+  if not pontos:
+    return _analisar_sem_dividir(codigo_fonte, parser, motor)
+
+  tipo_offset = "I" if len(codigo_fonte) <= 0xFFFFFFFF else "Q"
+  limites = [0] + pontos + [len(codigo_fonte)]
+  pedacos = []
+  linha = 1
+  for inicio, fim in zip(limites, limites[1:]):
+    pedacos.append((inicio, fim, linha))
+    linha += codigo_fonte.count("\n", inicio, fim)
+
+  def argumentos(inicio, fim, linha, primeiro):
+    return (codigo_fonte[inicio:fim], inicio, linha, primeiro, parser, motor, tipo_offset)
+
+  executor = ProcessPoolExecutor(max_workers=processos) if processos > 1 else None
+  tarefas = []
+  try:
+    if executor is not None:
+      tarefas = [executor.submit(_analisar_pedaco, *argumentos(inicio, fim, linha, inicio == 0)) for inicio, fim, linha in pedacos]
+      resultados = (tarefa.result() for tarefa in tarefas)
+    else:
+      resultados = (_analisar_pedaco(*argumentos(inicio, fim, linha, inicio == 0)) for inicio, fim, linha in pedacos)
+
+    partes = [] # Resultados cujos tokens formam o arquivo, em ordem
+    aceitos = 0
+    pendente = None # (inicio, linha) do pedaço que terminou no meio de um comando
+    erros = None # Primeiro erro sintático do arquivo
+    for (inicio, fim, linha), resultado in zip(pedacos, resultados):
+      if pendente is not None:
+        inicio, linha = pendente
+        pendente = None
+        resultado = _analisar_pedaco(*argumentos(inicio, fim, linha, aceitos == 0))
+      if resultado.erro_lexico:
+        return _analisar_sem_dividir(codigo_fonte, parser, motor)
+      if erros is None and not resultado.sucesso:
+        if resultado.no_fim and fim < len(codigo_fonte):
+          pendente = (inicio, linha)
+          continue
+        erros = resultado.erros
+      elif erros is None:
+        aceitos += 1
+      partes.append(resultado)
+  finally:
+    if executor is not None:
+      # Pedaços ainda na fila não são mais necessários (ex.: depois do
+      # primeiro erro). Cancelados um a um: shutdown(cancel_futures=True)
+      # só existe a partir do Python 3.9.
+      for tarefa in tarefas:
+        tarefa.cancel()
+      executor.shutdown()
+
+  tokens = TokenStream(codigo_fonte)
+  tamanho_do_item = tokens.inicios.itemsize
+  for i, parte in enumerate(partes):
+    ultima = i == len(partes) - 1
+    # O FIM_DE_ARQUIVO de cada pedaço, menos o do último, é descartado
+    tokens.tipos.frombytes(parte.tipos if ultima else parte.tipos[:-1])
+    tokens.inicios.frombytes(parte.inicios if ultima else parte.inicios[:-tamanho_do_item])
+    tokens.fins.frombytes(parte.fins if ultima else parte.fins[:-tamanho_do_item])
+  if erros is not None:
+    erros = [reconstruir(erro, tokens.indice_linhas) for erro in erros]
+    return tokens, {"sucesso": False, "erros": erros, "arvore": None}
+
+  programa = desserializar_arvore(partes[0].arvore)
+  for parte in partes[1:]:
+    programa.comandos.extend(desserializar_arvore(parte.arvore).comandos)
+  return tokens, {"sucesso": True, "erros": [], "arvore": programa}
@@ -1,8 +1,14 @@
 # src/scanner.py
 
+import re
 import sys # Para simular console.error (print(..., file=sys.stderr))
 from .token_type import TiposDeToken
 from .token import Token
+from .token_type import ORDINAL_DO_TIPO
+from .token_stream import TokenStream
+from .indice_linhas import IndiceDeLinhas
+from . import diagnostico
+from .diagnostico import DiagnosticoLexico
 
 """
 Requisito 7 (Ckp 1): Tabela de Palavras Reservadas.
@@ -26,230 +32,543 @@ PALAVRAS_RESERVADAS = {
   "VARIAVEL": TiposDeToken.PALAVRA_RESERVADA_VARIAVEL, # Palavra-chave da gramática original
 }
 
+"""
+Motor alternativo (regex): uma única expressão regular com todas as
+alternativas léxicas, testada com .match() a partir da posição atual.
+
+O padrão só reconhece os casos "seguros" (ASCII e lexemas válidos). Tudo o
+que ele não reconhece (erros léxicos como "1.", "123nome", cadeia não
+finalizada, símbolo desconhecido, ou letras/dígitos não-ASCII) é delegado
+ao motor caractere a caractere, que continua sendo a referência.
+"""
+_PADRAO_MESTRE = re.compile(r"""
+    (?P<ESPACO>\s+)
+  | (?P<COMENTARIO_BLOCO>/\*)
+  | (?P<COMENTARIO_LINHA>\#[^\n\r]*)
+  | (?P<IDENTIFICADOR>[A-Za-z_]\w*)
+  | (?P<NUMREAL>(?:[0-9]+\.[0-9]+|\.[0-9]+)(?![0-9.A-Za-z\x80-\U0010FFFF]))
+  | (?P<NUMINT>[0-9]+(?![0-9.A-Za-z\x80-\U0010FFFF]))
+  | (?P<OP_REL>[<>=!]=|[<>])
+  | (?P<OPERADOR_ATRIBUICAO>=)
+  | (?P<OPERADOR_MATEMATICO>[-+*/])
+  | (?P<LEFT_PAR>\()
+  | (?P<RIGHT_PAR>\))
+  | (?P<DOIS_PONTOS>:)
+  | (?P<CADEIA>"[^"]*")
+""", re.VERBOSE)
+
+# Expressões auxiliares do motor de caracteres, usadas para localizar o fim
+# de um lexema de uma só vez. Em str, \s equivale a isspace() e \w a
+# isalnum() or "_".
+_RE_ESPACOS = re.compile(r"\s+")
+_RE_CONTINUACAO_IDENTIFICADOR = re.compile(r"\w*")
+_RE_ALFANUMERICOS = re.compile(r"[^\W_]*")
+_RE_DIGITOS_ASCII = re.compile(r"[0-9]*")
+
+# Grupos do padrão mestre que não geram token
+_GRUPOS_IGNORADOS = frozenset(("ESPACO", "COMENTARIO_BLOCO", "COMENTARIO_LINHA"))
+
+# Grupos do padrão mestre cujo nome é o próprio tipo de token
+_TIPOS_POR_GRUPO = {
+  "NUMREAL": TiposDeToken.NUMREAL,
+  "NUMINT": TiposDeToken.NUMINT,
+  "OP_REL": TiposDeToken.OP_REL,
+  "OPERADOR_ATRIBUICAO": TiposDeToken.OPERADOR_ATRIBUICAO,
+  "OPERADOR_MATEMATICO": TiposDeToken.OPERADOR_MATEMATICO,
+  "LEFT_PAR": TiposDeToken.LEFT_PAR,
+  "RIGHT_PAR": TiposDeToken.RIGHT_PAR,
+  "DOIS_PONTOS": TiposDeToken.DOIS_PONTOS,
+}
+
+# Versões das tabelas acima em ordinais, para o modo em lote (TokenStream)
+_ORDINAL_POR_GRUPO = {grupo: ORDINAL_DO_TIPO[tipo] for grupo, tipo in _TIPOS_POR_GRUPO.items()}
+_ORDINAL_POR_PALAVRA = {texto: ORDINAL_DO_TIPO[tipo] for texto, tipo in PALAVRAS_RESERVADAS.items()}
+_ORDINAL_IDENTIFICADOR = ORDINAL_DO_TIPO[TiposDeToken.IDENTIFICADOR]
+_ORDINAL_CADEIA = ORDINAL_DO_TIPO[TiposDeToken.CADEIA]
+_ORDINAL_FIM_DE_ARQUIVO = ORDINAL_DO_TIPO[TiposDeToken.FIM_DE_ARQUIVO]
+
+# Requisitos 2 e 5 (Ckp 1): tokens de um único caractere, sem lookahead
+# ('/' fica de fora: pode começar um comentário)
+SIMBOLOS_SIMPLES = {
+  "+": TiposDeToken.OPERADOR_MATEMATICO,
+  "-": TiposDeToken.OPERADOR_MATEMATICO,
+  "*": TiposDeToken.OPERADOR_MATEMATICO,
+  "(": TiposDeToken.LEFT_PAR,
+  ")": TiposDeToken.RIGHT_PAR,
+  ":": TiposDeToken.DOIS_PONTOS,
+}
+
+# Texto dos tokens que não precisam ser fatiados do código: as palavras
+# reservadas devolvem sempre o mesmo objeto str da tabela acima
+_TEXTO_FIXO = {tipo: texto for texto, tipo in PALAVRAS_RESERVADAS.items()}
+_TEXTO_FIXO[TiposDeToken.FIM_DE_ARQUIVO] = "FIM_DE_ARQUIVO"
+
+# Retorno dos tratadores do motor de caracteres para espaços e comentários
+_IGNORADO = object()
+
+# Motores disponíveis para o construtor do AnalisadorLexico
+MOTORES = ("caracteres", "regex")
+
 class AnalisadorLexico:
-  def __init__(self, codigo_fonte):
+  # motor: "caracteres" (padrão, caractere a caractere) ou "regex"
+  # (padrão mestre). Ambos produzem a mesma sequência de tokens e erros.
+  def __init__(self, codigo_fonte, motor="caracteres"):
+    if motor not in MOTORES:
+      raise ValueError(f"Motor léxico desconhecido: '{motor}'. Opções: {', '.join(MOTORES)}")
     self.codigo_fonte = codigo_fonte
+    self.motor = motor
     self.posicao_atual = 0 # Índice do caractere que estamos lendo
-    self.linha_atual = 1 # Requisito 9 (Ckp 1): Controla a linha atual
-    self.coluna_atual = 1 # Requisito 9 (Ckp 1): Controla a coluna atual
-
-  # --- Métodos de Verificação e Navegação ---
-
-  def _chegou_ao_fim(self):
-    return self.posicao_atual >= len(self.codigo_fonte)
-
-  # Avança um caractere e atualiza a posição (linha/coluna)
-  def _avancar_caractere(self):
-    if self._chegou_ao_fim():
-      return "\0" # Caractere nulo para fim de arquivo
-    caractere = self.codigo_fonte[self.posicao_atual]
-    self.posicao_atual += 1
-    if caractere == "\n":
-      self.linha_atual += 1
-      self.coluna_atual = 1
+    # Requisito 9 (Ckp 1): linha/coluna não são contabilizadas a cada caractere.
+    # Os tokens guardam apenas o deslocamento inicial e resolvem a posição
+    # sob demanda neste índice de quebras de linha.
+    self.indice_linhas = IndiceDeLinhas(codigo_fonte)
+    # Requisito 9 (Ckp 1): erros léxicos encontrados até agora (DiagnosticoLexico)
+    self.diagnosticos = []
+    # Se True, cada erro léxico também é impresso em stderr (comportamento
+    # de proximo_token); tokenize() desliga a impressão.
+    self.reportar_erros = True
+    # Identificadores já vistos por proximo_token(): texto -> o mesmo objeto
+    # str, para que um nome repetido não gere uma cópia por token
+    self._nomes = {}
+    # Escolhe o motor uma única vez, sem custo de despacho por token
+    if motor == "regex":
+      self._proximo_lexema = self._proximo_lexema_regex
     else:
-      self.coluna_atual += 1
-    return caractere
+      self._proximo_lexema = self._proximo_lexema_caracteres
 
-  # Espia o caractere na posição 'lookahead' sem consumi-lo
-  def _olhar_proximo_caractere(self, lookahead=0):
-    idx = self.posicao_atual + lookahead
-    if idx >= len(self.codigo_fonte):
-      return "\0"
-    return self.codigo_fonte[idx]
+  # Requisito 9 (Ckp 1): linha atual (calculada a partir de posicao_atual)
+  @property
+  def linha_atual(self):
+    return self.indice_linhas.linha_coluna(self.posicao_atual)[0]
 
-  # --- Métodos de Processamento ---
+  # Requisito 9 (Ckp 1): coluna atual (calculada a partir de posicao_atual)
+  @property
+  def coluna_atual(self):
+    return self.indice_linhas.linha_coluna(self.posicao_atual)[1]
 
-  def _ignorar_espacos_e_comentarios(self):
-    while not self._chegou_ao_fim():
-      proximo_caractere = self._olhar_proximo_caractere()
+  # Último erro léxico (DiagnosticoLexico) encontrado; o Parser o consulta
+  # quando proximo_token() retorna None.
+  @property
+  def ultimo_erro(self):
+    return self.diagnosticos[-1] if self.diagnosticos else None
 
-      # 1. Ignorar espaços em branco
-      if proximo_caractere.isspace(): # Substitui /\s/.test(c)
-        self._avancar_caractere()
-        continue
+  # Retorna o índice logo após a sequência de dígitos que começa em 'inicio'.
+  # O trecho ASCII é varrido pela regex; isdigit() cobre dígitos Unicode.
+  def _fim_dos_digitos(self, inicio):
+    codigo = self.codigo_fonte
+    fim = _RE_DIGITOS_ASCII.match(codigo, inicio).end()
+    tamanho = len(codigo)
+    while fim < tamanho and codigo[fim].isdigit():
+      fim += 1
+    return fim
 
-      # 2. Requisito 8 (Ckp 1): Ignorar comentário de múltiplas linhas /* ... */
-      if (
-        proximo_caractere == "/" and
-        self._olhar_proximo_caractere(1) == "*"
-      ):
-        self._avancar_caractere() # Consome '/'
-        self._avancar_caractere() # Consome '*'
-        while (
-          not self._chegou_ao_fim() and
-          not (
-            self._olhar_proximo_caractere() == "*" and
-            self._olhar_proximo_caractere(1) == "/"
-          )
-        ):
-          self._avancar_caractere() # Consome o conteúdo do comentário
-        if not self._chegou_ao_fim():
-          self._avancar_caractere() # Consome '*'
-          self._avancar_caractere() # Consome '/'
-        continue # Volta ao início do loop
-
-      # 3. Requisito 8 (Ckp 1): Ignorar comentário de linha única # ... \n
-      if proximo_caractere == "#":
-        self._avancar_caractere() # Consome '#'
-        while (
-          not self._chegou_ao_fim() and
-          self._olhar_proximo_caractere() != "\n" and
-          self._olhar_proximo_caractere() != "\r"
-        ):
-          self._avancar_caractere() # Consome o conteúdo do comentário
-        continue
-      
-      # Se não for espaço nem comentário, para o loop
-      break
+  # Registra um erro léxico (Requisito 9 - Ckp 1) e retorna None,
+  # o valor que sinaliza o erro para quem chamou.
+  def _erro_lexico(self, codigo, inicio, fim):
+    erro = DiagnosticoLexico(codigo, inicio, fim, self.indice_linhas)
+    self.diagnosticos.append(erro)
+    if self.reportar_erros:
+      print(erro.mensagem, file=sys.stderr)
+    return None
 
-  # Retorna o próximo token válido do código-fonte.
+  # Retorna o próximo token válido do código-fonte, ou None em caso de
+  # erro léxico (a mensagem é impressa em stderr).
   # Este é o método principal do Analisador Léxico (Ckp 1).
+  # Palavras reservadas devolvem o texto da tabela e identificadores
+  # repetidos, o mesmo objeto str (internado em self._nomes).
   def proximo_token(self):
-    # 1. Limpa espaços e comentários antes de procurar o próximo token.
-    self._ignorar_espacos_e_comentarios()
-
-    # 2. Se chegamos ao fim, retorna o token FIM_DE_ARQUIVO.
-    if self._chegou_ao_fim():
-      return Token(
-        TiposDeToken.FIM_DE_ARQUIVO,
-        "FIM_DE_ARQUIVO",
-        self.linha_atual,
-        self.coluna_atual
-      )
-
-    # 3. Guarda a posição inicial para reportar erros (Req 9)
-    linha_do_token = self.linha_atual
-    coluna_do_token = self.coluna_atual
-    caractere_atual = self._avancar_caractere() # Consome o primeiro caractere do token
-
-    # Requisito 1 (Ckp 1): Identificadores
-    # Regra: (a-z | A-Z | _)(a-z | A-Z | _ | 0-9)*
-    if caractere_atual.isalpha() or caractere_atual == "_":
-      texto_completo = caractere_atual
-      while (
-        not self._chegou_ao_fim() and
-        (self._olhar_proximo_caractere().isalnum() or # isalpha() or isdigit()
-         self._olhar_proximo_caractere() == "_")
-      ):
-        texto_completo += self._avancar_caractere()
-
-      # Requisito 7 (Ckp 1): Antes de retornar IDENTIFICADOR, verifica se é uma Palavra Reservada.
-      tipo = PALAVRAS_RESERVADAS.get(texto_completo)
-      if tipo is None:
-        tipo = TiposDeToken.IDENTIFICADOR
-      
-      return Token(tipo, texto_completo, linha_do_token, coluna_do_token)
-
-    # Requisito 6 (Ckp 1): Constantes Numéricas (Inteiros e Reais)
-    # Regra: ((0-9)*.)?(0-9)+
-    if caractere_atual.isdigit() or caractere_atual == ".":
-      texto_completo = caractere_atual
-      tem_ponto_decimal = caractere_atual == "."
-
-      while not self._chegou_ao_fim():
-        proximo = self._olhar_proximo_caractere()
-        if proximo.isdigit():
-          texto_completo += self._avancar_caractere()
-        elif proximo == "." and not tem_ponto_decimal:
-          tem_ponto_decimal = True
-          texto_completo += self._avancar_caractere()
-        else:
-          break
-
-      # Requisito 9 (Ckp 1): Tratamento de erro para números inválidos (ex: "1." ou ".")
-      if texto_completo.endswith(".") or texto_completo == ".":
-        print(
-          f"ERRO LÉXICO: Número inválido '{texto_completo}' na Linha: {linha_do_token}, Coluna: {coluna_do_token}",
-          file=sys.stderr
-        )
-        return None # Retorna None para sinalizar erro léxico
-
-      # Requisito 9 (Ckp 1): Tratamento de erro para identificador mal formado (ex: "123nome")
-      if self._olhar_proximo_caractere().isalpha():
-        while (
-          not self._chegou_ao_fim() and
-          self._olhar_proximo_caractere().isalnum()
-        ):
-          texto_completo += self._avancar_caractere()
-        print(
-          f"ERRO LÉXICO: Identificador inválido '{texto_completo}' na Linha: {linha_do_token}, Coluna: {coluna_do_token}",
-          file=sys.stderr
-        )
-        return None
-
-      tipo_numero = (
-        TiposDeToken.NUMREAL if tem_ponto_decimal else TiposDeToken.NUMINT
-      )
-      return Token(tipo_numero, texto_completo, linha_do_token, coluna_do_token)
-
-    # Requisitos 2, 3, 4, 5 (Ckp 1): Operadores e Símbolos
-    if caractere_atual == "+":
-      return Token(TiposDeToken.OPERADOR_MATEMATICO, "+", linha_do_token, coluna_do_token)
-    if caractere_atual == "-":
-      return Token(TiposDeToken.OPERADOR_MATEMATICO, "-", linha_do_token, coluna_do_token)
-    if caractere_atual == "*":
-      return Token(TiposDeToken.OPERADOR_MATEMATICO, "*", linha_do_token, coluna_do_token)
-    if caractere_atual == "/":
-      return Token(TiposDeToken.OPERADOR_MATEMATICO, "/", linha_do_token, coluna_do_token)
-    if caractere_atual == "(":
-      return Token(TiposDeToken.LEFT_PAR, "(", linha_do_token, coluna_do_token)
-    if caractere_atual == ")":
-      return Token(TiposDeToken.RIGHT_PAR, ")", linha_do_token, coluna_do_token)
-    if caractere_atual == ":":
-      return Token(TiposDeToken.DOIS_PONTOS, ":", linha_do_token, coluna_do_token)
-      
-    if caractere_atual == ">":
-      if self._olhar_proximo_caractere() == "=":
-        self._avancar_caractere()
-        return Token(TiposDeToken.OP_REL, ">=", linha_do_token, coluna_do_token)
-      return Token(TiposDeToken.OP_REL, ">", linha_do_token, coluna_do_token)
-
-    if caractere_atual == "<":
-      if self._olhar_proximo_caractere() == "=":
-        self._avancar_caractere()
-        return Token(TiposDeToken.OP_REL, "<=", linha_do_token, coluna_do_token)
-      return Token(TiposDeToken.OP_REL, "<", linha_do_token, coluna_do_token)
-
-    if caractere_atual == "!":
-      if self._olhar_proximo_caractere() == "=":
-        self._avancar_caractere()
-        return Token(TiposDeToken.OP_REL, "!=", linha_do_token, coluna_do_token)
-      # Erro: '!' sozinho não é válido (segue a lógica original de JS)
-      
-    if caractere_atual == "=":
-      if self._olhar_proximo_caractere() == "=":
-        self._avancar_caractere()
-        return Token(TiposDeToken.OP_REL, "==", linha_do_token, coluna_do_token)
-      # Requisito 3 (Ckp 1)
-      return Token(TiposDeToken.OPERADOR_ATRIBUICAO, "=", linha_do_token, coluna_do_token)
-
-    # Token CADEIA (necessário para 'IMPRIMIR' da gramática do Ckp 2
-    if caractere_atual == '"':
-      texto = ""
-      # Consome caracteres até o próximo "
-      while not self._chegou_ao_fim() and self._olhar_proximo_caractere() != '"':
-        texto += self._avancar_caractere()
-      
-      # Requisito 9 (Ckp 1): Erro de cadeia não finalizada
-      if self._olhar_proximo_caractere() != '"':
-        print(
-          f"ERRO LÉXICO: Cadeia não finalizada na Linha: {linha_do_token}, Coluna: {coluna_do_token}",
-          file=sys.stderr
-        )
-        return None
-      self._avancar_caractere() # Consome o " final
-      return Token(
-        TiposDeToken.CADEIA,
-        texto,
-        linha_do_token,
-        coluna_do_token
-      )
-
-    # Requisito 9 (Ckp 1): Erro para Símbolos Desconhecidos
-    # Se o caractere não se encaixou em nenhuma regra, é um erro.
-    print(
-      f"ERRO LÉXICO: Símbolo não reconhecido '{caractere_atual}' na Linha: {linha_do_token}, Coluna: {coluna_do_token}",
-      file=sys.stderr
+    lexema = self._proximo_lexema()
+    if lexema is None:
+      return None # Erro léxico
+    tipo, inicio, fim = lexema
+    texto = _TEXTO_FIXO.get(tipo)
+    if texto is None:
+      if tipo is TiposDeToken.CADEIA:
+        texto = self.codigo_fonte[inicio + 1:fim - 1] # Sem as aspas
+      else:
+        texto = self.codigo_fonte[inicio:fim]
+        if tipo is TiposDeToken.IDENTIFICADOR:
+          texto = self._nomes.setdefault(texto, texto)
+    return Token(tipo, texto, offset=inicio, indice=self.indice_linhas)
+
+  # API em lote. Com lote=False (padrão), retorna um gerador que produz os
+  # tokens um a um, terminando no FIM_DE_ARQUIVO (inclusive). Com lote=True,
+  # varre o arquivo inteiro de uma vez e retorna um TokenStream.
+  # Nos dois modos os erros léxicos não interrompem a varredura nem são
+  # impressos: ficam em self.diagnosticos (e em TokenStream.diagnosticos).
+  def tokenize(self, lote=False):
+    self.reportar_erros = False
+    if lote:
+      if self.motor == "regex":
+        return self._tokenize_lote_regex()
+      return self._tokenize_lote()
+    return self._tokenize_gerador()
+
+  def _tokenize_gerador(self):
+    proximo_token = self.proximo_token
+    while True:
+      token = proximo_token()
+      if token is None:
+        continue # Erro já registrado em self.diagnosticos
+      yield token
+      if token.tipo is TiposDeToken.FIM_DE_ARQUIVO:
+        return
+
+  # Modo em lote do motor de caracteres: grava (tipo, início, fim) direto
+  # nos vetores do TokenStream, sem criar objetos Token. Os tokens de um
+  # caractere saem direto da tabela de ordinais, espaços e identificadores
+  # são tratados no próprio laço e os demais lexemas, pelo tratador do
+  # primeiro caractere.
+  def _tokenize_lote(self):
+    codigo = self.codigo_fonte
+    tamanho = len(codigo)
+    stream = TokenStream(codigo, self.indice_linhas)
+    adicionar_tipo = stream.tipos.append
+    adicionar_inicio = stream.inicios.append
+    adicionar_fim = stream.fins.append
+    diagnosticos = self.diagnosticos
+    ordinais_simples = _ORDINAL_SIMPLES_ASCII
+    tratadores = _TRATADORES_ASCII
+    nao_ascii = AnalisadorLexico._lexema_nao_ascii
+    espacos = AnalisadorLexico._lexema_espacos
+    identificador = AnalisadorLexico._lexema_identificador
+    palavra = AnalisadorLexico._lexema_palavra
+    casar_espacos = _RE_ESPACOS.match
+    casar_continuacao = _RE_CONTINUACAO_IDENTIFICADOR.match
+    ordinal_por_palavra = _ORDINAL_POR_PALAVRA.get
+    ordinal_identificador = _ORDINAL_IDENTIFICADOR
+    ignorado = _IGNORADO
+    ordinal = ORDINAL_DO_TIPO
+    pos = self.posicao_atual
+    while pos < tamanho:
+      numero = ord(codigo[pos])
+      if numero < 128:
+        simples = ordinais_simples[numero]
+        if simples is not None:
+          adicionar_tipo(simples)
+          adicionar_inicio(pos)
+          pos += 1
+          adicionar_fim(pos)
+          continue
+        tratador = tratadores[numero]
+        # Espaços e identificadores, os lexemas mais comuns, sem chamada
+        if tratador is espacos:
+          pos = casar_espacos(codigo, pos).end()
+          continue
+        if tratador is identificador or tratador is palavra:
+          fim = casar_continuacao(codigo, pos + 1).end()
+          adicionar_tipo(
+            ordinal_identificador if tratador is identificador
+            else ordinal_por_palavra(codigo[pos:fim], ordinal_identificador)
+          )
+          adicionar_inicio(pos)
+          adicionar_fim(fim)
+          pos = fim
+          continue
+        lexema = tratador(self, codigo, pos)
+      else:
+        lexema = nao_ascii(self, codigo, pos)
+      pos = self.posicao_atual
+      if lexema is ignorado:
+        continue
+      if lexema is None:
+        self._anotar_erro_no_stream(stream, diagnosticos[-1])
+        continue
+      tipo, inicio, fim = lexema
+      adicionar_tipo(ordinal[tipo])
+      adicionar_inicio(inicio)
+      adicionar_fim(fim)
+
+    self.posicao_atual = pos
+    adicionar_tipo(_ORDINAL_FIM_DE_ARQUIVO)
+    adicionar_inicio(pos)
+    adicionar_fim(pos)
+    return stream
+
+  # Associa um erro léxico à posição corrente do TokenStream
+  def _anotar_erro_no_stream(self, stream, erro):
+    erro.indice_token = len(stream.tipos)
+    stream.diagnosticos.append(erro)
+
+  # Retorna (tipo, início, fim) do próximo lexema, ou None em caso de erro
+  # léxico. Motor caractere a caractere (referência): o primeiro caractere
+  # escolhe o tratador na tabela _TRATADORES_ASCII (uma indexação, sem a
+  # cadeia de comparações); espaços e comentários são pulados no laço.
+  def _proximo_lexema_caracteres(self):
+    codigo = self.codigo_fonte
+    tamanho = len(codigo)
+    pos = self.posicao_atual
+    while pos < tamanho:
+      numero = ord(codigo[pos])
+      if numero < 128:
+        lexema = _TRATADORES_ASCII[numero](self, codigo, pos)
+      else:
+        lexema = self._lexema_nao_ascii(codigo, pos)
+      if lexema is not _IGNORADO:
+        return lexema
+      pos = self.posicao_atual
+    return (TiposDeToken.FIM_DE_ARQUIVO, pos, pos)
+
+  # --- Tratadores do motor de caracteres ---
+  # Cada um recebe o código e o início do lexema, deixa posicao_atual logo
+  # depois dele e retorna (tipo, início, fim), None (erro léxico) ou
+  # _IGNORADO (espaços e comentários). Nos ramos abaixo, o fim do lexema é
+  # localizado primeiro e o texto é obtido com uma única fatia.
+
+  # Ignorar espaços em branco (a sequência inteira de uma vez)
+  def _lexema_espacos(self, codigo, inicio):
+    self.posicao_atual = _RE_ESPACOS.match(codigo, inicio).end()
+    return _IGNORADO
+
+  # Requisito 8 (Ckp 1): Ignorar comentário de linha única # ... \n
+  def _lexema_comentario_de_linha(self, codigo, inicio):
+    fim = codigo.find("\n", inicio)
+    if fim == -1:
+      fim = len(codigo)
+    # '\r' também encerra o comentário; a busca fica limitada à linha
+    retorno = codigo.find("\r", inicio, fim)
+    if retorno != -1:
+      fim = retorno
+    self.posicao_atual = fim # O '\n'/'\r' fica para os espaços
+    return _IGNORADO
+
+  # Requisito 8 (Ckp 1): comentário de múltiplas linhas /* ... */, ou o
+  # operador de divisão (Requisito 2)
+  def _lexema_barra(self, codigo, inicio):
+    if codigo.startswith("*", inicio + 1):
+      fim = codigo.find("*/", inicio + 2)
+      # Comentário não finalizado consome o restante do arquivo
+      self.posicao_atual = len(codigo) if fim == -1 else fim + 2
+      return _IGNORADO
+    self.posicao_atual = inicio + 1
+    return (TiposDeToken.OPERADOR_MATEMATICO, inicio, inicio + 1)
+
+  # Requisito 1 (Ckp 1): Identificadores
+  # Regra: (a-z | A-Z | _)(a-z | A-Z | _ | 0-9)*
+  # Começando por letra minúscula ou '_', não pode ser palavra reservada.
+  def _lexema_identificador(self, codigo, inicio):
+    # \w equivale a isalnum() or "_"
+    fim = _RE_CONTINUACAO_IDENTIFICADOR.match(codigo, inicio + 1).end()
+    self.posicao_atual = fim
+    return (TiposDeToken.IDENTIFICADOR, inicio, fim)
+
+  # Requisito 7 (Ckp 1): começando por letra maiúscula, verifica se o
+  # identificador é uma Palavra Reservada.
+  def _lexema_palavra(self, codigo, inicio):
+    fim = _RE_CONTINUACAO_IDENTIFICADOR.match(codigo, inicio + 1).end()
+    self.posicao_atual = fim
+    return (PALAVRAS_RESERVADAS.get(codigo[inicio:fim], TiposDeToken.IDENTIFICADOR), inicio, fim)
+
+  # Requisito 6 (Ckp 1): Constantes Numéricas (Inteiros e Reais)
+  # Regra: ((0-9)*.)?(0-9)+
+  def _lexema_numero(self, codigo, inicio):
+    tem_ponto_decimal = codigo[inicio] == "."
+    fim = self._fim_dos_digitos(inicio + 1)
+    if not tem_ponto_decimal and fim < len(codigo) and codigo[fim] == ".":
+      tem_ponto_decimal = True
+      fim = self._fim_dos_digitos(fim + 1)
+    self.posicao_atual = fim
+
+    # Requisito 9 (Ckp 1): Tratamento de erro para números inválidos (ex: "1." ou ".")
+    if codigo[fim - 1] == ".":
+      return self._erro_lexico(diagnostico.NUMERO_INVALIDO, inicio, fim)
+
+    # Requisito 9 (Ckp 1): Tratamento de erro para identificador mal formado (ex: "123nome")
+    if fim < len(codigo) and codigo[fim].isalpha():
+      # [^\W_] equivale a isalnum()
+      fim = _RE_ALFANUMERICOS.match(codigo, fim).end()
+      self.posicao_atual = fim
+      return self._erro_lexico(diagnostico.IDENTIFICADOR_INVALIDO, inicio, fim)
+
+    tipo_numero = (
+      TiposDeToken.NUMREAL if tem_ponto_decimal else TiposDeToken.NUMINT
     )
-    return None
\ No newline at end of file
+    return (tipo_numero, inicio, fim)
+
+  # Requisitos 2 e 5 (Ckp 1): '+', '-', '*', '(', ')' e ':'
+  def _lexema_simbolo(self, codigo, inicio):
+    self.posicao_atual = inicio + 1
+    return (SIMBOLOS_SIMPLES[codigo[inicio]], inicio, inicio + 1)
+
+  # Requisitos 3 e 4 (Ckp 1): '>', '<', '!' e '=', seguidos ou não de '='
+  def _lexema_relacional(self, codigo, inicio):
+    if codigo.startswith("=", inicio + 1):
+      self.posicao_atual = inicio + 2
+      return (TiposDeToken.OP_REL, inicio, inicio + 2) # ">=", "<=", "!=", "=="
+    self.posicao_atual = inicio + 1
+    caractere = codigo[inicio]
+    if caractere == "=":
+      # Requisito 3 (Ckp 1)
+      return (TiposDeToken.OPERADOR_ATRIBUICAO, inicio, inicio + 1)
+    if caractere == "!":
+      # Erro: '!' sozinho não é válido (segue a lógica original de JS)
+      return self._erro_lexico(diagnostico.SIMBOLO_NAO_RECONHECIDO, inicio, inicio + 1)
+    return (TiposDeToken.OP_REL, inicio, inicio + 1)
+
+  # Token CADEIA (necessário para 'IMPRIMIR' da gramática do Ckp 2)
+  def _lexema_cadeia(self, codigo, inicio):
+    # Localiza o próximo " de uma vez
+    fim = codigo.find('"', inicio + 1)
+
+    # Requisito 9 (Ckp 1): Erro de cadeia não finalizada
+    if fim == -1:
+      self.posicao_atual = len(codigo) # Consome o restante do arquivo
+      return self._erro_lexico(diagnostico.CADEIA_NAO_FINALIZADA, inicio, len(codigo))
+    self.posicao_atual = fim + 1 # Consome o conteúdo e o " final
+    return (TiposDeToken.CADEIA, inicio, fim + 1)
+
+  # Requisito 9 (Ckp 1): Erro para Símbolos Desconhecidos
+  # Se o caractere não se encaixou em nenhuma regra, é um erro.
+  def _lexema_desconhecido(self, codigo, inicio):
+    self.posicao_atual = inicio + 1
+    return self._erro_lexico(diagnostico.SIMBOLO_NAO_RECONHECIDO, inicio, inicio + 1)
+
+  # Primeiro caractere fora do ASCII: espaço, letra ou dígito Unicode
+  # (isspace, isalpha e isdigit, como no restante do lexema), ou erro
+  def _lexema_nao_ascii(self, codigo, inicio):
+    caractere = codigo[inicio]
+    if caractere.isspace():
+      return self._lexema_espacos(codigo, inicio)
+    if caractere.isalpha():
+      return self._lexema_identificador(codigo, inicio)
+    if caractere.isdigit():
+      return self._lexema_numero(codigo, inicio)
+    return self._lexema_desconhecido(codigo, inicio)
+
+  # --- Motor Regex ---
+
+  # Versão de _proximo_lexema() baseada no padrão mestre.
+  def _proximo_lexema_regex(self):
+    codigo = self.codigo_fonte
+    tamanho = len(codigo)
+    casar = _PADRAO_MESTRE.match
+    pos = self.posicao_atual
+
+    while True:
+      if pos >= tamanho:
+        self.posicao_atual = pos
+        return (TiposDeToken.FIM_DE_ARQUIVO, pos, pos)
+
+      m = casar(codigo, pos)
+      if m is None:
+        # Caso não coberto pelo padrão (erro léxico ou não-ASCII):
+        # processa um único token com o motor de caracteres
+        self.posicao_atual = pos
+        return self._proximo_lexema_caracteres()
+
+      grupo = m.lastgroup
+      fim = m.end()
+
+      if grupo in _GRUPOS_IGNORADOS:
+        if grupo == "COMENTARIO_BLOCO":
+          # O padrão casa só o "/*"; o fim é localizado com str.find
+          fim = codigo.find("*/", fim)
+          fim = tamanho if fim == -1 else fim + 2
+        pos = fim
+        continue
+
+      if grupo == "IDENTIFICADOR":
+        tipo = PALAVRAS_RESERVADAS.get(m.group(), TiposDeToken.IDENTIFICADOR)
+      elif grupo == "CADEIA":
+        tipo = TiposDeToken.CADEIA
+      else:
+        tipo = _TIPOS_POR_GRUPO[grupo]
+
+      self.posicao_atual = fim
+      return (tipo, pos, fim)
+
+  # Modo em lote do motor regex: o laço do padrão mestre grava os ordinais
+  # e deslocamentos direto no TokenStream.
+  def _tokenize_lote_regex(self):
+    codigo = self.codigo_fonte
+    tamanho = len(codigo)
+    stream = TokenStream(codigo, self.indice_linhas)
+    tipos = stream.tipos
+    adicionar_tipo = tipos.append
+    adicionar_inicio = stream.inicios.append
+    adicionar_fim = stream.fins.append
+    casar = _PADRAO_MESTRE.match
+    procurar = codigo.find
+    ignorados = _GRUPOS_IGNORADOS
+    ordinal_por_grupo = _ORDINAL_POR_GRUPO
+    ordinal_por_palavra = _ORDINAL_POR_PALAVRA.get
+    ordinal_identificador = _ORDINAL_IDENTIFICADOR
+    ordinal_tipo = ORDINAL_DO_TIPO
+    diagnosticos = self.diagnosticos
+    pos = self.posicao_atual
+
+    while pos < tamanho:
+      m = casar(codigo, pos)
+      if m is None:
+        self.posicao_atual = pos
+        lexema = self._proximo_lexema_caracteres()
+        if lexema is None:
+          self._anotar_erro_no_stream(stream, diagnosticos[-1])
+        else:
+          adicionar_tipo(ordinal_tipo[lexema[0]])
+          adicionar_inicio(lexema[1])
+          adicionar_fim(lexema[2])
+        pos = self.posicao_atual
+        continue
+
+      grupo = m.lastgroup
+      fim = m.end()
+      if grupo in ignorados:
+        if grupo == "COMENTARIO_BLOCO":
+          fim = procurar("*/", fim)
+          fim = tamanho if fim == -1 else fim + 2
+      elif grupo == "IDENTIFICADOR":
+        adicionar_tipo(ordinal_por_palavra(m.group(), ordinal_identificador))
+        adicionar_inicio(pos)
+        adicionar_fim(fim)
+      elif grupo == "CADEIA":
+        adicionar_tipo(_ORDINAL_CADEIA)
+        adicionar_inicio(pos)
+        adicionar_fim(fim)
+      else:
+        adicionar_tipo(ordinal_por_grupo[grupo])
+        adicionar_inicio(pos)
+        adicionar_fim(fim)
+      pos = fim
+
+    self.posicao_atual = pos
+    adicionar_tipo(_ORDINAL_FIM_DE_ARQUIVO)
+    adicionar_inicio(pos)
+    adicionar_fim(pos)
+    return stream
+
+"""
+Tabelas de despacho do motor de caracteres, indexadas pelo código do
+primeiro caractere ASCII do lexema (128 entradas). A classificação usa os
+mesmos testes do lexema inteiro (isspace, isalpha, isdigit), de modo que
+o resultado é o mesmo da antiga cadeia de comparações; caracteres fora do
+ASCII seguem para _lexema_nao_ascii.
+"""
+def _tratador_ascii(caractere):
+  if caractere.isspace():
+    return AnalisadorLexico._lexema_espacos
+  if "A" <= caractere <= "Z":
+    return AnalisadorLexico._lexema_palavra # Palavras reservadas começam com maiúscula
+  if caractere.isalpha() or caractere == "_":
+    return AnalisadorLexico._lexema_identificador
+  if caractere.isdigit() or caractere == ".":
+    return AnalisadorLexico._lexema_numero
+  if caractere in SIMBOLOS_SIMPLES:
+    return AnalisadorLexico._lexema_simbolo
+  if caractere in "<>=!":
+    return AnalisadorLexico._lexema_relacional
+  if caractere == "/":
+    return AnalisadorLexico._lexema_barra
+  if caractere == "#":
+    return AnalisadorLexico._lexema_comentario_de_linha
+  if caractere == '"':
+    return AnalisadorLexico._lexema_cadeia
+  return AnalisadorLexico._lexema_desconhecido
+
+_TRATADORES_ASCII = tuple(_tratador_ascii(chr(numero)) for numero in range(128))
+
+# Ordinal do token de um caractere (ou None), para o laço do modo em lote
+_ORDINAL_SIMPLES_ASCII = tuple(
+  ORDINAL_DO_TIPO[SIMBOLOS_SIMPLES[chr(numero)]] if chr(numero) in SIMBOLOS_SIMPLES else None
+  for numero in range(128)
+)
@@ -0,0 +1,404 @@
+# src/scanner_fluxo.py
+
+import codecs
+import mmap
+import os
+import re
+from .token_type import TiposDeToken
+from .token import Token
+from .diagnostico import DiagnosticoLexico
+from .scanner import AnalisadorLexico, PALAVRAS_RESERVADAS, _RE_ESPACOS
+"""
+ScannerFluxo.py
+
+Analisador Léxico em fluxo, para arquivos grandes demais para ler num
+único str. Lê o arquivo como bytes: por mmap quando a origem é um arquivo
+comum, ou em blocos (read) para pipes e outros objetos binários. No modo
+em blocos, a janela em memória guarda só os bytes a partir do token
+corrente; cadeias e comentários que atravessam o fim de um bloco fazem a
+janela crescer até o fim do lexema (comentários /* */ são pulados bloco a
+bloco, sem crescer a janela). No modo mmap, as páginas já consumidas são
+devolvidas ao sistema (MADV_DONTNEED).
+
+Tem a mesma interface de proximo_token() que o Parser usa: retorna a si
+mesmo (como o CursorDeTokens), com tipo/offset do token corrente; texto e
+linha/coluna só são calculados quando acessados. Os deslocamentos são em
+bytes, mas linha e coluna contam caracteres e tratam '\\r\\n' e '\\r' como
+quebras de linha, como o open() em modo texto do main.py, de modo que as
+mensagens são as mesmas do AnalisadorLexico.
+
+O caminho rápido é uma versão em bytes do padrão mestre do motor regex.
+Erros léxicos e lexemas não-ASCII são delegados, um a um, ao motor de
+caracteres do AnalisadorLexico sobre um trecho decodificado.
+"""
+
+TAMANHO_DO_BLOCO = 1 << 20 # Bytes lidos (ou validados/liberados, no mmap) por vez
+_TRECHO_DO_MOTOR_DE_CARACTERES = 256 # Bytes decodificados para um lexema delegado (dobra se precisar)
+
+_PADRAO_MESTRE_BYTES = re.compile(rb"""
+    (?P<ESPACO>[ \t\n\r\x0b\x0c\x1c-\x1f]+)
+  | (?P<COMENTARIO_BLOCO>/\*)
+  | (?P<COMENTARIO_LINHA>\#[^\n\r]*)
+  | (?P<IDENTIFICADOR>[A-Za-z_][A-Za-z0-9_]*(?![A-Za-z0-9_\x80-\xff]))
+  | (?P<NUMREAL>(?:[0-9]+\.[0-9]+|\.[0-9]+)(?![0-9.A-Za-z\x80-\xff]))
+  | (?P<NUMINT>[0-9]+(?![0-9.A-Za-z\x80-\xff]))
+  | (?P<OP_REL>[<>=!]=|[<>])
+  | (?P<OPERADOR_ATRIBUICAO>=)
+  | (?P<OPERADOR_MATEMATICO>[-+*/])
+  | (?P<LEFT_PAR>\()
+  | (?P<RIGHT_PAR>\))
+  | (?P<DOIS_PONTOS>:)
+  | (?P<CADEIA>"[^"]*")
+""", re.VERBOSE)
+
+_GRUPOS_IGNORADOS = frozenset(("ESPACO", "COMENTARIO_LINHA"))
+_TIPOS_POR_GRUPO = {
+  "NUMREAL": TiposDeToken.NUMREAL,
+  "NUMINT": TiposDeToken.NUMINT,
+  "OP_REL": TiposDeToken.OP_REL,
+  "OPERADOR_ATRIBUICAO": TiposDeToken.OPERADOR_ATRIBUICAO,
+  "OPERADOR_MATEMATICO": TiposDeToken.OPERADOR_MATEMATICO,
+  "LEFT_PAR": TiposDeToken.LEFT_PAR,
+  "RIGHT_PAR": TiposDeToken.RIGHT_PAR,
+  "DOIS_PONTOS": TiposDeToken.DOIS_PONTOS,
+  "CADEIA": TiposDeToken.CADEIA,
+}
+_PALAVRAS_EM_BYTES = {texto.encode("ascii"): tipo for texto, tipo in PALAVRAS_RESERVADAS.items()}
+
+# Quantidade de caracteres de um trecho UTF-8 (que começa e termina em
+# fronteiras de caractere)
+def _caracteres(trecho):
+  return len(trecho) if trecho.isascii() else len(trecho.decode("utf-8", "replace"))
+
+# Mesma mensagem de UnicodeDecodeError, mas com a posição no arquivo inteiro
+def _erro_de_codificacao(erro, deslocamento):
+  inicio = erro.start + deslocamento
+  if erro.end - erro.start == 1:
+    return ValueError(
+      f"'{erro.encoding}' codec can't decode byte 0x{erro.object[erro.start]:02x} in position {inicio}: {erro.reason}"
+    )
+  return ValueError(
+    f"'{erro.encoding}' codec can't decode bytes in position {inicio}-{erro.end - 1 + deslocamento}: {erro.reason}"
+  )
+
+class _PosicaoFixa:
+  __slots__ = ("posicao",)
+
+  def __init__(self, linha, coluna):
+    self.posicao = (linha, coluna)
+
+  def linha_coluna(self, _offset):
+    return self.posicao
+
+# Diagnóstico com texto e posição já resolvidos: o trecho do arquivo pode
+# não estar mais na memória quando a mensagem for montada
+class DiagnosticoDeFluxo(DiagnosticoLexico):
+  __slots__ = ("_texto",)
+
+  def __init__(self, codigo, inicio, fim, texto, linha, coluna):
+    super().__init__(codigo, inicio, fim, _PosicaoFixa(linha, coluna))
+    self._texto = texto
+
+  @property
+  def texto(self):
+    return self._texto
+
+class AnalisadorLexicoEmFluxo:
+  # 'origem': caminho do arquivo ou objeto binário (com read()). Com
+  # usar_mmap=False, mesmo arquivos comuns são lidos em blocos.
+  def __init__(self, origem, tamanho_do_bloco=TAMANHO_DO_BLOCO, usar_mmap=True):
+    self._arquivo = None # Aberto aqui (fechado em fechar())
+    if isinstance(origem, (str, bytes, os.PathLike)):
+      origem = self._arquivo = open(origem, "rb")
+    self.tamanho_do_bloco = tamanho_do_bloco
+    self._mapa = None
+    if usar_mmap:
+      try:
+        self._mapa = mmap.mmap(origem.fileno(), 0, access=mmap.ACCESS_READ)
+      except (AttributeError, OSError, ValueError):
+        pass # Sem descritor (BytesIO), pipe ou arquivo vazio: lê em blocos
+    if self._mapa is not None:
+      self._dados = self._mapa
+      self._fim_do_arquivo = True
+    else:
+      self._ler = origem.read
+      self._dados = b""
+      self._fim_do_arquivo = False
+    self._base = 0 # Deslocamento (no arquivo) de self._dados[0]
+    self._validado_ate = 0 # mmap: bytes já conferidos como UTF-8 válido
+    self._decodificador = codecs.getincrementaldecoder("utf-8")()
+    self._liberado_ate = 0 # mmap: páginas já devolvidas ao sistema
+    self.posicao = 0 # Deslocamento onde começa a busca pelo próximo lexema
+
+    # Token corrente
+    self.tipo = None
+    self.offset = 0
+    self._fim = 0
+
+    # Linha/coluna do deslocamento self._contado_ate (avança só para frente)
+    self._linha = 1
+    self._coluna = 0 # Caracteres desde o início da linha
+    self._contado_ate = 0
+    self._terminou_em_cr = False
+
+    # Só o primeiro e o último erro ficam guardados (memória constante)
+    self.primeiro_erro = None
+    self.ultimo_erro = None
+    self.quantidade_de_erros = 0
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *_):
+    self.fechar()
+
+  def fechar(self):
+    if self._mapa is not None:
+      self._mapa.close()
+      self._mapa = None
+    if self._arquivo is not None:
+      self._arquivo.close()
+      self._arquivo = None
+
+  # --- Interface usada pelo Parser ---
+
+  # Avança para o próximo token; retorna None em caso de erro léxico (o
+  # erro fica em ultimo_erro). Depois do FIM_DE_ARQUIVO, permanece nele.
+  def proximo_token(self):
+    if self.tipo is TiposDeToken.FIM_DE_ARQUIVO:
+      return self
+    lexema = self._proximo_lexema()
+    if lexema is None:
+      return None
+    self.tipo, self.offset, self._fim = lexema
+    return self
+
+  @property
+  def texto(self):
+    if self.tipo is TiposDeToken.FIM_DE_ARQUIVO:
+      return "FIM_DE_ARQUIVO"
+    base = self._base
+    if self.tipo is TiposDeToken.CADEIA:
+      texto = self._dados[self.offset + 1 - base:self._fim - 1 - base].decode("utf-8")
+      # O main.py lê em modo texto, que converte '\r\n' e '\r' em '\n'
+      return texto.replace("\r\n", "\n").replace("\r", "\n") if "\r" in texto else texto
+    return self._dados[self.offset - base:self._fim - base].decode("utf-8")
+
+  @property
+  def linha(self):
+    return self.linha_coluna(self.offset)[0]
+
+  @property
+  def coluna(self):
+    return self.linha_coluna(self.offset)[1]
+
+  # Cópia estável do token corrente
+  def como_token(self):
+    linha, coluna = self.linha_coluna(self.offset)
+    return Token(self.tipo, self.texto, linha, coluna, offset=self.offset)
+
+  def __str__(self):
+    return str(self.como_token())
+
+  # Linha/coluna de um deslocamento. As consultas precisam ser em ordem
+  # crescente (o token corrente ou posições depois dele).
+  def linha_coluna(self, offset):
+    self._contar_ate(offset)
+    return self._linha, self._coluna + 1
+
+  # --- Listagem e erros ---
+
+  # Escreve os tokens até o primeiro erro léxico (ou o fim), no formato de
+  # Token.__str__, em blocos. Retorna o primeiro erro (ou None).
+  def escrever(self, saida, tamanho_do_bloco=4096):
+    bloco = []
+    while True:
+      token = self.proximo_token()
+      if token is None:
+        break
+      linha, coluna = self.linha_coluna(self.offset)
+      bloco.append(f"Token [Tipo: {self.tipo.name}, Texto: '{self.texto}', Linha: {linha}, Coluna: {coluna}]\n")
+      if len(bloco) >= tamanho_do_bloco:
+        saida.write("".join(bloco))
+        bloco.clear()
+      if self.tipo is TiposDeToken.FIM_DE_ARQUIVO:
+        break
+    if bloco:
+      saida.write("".join(bloco))
+    return self.primeiro_erro
+
+  # Primeiro erro léxico do arquivo: se ainda não apareceu, continua a
+  # varredura (sem o Parser) até encontrá-lo ou chegar ao fim
+  def procurar_primeiro_erro(self):
+    while self.primeiro_erro is None and self.tipo is not TiposDeToken.FIM_DE_ARQUIVO:
+      self.proximo_token()
+    return self.primeiro_erro
+
+  # --- Varredura ---
+
+  # Retorna (tipo, início, fim) do próximo lexema, ou None em caso de erro
+  def _proximo_lexema(self):
+    casar = _PADRAO_MESTRE_BYTES.match
+    while True:
+      pos = self.posicao
+      if self._mapa is not None and pos + _TRECHO_DO_MOTOR_DE_CARACTERES > self._validado_ate:
+        self._validar_mapa()
+      dados = self._dados
+      base = self._base
+      relativo = pos - base
+      tamanho = len(dados)
+      if relativo >= tamanho:
+        if self._fim_do_arquivo:
+          return (TiposDeToken.FIM_DE_ARQUIVO, pos, pos)
+        self._ler_mais()
+        continue
+
+      m = casar(dados, relativo)
+      if m is None:
+        lexema = self._lexema_com_motor_de_caracteres()
+        if lexema is False:
+          continue # Precisou ler mais ou pulou espaços não-ASCII
+        return lexema
+      fim = m.end()
+      if fim == tamanho and not self._fim_do_arquivo:
+        # O lexema pode continuar no próximo bloco
+        self._ler_mais()
+        continue
+      grupo = m.lastgroup
+      if grupo in _GRUPOS_IGNORADOS:
+        self.posicao = base + fim
+        continue
+      if grupo == "COMENTARIO_BLOCO":
+        self._pular_comentario(fim)
+        continue
+      if grupo == "IDENTIFICADOR":
+        tipo = _PALAVRAS_EM_BYTES.get(m.group(), TiposDeToken.IDENTIFICADOR)
+      else:
+        tipo = _TIPOS_POR_GRUPO[grupo]
+      self.posicao = base + fim
+      return (tipo, pos, base + fim)
+
+  # O comentário /* ... */ pode atravessar vários blocos: os blocos já
+  # varridos são descartados (só o último byte fica, pode ser o '*')
+  def _pular_comentario(self, relativo):
+    while True:
+      fim = self._dados.find(b"*/", relativo)
+      if fim != -1:
+        self.posicao = self._base + fim + 2
+        return
+      tamanho = len(self._dados)
+      if self._fim_do_arquivo:
+        self.posicao = self._base + tamanho # Não finalizado: consome o restante
+        return
+      manter = max(relativo, tamanho - 1)
+      while manter > relativo and self._dados[manter] & 0xC0 == 0x80:
+        manter -= 1 # Fronteira de caractere, para a contagem de colunas
+      self.posicao = self._base + manter
+      self._ler_mais()
+      relativo = self.posicao - self._base
+
+  # Erros léxicos e lexemas não-ASCII: o motor de caracteres processa um
+  # único lexema sobre um trecho decodificado. Retorna False quando é
+  # preciso tentar de novo (leu mais dados ou só pulou espaços).
+  def _lexema_com_motor_de_caracteres(self):
+    pos = self.posicao
+    relativo = pos - self._base
+    tamanho = _TRECHO_DO_MOTOR_DE_CARACTERES
+    while True:
+      bruto = bytes(self._dados[relativo:relativo + tamanho])
+      try:
+        texto, _ = codecs.utf_8_decode(bruto, "strict", False) # Ignora um caractere incompleto no fim
+      except UnicodeDecodeError as erro:
+        raise _erro_de_codificacao(erro, pos) from None
+      no_fim_dos_dados = relativo + tamanho >= len(self._dados)
+      if texto[:1].isspace():
+        # Espaço não-ASCII (ex.: U+00A0): pula a sequência inteira
+        fim = _RE_ESPACOS.match(texto).end()
+        if fim == len(texto) and no_fim_dos_dados and not self._fim_do_arquivo:
+          self._ler_mais()
+          return False
+        self.posicao = pos + len(texto[:fim].encode("utf-8"))
+        return False
+      analisador = AnalisadorLexico(texto)
+      analisador.reportar_erros = False
+      lexema = analisador._proximo_lexema_caracteres()
+      fim = analisador.posicao_atual
+      if fim < len(texto) or (no_fim_dos_dados and self._fim_do_arquivo):
+        break
+      if no_fim_dos_dados:
+        self._ler_mais() # O lexema pode continuar no próximo bloco
+        return False
+      tamanho *= 2
+    fim_em_bytes = pos + len(texto[:fim].encode("utf-8"))
+    self.posicao = fim_em_bytes
+    if lexema is not None:
+      return (lexema[0], pos, fim_em_bytes)
+    erro = analisador.diagnosticos[-1]
+    linha, coluna = self.linha_coluna(pos)
+    diagnostico = DiagnosticoDeFluxo(erro.codigo, pos, fim_em_bytes, erro.texto, linha, coluna)
+    if self.primeiro_erro is None:
+      self.primeiro_erro = diagnostico
+    self.ultimo_erro = diagnostico
+    self.quantidade_de_erros += 1
+    return None
+
+  # Modo em blocos: descarta o que vem antes de self.posicao e lê mais um bloco
+  def _ler_mais(self):
+    corte = self.posicao - self._base
+    self._contar_ate(self.posicao)
+    bloco = self._ler(self.tamanho_do_bloco)
+    if not bloco:
+      self._fim_do_arquivo = True
+    self._decodificar(bloco, self._base + len(self._dados), self._fim_do_arquivo)
+    self._dados = self._dados[corte:] + bloco
+    self._base = self.posicao
+
+  # mmap: confere o próximo bloco à frente da posição corrente
+  def _validar_mapa(self):
+    inicio = self._validado_ate
+    fim = min(inicio + self.tamanho_do_bloco, len(self._mapa))
+    self._decodificar(self._mapa[inicio:fim], inicio, fim == len(self._mapa))
+    self._validado_ate = fim
+    # A contagem de linhas acompanha a posição, para que nenhuma consulta
+    # posterior precise reler (e copiar) um trecho grande do arquivo
+    self._contar_ate(self.posicao)
+    self._liberar_paginas()
+
+  # Confere que o arquivo é UTF-8 válido (como o open() do main.py),
+  # um bloco por vez, com um decodificador incremental
+  def _decodificar(self, trecho, deslocamento, final):
+    pendentes = len(self._decodificador.getstate()[0]) # Caractere incompleto do bloco anterior
+    try:
+      self._decodificador.decode(trecho, final)
+    except UnicodeDecodeError as erro:
+      raise _erro_de_codificacao(erro, deslocamento - pendentes) from None
+
+  # mmap: devolve ao sistema as páginas já consumidas (são relidas do
+  # arquivo se forem acessadas de novo)
+  def _liberar_paginas(self):
+    if not hasattr(self._mapa, "madvise") or not hasattr(mmap, "MADV_DONTNEED"):
+      return
+    ate = (self.posicao // mmap.PAGESIZE) * mmap.PAGESIZE
+    if ate - self._liberado_ate >= self.tamanho_do_bloco:
+      self._mapa.madvise(mmap.MADV_DONTNEED, self._liberado_ate, ate - self._liberado_ate)
+      self._liberado_ate = ate
+
+  # Avança a contagem de linha/coluna até o deslocamento 'ate'
+  def _contar_ate(self, ate):
+    if ate <= self._contado_ate:
+      return
+    trecho = bytes(self._dados[self._contado_ate - self._base:ate - self._base])
+    if self._terminou_em_cr or b"\r" in trecho:
+      if self._terminou_em_cr and trecho.startswith(b"\n"):
+        trecho_efetivo = trecho[1:] # O '\n' completa o '\r\n' já contado
+      else:
+        trecho_efetivo = trecho
+      self._terminou_em_cr = trecho.endswith(b"\r")
+      trecho = trecho_efetivo.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    quebras = trecho.count(b"\n")
+    if quebras:
+      self._linha += quebras
+      self._coluna = _caracteres(trecho[trecho.rfind(b"\n") + 1:])
+    else:
+      self._coluna += _caracteres(trecho)
+    self._contado_ate = ate
@@ -0,0 +1,175 @@
+# src/semantico.py
+
+from array import array
+from .token_type import TiposDeToken
+from . import arvore
+"""
+Análise Semântica
+
+Percorre a AST produzida pelo Parser (src/arvore.py) numa única passada:
+  - monta a tabela de símbolos a partir das declarações (nome -> INTEIRO/REAL);
+  - aponta variáveis declaradas mais de uma vez e variáveis usadas sem
+    declaração;
+  - infere o tipo (INTEIRO/REAL) das expressões aritméticas e aponta a
+    atribuição de um valor REAL a uma variável INTEIRO.
+
+Cada nome é internado num "slot" inteiro e denso (0, 1, 2, ...): os nós Var
+recebem o slot da variável, e as fases seguintes indexam vetores por slot
+em vez de procurar o nome num dicionário. O percurso é iterativo (pilhas
+explícitas), então árvores muito profundas não esgotam a recursão.
+"""
+
+INTEIRO = TiposDeToken.PALAVRA_RESERVADA_INTEIRO
+REAL = TiposDeToken.PALAVRA_RESERVADA_REAL
+# Tipos de variável, na ordem do código guardado em TabelaDeSimbolos.tipos
+TIPOS_DE_VARIAVEL = (INTEIRO, REAL)
+CODIGO_DO_TIPO = {tipo: codigo for codigo, tipo in enumerate(TIPOS_DE_VARIAVEL)}
+
+# Tipo de cada literal numérico
+TIPO_DO_LITERAL = {TiposDeToken.NUMINT: INTEIRO, TiposDeToken.NUMREAL: REAL}
+
+class TabelaDeSimbolos:
+  def __init__(self):
+    self.slots = {} # nome -> slot
+    self.nomes = [] # slot -> nome
+    self.tipos = array("B") # slot -> código do tipo (índice em TIPOS_DE_VARIAVEL)
+    self.declaracoes = array("q") # slot -> deslocamento da declaração
+
+  # Declara uma variável e retorna o seu slot (None se o nome já existia)
+  def declarar(self, nome, tipo, inicio):
+    if nome in self.slots:
+      return None
+    slot = len(self.nomes)
+    self.slots[nome] = slot
+    self.nomes.append(nome)
+    self.tipos.append(CODIGO_DO_TIPO[tipo])
+    self.declaracoes.append(inicio)
+    return slot
+
+  # Slot de um nome (None se não foi declarado)
+  def slot(self, nome):
+    return self.slots.get(nome)
+
+  def tipo(self, slot):
+    return TIPOS_DE_VARIAVEL[self.tipos[slot]]
+
+  def __len__(self):
+    return len(self.nomes)
+
+  def __contains__(self, nome):
+    return nome in self.slots
+
+class AnalisadorSemantico:
+  # 'indice_linhas' (IndiceDeLinhas do código-fonte) é usado só para
+  # mostrar linha/coluna nas mensagens de erro.
+  def __init__(self, programa, indice_linhas=None):
+    self.programa = programa
+    self.indice_linhas = indice_linhas
+    self.tabela = TabelaDeSimbolos()
+    self.erros = []
+
+  # Ponto de entrada. Retorna {"sucesso", "erros", "tabela"}.
+  def analisar(self):
+    for declaracao in self.programa.declaracoes:
+      self._declaracao(declaracao)
+    self._comandos(self.programa.comandos)
+    return {"sucesso": not self.erros, "erros": self.erros, "tabela": self.tabela}
+
+  # --- Mensagens ---
+
+  def _posicao(self, inicio):
+    if self.indice_linhas is None:
+      return f"na posição {inicio}"
+    linha, coluna = self.indice_linhas.linha_coluna(inicio)
+    return f"na linha {linha}, coluna {coluna}"
+
+  def _erro(self, mensagem, inicio):
+    self.erros.append(f"ERRO SEMÂNTICO: {mensagem} {self._posicao(inicio)}.")
+
+  # --- Declarações ---
+
+  def _declaracao(self, declaracao):
+    if self.tabela.declarar(declaracao.nome, declaracao.tipo, declaracao.inicio) is None:
+      anterior = self.tabela.declaracoes[self.tabela.slot(declaracao.nome)]
+      self._erro(
+        f"Variável '{declaracao.nome}' declarada novamente (primeira declaração {self._posicao(anterior)})",
+        declaracao.inicio,
+      )
+
+  # --- Comandos ---
+
+  # Percorre os comandos na ordem do código-fonte, com uma pilha explícita
+  def _comandos(self, comandos):
+    pendentes = list(reversed(comandos))
+    while pendentes:
+      comando = pendentes.pop()
+      classe = type(comando)
+      if classe is arvore.Atribuicao:
+        alvo = self._variavel(comando.alvo)
+        tipo = self._expressao(comando.expressao)
+        if alvo is not None and tipo is REAL and self.tabela.tipo(alvo) is INTEIRO:
+          self._erro(
+            f"Atribuição de valor REAL à variável INTEIRO '{comando.alvo.nome}'",
+            comando.inicio,
+          )
+      elif classe is arvore.Ler:
+        self._variavel(comando.alvo)
+      elif classe is arvore.Imprimir:
+        if type(comando.valor) is arvore.Var:
+          self._variavel(comando.valor)
+      elif classe is arvore.Se:
+        self._expressao(comando.condicao)
+        if comando.senao is not None:
+          pendentes.append(comando.senao)
+        pendentes.append(comando.entao)
+      elif classe is arvore.Enquanto:
+        self._expressao(comando.condicao)
+        pendentes.append(comando.corpo)
+      elif classe is arvore.Bloco:
+        pendentes.extend(reversed(comando.comandos))
+
+  # Resolve o slot de um uso de variável (None, com erro, se não declarada)
+  def _variavel(self, var):
+    slot = self.tabela.slots.get(var.nome)
+    var.slot = slot
+    if slot is None:
+      self._erro(f"Variável '{var.nome}' não declarada", var.inicio)
+    return slot
+
+  # Tipo de uma expressão: INTEIRO, REAL ou None (desconhecido, por causa de
+  # uma variável não declarada, ou expressão relacional/booleana).
+  # Pós-ordem iterativa: os marcadores combinam os dois últimos tipos.
+  def _expressao(self, expressao):
+    pendentes = [expressao]
+    tipos = []
+    while pendentes:
+      no = pendentes.pop()
+      if no is _OPERACAO_ARITMETICA:
+        direita, esquerda = tipos.pop(), tipos.pop()
+        if esquerda is None or direita is None:
+          tipos.append(None)
+        else:
+          # REAL se algum operando for REAL (INTEIRO / INTEIRO continua INTEIRO)
+          tipos.append(REAL if esquerda is REAL or direita is REAL else INTEIRO)
+      elif no is _OPERACAO_LOGICA:
+        tipos.pop()
+        tipos[-1] = None
+      elif type(no) is arvore.Var:
+        slot = self._variavel(no)
+        tipos.append(None if slot is None else self.tabela.tipo(slot))
+      elif type(no) is arvore.Literal:
+        tipos.append(TIPO_DO_LITERAL.get(no.tipo))
+      else:
+        # BinOp, RelOp ou BoolOp: esquerda, direita e depois o marcador
+        pendentes.append(_OPERACAO_ARITMETICA if type(no) is arvore.BinOp else _OPERACAO_LOGICA)
+        pendentes.append(no.direita)
+        pendentes.append(no.esquerda)
+    return tipos[-1]
+
+# Marcadores da pós-ordem em AnalisadorSemantico._expressao
+_OPERACAO_ARITMETICA = object()
+_OPERACAO_LOGICA = object()
+
+# Analisa uma AST e retorna {"sucesso", "erros", "tabela"}
+def analisar(programa, indice_linhas=None):
+  return AnalisadorSemantico(programa, indice_linhas).analisar()
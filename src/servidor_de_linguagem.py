@@ -0,0 +1,496 @@
+# src/servidor_de_linguagem.py
+
+import asyncio
+import json
+import os
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .token_type import TiposDeToken, TIPOS_POR_ORDINAL
+from .incremental import DocumentoIncremental
+"""
+Servidor_de_linguagem.py
+
+Servidor de linguagem para editores (main.py --servidor): um processo de
+longa duração que fala JSON-RPC no formato do LSP (Language Server
+Protocol) pela entrada e saída padrão. O editor abre e edita documentos
+.mc, e o servidor publica os erros léxicos e sintáticos de cada um
+(textDocument/publishDiagnostics) e responde aos pedidos de tokens
+semânticos (textDocument/semanticTokens), com os tipos vindos do
+TiposDeToken.
+
+O laço de eventos (asyncio) só lê as mensagens, agenda o trabalho e
+escreve as respostas. As análises rodam num conjunto de processos, cada
+um com um único trabalhador: um documento fica sempre no mesmo processo
+(o menos ocupado quando ele foi aberto), que guarda o texto e um
+DocumentoIncremental (src/incremental.py). Assim, uma edição trafega
+como as mudanças enviadas pelo editor, e só os comandos afetados são
+reanalisados. Edições em sequência rápida são agrupadas: a análise só é
+enviada ao processo depois de ATRASO segundos sem novas mudanças naquele
+documento, e um resultado já superado por uma versão mais nova não é
+publicado.
+"""
+
+ATRASO = 0.15 # Segundos sem mudanças antes de reanalisar um documento
+
+# Códigos de erro do JSON-RPC e do LSP
+ERRO_DE_JSON = -32700
+METODO_NAO_ENCONTRADO = -32601
+PARAMETROS_INVALIDOS = -32602
+ERRO_INTERNO = -32603
+NAO_INICIALIZADO = -32002
+REQUISICAO_CANCELADA = -32800
+
+SEVERIDADE_ERRO = 1
+ORIGEM = "mc" # Campo 'source' dos diagnósticos
+
+# Legenda dos tokens semânticos (tipos padrão do LSP, que os editores já
+# sabem colorir) e o tipo de cada TiposDeToken; parênteses, ':' e o fim do
+# arquivo ficam sem tipo
+TIPOS_SEMANTICOS = ("keyword", "type", "variable", "number", "string", "operator")
+
+def tipo_semantico(tipo):
+  if tipo in (TiposDeToken.PALAVRA_RESERVADA_INTEIRO, TiposDeToken.PALAVRA_RESERVADA_REAL):
+    return "type"
+  if tipo in (TiposDeToken.IDENTIFICADOR, TiposDeToken.PALAVRA_RESERVADA_VARIAVEL):
+    return "variable"
+  if tipo.name.startswith("PALAVRA_RESERVADA_"):
+    return "keyword"
+  if tipo in (TiposDeToken.NUMINT, TiposDeToken.NUMREAL):
+    return "number"
+  if tipo is TiposDeToken.CADEIA:
+    return "string"
+  if tipo in (TiposDeToken.OP_REL, TiposDeToken.OPERADOR_MATEMATICO, TiposDeToken.OPERADOR_ATRIBUICAO):
+    return "operator"
+  return None
+
+# Índice na legenda, por ordinal do TiposDeToken (None: token sem tipo)
+_SEMANTICO_POR_ORDINAL = tuple(
+  None if tipo_semantico(tipo) is None else TIPOS_SEMANTICOS.index(tipo_semantico(tipo))
+  for tipo in TIPOS_POR_ORDINAL
+)
+
+# --- Mensagens (cabeçalho Content-Length e corpo JSON) ---
+
+# Lê uma mensagem de um fluxo binário; None no fim da entrada
+def ler_mensagem(entrada):
+  tamanho = None
+  while True:
+    linha = entrada.readline()
+    if not linha:
+      return None
+    linha = linha.strip()
+    if not linha:
+      if tamanho is not None:
+        break
+      continue # Linhas vazias antes do cabeçalho
+    nome, _, valor = linha.partition(b":")
+    if nome.strip().lower() == b"content-length":
+      tamanho = int(valor)
+  corpo = entrada.read(tamanho)
+  if len(corpo) < tamanho:
+    return None
+  return json.loads(corpo)
+
+def escrever_mensagem(saida, mensagem):
+  corpo = json.dumps(mensagem, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+  saida.write(b"Content-Length: %d\r\n\r\n" % len(corpo) + corpo)
+  saida.flush()
+
+# --- Posições do LSP (linha, caractere) <-> deslocamentos no texto ---
+
+# Quebras de linha do LSP: '\n', '\r\n' e '\r'
+_RE_QUEBRA = re.compile(r"\r\n?|\n")
+
+# Início de cada linha do texto. As colunas do LSP contam unidades UTF-16
+# (padrão) ou caracteres (codificação 'utf-32', se o editor aceitar).
+class _Linhas:
+  __slots__ = ("inicios", "utf16", "ascii")
+
+  def __init__(self, texto, utf16):
+    self.inicios = [0]
+    self.inicios.extend(quebra.end() for quebra in _RE_QUEBRA.finditer(texto))
+    self.utf16 = utf16
+    # Texto só ASCII (colunas UTF-16 = caracteres). Depois de uma edição com
+    # outros caracteres fica False, e cada linha é conferida.
+    self.ascii = texto.isascii()
+
+  # Deslocamento do fim do conteúdo da linha (antes da quebra)
+  def fim_da_linha(self, texto, linha):
+    if linha + 1 >= len(self.inicios):
+      return len(texto)
+    fim = self.inicios[linha + 1] - 1
+    if texto[fim] == "\n" and fim > self.inicios[linha] and texto[fim - 1] == "\r":
+      fim -= 1
+    return fim
+
+  def coluna(self, texto, inicio_da_linha, offset):
+    if self.utf16 and not self.ascii:
+      trecho = texto[inicio_da_linha:offset]
+      if not trecho.isascii():
+        return len(trecho.encode("utf-16-le")) // 2
+    return offset - inicio_da_linha
+
+  def posicao(self, texto, offset):
+    linha = bisect_right(self.inicios, offset) - 1
+    return {"line": linha, "character": self.coluna(texto, self.inicios[linha], offset)}
+
+  # Posição do LSP -> deslocamento (além do fim da linha ou do texto: o fim)
+  def offset(self, texto, posicao):
+    linha = posicao["line"]
+    if linha >= len(self.inicios):
+      return len(texto)
+    inicio = self.inicios[linha]
+    fim = self.fim_da_linha(texto, linha)
+    caractere = posicao["character"]
+    if self.utf16 and not self.ascii and not texto[inicio:fim].isascii():
+      unidades = 0
+      for k in range(inicio, fim):
+        if unidades >= caractere:
+          return k
+        unidades += 2 if ord(texto[k]) > 0xFFFF else 1
+      return fim
+    return min(inicio + caractere, fim)
+
+  # Atualiza os inícios depois que [inicio, fim) do texto antigo virou
+  # 'inseridos' ('texto' já é o novo). Só as quebras perto do trecho
+  # editado são procuradas de novo; as seguintes são deslocadas.
+  def atualizar(self, texto, inicio, fim, inseridos):
+    self.ascii = self.ascii and inseridos.isascii()
+    delta = len(inseridos) - (fim - inicio)
+    a = max(inicio - 1, 0)
+    b = min(inicio + len(inseridos) + 1, len(texto))
+    novos = [quebra.end() for quebra in _RE_QUEBRA.finditer(texto, a, b + 1) if quebra.end() <= b]
+    seguintes = bisect_right(self.inicios, fim + 1)
+    novos.extend(inicio_da_linha + delta for inicio_da_linha in self.inicios[seguintes:])
+    self.inicios[bisect_right(self.inicios, a):] = novos
+
+# --- Trabalho nos processos (cada processo guarda os seus documentos) ---
+
+class _DocumentoAberto:
+  __slots__ = ("documento", "linhas", "tokens")
+
+  def __init__(self, documento, linhas):
+    self.documento = documento
+    self.linhas = linhas
+    self.tokens = None # TokenStream da versão atual, para os tokens semânticos
+
+_documentos = {} # uri -> _DocumentoAberto, no processo trabalhador
+
+def _abrir(uri, texto, utf16, parser, motor):
+  aberto = _DocumentoAberto(DocumentoIncremental(texto, parser, motor), _Linhas(texto, utf16))
+  _documentos[uri] = aberto
+  return _diagnosticos(aberto)
+
+# Aplica as mudanças do editor (em ordem) ao texto e reanalisa uma vez só,
+# o trecho entre o maior prefixo e o maior sufixo que nenhuma mudança tocou
+def _editar(uri, mudancas):
+  aberto = _documentos[uri]
+  linhas = aberto.linhas
+  texto = aberto.documento.codigo_fonte
+  tamanho = len(texto)
+  prefixo = sufixo = None
+  for mudanca in mudancas:
+    if "range" in mudanca:
+      inicio = linhas.offset(texto, mudanca["range"]["start"])
+      fim = max(linhas.offset(texto, mudanca["range"]["end"]), inicio)
+    else:
+      inicio, fim = 0, len(texto) # Documento inteiro
+    inseridos = mudanca["text"]
+    prefixo = inicio if prefixo is None else min(prefixo, inicio)
+    sufixo = len(texto) - fim if sufixo is None else min(sufixo, len(texto) - fim)
+    texto = texto[:inicio] + inseridos + texto[fim:]
+    linhas.atualizar(texto, inicio, fim, inseridos)
+  if prefixo is not None:
+    aberto.documento.editar(prefixo, tamanho - prefixo - sufixo, texto[prefixo:len(texto) - sufixo])
+    aberto.tokens = None
+  return _diagnosticos(aberto)
+
+def _fechar(uri):
+  _documentos.pop(uri, None)
+
+def _diagnosticos(aberto):
+  texto = aberto.documento.codigo_fonte
+  linhas = aberto.linhas
+  diagnosticos = []
+  for inicio, fim, codigo, mensagem in aberto.documento.diagnosticos():
+    diagnostico = {
+      "range": {"start": linhas.posicao(texto, inicio), "end": linhas.posicao(texto, fim)},
+      "severity": SEVERIDADE_ERRO, "source": ORIGEM, "message": mensagem,
+    }
+    if codigo is not None:
+      diagnostico["code"] = codigo
+    diagnosticos.append(diagnostico)
+  return diagnosticos
+
+# Tokens semânticos no formato do LSP (5 inteiros por token, relativos ao
+# anterior) do documento inteiro ou de um intervalo. Cadeias que ocupam
+# várias linhas viram um token por linha.
+def _tokens_semanticos(uri, intervalo):
+  aberto = _documentos[uri]
+  texto = aberto.documento.codigo_fonte
+  linhas = aberto.linhas
+  if intervalo is None:
+    if aberto.tokens is None:
+      aberto.tokens = aberto.documento.tokens()
+    tokens = aberto.tokens
+    primeiro, ultimo = 0, len(tokens)
+  else:
+    # Só os comandos que cobrem o intervalo (a parte visível no editor)
+    inicio, fim = linhas.offset(texto, intervalo["start"]), linhas.offset(texto, intervalo["end"])
+    tokens = aberto.documento.tokens(inicio, fim)
+    primeiro, ultimo = bisect_right(tokens.fins, inicio), bisect_left(tokens.inicios, fim)
+  dados = []
+  linha_anterior = coluna_anterior = 0
+  for k in range(primeiro, ultimo):
+    tipo = _SEMANTICO_POR_ORDINAL[tokens.tipos[k]]
+    if tipo is None:
+      continue
+    inicio, fim = tokens.inicios[k], tokens.fins[k]
+    linha = bisect_right(linhas.inicios, inicio) - 1
+    while True:
+      inicio_da_linha = linhas.inicios[linha]
+      fim_da_linha = linhas.fim_da_linha(texto, linha)
+      coluna = linhas.coluna(texto, inicio_da_linha, inicio)
+      comprimento = linhas.coluna(texto, inicio_da_linha, min(fim, fim_da_linha)) - coluna
+      if comprimento > 0:
+        if linha != linha_anterior:
+          coluna_anterior = 0
+        dados.extend((linha - linha_anterior, coluna - coluna_anterior, comprimento, tipo, 0))
+        linha_anterior, coluna_anterior = linha, coluna
+      if fim <= fim_da_linha or linha + 1 >= len(linhas.inicios):
+        break
+      linha += 1
+      inicio = linhas.inicios[linha]
+  return dados
+
+# --- Servidor (laço de eventos) ---
+
+# Erro de uma requisição, respondido com o código dado
+class ErroDeRequisicao(Exception):
+  def __init__(self, codigo, mensagem):
+    super().__init__(mensagem)
+    self.codigo = codigo
+
+class _EstadoDoDocumento:
+  __slots__ = ("uri", "versao", "trabalhador", "mudancas", "temporizador", "enviada")
+
+  def __init__(self, uri, versao, trabalhador):
+    self.uri = uri
+    self.versao = versao
+    self.trabalhador = trabalhador # Índice do processo que guarda o documento
+    self.mudancas = [] # Mudanças ainda não enviadas ao processo
+    self.temporizador = None # Envio agendado (asyncio.TimerHandle)
+    self.enviada = None # Última versão enviada para análise
+
+class ServidorDeLinguagem:
+  # 'entrada' e 'saida' são fluxos binários (sys.stdin.buffer e
+  # sys.stdout.buffer). processos=None usa um processo por núcleo.
+  def __init__(self, entrada, saida, processos=None, parser="recursivo", motor="caracteres", atraso=ATRASO):
+    self.entrada = entrada
+    self.saida = saida
+    self.processos = processos or os.cpu_count() or 1
+    self.parser = parser
+    self.motor = motor
+    self.atraso = atraso
+    self.utf16 = True # Codificação das colunas (negociada no 'initialize')
+    self.inicializado = False
+    self.desligado = False # Recebeu 'shutdown'
+    self.encerrado = False # Recebeu 'exit': nada mais é escrito
+    self.documentos = {} # uri -> _EstadoDoDocumento
+    self.trabalhadores = []
+    self._carga = [] # Documentos abertos em cada processo
+    self._pendentes = {} # id -> tarefa de cada requisição em andamento
+    self._requisicoes = {
+      "initialize": self._initialize,
+      "shutdown": self._shutdown,
+      "textDocument/semanticTokens/full": self._tokens_completos,
+      "textDocument/semanticTokens/range": self._tokens_do_intervalo,
+    }
+    self._notificacoes = {
+      "initialized": lambda parametros: None,
+      "textDocument/didOpen": self._did_open,
+      "textDocument/didChange": self._did_change,
+      "textDocument/didClose": self._did_close,
+      "$/cancelRequest": self._cancelar,
+    }
+
+  # Atende até o 'exit' (ou o fim da entrada). Retorna o código de saída do
+  # processo: 0 se o 'shutdown' veio antes, 1 caso contrário (como pede o LSP).
+  async def executar(self):
+    laco = asyncio.get_running_loop()
+    self.trabalhadores = [ProcessPoolExecutor(max_workers=1) for _ in range(self.processos)]
+    self._carga = [0] * self.processos
+    try:
+      with ThreadPoolExecutor(max_workers=1) as leitura:
+        while True:
+          try:
+            mensagem = await laco.run_in_executor(leitura, ler_mensagem, self.entrada)
+          except ValueError as erro: # JSON inválido
+            self._enviar({"jsonrpc": "2.0", "id": None, "error": {"code": ERRO_DE_JSON, "message": str(erro)}})
+            continue
+          if mensagem is None or mensagem.get("method") == "exit":
+            break
+          self._despachar(mensagem)
+    finally:
+      self.encerrado = True
+      for tarefa in self._pendentes.values():
+        tarefa.cancel()
+      for trabalhador in self.trabalhadores:
+        trabalhador.shutdown(cancel_futures=True) # Espera só a análise em andamento
+    return 0 if self.desligado else 1
+
+  def _enviar(self, mensagem):
+    if not self.encerrado:
+      escrever_mensagem(self.saida, mensagem)
+
+  def _notificar(self, metodo, parametros):
+    self._enviar({"jsonrpc": "2.0", "method": metodo, "params": parametros})
+
+  # Notificações são tratadas na hora, em ordem; cada requisição vira uma
+  # tarefa, para que uma resposta lenta não atrase as mensagens seguintes
+  def _despachar(self, mensagem):
+    metodo = mensagem.get("method")
+    if metodo is None:
+      return # Resposta do editor a algo que o servidor não pede
+    parametros = mensagem.get("params") or {}
+    if "id" not in mensagem:
+      tratar = self._notificacoes.get(metodo)
+      if tratar is not None and (self.inicializado or metodo == "initialized"):
+        try:
+          tratar(parametros)
+        except Exception as erro:
+          print(f"Erro ao tratar '{metodo}': {erro!r}", file=sys.stderr)
+      return
+    identificador = mensagem["id"]
+    self._pendentes[identificador] = asyncio.ensure_future(self._responder(identificador, metodo, parametros))
+
+  async def _responder(self, identificador, metodo, parametros):
+    try:
+      tratar = self._requisicoes.get(metodo)
+      if tratar is None:
+        raise ErroDeRequisicao(METODO_NAO_ENCONTRADO, f"Método não suportado: {metodo}")
+      if not self.inicializado and metodo != "initialize":
+        raise ErroDeRequisicao(NAO_INICIALIZADO, "O servidor ainda não recebeu 'initialize'.")
+      resposta = {"result": await tratar(parametros)}
+    except asyncio.CancelledError:
+      resposta = {"error": {"code": REQUISICAO_CANCELADA, "message": "Requisição cancelada."}}
+    except ErroDeRequisicao as erro:
+      resposta = {"error": {"code": erro.codigo, "message": str(erro)}}
+    except Exception as erro:
+      resposta = {"error": {"code": ERRO_INTERNO, "message": f"{type(erro).__name__}: {erro}"}}
+    finally:
+      self._pendentes.pop(identificador, None)
+    self._enviar({"jsonrpc": "2.0", "id": identificador, **resposta})
+
+  # --- Documentos ---
+
+  def _documento(self, parametros):
+    uri = parametros["textDocument"]["uri"]
+    estado = self.documentos.get(uri)
+    if estado is None:
+      raise ErroDeRequisicao(PARAMETROS_INVALIDOS, f"Documento não aberto: {uri}")
+    return estado
+
+  # Roda uma função no processo do documento (na ordem em que foi pedida)
+  def _no_trabalhador(self, estado, funcao, *argumentos):
+    laco = asyncio.get_running_loop()
+    return laco.run_in_executor(self.trabalhadores[estado.trabalhador], funcao, *argumentos)
+
+  # Envia uma análise e publica os diagnósticos quando ela terminar, se
+  # nenhuma versão mais nova tiver sido enviada nesse meio-tempo
+  def _analisar(self, estado, funcao, *argumentos):
+    versao = estado.enviada = estado.versao
+    futuro = self._no_trabalhador(estado, funcao, *argumentos)
+    futuro.add_done_callback(lambda futuro: self._publicar(estado, versao, futuro))
+
+  def _publicar(self, estado, versao, futuro):
+    if futuro.cancelled():
+      return
+    erro = futuro.exception()
+    if erro is not None:
+      print(f"Erro ao analisar '{estado.uri}': {erro!r}", file=sys.stderr)
+      return
+    if self.documentos.get(estado.uri) is estado and estado.enviada == versao:
+      self._notificar("textDocument/publishDiagnostics", {"uri": estado.uri, "version": versao, "diagnostics": futuro.result()})
+
+  # Envia já as mudanças que esperam o fim do ATRASO
+  def _enviar_mudancas(self, estado):
+    if estado.temporizador is not None:
+      estado.temporizador.cancel()
+      estado.temporizador = None
+    if estado.mudancas:
+      mudancas, estado.mudancas = estado.mudancas, []
+      self._analisar(estado, _editar, estado.uri, mudancas)
+
+  # --- Notificações ---
+
+  def _did_open(self, parametros):
+    documento = parametros["textDocument"]
+    uri = documento["uri"]
+    if uri in self.documentos:
+      self._did_close({"textDocument": {"uri": uri}})
+    trabalhador = min(range(self.processos), key=self._carga.__getitem__)
+    self._carga[trabalhador] += 1
+    estado = self.documentos[uri] = _EstadoDoDocumento(uri, documento.get("version"), trabalhador)
+    self._analisar(estado, _abrir, uri, documento["text"], self.utf16, self.parser, self.motor)
+
+  def _did_change(self, parametros):
+    estado = self._documento(parametros)
+    estado.versao = parametros["textDocument"].get("version")
+    estado.mudancas.extend(parametros["contentChanges"])
+    if estado.temporizador is not None:
+      estado.temporizador.cancel()
+    estado.temporizador = asyncio.get_running_loop().call_later(self.atraso, self._enviar_mudancas, estado)
+
+  def _did_close(self, parametros):
+    estado = self._documento(parametros)
+    if estado.temporizador is not None:
+      estado.temporizador.cancel()
+    del self.documentos[estado.uri]
+    self._carga[estado.trabalhador] -= 1
+    self._no_trabalhador(estado, _fechar, estado.uri)
+    self._notificar("textDocument/publishDiagnostics", {"uri": estado.uri, "diagnostics": []})
+
+  def _cancelar(self, parametros):
+    tarefa = self._pendentes.get(parametros.get("id"))
+    if tarefa is not None:
+      tarefa.cancel()
+
+  # --- Requisições ---
+
+  async def _initialize(self, parametros):
+    codificacoes = ((parametros.get("capabilities") or {}).get("general") or {}).get("positionEncodings") or ()
+    self.utf16 = "utf-32" not in codificacoes
+    self.inicializado = True
+    return {
+      "capabilities": {
+        "positionEncoding": "utf-16" if self.utf16 else "utf-32",
+        "textDocumentSync": {"openClose": True, "change": 2}, # 2: mudanças incrementais
+        "semanticTokensProvider": {
+          "legend": {"tokenTypes": list(TIPOS_SEMANTICOS), "tokenModifiers": []},
+          "full": True, "range": True,
+        },
+      },
+      "serverInfo": {"name": "compiladorPython-mc"},
+    }
+
+  async def _shutdown(self, parametros):
+    self.desligado = True
+    return None
+
+  async def _tokens_completos(self, parametros):
+    estado = self._documento(parametros)
+    self._enviar_mudancas(estado) # Os tokens são da versão atual
+    return {"data": await self._no_trabalhador(estado, _tokens_semanticos, estado.uri, None)}
+
+  async def _tokens_do_intervalo(self, parametros):
+    estado = self._documento(parametros)
+    self._enviar_mudancas(estado)
+    return {"data": await self._no_trabalhador(estado, _tokens_semanticos, estado.uri, parametros["range"])}
+
+# Atende pela entrada e saída padrão até o 'exit' e encerra o processo
+def servir(processos=None, parser="recursivo", motor="caracteres"):
+  servidor = ServidorDeLinguagem(sys.stdin.buffer, sys.stdout.buffer, processos, parser, motor)
+  sys.exit(asyncio.run(servidor.executar()))
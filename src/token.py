@@ -7,17 +7,54 @@ Token.py
 Define a estrutura de um Token.
 Armazena o tipo, o texto (lexema) e a localização (linha/coluna)
 para facilitar o reporte de erros (Requisito 9 - Ckp 1).
+
+A localização pode ser informada diretamente (linha/coluna) ou de forma
+preguiçosa: o token guarda apenas o deslocamento inicial no código-fonte
+(offset) e o IndiceDeLinhas, e linha/coluna são calculadas no primeiro acesso.
 """
 class Token:
-  def __init__(self, tipo: TiposDeToken, texto: str, linha: int = None, coluna: int = None):
+  # Sem __dict__ por instância: arquivos grandes geram milhões de tokens
+  __slots__ = ("tipo", "texto", "_linha", "_coluna", "offset", "_indice")
+
+  def __init__(self, tipo: TiposDeToken, texto: str, linha: int = None, coluna: int = None,
+               offset: int = None, indice=None):
     self.tipo = tipo
     self.texto = texto
-    self.linha = linha # Requisito 9 (Ckp 1)
-    self.coluna = coluna # Requisito 9 (Ckp 1)
+    self._linha = linha # Requisito 9 (Ckp 1)
+    self._coluna = coluna # Requisito 9 (Ckp 1)
+    self.offset = offset # Deslocamento do início do token no código-fonte
+    self._indice = indice # IndiceDeLinhas usado para resolver linha/coluna
+
+  # Calcula linha/coluna a partir do deslocamento (só uma vez por token)
+  def _resolver_posicao(self):
+    if self._linha is None and self._indice is not None:
+      self._linha, self._coluna = self._indice.linha_coluna(self.offset)
+
+  @property
+  def linha(self):
+    self._resolver_posicao()
+    return self._linha
+
+  @linha.setter
+  def linha(self, valor):
+    self._linha = valor
+
+  @property
+  def coluna(self):
+    self._resolver_posicao()
+    return self._coluna
+
+  @coluna.setter
+  def coluna(self, valor):
+    self._coluna = valor
+
+  # O próprio token já é uma representação estável (ver CursorDeTokens)
+  def como_token(self):
+    return self
 
   def __str__(self):
     pos_info = ""
     if self.linha is not None and self.coluna is not None:
       pos_info = f", Linha: {self.linha}, Coluna: {self.coluna}"
     # O tipo do enum é acessado com .name
-    return f"Token [Tipo: {self.tipo.name}, Texto: '{self.texto}'{pos_info}]"
\ No newline at end of file
+    return f"Token [Tipo: {self.tipo.name}, Texto: '{self.texto}'{pos_info}]"
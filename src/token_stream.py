@@ -0,0 +1,176 @@
+# src/token_stream.py
+
+from array import array
+from .token_type import TiposDeToken, TIPOS_POR_ORDINAL, ORDINAL_DO_TIPO
+from .token import Token
+from .indice_linhas import IndiceDeLinhas
+"""
+TokenStream.py
+
+Armazena todos os tokens de um arquivo "por colunas": em vez de um objeto
+Token por token, guarda três vetores compactos (array):
+  - tipos:   ordinal do TiposDeToken (1 byte)
+  - inicios: deslocamento do início do token no código-fonte
+  - fins:    deslocamento do fim do token no código-fonte
+
+O texto (lexema) e a linha/coluna só são calculados quando acessados.
+O Parser pode consumir o TokenStream por meio de um CursorDeTokens, sem
+criar um Token por passo.
+"""
+
+_ORDINAL_CADEIA = ORDINAL_DO_TIPO[TiposDeToken.CADEIA]
+_ORDINAL_FIM_DE_ARQUIVO = ORDINAL_DO_TIPO[TiposDeToken.FIM_DE_ARQUIVO]
+
+class TokenStream:
+  def __init__(self, codigo_fonte, indice_linhas=None):
+    self.codigo_fonte = codigo_fonte
+    self.indice_linhas = indice_linhas or IndiceDeLinhas(codigo_fonte)
+    # 'I' (32 bits) comporta arquivos de até 4 GiB; acima disso usa 'Q'
+    tipo_offset = "I" if len(codigo_fonte) <= 0xFFFFFFFF else "Q"
+    self.tipos = array("B")
+    self.inicios = array(tipo_offset)
+    self.fins = array(tipo_offset)
+    # Erros léxicos (DiagnosticoLexico), na ordem em que ocorreram. O
+    # atributo indice_token de cada um diz quantos tokens já tinham sido
+    # gravados quando o erro foi encontrado.
+    self.diagnosticos = []
+
+  # Gera o TokenStream de um AnalisadorLexico (modo em lote de tokenize())
+  @classmethod
+  def do_analisador(cls, analisador):
+    return analisador.tokenize(lote=True)
+
+  # Grava um token a partir de seu tipo e deslocamentos
+  def adicionar(self, tipo, inicio, fim):
+    self.tipos.append(ORDINAL_DO_TIPO[tipo])
+    self.inicios.append(inicio)
+    self.fins.append(fim)
+
+  # Grava um Token já construído (o fim é deduzido do texto)
+  def adicionar_token(self, token):
+    inicio = token.offset
+    if token.tipo == TiposDeToken.FIM_DE_ARQUIVO:
+      fim = inicio
+    elif token.tipo == TiposDeToken.CADEIA:
+      fim = inicio + len(token.texto) + 2 # Inclui as aspas
+    else:
+      fim = inicio + len(token.texto)
+    self.adicionar(token.tipo, inicio, fim)
+
+  def __len__(self):
+    return len(self.tipos)
+
+  def tipo(self, i):
+    return TIPOS_POR_ORDINAL[self.tipos[i]]
+
+  # Lexema do i-ésimo token (fatiado do código-fonte apenas neste momento)
+  def texto(self, i):
+    ordinal = self.tipos[i]
+    if ordinal == _ORDINAL_CADEIA:
+      return self.codigo_fonte[self.inicios[i] + 1:self.fins[i] - 1] # Sem as aspas
+    if ordinal == _ORDINAL_FIM_DE_ARQUIVO:
+      return "FIM_DE_ARQUIVO"
+    return self.codigo_fonte[self.inicios[i]:self.fins[i]]
+
+  def linha_coluna(self, i):
+    return self.indice_linhas.linha_coluna(self.inicios[i])
+
+  # Materializa o i-ésimo token como objeto Token
+  def token(self, i):
+    return Token(self.tipo(i), self.texto(i), offset=self.inicios[i], indice=self.indice_linhas)
+
+  def __iter__(self):
+    for i in range(len(self.tipos)):
+      yield self.token(i)
+
+  def cursor(self):
+    return CursorDeTokens(self)
+
+  # Escreve os tokens [0, ate) em 'saida', um por linha, no mesmo formato de
+  # Token.__str__. Linha/coluna são calculadas de forma incremental (os
+  # tokens estão em ordem de deslocamento) e a escrita é feita em blocos.
+  def escrever(self, saida, ate=None, tamanho_do_bloco=4096):
+    if ate is None:
+      ate = len(self.tipos)
+    codigo = self.codigo_fonte
+    quebras = self.indice_linhas.quebras()
+    total_quebras = len(quebras)
+    nomes = [tipo.name for tipo in TIPOS_POR_ORDINAL]
+    texto = self.texto
+    inicios = self.inicios
+    tipos = self.tipos
+    proxima_quebra = 0 # Índice, em 'quebras', do primeiro '\n' ainda não ultrapassado
+    inicio_da_linha = 0
+    bloco = []
+    for i in range(ate):
+      inicio = inicios[i]
+      while proxima_quebra < total_quebras and quebras[proxima_quebra] < inicio:
+        inicio_da_linha = quebras[proxima_quebra] + 1
+        proxima_quebra += 1
+      bloco.append(
+        f"Token [Tipo: {nomes[tipos[i]]}, Texto: '{texto(i)}', "
+        f"Linha: {proxima_quebra + 1}, Coluna: {inicio - inicio_da_linha + 1}]\n"
+      )
+      if len(bloco) >= tamanho_do_bloco:
+        saida.write("".join(bloco))
+        bloco.clear()
+    if bloco:
+      saida.write("".join(bloco))
+
+"""
+Cursor sobre um TokenStream com a mesma interface do AnalisadorLexico
+(proximo_token). Em vez de criar um Token a cada passo, o cursor devolve
+a si mesmo, expondo tipo/texto/linha/coluna do token corrente. Nas
+posições onde houve erro léxico, devolve None, como o analisador faria.
+"""
+class CursorDeTokens:
+  __slots__ = ("stream", "indice", "tipo", "ultimo_erro", "_tipos", "_erros", "_erro_pendente", "_proximo_erro")
+
+  def __init__(self, stream):
+    self.stream = stream
+    self.indice = -1
+    self.tipo = None
+    self.ultimo_erro = None # DiagnosticoLexico da última posição com erro
+    self._tipos = stream.tipos
+    self._erros = iter(stream.diagnosticos)
+    self._proximo_erro = self._carregar_proximo_erro()
+
+  # Avança para o próximo token. Depois do FIM_DE_ARQUIVO, permanece nele.
+  def proximo_token(self):
+    i = self.indice + 1
+    if i == self._proximo_erro:
+      self.ultimo_erro = self._erro_pendente
+      self._proximo_erro = self._carregar_proximo_erro()
+      return None
+    if i < len(self._tipos):
+      self.indice = i
+      self.tipo = TIPOS_POR_ORDINAL[self._tipos[i]]
+    return self
+
+  # Lê o próximo erro do stream e retorna o índice do token em que ele ocorre
+  def _carregar_proximo_erro(self):
+    self._erro_pendente = next(self._erros, None)
+    return self._erro_pendente.indice_token if self._erro_pendente is not None else None
+
+  @property
+  def texto(self):
+    return self.stream.texto(self.indice)
+
+  @property
+  def offset(self):
+    return self.stream.inicios[self.indice]
+
+  @property
+  def linha(self):
+    return self.stream.linha_coluna(self.indice)[0]
+
+  @property
+  def coluna(self):
+    return self.stream.linha_coluna(self.indice)[1]
+
+  # Cópia estável do token corrente (o cursor muda a cada avanço)
+  def como_token(self):
+    return self.stream.token(self.indice)
+
+  def __str__(self):
+    return str(self.como_token())
@@ -53,4 +53,9 @@ class TiposDeToken(enum.Enum):
 
   # --- Tokens de Controle ---
   DOIS_PONTOS = "DOIS_PONTOS" # Símbolo da gramática original
-  FIM_DE_ARQUIVO = "FIM_DE_ARQUIVO" # Token de controle do parser
\ No newline at end of file
+  FIM_DE_ARQUIVO = "FIM_DE_ARQUIVO" # Token de controle do parser
+
+# Representação compacta dos tipos de token (um byte por token em TokenStream).
+# O ordinal é a posição do tipo na ordem de declaração do enum.
+TIPOS_POR_ORDINAL = tuple(TiposDeToken)
+ORDINAL_DO_TIPO = {tipo: ordinal for ordinal, tipo in enumerate(TIPOS_POR_ORDINAL)}
@@ -0,0 +1,314 @@
+# src/tradutor_python.py
+
+import ast
+import hashlib
+import marshal
+import os
+import sys
+import types
+from .token_type import TiposDeToken
+from .semantico import INTEIRO, REAL
+from .maquina_virtual import ErroDeExecucao
+from . import arvore
+"""
+TradutorPython.py
+
+Segundo executor dos programas .mc: em vez de interpretar bytecode, traduz
+a AST analisada para um módulo Python (ast.Module) e o compila com
+compile(). O corpo do :ALGORITMO vira uma função 'programa', em que cada
+variável é uma variável local (acesso rápido), ENQUANTO vira 'while' e
+SE/SENAO vira 'if'/'else'. O laço passa a ser executado pelo próprio
+CPython.
+
+A semântica é a mesma da máquina virtual (src/maquina_virtual.py):
+INTEIRO / INTEIRO trunca em direção a zero, um valor INTEIRO atribuído a
+uma variável REAL vira float, e os erros de execução têm a mesma mensagem.
+As linhas e colunas dos nós gerados são as do código-fonte .mc, de modo
+que a posição de um erro é lida do próprio traceback (co_positions). Antes
+do Python 3.11 o code object não guarda colunas: cada nó posicionado
+recebe então uma "linha virtual" (1, 2, 3, ...), e o módulo gerado guarda
+em _POSICOES a linha e a coluna .mc de cada uma, achadas pelo tb_lineno.
+
+O code object é guardado em disco com marshal, num arquivo por programa
+que guarda também o hash do código-fonte: uma segunda execução do mesmo
+arquivo não passa pelo Analisador Léxico, pelo Parser nem pela análise
+semântica, e editar o arquivo sobrescreve a entrada.
+
+A tradução e o compile() do CPython são recursivos: programas com
+aninhamento muito profundo (ou mais de 20 ENQUANTO aninhados, limite do
+CPython) levantam ProgramaNaoTraduzivel, e devem ser executados na
+máquina virtual.
+"""
+
+VERSAO_DO_CACHE = 2 # Incrementar quando o código gerado mudar
+NOME_DA_FUNCAO = "programa"
+NOME_DAS_POSICOES = "_POSICOES"
+# Sem co_positions (Python < 3.11), as posições vão numa tabela (linhas virtuais)
+LINHAS_VIRTUAIS = not hasattr(types.CodeType, "co_positions")
+# Parâmetros da função gerada (funções auxiliares passadas por quem executa)
+PARAMETROS = ("_ler_inteiro", "_ler_real", "_escrever", "_real")
+
+OPERADORES_ARITMETICOS = {"+": ast.Add, "-": ast.Sub, "*": ast.Mult, "/": ast.Div}
+COMPARACOES = {
+  "<": ast.Lt, "<=": ast.LtE, ">": ast.Gt, ">=": ast.GtE, "==": ast.Eq, "!=": ast.NotEq,
+}
+
+class ProgramaNaoTraduzivel(Exception):
+  pass
+
+# Erro de leitura (LER), completado com a posição por executar_codigo()
+class _ErroDeLeitura(Exception):
+  pass
+
+class TradutorPython:
+  # 'tabela' é a TabelaDeSimbolos da análise semântica (sem erros) da mesma
+  # AST; 'indice_linhas' dá a linha/coluna gravadas nos nós gerados.
+  def __init__(self, programa, tabela, indice_linhas, nome_do_arquivo="<programa>"):
+    self.programa = programa
+    self.tabela = tabela
+    self.indice_linhas = indice_linhas
+    self.nome_do_arquivo = nome_do_arquivo
+    self._divisoes = 0 # Numera as variáveis temporárias de cada divisão inteira
+    # Linha e coluna .mc de cada linha virtual, em sequência (LINHAS_VIRTUAIS)
+    self._posicoes = []
+
+  # Retorna o ast.Module com a função 'programa'
+  def traduzir(self):
+    corpo = []
+    for slot, nome in enumerate(self.tabela.nomes):
+      inicial = 0.0 if self.tabela.tipo(slot) is REAL else 0
+      corpo.append(self._local(ast.Assign(targets=[_nome(nome, ast.Store())], value=ast.Constant(inicial)), 1, 0))
+    corpo.extend(self._comandos(self.programa.comandos) or [ast.Pass()])
+    argumentos = ast.arguments(
+      posonlyargs=[], args=[ast.arg(arg=parametro) for parametro in PARAMETROS],
+      kwonlyargs=[], kw_defaults=[], defaults=[],
+    )
+    funcao = ast.FunctionDef(name=NOME_DA_FUNCAO, args=argumentos, body=corpo, decorator_list=[], returns=None)
+    corpo_do_modulo = [self._local(funcao, 1, 0)]
+    if LINHAS_VIRTUAIS:
+      posicoes = ast.Assign(targets=[ast.Name(NOME_DAS_POSICOES, ast.Store())], value=ast.Constant(tuple(self._posicoes)))
+      corpo_do_modulo.append(self._local(posicoes, 1, 0))
+    modulo = ast.Module(body=corpo_do_modulo, type_ignores=[])
+    return ast.fix_missing_locations(modulo)
+
+  # Compila o módulo e retorna o code object
+  def compilar(self):
+    try:
+      return compile(self.traduzir(), self.nome_do_arquivo, "exec")
+    except (RecursionError, MemoryError, SyntaxError) as erro:
+      # SyntaxError: "too many statically nested blocks" (ENQUANTO aninhados)
+      raise ProgramaNaoTraduzivel(f"Programa não pode ser traduzido para Python ({erro}).") from None
+
+  # --- Posições ---
+
+  def _local(self, no, linha, coluna):
+    if LINHAS_VIRTUAIS:
+      self._posicoes += (linha, coluna)
+      linha = len(self._posicoes) // 2
+    no.lineno = no.end_lineno = linha
+    no.col_offset = coluna
+    no.end_col_offset = coluna + 1
+    return no
+
+  def _no_na_posicao(self, no, inicio):
+    linha, coluna = self.indice_linhas.linha_coluna(inicio)
+    return self._local(no, linha, coluna - 1)
+
+  # --- Comandos ---
+
+  def _comando(self, comando):
+    classe = type(comando)
+    if classe is arvore.Atribuicao:
+      valor, tipo = self._expressao(comando.expressao)
+      if tipo is INTEIRO and self.tabela.tipo(comando.alvo.slot) is REAL:
+        valor = ast.Call(func=ast.Name("_real", ast.Load()), args=[valor], keywords=[])
+      no = ast.Assign(targets=[_nome(comando.alvo.nome, ast.Store())], value=valor)
+    elif classe is arvore.Ler:
+      alvo = comando.alvo
+      leitura = "_ler_real" if self.tabela.tipo(alvo.slot) is REAL else "_ler_inteiro"
+      chamada = ast.Call(func=ast.Name(leitura, ast.Load()), args=[ast.Constant(alvo.nome)], keywords=[])
+      no = ast.Assign(targets=[_nome(alvo.nome, ast.Store())], value=self._no_na_posicao(chamada, comando.inicio))
+    elif classe is arvore.Imprimir:
+      if type(comando.valor) is arvore.Var:
+        texto = ast.JoinedStr([
+          ast.FormattedValue(_nome(comando.valor.nome, ast.Load()), conversion=-1, format_spec=None),
+          ast.Constant("\n"),
+        ])
+      else:
+        texto = ast.Constant(comando.valor.texto + "\n")
+      chamada = ast.Call(func=ast.Name("_escrever", ast.Load()), args=[texto], keywords=[])
+      no = ast.Expr(chamada)
+    elif classe is arvore.Se:
+      senao = [] if comando.senao is None else self._corpo(comando.senao)
+      no = ast.If(test=self._expressao(comando.condicao)[0], body=self._corpo(comando.entao), orelse=senao)
+    elif classe is arvore.Enquanto:
+      no = ast.While(test=self._expressao(comando.condicao)[0], body=self._corpo(comando.corpo), orelse=[])
+    return self._no_na_posicao(no, comando.inicio)
+
+  # Lista de comandos Python; os comandos de um Bloco entram no mesmo nível
+  def _comandos(self, comandos):
+    traduzidos = []
+    for comando in comandos:
+      if type(comando) is arvore.Bloco:
+        traduzidos.extend(self._comandos(comando.comandos))
+      else:
+        traduzidos.append(self._comando(comando))
+    return traduzidos
+
+  # Corpo de um ENTAO/SENAO/ENQUANTO
+  def _corpo(self, comando):
+    return self._comandos([comando]) or [ast.Pass()]
+
+  # --- Expressões ---
+
+  # Retorna (nó ast, tipo): tipo INTEIRO/REAL, ou None para condições
+  def _expressao(self, expressao):
+    classe = type(expressao)
+    if classe is arvore.Var:
+      return _nome(expressao.nome, ast.Load()), self.tabela.tipo(expressao.slot)
+    if classe is arvore.Literal:
+      if expressao.tipo == TiposDeToken.NUMINT:
+        return ast.Constant(int(expressao.texto)), INTEIRO
+      return ast.Constant(float(expressao.texto)), REAL
+    esquerda, tipo_esquerda = self._expressao(expressao.esquerda)
+    direita, tipo_direita = self._expressao(expressao.direita)
+    if classe is arvore.BoolOp:
+      operador = ast.And() if expressao.op == "E" else ast.Or()
+      return ast.BoolOp(op=operador, values=[esquerda, direita]), None
+    if classe is arvore.RelOp:
+      return ast.Compare(left=esquerda, ops=[COMPARACOES[expressao.op]()], comparators=[direita]), None
+    tipo = REAL if tipo_esquerda is REAL or tipo_direita is REAL else INTEIRO
+    if expressao.op == "/" and tipo is INTEIRO:
+      return self._divisao_inteira(esquerda, direita, expressao.inicio), INTEIRO
+    operacao = ast.BinOp(left=esquerda, op=OPERADORES_ARITMETICOS[expressao.op](), right=direita)
+    return self._no_na_posicao(operacao, expressao.inicio), tipo
+
+  # INTEIRO / INTEIRO truncado em direção a zero, sem chamar função:
+  #   (q := (a := esquerda) // (b := direita)) + (q < 0 and q * b != a)
+  # ('//' arredonda para baixo; soma 1 quando o quociente negativo não é exato).
+  # Cada divisão usa temporárias próprias, pois uma pode estar dentro da outra.
+  def _divisao_inteira(self, esquerda, direita, inicio):
+    self._divisoes += 1
+    a, b, q = (f"_{letra}{self._divisoes}" for letra in "abq")
+    divisao = ast.BinOp(
+      left=ast.NamedExpr(target=ast.Name(a, ast.Store()), value=esquerda),
+      op=ast.FloorDiv(),
+      right=ast.NamedExpr(target=ast.Name(b, ast.Store()), value=direita),
+    )
+    self._no_na_posicao(divisao, inicio)
+    inexata = ast.BoolOp(op=ast.And(), values=[
+      ast.Compare(left=ast.Name(q, ast.Load()), ops=[ast.Lt()], comparators=[ast.Constant(0)]),
+      ast.Compare(
+        left=ast.BinOp(left=ast.Name(q, ast.Load()), op=ast.Mult(), right=ast.Name(b, ast.Load())),
+        ops=[ast.NotEq()], comparators=[ast.Name(a, ast.Load())],
+      ),
+    ])
+    return ast.BinOp(left=ast.NamedExpr(target=ast.Name(q, ast.Store()), value=divisao), op=ast.Add(), right=inexata)
+
+# Variáveis do programa ganham o prefixo 'v_': nunca colidem com palavras
+# reservadas do Python nem com os parâmetros da função gerada
+def _nome(nome, contexto):
+  return ast.Name(f"v_{nome}", contexto)
+
+# Compila uma AST analisada para um code object Python
+def compilar_para_python(programa, tabela, indice_linhas, nome_do_arquivo="<programa>"):
+  return TradutorPython(programa, tabela, indice_linhas, nome_do_arquivo).compilar()
+
+# --- Execução ---
+
+# Executa o code object gerado. Erros de execução levantam ErroDeExecucao,
+# com as mesmas mensagens da máquina virtual.
+def executar_codigo(codigo, entrada=None, saida=None):
+  entrada = entrada if entrada is not None else sys.stdin
+  saida = saida if saida is not None else sys.stdout
+
+  def ler(nome, conversao, tipo):
+    linha = entrada.readline()
+    if not linha:
+      raise _ErroDeLeitura(f"Fim da entrada ao ler a variável '{nome}'")
+    texto = linha.strip()
+    try:
+      return conversao(texto)
+    except ValueError:
+      raise _ErroDeLeitura(f"Valor inválido '{texto}' para a variável {tipo} '{nome}'") from None
+
+  def ler_inteiro(nome):
+    return ler(nome, int, "INTEIRO")
+
+  def ler_real(nome):
+    return ler(nome, float, "REAL")
+
+  escopo = {"__builtins__": {}}
+  exec(codigo, escopo)
+  funcao = escopo[NOME_DA_FUNCAO]
+  posicoes = escopo.get(NOME_DAS_POSICOES)
+  try:
+    funcao(ler_inteiro, ler_real, saida.write, float)
+  except ZeroDivisionError as erro:
+    raise _erro_de_execucao("Divisão por zero", erro, funcao.__code__, posicoes) from None
+  except _ErroDeLeitura as erro:
+    raise _erro_de_execucao(str(erro), erro, funcao.__code__, posicoes) from None
+
+# Monta o ErroDeExecucao com a linha/coluna .mc da instrução que falhou.
+# 'posicoes' é a tabela das linhas virtuais (None se o código tem colunas).
+def _erro_de_execucao(mensagem, erro, codigo_da_funcao, posicoes=None):
+  traceback = erro.__traceback__
+  posicao = None
+  while traceback is not None:
+    if traceback.tb_frame.f_code is codigo_da_funcao:
+      posicao = _posicao(codigo_da_funcao, traceback, posicoes)
+    traceback = traceback.tb_next
+  if posicao is None or posicao[0] is None:
+    return ErroDeExecucao(f"ERRO DE EXECUÇÃO: {mensagem}.")
+  linha, coluna = posicao
+  return ErroDeExecucao(f"ERRO DE EXECUÇÃO: {mensagem} na linha {linha}, coluna {coluna + 1}.")
+
+# (linha, coluna a partir de 0) da instrução do quadro 'traceback'
+def _posicao(codigo_da_funcao, traceback, posicoes):
+  if posicoes is not None:
+    virtual = traceback.tb_lineno
+    if virtual is None or not 0 < virtual <= len(posicoes) // 2:
+      return None
+    return posicoes[2 * virtual - 2], posicoes[2 * virtual - 1]
+  linha, _, coluna, _ = list(codigo_da_funcao.co_positions())[traceback.tb_lasti // 2]
+  return linha, coluna
+
+# --- Cache em disco (marshal) ---
+
+# O cache fica em '__pycache__', ao lado do arquivo .mc, num único arquivo
+# por programa e versão do Python (o formato do marshal e o bytecode mudam
+# entre versões). O arquivo guarda o code object junto com o resumo do
+# código-fonte e das 'opcoes' de compilação (como os passos do otimizador):
+# editar o .mc sobrescreve a entrada, em vez de deixar uma nova a cada versão.
+def arquivo_de_cache(caminho):
+  diretorio = os.path.join(os.path.dirname(os.path.abspath(caminho)), "__pycache__")
+  nome = os.path.basename(caminho) # Com a extensão: 'prog.mc' e 'prog.txt' não colidem
+  return os.path.join(diretorio, f"{nome}.{sys.implementation.cache_tag}.marshal")
+
+def resumo_do_codigo(codigo_fonte, opcoes=""):
+  conteudo = f"{VERSAO_DO_CACHE}:{sys.implementation.cache_tag}:{opcoes}:{codigo_fonte}"
+  return hashlib.sha256(conteudo.encode("utf-8", "surrogatepass")).digest()
+
+# Code object em cache para este código-fonte (None se não houver, ou se a
+# entrada for de outra versão do arquivo)
+def carregar_do_cache(caminho, codigo_fonte, opcoes=""):
+  arquivo = arquivo_de_cache(caminho)
+  if not os.path.exists(arquivo):
+    return None
+  try:
+    with open(arquivo, "rb") as f:
+      resumo, codigo = marshal.load(f)
+  except (OSError, EOFError, ValueError, TypeError):
+    return None # Cache corrompido: é gerado de novo
+  return codigo if resumo == resumo_do_codigo(codigo_fonte, opcoes) else None
+
+def salvar_no_cache(caminho, codigo_fonte, codigo, opcoes=""):
+  arquivo = arquivo_de_cache(caminho)
+  try:
+    os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+    temporario = f"{arquivo}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as f:
+      marshal.dump((resumo_do_codigo(codigo_fonte, opcoes), codigo), f)
+    os.replace(temporario, arquivo) # Escrita atômica
+  except OSError:
+    pass # Sem permissão de escrita: segue sem cache